@@ -0,0 +1,82 @@
+"""Add daily_transaction_rollups table
+
+Revision ID: 008_daily_rollups
+Revises: 007_theme_preference
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008_daily_rollups'
+down_revision = '007_theme_preference'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Verificar se a tabela já existe
+    conn = op.get_bind()
+    
+    result = conn.execute(sa.text("""
+        SELECT table_name 
+        FROM information_schema.tables 
+        WHERE table_name = 'daily_transaction_rollups'
+    """))
+    table_exists = result.fetchone() is not None
+    
+    if table_exists:
+        return
+    
+    # Os tipos enum já existem (criados com a tabela transactions)
+    transaction_type = postgresql.ENUM('INCOME', 'EXPENSE', 'TRANSFER', name='transactiontype', create_type=False)
+    transaction_status = postgresql.ENUM('PENDING', 'COMPLETED', 'CANCELLED', name='transactionstatus', create_type=False)
+    
+    op.create_table(
+        'daily_transaction_rollups',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('workspace_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('category_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('transaction_type', transaction_type, nullable=False),
+        sa.Column('status', transaction_status, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_amount', sa.Numeric(15, 2), nullable=False, server_default='0'),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    
+    # NULLS NOT DISTINCT (PostgreSQL 15+): workspace/categoria nulos formam uma única chave
+    op.create_index(
+        'uq_daily_transaction_rollups_key',
+        'daily_transaction_rollups',
+        ['user_id', 'workspace_id', 'category_id', 'transaction_type', 'status', 'day'],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    op.create_index('idx_daily_rollups_user_day', 'daily_transaction_rollups', ['user_id', 'day'])
+    
+    # Popular a tabela com as transações existentes
+    op.execute("""
+        INSERT INTO daily_transaction_rollups
+            (id, user_id, workspace_id, category_id, transaction_type, status, day,
+             total_amount, transaction_count, updated_at)
+        SELECT gen_random_uuid(), user_id, workspace_id, category_id, transaction_type, status,
+               (transaction_date AT TIME ZONE 'UTC')::date,
+               SUM(amount), COUNT(*), now()
+        FROM transactions
+        GROUP BY user_id, workspace_id, category_id, transaction_type, status,
+                 (transaction_date AT TIME ZONE 'UTC')::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_daily_rollups_user_day', table_name='daily_transaction_rollups')
+    op.drop_index('uq_daily_transaction_rollups_key', table_name='daily_transaction_rollups')
+    op.drop_table('daily_transaction_rollups')
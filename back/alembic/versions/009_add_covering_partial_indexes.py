@@ -0,0 +1,84 @@
+"""Add covering and partial indexes for repository hot paths
+
+Revision ID: 009_hot_path_indexes
+Revises: 008_daily_rollups
+Create Date: 2026-10-17 00:00:00.000000
+
+Índices escolhidos a partir de scripts/benchmark_query_plans.py (EXPLAIN ANALYZE
+dos métodos de repositório com 500k transações).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009_hot_path_indexes'
+down_revision = '008_daily_rollups'
+branch_labels = None
+depends_on = None
+
+
+def _index_exists(name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": name})
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    # Filtros por tipo/status com ordenação por data (search, get_sum_by_period);
+    # INCLUDE permite somar sem visitar a tabela
+    if not _index_exists('ix_transactions_user_type_status_date'):
+        op.create_index(
+            'ix_transactions_user_type_status_date',
+            'transactions',
+            ['user_id', 'transaction_type', 'status', 'transaction_date'],
+            unique=False,
+            postgresql_include=['amount', 'category_id'],
+        )
+
+    # Estatísticas do workspace: só transações que pertencem a um workspace
+    if not _index_exists('ix_transactions_workspace_date'):
+        op.create_index(
+            'ix_transactions_workspace_date',
+            'transactions',
+            ['workspace_id', 'transaction_date'],
+            unique=False,
+            postgresql_where=sa.text('workspace_id IS NOT NULL'),
+        )
+
+    # Busca da bill de uma transação (get_by_transaction_id, pagamento/cancelamento)
+    if not _index_exists('ix_bills_transaction_id'):
+        op.create_index(
+            'ix_bills_transaction_id',
+            'bills',
+            ['transaction_id'],
+            unique=False,
+            postgresql_where=sa.text('transaction_id IS NOT NULL'),
+        )
+
+    # Exclusão de transações de bills canceladas em todas as consultas de transações:
+    # índice pequeno, lido por index-only scan
+    if not _index_exists('ix_bills_cancelled_transaction_id'):
+        op.create_index(
+            'ix_bills_cancelled_transaction_id',
+            'bills',
+            ['transaction_id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'CANCELLED' AND transaction_id IS NOT NULL"),
+        )
+
+    # Listagens de bills por usuário/status/vencimento (get_by_user_id, get_upcoming, get_overdue)
+    if not _index_exists('ix_bills_user_status_due_date'):
+        op.create_index(
+            'ix_bills_user_status_due_date',
+            'bills',
+            ['user_id', 'status', 'due_date'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bills_user_status_due_date', table_name='bills')
+    op.drop_index('ix_bills_cancelled_transaction_id', table_name='bills')
+    op.drop_index('ix_bills_transaction_id', table_name='bills')
+    op.drop_index('ix_transactions_workspace_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_type_status_date', table_name='transactions')
@@ -0,0 +1,62 @@
+"""Add notification_outbox table
+
+Revision ID: 010_notification_outbox
+Revises: 009_hot_path_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010_notification_outbox'
+down_revision = '009_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Verificar se a tabela já existe
+    conn = op.get_bind()
+
+    result = conn.execute(sa.text("""
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_name = 'notification_outbox'
+    """))
+    table_exists = result.fetchone() is not None
+
+    if table_exists:
+        return
+
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('channel', sa.String(20), nullable=False, server_default='email'),
+        sa.Column('recipient', sa.String(255), nullable=False),
+        sa.Column('subject', sa.String(500), nullable=True),
+        sa.Column('html_content', sa.Text(), nullable=True),
+        sa.Column('text_content', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    # Apenas as pendentes, na ordem em que o worker as busca
+    op.create_index(
+        'idx_notification_outbox_pending',
+        'notification_outbox',
+        ['next_attempt_at'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_notification_outbox_pending', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
@@ -0,0 +1,90 @@
+"""Add calendar sync watermark and unique financial event indexes
+
+Revision ID: 011_calendar_sync
+Revises: 010_notification_outbox
+Create Date: 2026-10-17 00:00:00.000000
+
+A sincronização em lote (INSERT ... SELECT ... ON CONFLICT DO NOTHING) usa os
+índices únicos parciais como árbitros e a marca d'água por usuário para ler só
+o que mudou desde a última execução.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '011_calendar_sync'
+down_revision = '010_notification_outbox'
+branch_labels = None
+depends_on = None
+
+# (índice, coluna de origem, event_type)
+FINANCIAL_EVENT_INDEXES = [
+    ('uq_calendar_events_transaction', 'related_transaction_id', 'transaction'),
+    ('uq_calendar_events_bill', 'related_bill_id', 'bill'),
+    ('uq_calendar_events_goal', 'related_goal_id', 'goal'),
+]
+
+
+def _index_exists(name: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": name})
+    return result.fetchone() is not None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    for index_name, column, event_type in FINANCIAL_EVENT_INDEXES:
+        if _index_exists(index_name):
+            continue
+
+        # Remover duplicatas criadas por sincronizações concorrentes (mantém o mais antigo)
+        duplicates = f"""
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY {column} ORDER BY created_at, id) AS position
+                FROM calendar_events
+                WHERE event_type = '{event_type}' AND {column} IS NOT NULL
+            ) ranked
+            WHERE position > 1
+        """
+        conn.execute(sa.text(f"DELETE FROM calendar_event_comments WHERE event_id IN ({duplicates})"))
+        conn.execute(sa.text(f"DELETE FROM calendar_event_participants WHERE event_id IN ({duplicates})"))
+        conn.execute(sa.text(f"DELETE FROM calendar_events WHERE id IN ({duplicates})"))
+
+        op.create_index(
+            index_name,
+            'calendar_events',
+            [column],
+            unique=True,
+            postgresql_where=sa.text(f"event_type = '{event_type}'"),
+        )
+
+    # Leitura incremental: só linhas alteradas depois da marca d'água
+    if not _index_exists('ix_transactions_user_updated_at'):
+        op.create_index('ix_transactions_user_updated_at', 'transactions', ['user_id', 'updated_at'], unique=False)
+    if not _index_exists('ix_bills_user_updated_at'):
+        op.create_index('ix_bills_user_updated_at', 'bills', ['user_id', 'updated_at'], unique=False)
+
+    result = conn.execute(sa.text("""
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_name = 'calendar_sync_state'
+    """))
+    if result.fetchone() is None:
+        op.create_table(
+            'calendar_sync_state',
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('synced_until', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('user_id'),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_sync_state')
+    op.drop_index('ix_bills_user_updated_at', table_name='bills')
+    op.drop_index('ix_transactions_user_updated_at', table_name='transactions')
+    for index_name, _, _ in reversed(FINANCIAL_EVENT_INDEXES):
+        op.drop_index(index_name, table_name='calendar_events')
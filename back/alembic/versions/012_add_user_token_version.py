@@ -0,0 +1,33 @@
+"""Add token_version to users
+
+Revision ID: 012_user_token_version
+Revises: 011_calendar_sync
+Create Date: 2026-10-17 00:00:00.000000
+
+Versão dos tokens do usuário (claim "ver" do JWT); incrementada na redefinição
+de senha para revogar os tokens já emitidos.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_user_token_version'
+down_revision = '011_calendar_sync'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Verificar se a coluna já existe
+    conn = op.get_bind()
+    result = conn.execute(sa.text("""
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_name = 'users' AND column_name = 'token_version'
+    """))
+    if result.fetchone() is None:
+        op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,85 @@
+"""
+Benchmark da exclusão de transações de bills canceladas: NOT IN global x NOT EXISTS
+
+Usa os dados sintéticos de scripts/benchmark_query_plans.py (rode `seed` antes)
+e mede a latência de listagem (get_by_user_id) e busca (search) com as duas
+formas do filtro, trocando SQLAlchemyTransactionRepository._not_from_cancelled_bill.
+
+Uso: python -m scripts.benchmark_cancelled_bills_filter [iterações]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+import pytz
+from sqlalchemy import select, text
+from src.infrastructure.database.base import AsyncSessionLocal
+from src.infrastructure.database.models import *  # noqa
+from src.infrastructure.database.models.bill import Bill, BillStatus
+from src.infrastructure.database.models.transaction import Transaction
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from scripts.benchmark_query_plans import BENCH_USERS
+
+
+def not_in_cancelled_bills():
+    """Forma anterior: NOT IN sobre as bills canceladas de todos os usuários"""
+    return ~Transaction.id.in_(
+        select(Bill.transaction_id).where(
+            Bill.status == BillStatus.CANCELLED,
+            Bill.transaction_id.isnot(None),
+        )
+    )
+
+
+async def measure(user_id, iterations: int):
+    now = datetime.now(pytz.UTC)
+    cases = {
+        "get_by_user_id (mês)": lambda repo: repo.get_by_user_id(user_id, now.replace(day=1), now),
+        "get_by_user_id (ano)": lambda repo: repo.get_by_user_id(user_id, now - timedelta(days=365), now),
+        "search (despesas, 100)": lambda repo: repo.search(user_id=user_id, transaction_type="expense", limit=100),
+    }
+    timings = {}
+    async with AsyncSessionLocal() as session:
+        repo = SQLAlchemyTransactionRepository(session)
+        for name, case in cases.items():
+            await case(repo)  # aquecimento
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await case(repo)
+                samples.append((time.perf_counter() - start) * 1000)
+                session.expunge_all()
+            timings[name] = statistics.median(samples)
+    return timings
+
+
+async def main(iterations: int):
+    async with AsyncSessionLocal() as session:
+        user_id = (await session.execute(text(f"""
+            SELECT user_id FROM transactions WHERE user_id IN ({BENCH_USERS})
+            GROUP BY user_id ORDER BY count(*) DESC LIMIT 1
+        """))).scalar()
+        if not user_id:
+            print("Sem dados sintéticos; rode: python -m scripts.benchmark_query_plans seed")
+            return
+        bills, cancelled = (await session.execute(text(
+            "SELECT count(*), count(*) FILTER (WHERE status = 'CANCELLED') FROM bills"
+        ))).one()
+    print(f"bills: {bills} ({cancelled} canceladas); mediana de {iterations} execuções\n")
+
+    current = SQLAlchemyTransactionRepository.__dict__["_not_from_cancelled_bill"]
+    SQLAlchemyTransactionRepository._not_from_cancelled_bill = staticmethod(not_in_cancelled_bills)
+    try:
+        before = await measure(user_id, iterations)
+    finally:
+        SQLAlchemyTransactionRepository._not_from_cancelled_bill = current
+    after = await measure(user_id, iterations)
+
+    print(f"{'consulta':<26} {'NOT IN':>10} {'NOT EXISTS':>12}")
+    for name in before:
+        print(f"{name:<26} {before[name]:>8.2f}ms {after[name]:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 30))
@@ -0,0 +1,129 @@
+"""
+Benchmark do LoggingMiddleware: BaseHTTPMiddleware (anterior) x ASGI puro (atual)
+
+Mede requisições/segundo em processo (httpx + ASGITransport, sem rede) numa
+rota JSON representativa de listagem. O sink de logs é substituído por um
+contador para medir apenas o custo do middleware.
+
+Uso: python -m scripts.benchmark_logging_middleware [requisições] [concorrência]
+"""
+import asyncio
+import sys
+import time
+import uuid
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from src.application.services.logging_service import LoggingService
+from src.presentation.api.middleware import logging_middleware
+from src.presentation.api.middleware.logging_middleware import LoggingMiddleware
+
+
+class CountingSink:
+    """Sink que apenas conta os logs recebidos"""
+
+    def __init__(self):
+        self.count = 0
+
+    def enqueue(self, log) -> bool:
+        self.count += 1
+        return True
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """Implementação anterior (BaseHTTPMiddleware) com o mesmo trabalho de log"""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        response = None
+        error = None
+        try:
+            response = await call_next(request)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            user = getattr(request.state, "user", None)
+            logging_middleware.request_log_sink.enqueue(
+                LoggingService.build_api_request_log(
+                    method=request.method,
+                    endpoint=str(request.url.path),
+                    user_id=user.id if user else None,
+                    status_code=response.status_code if response else 500,
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    ip_address=request.client.host if request.client else None,
+                    user_agent=request.headers.get("user-agent"),
+                    request_id=request_id,
+                    error=error,
+                )
+            )
+        return response
+
+
+def build_app(middleware_class) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware_class)
+
+    # Payload no formato de uma página de /transactions
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "description": f"Transação {i}",
+            "amount": "123.45",
+            "transaction_type": "expense",
+            "status": "completed",
+            "transaction_date": "2025-01-15T12:00:00+00:00",
+        }
+        for i in range(50)
+    ]
+
+    @app.get("/api/v1/transactions")
+    async def list_transactions():
+        return items
+
+    return app
+
+
+async def run(app: FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Aquecimento
+        for _ in range(50):
+            await client.get("/api/v1/transactions")
+
+        remaining = total
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get("/api/v1/transactions")
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+async def main(total: int, concurrency: int):
+    sink = CountingSink()
+    logging_middleware.request_log_sink = sink
+
+    results = {}
+    for name, middleware_class in (
+        ("BaseHTTPMiddleware", BaseHTTPLoggingMiddleware),
+        ("ASGI puro", LoggingMiddleware),
+    ):
+        results[name] = await run(build_app(middleware_class), total, concurrency)
+        print(f"{name:<20} {results[name]:>10.0f} req/s")
+
+    baseline = results["BaseHTTPMiddleware"]
+    print(f"Ganho: {(results['ASGI puro'] / baseline - 1) * 100:.1f}% ({sink.count} logs gerados)")
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(total, concurrency))
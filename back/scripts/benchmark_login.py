@@ -0,0 +1,113 @@
+"""
+Benchmark de login: bcrypt no event loop (como antes) x pool limitado (PasswordHasher)
+
+Simula N logins concorrentes verificando a mesma senha com o custo de bcrypt
+configurado e, em paralelo, uma corrotina "heartbeat" que acorda a cada 10 ms,
+como as demais requisições atendidas pelo mesmo processo. Mostra logins/s, a
+latência de cada login e o atraso do event loop (p50/p95/máx) em cada modo.
+Com --burst, dispara uma rajada maior que a fila para mostrar as recusas (429)
+em vez de espera ilimitada.
+
+Uso:
+    python -m scripts.benchmark_login [--logins N] [--workers W] [--max-pending P] [--burst B]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List
+from src.application.auth.jwt_service import JWTService
+from src.application.auth.password_hasher import PasswordHasher
+from src.shared.exceptions import TooManyRequestsException
+
+PASSWORD = "senha-de-teste-123"
+HEARTBEAT_INTERVAL = 0.01
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _heartbeat(lags: List[float], stop: asyncio.Event):
+    """Mede quanto o loop atrasa para acordar uma corrotina a cada 10 ms"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append((time.perf_counter() - started - HEARTBEAT_INTERVAL) * 1000)
+
+
+async def run_mode(name: str, verify, logins: int) -> Dict:
+    hashed = JWTService.get_password_hash(PASSWORD)
+    lags: List[float] = []
+    latencies: List[float] = []
+    rejected = 0
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+
+    async def login():
+        nonlocal rejected
+        started = time.perf_counter()
+        try:
+            assert await verify(PASSWORD, hashed)
+            latencies.append((time.perf_counter() - started) * 1000)
+        except TooManyRequestsException:
+            rejected += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+
+    result = {
+        "modo": name,
+        "ok": len(latencies),
+        "429": rejected,
+        "logins_s": len(latencies) / elapsed if elapsed else 0.0,
+        "login_p50": statistics.median(latencies) if latencies else 0.0,
+        "login_p95": _percentile(latencies, 0.95),
+        "lag_p50": statistics.median(lags) if lags else elapsed * 1000,
+        "lag_p95": _percentile(lags, 0.95) if lags else elapsed * 1000,
+        "lag_max": max(lags) if lags else elapsed * 1000,
+    }
+    print(
+        f"  {name:<22} {result['ok']:4d} ok {result['429']:4d} x 429 | "
+        f"{result['logins_s']:6.2f} logins/s | login p50 {result['login_p50']:7.1f} ms p95 {result['login_p95']:7.1f} ms | "
+        f"loop p50 {result['lag_p50']:6.1f} ms p95 {result['lag_p95']:6.1f} ms máx {result['lag_max']:7.1f} ms"
+    )
+    return result
+
+
+async def main(logins: int, workers: int, max_pending: int, burst: int):
+    print(f"CPUs: {os.cpu_count()} | logins concorrentes: {logins} | workers: {workers} | fila: {max_pending}")
+
+    async def inline_verify(plain, hashed):
+        # Comportamento anterior: bcrypt direto na corrotina, bloqueando o loop
+        return JWTService.verify_password(plain, hashed)
+
+    print("\nLogins concorrentes")
+    await run_mode("inline (anterior)", inline_verify, logins)
+    hasher = PasswordHasher(workers=workers, max_pending=max(max_pending, logins))
+    await run_mode(f"pool ({workers} threads)", hasher.verify, logins)
+    hasher.shutdown()
+
+    if burst:
+        print(f"\nRajada de {burst} logins com fila de {max_pending}")
+        hasher = PasswordHasher(workers=workers, max_pending=max_pending)
+        await run_mode(f"pool ({workers} threads)", hasher.verify, burst)
+        print(f"  stats: {hasher.stats()}")
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de login (bcrypt)")
+    parser.add_argument("--logins", type=int, default=16, help="Logins concorrentes por modo")
+    parser.add_argument("--workers", type=int, default=max(1, min(4, os.cpu_count() or 1)), help="Threads do pool")
+    parser.add_argument("--max-pending", type=int, default=32, help="Fila máxima do pool na rajada")
+    parser.add_argument("--burst", type=int, default=64, help="Tamanho da rajada (0 para pular)")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers, args.max_pending, args.burst))
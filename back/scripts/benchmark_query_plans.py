@@ -0,0 +1,271 @@
+"""
+Benchmark de planos de consulta dos repositórios (EXPLAIN ANALYZE)
+
+Popula um volume sintético grande no PostgreSQL local (usuários bench-*@bench.invalid,
+sem tocar nos dados existentes), executa os caminhos quentes dos repositórios,
+captura o SQL gerado e registra EXPLAIN (ANALYZE, BUFFERS) de cada consulta.
+
+Uso:
+    python -m scripts.benchmark_query_plans seed [--users 200] [--transactions 500000]
+    python -m scripts.benchmark_query_plans run [--output resultados.json]
+    python -m scripts.benchmark_query_plans cleanup
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Tuple
+import pytz
+from sqlalchemy import event, select, and_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.database.base import AsyncSessionLocal, engine
+from src.infrastructure.database.models import *  # noqa
+from src.infrastructure.database.models.transaction import Transaction, TransactionStatus
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.infrastructure.repositories.bill_repository import SQLAlchemyBillRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+
+BENCH_EMAIL = "bench-%@bench.invalid"
+BENCH_USERS = f"SELECT id FROM users WHERE email LIKE '{BENCH_EMAIL}'"
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, email, username, hashed_password, is_active, is_verified, role, created_at, updated_at)
+    SELECT gen_random_uuid(), 'bench-' || i || '@bench.invalid', 'bench_' || i, 'x', true, true, 'USER', now(), now()
+    FROM generate_series(1, :users) AS i
+    """,
+    f"""
+    INSERT INTO workspaces (id, name, workspace_type, owner_id, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench', 'SHARED', u.id, true, now(), now()
+    FROM ({BENCH_USERS}) AS u
+    """,
+    f"""
+    INSERT INTO accounts (id, name, account_type, balance, initial_balance, currency, is_active, owner_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench ' || k, 'CHECKING', 0, 0, 'BRL', true, u.id, now(), now()
+    FROM ({BENCH_USERS}) AS u CROSS JOIN generate_series(1, 3) AS k
+    """,
+    f"""
+    INSERT INTO categories (id, name, category_type, is_active, user_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench ' || k, (CASE WHEN k <= 6 THEN 'EXPENSE' ELSE 'INCOME' END)::categorytype,
+           true, u.id, now(), now()
+    FROM ({BENCH_USERS}) AS u CROSS JOIN generate_series(1, 8) AS k
+    """,
+    f"""
+    CREATE TEMP TABLE bench_accounts AS
+    SELECT row_number() OVER () AS rn, a.id AS account_id, a.owner_id, w.id AS workspace_id
+    FROM accounts a JOIN workspaces w ON w.owner_id = a.owner_id
+    WHERE a.owner_id IN ({BENCH_USERS})
+    """,
+    f"""
+    CREATE TEMP TABLE bench_categories AS
+    SELECT user_id, (row_number() OVER (PARTITION BY user_id ORDER BY name) - 1) AS k, id AS category_id
+    FROM categories WHERE user_id IN ({BENCH_USERS})
+    """,
+    """
+    INSERT INTO transactions (id, description, amount, transaction_type, status, transaction_date,
+                              user_id, account_id, category_id, workspace_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench ' || g, round((5 + random() * 500)::numeric, 2),
+           (CASE WHEN random() < 0.75 THEN 'EXPENSE' ELSE 'INCOME' END)::transactiontype,
+           (CASE WHEN r < 0.88 THEN 'COMPLETED' WHEN r < 0.97 THEN 'PENDING' ELSE 'CANCELLED' END)::transactionstatus,
+           now() - random() * interval '1095 days',
+           a.owner_id, a.account_id, c.category_id,
+           CASE WHEN random() < 0.3 THEN a.workspace_id END, now(), now()
+    FROM (SELECT g, random() AS r FROM generate_series(1, :transactions) AS g) AS s
+    JOIN bench_accounts a ON a.rn = 1 + (s.g::bigint * 7919) % (SELECT count(*) FROM bench_accounts)
+    JOIN bench_categories c ON c.user_id = a.owner_id AND c.k = s.g % 8
+    """,
+    # Bills ligadas a ~5% das despesas (parte canceladas) + bills futuras pendentes
+    f"""
+    INSERT INTO bills (id, name, bill_type, amount, due_date, status, is_recurring, recurrence_type,
+                       user_id, transaction_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench', 'EXPENSE', t.amount, t.transaction_date,
+           (CASE WHEN random() < 0.2 THEN 'CANCELLED' WHEN random() < 0.7 THEN 'PAID' ELSE 'PENDING' END)::billstatus,
+           false, 'NONE', t.user_id, t.id, now(), now()
+    FROM transactions t
+    WHERE t.user_id IN ({BENCH_USERS}) AND t.transaction_type = 'EXPENSE' AND random() < 0.05
+    """,
+    f"""
+    INSERT INTO bills (id, name, bill_type, amount, due_date, status, is_recurring, recurrence_type,
+                       user_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Bench futura', 'EXPENSE', 100, now() + k * interval '3 days',
+           'PENDING', false, 'NONE', u.id, now(), now()
+    FROM ({BENCH_USERS}) AS u CROSS JOIN generate_series(1, 20) AS k
+    """,
+]
+
+CLEANUP_STATEMENTS = [
+    f"DELETE FROM daily_transaction_rollups WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM bills WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM transactions WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM categories WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM accounts WHERE owner_id IN ({BENCH_USERS})",
+    f"DELETE FROM workspaces WHERE owner_id IN ({BENCH_USERS})",
+    f"DELETE FROM users WHERE email LIKE '{BENCH_EMAIL}'",
+]
+
+
+async def seed(users: int, transactions: int):
+    """Insere o volume sintético e atualiza estatísticas"""
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        for statement in SEED_STATEMENTS:
+            await conn.execute(text(statement), {"users": users, "transactions": transactions})
+
+    async with AsyncSessionLocal() as session:
+        user_ids = (await session.execute(text(BENCH_USERS))).scalars().all()
+        rollups = SQLAlchemyTransactionRollupRepository(session)
+        for user_id in user_ids:
+            await rollups.rebuild(user_id)
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
+    print(f"Volume sintético criado em {time.perf_counter() - start:.1f}s")
+
+
+async def cleanup():
+    """Remove os dados sintéticos"""
+    async with engine.begin() as conn:
+        for statement in CLEANUP_STATEMENTS:
+            await conn.execute(text(statement))
+    print("Dados sintéticos removidos")
+
+
+def _plan_indexes(plan: Dict) -> List[str]:
+    """Índices usados em um plano (recursivo)"""
+    found = []
+    if "Index Name" in plan:
+        found.append(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_plan_indexes(child))
+    return found
+
+
+def _plan_nodes(plan: Dict) -> List[str]:
+    """Tipos de nó com a tabela, ex.: 'Seq Scan transactions'"""
+    node = plan["Node Type"]
+    if "Relation Name" in plan:
+        node = f"{node} {plan['Relation Name']}"
+    nodes = [node]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def build_cases(ctx: Dict) -> List[Tuple[str, Callable[[AsyncSession], Awaitable]]]:
+    """Caminhos quentes: métodos de repositório e consultas de rotas"""
+    user_id = ctx["user_id"]
+    now = datetime.now(pytz.UTC)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    year_start = now - timedelta(days=365)
+
+    def tx(session):
+        return SQLAlchemyTransactionRepository(session)
+
+    async def workspace_stats(session):
+        # Mesma consulta de routes/workspaces.py:get_workspace_stats
+        await session.execute(select(Transaction).where(and_(
+            Transaction.workspace_id == ctx["workspace_id"],
+            Transaction.status == TransactionStatus.COMPLETED,
+            Transaction.transaction_date >= month_start,
+            Transaction.transaction_date <= now,
+        )))
+
+    return [
+        ("transactions.get_by_user_id (mês)", lambda s: tx(s).get_by_user_id(user_id, month_start, now)),
+        ("transactions.get_by_user_id (ano)", lambda s: tx(s).get_by_user_id(user_id, year_start, now)),
+        ("transactions.aggregate (ano, mês x tipo)", lambda s: tx(s).aggregate(user_id, year_start, now, group_by=("month", "type"))),
+        ("transactions.aggregate (mês, categoria)", lambda s: tx(s).aggregate(user_id, month_start, now, group_by=("category",), transaction_type="expense")),
+        ("transactions.get_sum_by_period (despesas do mês)", lambda s: tx(s).get_sum_by_period(user_id, month_start, now, "expense")),
+        ("transactions.search (despesas pendentes)", lambda s: tx(s).search(user_id=user_id, transaction_type="expense", status="pending", limit=100, offset=0)),
+        ("transactions.get_visible_page (1ª página)", lambda s: tx(s).get_visible_page(user_id, limit=101)),
+        ("transactions.get_visible_page (cursor antigo)", lambda s: tx(s).get_visible_page(user_id, limit=101, after=(now - timedelta(days=700), ctx["transaction_id"]))),
+        ("transactions.get_by_account_id (mês)", lambda s: tx(s).get_by_account_id(ctx["account_id"], month_start, now)),
+        ("bills.get_by_user_id (pendentes)", lambda s: SQLAlchemyBillRepository(s).get_by_user_id(user_id, status="pending")),
+        ("bills.get_by_transaction_id", lambda s: SQLAlchemyBillRepository(s).get_by_transaction_id(ctx["transaction_id"])),
+        ("rollups.get_totals (mês, categoria)", lambda s: SQLAlchemyTransactionRollupRepository(s).get_totals(user_id, month_start.date(), now.date(), group_by=("category",), transaction_type="expense", status="completed")),
+        ("routes.workspaces.get_workspace_stats", workspace_stats),
+    ]
+
+
+async def run(output: str = None):
+    """Executa os casos e registra EXPLAIN ANALYZE de cada SELECT emitido"""
+    async with AsyncSessionLocal() as session:
+        row = (await session.execute(text(f"""
+            SELECT t.user_id, min(t.account_id::text)::uuid, min(t.workspace_id::text)::uuid, min(t.id::text)::uuid
+            FROM transactions t WHERE t.user_id IN ({BENCH_USERS})
+            GROUP BY t.user_id ORDER BY count(*) DESC LIMIT 1
+        """))).first()
+        if not row:
+            print("Sem dados sintéticos; rode primeiro: python -m scripts.benchmark_query_plans seed")
+            return
+        total = (await session.execute(text("SELECT count(*) FROM transactions"))).scalar()
+    ctx = {"user_id": row[0], "account_id": row[1], "workspace_id": row[2], "transaction_id": row[3]}
+    print(f"transactions: {total} linhas; usuário medido: {ctx['user_id']}\n")
+
+    captured: List[Tuple[str, object]] = []
+    capturing = {"on": False}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing["on"] and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    results = []
+    try:
+        for name, case in build_cases(ctx):
+            async with AsyncSessionLocal() as session:
+                captured.clear()
+                capturing["on"] = True
+                start = time.perf_counter()
+                await case(session)
+                wall_ms = (time.perf_counter() - start) * 1000
+                capturing["on"] = False
+
+                conn = await session.connection()
+                for statement, parameters in list(captured):
+                    explain = await conn.exec_driver_sql(
+                        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+                    )
+                    plan = explain.scalar()[0]
+                    results.append({
+                        "case": name,
+                        "wall_ms": round(wall_ms, 2),
+                        "execution_ms": plan["Execution Time"],
+                        "planning_ms": plan["Planning Time"],
+                        "indexes": sorted(set(_plan_indexes(plan["Plan"]))),
+                        "nodes": _plan_nodes(plan["Plan"]),
+                        "sql": statement,
+                    })
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    for item in results:
+        scans = [n for n in item["nodes"] if "Scan" in n]
+        print(f"{item['case']:<50} exec {item['execution_ms']:>9.2f} ms  plan {item['planning_ms']:>6.2f} ms")
+        print(f"{'':<50} {', '.join(scans)[:120]} | índices: {', '.join(item['indexes']) or '-'}")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({"generated_at": datetime.now(pytz.UTC).isoformat(), "rows": total, "results": results}, f, indent=2)
+        print(f"\nResultados gravados em {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed_parser = subparsers.add_parser("seed")
+    seed_parser.add_argument("--users", type=int, default=200)
+    seed_parser.add_argument("--transactions", type=int, default=500000)
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--output")
+    subparsers.add_parser("cleanup")
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        asyncio.run(seed(args.users, args.transactions))
+    elif args.command == "run":
+        asyncio.run(run(args.output))
+    else:
+        asyncio.run(cleanup())
@@ -0,0 +1,26 @@
+"""
+Gera o pacote pré-compilado do conteúdo de ajuda (corpos JSON por tópico)
+
+Com HELP_CONTENT_PACK_PATH apontando para o arquivo gerado, a API carrega o
+conteúdo pronto no startup em vez de compilar o módulo de conteúdo.
+
+Uso: python -m scripts.build_help_content [arquivo_de_saida]
+"""
+import hashlib
+import json
+import sys
+from src.application.content.help_content import HELP_CONTENT
+from src.application.services.help_content_service import ALL_TOPICS, compile_help_content
+
+
+def build_pack(output_path: str):
+    compiled = compile_help_content(HELP_CONTENT)
+    with open(output_path, "w", encoding="utf-8") as pack:
+        json.dump({topic: body.decode("utf-8") for topic, body in compiled.items()}, pack, ensure_ascii=False)
+    total = compiled[ALL_TOPICS]
+    print(f"{len(compiled) - 1} tópicos, {len(total)} bytes, ETag {hashlib.sha256(total).hexdigest()[:32]}")
+    print(f"Pacote gravado em {output_path}")
+
+
+if __name__ == "__main__":
+    build_pack(sys.argv[1] if len(sys.argv) > 1 else "help_content.pack.json")
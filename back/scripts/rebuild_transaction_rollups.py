@@ -0,0 +1,23 @@
+"""
+Script para reconstruir os totais diários de transações (daily_transaction_rollups)
+
+Uso: python -m scripts.rebuild_transaction_rollups [user_id]
+"""
+import asyncio
+import sys
+from uuid import UUID
+from src.infrastructure.database.base import AsyncSessionLocal
+from src.infrastructure.database.models import *  # noqa
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+
+
+async def rebuild_rollups(user_id: UUID = None):
+    """Recalcula os totais diários a partir da tabela de transações"""
+    async with AsyncSessionLocal() as session:
+        repository = SQLAlchemyTransactionRollupRepository(session)
+        rows = await repository.rebuild(user_id)
+        print(f"Totais diários reconstruídos: {rows} linhas")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_rollups(UUID(sys.argv[1]) if len(sys.argv) > 1 else None))
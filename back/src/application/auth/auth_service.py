@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.domain.repositories.user_repository import UserRepository
 from src.infrastructure.database.models.user import User
 from src.application.auth.jwt_service import JWTService
+from src.application.auth.password_hasher import password_hasher
+from src.infrastructure.cache.principal_cache import principal_cache
 from src.shared.exceptions import UnauthorizedException, ValidationException
 
 
@@ -33,7 +35,7 @@ class AuthService:
             raise UnauthorizedException("Usuário inativo")
         
         print(f"🔐 Verificando senha para usuário: {email}")
-        password_valid = self.jwt_service.verify_password(password, user.hashed_password)
+        password_valid = await password_hasher.verify(password, user.hashed_password)
         print(f"🔐 Resultado da verificação de senha: {password_valid}")
         
         if not password_valid:
@@ -41,10 +43,10 @@ class AuthService:
             raise UnauthorizedException("Email ou senha incorretos")
         
         access_token = self.jwt_service.create_access_token(
-            data={"sub": str(user.id), "email": user.email}
+            data={"sub": str(user.id), "email": user.email, "ver": user.token_version}
         )
         refresh_token = self.jwt_service.create_refresh_token(
-            data={"sub": str(user.id)}
+            data={"sub": str(user.id), "ver": user.token_version}
         )
         
         return {
@@ -76,9 +78,12 @@ class AuthService:
         
         if not user or not user.is_active:
             raise UnauthorizedException("Usuário inválido")
+
+        if payload.get("ver", 0) != user.token_version:
+            raise UnauthorizedException("Token revogado")
         
         access_token = self.jwt_service.create_access_token(
-            data={"sub": str(user.id), "email": user.email}
+            data={"sub": str(user.id), "email": user.email, "ver": user.token_version}
         )
         
         return {
@@ -94,11 +99,22 @@ class AuthService:
             raise UnauthorizedException("Token inválido")
         
         user_id = UUID(payload.get("sub"))
+        token_version = payload.get("ver", 0)
+
+        # Caminho quente: principal em cache, sem consulta ao banco
+        user = await principal_cache.get(user_id, token_version)
+        if user:
+            return user
+
         user = await self.user_repository.get_by_id(user_id)
         
         if not user or not user.is_active:
             raise UnauthorizedException("Usuário inválido")
-        
+
+        if token_version != user.token_version:
+            raise UnauthorizedException("Token revogado")
+
+        await principal_cache.set(user)
         return user
 
     async def request_password_reset(self, email: str) -> Optional[str]:
@@ -133,7 +149,7 @@ class AuthService:
             raise ValidationException("Token de reset expirado")
         
         # Atualizar senha
-        hashed_password = self.jwt_service.get_password_hash(new_password)
+        hashed_password = await password_hasher.hash(new_password)
         await self.user_repository.update_password(user.id, hashed_password)
         
         # Limpar token de reset
@@ -142,6 +158,9 @@ class AuthService:
             reset_token=None,
             reset_token_expires=None
         )
+
+        # Encerrar as sessões abertas com a senha antiga
+        await self.user_repository.revoke_tokens(user.id)
         
         return True
 
@@ -0,0 +1,79 @@
+"""
+Hash e verificação de senhas (bcrypt) fora do event loop
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from src.shared.config import settings
+from src.shared.exceptions import TooManyRequestsException
+from src.application.auth.jwt_service import JWTService
+
+
+class PasswordHasher:
+    """bcrypt em um pool de threads limitado, com fila de no máximo `max_pending`.
+
+    Cada hash/verificação custa centenas de milissegundos de CPU; o bcrypt
+    libera o GIL, então as threads do pool rodam em paralelo sem travar o
+    event loop. Quando a fila enche (rajada de logins), a requisição é
+    recusada na hora com 429 em vez de esperar atrás das outras.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        max_pending: int = settings.PASSWORD_HASH_MAX_PENDING,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.processed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise TooManyRequestsException("Muitas tentativas de autenticação em andamento. Tente novamente em instantes.")
+
+        self.pending += 1
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            self.processed += 1
+            self.hash_seconds += time.monotonic() - started
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica a senha no pool (JWTService.verify_password)"""
+        return await self._run(JWTService.verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Gera o hash no pool (JWTService.get_password_hash)"""
+        return await self._run(JWTService.get_password_hash, password)
+
+    def stats(self) -> Dict[str, float]:
+        """Fila, recusas e tempo médio (espera + bcrypt)"""
+        return {
+            "pending": self.pending,
+            "processed": self.processed,
+            "rejected": self.rejected,
+            "avg_ms": round(self.hash_seconds / self.processed * 1000, 1) if self.processed else 0.0,
+        }
+
+    def shutdown(self):
+        """Encerra as threads do pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instância global
+password_hasher = PasswordHasher()
@@ -0,0 +1,1015 @@
+"""
+Conteúdo de ajuda da aplicação (aba Ajuda da Educação Financeira)
+
+Texto estático em markdown por tópico. É compilado uma vez pelo
+HelpContentIndex (application/services/help_content_service.py); alterar
+este arquivo muda o ETag das respostas.
+"""
+
+HELP_CONTENT = {
+    "dashboard": {
+        "title": "📊 Dashboard - Sua Central Financeira",
+        "description": "Bem-vindo ao seu painel de controle financeiro! Aqui você tem uma visão completa e organizada de todas as suas finanças.",
+        "icon": "📊",
+        "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
+        "content": """
+# 📊 Dashboard - Sua Central Financeira
+
+Olá! 👋 Bem-vindo ao seu **Dashboard**, o coração do FormuladoBolso! Aqui você encontra tudo que precisa para entender sua situação financeira de forma rápida e clara.
+
+## 🎯 O que você encontra aqui?
+
+### 💰 Indicadores Principais (KPIs)
+No topo da página, você verá quatro cartões importantes:
+
+- **💵 Saldo Total**: A soma de todas as suas contas ativas. É o dinheiro que você tem disponível agora!
+- **📈 Receitas do Mês**: Todo o dinheiro que entrou este mês. Seu salário, vendas, e outras receitas.
+- **📉 Despesas do Mês**: Todo o dinheiro que saiu este mês. Gastos, contas, e compras.
+- **💚 Economia**: A diferença entre receitas e despesas. Quanto você conseguiu economizar!
+
+> 💡 **Dica**: Uma economia positiva significa que você está no caminho certo! Se estiver negativa, é hora de revisar seus gastos.
+
+### 📊 Gráficos Interativos
+
+**Evolução Mensal**
+- Veja como suas receitas e despesas mudam ao longo do tempo
+- Identifique tendências e padrões
+- Perfeito para planejar o futuro!
+
+**Distribuição por Categoria**
+- Entenda visualmente onde você mais gasta
+- Descubra se está gastando demais em alguma área
+- Use essas informações para ajustar seu orçamento
+
+### 📝 Últimas Transações
+Acompanhe suas transações mais recentes diretamente no dashboard, sem precisar navegar para outra página.
+
+## 🚀 Como usar?
+
+1. **Acompanhe diariamente**: Visite o dashboard todos os dias para manter o controle
+2. **Analise os gráficos**: Use os gráficos para identificar padrões
+3. **Ajuste conforme necessário**: Se algo não estiver como esperado, faça ajustes nas suas transações ou planejamento
+
+> ✨ **Lembre-se**: O dashboard é atualizado em tempo real! Sempre que você adicionar uma transação, ela aparecerá aqui automaticamente.
+            """,
+        "tips": [
+            "Visite o dashboard diariamente para manter o controle",
+            "Use os gráficos para identificar padrões de gastos",
+            "Compare mês a mês para ver sua evolução"
+        ],
+        "video_url": None,
+    },
+    "transactions": {
+        "title": "💸 Transações - Registre Tudo",
+        "description": "Aprenda a registrar e gerenciar todas as suas movimentações financeiras de forma simples e organizada.",
+        "icon": "💸",
+        "image": "https://images.unsplash.com/photo-1579621970563-ebec7560ff3e?w=800",
+        "content": """
+# 💸 Transações - O Coração do Seu Controle
+
+As transações são como o diário da sua vida financeira! Cada entrada e saída de dinheiro deve ser registrada aqui para você ter controle total.
+
+## ✨ Por que registrar transações?
+
+- 📊 **Controle total**: Saiba exatamente para onde vai seu dinheiro
+- 🎯 **Tomada de decisão**: Dados reais para decidir melhor
+- 📈 **Análise de padrões**: Entenda seus hábitos de consumo
+- 💰 **Economia**: Identifique onde pode economizar
+
+## ➕ Como criar uma transação?
+
+É super simples! Siga estes passos:
+
+### Passo 1: Acesse a página de Transações
+Clique em **"Transações"** no menu lateral e depois em **"Nova Transação"**.
+
+### Passo 2: Preencha os dados
+
+**📝 Descrição** (obrigatório)
+- Seja claro e específico
+- Exemplos: "Almoço no restaurante", "Salário mensal", "Conta de luz"
+
+**💰 Valor** (obrigatório)
+- Digite o valor exato
+- Use ponto para decimais (ex: 150.50)
+
+**📊 Tipo** (obrigatório)
+- **Receita**: Dinheiro que entra (salário, vendas, etc.)
+- **Despesa**: Dinheiro que sai (compras, contas, etc.)
+
+**📅 Data** (obrigatório)
+- Selecione a data da transação
+- Por padrão, usa a data de hoje
+
+**🏦 Conta** (obrigatório)
+- Escolha em qual conta a transação aconteceu
+- Pode ser conta corrente, poupança, cartão, etc.
+
+**📁 Categoria** (opcional, mas recomendado!)
+- Organize seus gastos por categoria
+- Facilita muito na hora de analisar relatórios
+- Exemplos: Alimentação, Transporte, Saúde, Lazer
+
+### Passo 3: Salvar
+Clique em **"Salvar"** e pronto! Sua transação foi registrada. 🎉
+
+## ✏️ Como editar uma transação?
+
+1. Na lista de transações, encontre a que deseja editar
+2. Clique no ícone de **lápis** (✏️) ou no botão **"Editar"**
+3. Modifique os campos que precisar
+4. Clique em **"Salvar"**
+
+> 💡 **Dica**: Você pode editar qualquer transação, mas tente fazer isso logo após criar, para manter os dados sempre atualizados!
+
+## 🔍 Como filtrar transações?
+
+Use os filtros no topo da página para encontrar transações específicas:
+
+- **📅 Por Período**: Veja transações de um mês, semana ou período específico
+- **📊 Por Tipo**: Filtre apenas receitas ou apenas despesas
+- **📁 Por Categoria**: Veja todos os gastos de uma categoria específica
+- **🏦 Por Conta**: Filtre por conta bancária
+
+## 💡 Dicas Pro
+
+- ✅ **Registre imediatamente**: Não deixe para depois! Registre assim que fizer uma compra
+- 📸 **Use descrições claras**: Facilita encontrar transações depois
+- 🏷️ **Sempre use categorias**: Ajuda muito na análise de gastos
+- 🔄 **Revise regularmente**: Dê uma olhada nas transações da semana para manter o controle
+
+> 🎯 **Meta**: Tente registrar pelo menos 90% das suas transações. Quanto mais completo, melhor será sua análise financeira!
+            """,
+        "tips": [
+            "Registre transações imediatamente após fazer uma compra",
+            "Use descrições claras e específicas",
+            "Sempre categorize suas transações para melhor análise",
+            "Revise suas transações semanalmente"
+        ],
+        "video_url": None,
+    },
+    "accounts": {
+        "title": "🏦 Contas - Organize Seu Dinheiro",
+        "description": "Gerencie todas as suas contas bancárias, cartões e dinheiro em um só lugar. Tenha controle total sobre onde está seu dinheiro!",
+        "icon": "🏦",
+        "image": "https://images.unsplash.com/photo-1579621970795-87facc2f976d?w=800",
+        "content": """
+# 🏦 Contas - Organize Seu Dinheiro
+
+Ter múltiplas contas pode ser confuso, mas não aqui! No FormuladoBolso você gerencia todas as suas contas em um só lugar, de forma simples e organizada.
+
+## 🎯 Por que cadastrar suas contas?
+
+- 📊 **Visão completa**: Veja todos os seus saldos em um só lugar
+- 💰 **Controle total**: Saiba exatamente quanto tem em cada conta
+- 🔄 **Transferências fáceis**: Mova dinheiro entre contas com um clique
+- 📈 **Análise completa**: Relatórios consideram todas as suas contas
+
+## ➕ Como criar uma conta?
+
+### Passo 1: Acesse Contas
+Clique em **"Contas"** no menu lateral e depois em **"Nova Conta"**.
+
+### Passo 2: Preencha as informações
+
+**📝 Nome da Conta** (obrigatório)
+- Escolha um nome que você reconheça facilmente
+- Exemplos: "Conta Nubank", "Poupança Itaú", "Cartão Visa"
+
+**🏦 Tipo de Conta** (obrigatório)
+Escolha o tipo que melhor descreve sua conta:
+
+- **💳 Conta Corrente**: Para uso diário, pagamentos e recebimentos
+- **💰 Poupança**: Para suas economias e reservas
+- **💳 Cartão de Crédito**: Para controlar faturas e limites
+- **💵 Dinheiro**: Para dinheiro físico que você guarda
+- **🏛️ Outros**: Para outros tipos de conta
+
+**💵 Saldo Inicial** (opcional)
+- Digite quanto você tem nesta conta agora
+- Se deixar em branco, começará com R$ 0,00
+- Você pode ajustar depois se precisar!
+
+**🏪 Banco** (opcional)
+- Nome do banco ou instituição financeira
+- Exemplos: "Nubank", "Itaú", "Bradesco", "XP Investimentos"
+
+**📄 Descrição** (opcional)
+- Adicione informações extras se quiser
+- Exemplo: "Conta principal para receber salário"
+
+### Passo 3: Salvar
+Clique em **"Salvar"** e sua conta estará pronta para uso! 🎉
+
+## 📋 Tipos de Conta Explicados
+
+### 💳 Conta Corrente
+- Use para: Receber salário, fazer pagamentos, transferências
+- Ideal para: Uso diário e movimentações frequentes
+- 💡 Dica: Mantenha apenas o necessário para o dia a dia
+
+### 💰 Poupança
+- Use para: Guardar dinheiro, reserva de emergência, objetivos
+- Ideal para: Economias e dinheiro que não será usado imediatamente
+- 💡 Dica: Separe diferentes poupanças por objetivo (ex: "Poupança Emergência", "Poupança Viagem")
+
+### 💳 Cartão de Crédito
+- Use para: Controlar faturas e limites
+- Ideal para: Acompanhar gastos no cartão
+- 💡 Dica: Registre as compras como despesas e o pagamento da fatura como transferência
+
+### 💵 Dinheiro
+- Use para: Dinheiro físico que você guarda
+- Ideal para: Reserva em casa, dinheiro para emergências
+- 💡 Dica: Não esqueça de atualizar quando usar ou guardar dinheiro
+
+## 🔄 Transferências Entre Contas
+
+Precisa mover dinheiro de uma conta para outra? É fácil!
+
+1. Vá em **"Transferências"** no menu
+2. Clique em **"Nova Transferência"**
+3. Escolha:
+   - **De**: Conta de origem (de onde sai o dinheiro)
+   - **Para**: Conta de destino (para onde vai o dinheiro)
+   - **Valor**: Quanto você quer transferir
+4. Clique em **"Transferir"**
+
+> 💡 **Importante**: As transferências atualizam automaticamente os saldos das contas envolvidas!
+
+## ✏️ Gerenciando suas contas
+
+- **Editar**: Clique no botão de editar para modificar informações
+- **Desativar**: Se não usar mais uma conta, desative-a em vez de deletar (mantém histórico)
+- **Visualizar**: Veja todas as transações de uma conta específica
+
+## 💡 Dicas Pro
+
+- ✅ **Cadastre todas as contas**: Quanto mais completo, melhor o controle
+- 🔄 **Atualize saldos regularmente**: Mantenha os saldos sempre atualizados
+- 📊 **Use nomes claros**: Facilita identificar cada conta rapidamente
+- 🎯 **Organize por propósito**: Separe contas por objetivo (ex: "Conta Pessoal", "Conta Negócio")
+
+> 🎯 **Meta**: Cadastre todas as suas contas principais. Quanto mais completo, melhor será sua visão financeira!
+            """,
+        "tips": [
+            "Cadastre todas as suas contas para ter visão completa",
+            "Atualize os saldos regularmente",
+            "Use nomes claros e fáceis de identificar",
+            "Organize contas por propósito (pessoal, negócio, etc.)"
+        ],
+        "video_url": None,
+    },
+    "categories": {
+        "title": "📁 Categorias - Organize Seus Gastos",
+        "description": "Aprenda a organizar seus gastos por categorias e entenda melhor seus hábitos financeiros!",
+        "icon": "📁",
+        "image": "https://images.unsplash.com/photo-1460925895917-afdab827c52f?w=800",
+        "content": """
+# 📁 Categorias - Organize Seus Gastos
+
+Categorias são como etiquetas para seus gastos! Elas ajudam você a entender exatamente onde seu dinheiro está indo e facilitam muito a análise financeira.
+
+## 🎯 Por que usar categorias?
+
+- 📊 **Análise clara**: Veja exatamente quanto gasta em cada área da vida
+- 🎯 **Controle melhor**: Identifique onde pode economizar
+- 📈 **Relatórios precisos**: Gere relatórios detalhados por categoria
+- 💡 **Insights valiosos**: Descubra padrões nos seus gastos
+
+## ➕ Como criar uma categoria?
+
+### Passo 1: Acesse Categorias
+Clique em **"Categorias"** no menu lateral e depois em **"Nova Categoria"**.
+
+### Passo 2: Configure sua categoria
+
+**📝 Nome** (obrigatório)
+- Escolha um nome claro e descritivo
+- Exemplos: "Alimentação", "Transporte", "Saúde", "Lazer"
+
+**🎨 Cor** (recomendado)
+- Escolha uma cor para identificar visualmente
+- Facilita muito na hora de ver gráficos e relatórios
+- Use cores diferentes para cada categoria
+
+**🎯 Ícone** (opcional, mas divertido!)
+- Escolha um emoji ou ícone que represente a categoria
+- Exemplos: 🍔 para Alimentação, 🚗 para Transporte, 🏥 para Saúde
+
+**📊 Tipo** (obrigatório)
+- **Receita**: Para categorizar suas receitas (ex: "Salário", "Vendas")
+- **Despesa**: Para categorizar seus gastos (ex: "Alimentação", "Transporte")
+
+### Passo 3: Salvar
+Clique em **"Salvar"** e sua categoria estará pronta! 🎉
+
+## 📋 Categorias Sugeridas
+
+Aqui estão algumas categorias comuns que você pode criar:
+
+### 💰 Receitas
+- **Salário**: Seu salário mensal
+- **Freelance**: Trabalhos extras
+- **Vendas**: Vendas de produtos ou serviços
+- **Investimentos**: Rendimentos de investimentos
+- **Outros**: Outras receitas
+
+### 💸 Despesas Essenciais
+- **🏠 Moradia**: Aluguel, condomínio, IPTU, água, luz, internet
+- **🍔 Alimentação**: Supermercado, restaurantes, delivery
+- **🚗 Transporte**: Combustível, transporte público, manutenção do carro
+- **🏥 Saúde**: Médicos, remédios, plano de saúde, academia
+- **👕 Vestuário**: Roupas, calçados, acessórios
+
+### 🎯 Despesas Pessoais
+- **🎬 Lazer**: Cinema, shows, viagens, hobbies
+- **📚 Educação**: Cursos, livros, material escolar
+- **💅 Beleza**: Salão, produtos de beleza, estética
+- **🎁 Presentes**: Presentes para família e amigos
+
+### 💼 Despesas Profissionais
+- **💻 Tecnologia**: Software, equipamentos, cursos técnicos
+- **📱 Comunicação**: Telefone, internet, serviços online
+
+## 💡 Como usar categorias?
+
+### Ao criar uma transação:
+1. Preencha os dados da transação
+2. No campo **"Categoria"**, escolha a categoria apropriada
+3. Salve a transação
+
+> 💡 **Dica**: Sempre categorize suas transações! Quanto mais organizado, melhor será sua análise.
+
+### Visualizando por categoria:
+- **Relatórios**: Veja gráficos de distribuição por categoria
+- **Insights**: Receba análises sobre suas categorias de maior gasto
+- **Planejamento**: Planeje gastos por categoria
+
+## 🎨 Dicas de Organização
+
+- ✅ **Seja específico**: Em vez de "Compras", use "Supermercado", "Farmácia", etc.
+- 🎨 **Use cores diferentes**: Facilita identificar rapidamente
+- 📊 **Agrupe quando fizer sentido**: Crie categorias principais e subcategorias
+- 🔄 **Revise regularmente**: Ajuste categorias conforme sua vida muda
+
+## 🚀 Categorias Inteligentes
+
+O sistema pode sugerir categorias automaticamente baseado na descrição da transação. Use isso como ponto de partida e ajuste se necessário!
+
+> 🎯 **Meta**: Categorize pelo menos 80% das suas transações. Isso fará uma diferença enorme na qualidade dos seus relatórios!
+            """,
+        "tips": [
+            "Seja específico ao criar categorias (ex: 'Supermercado' em vez de 'Compras')",
+            "Use cores diferentes para facilitar identificação visual",
+            "Sempre categorize suas transações para melhor análise",
+            "Revise e ajuste suas categorias periodicamente"
+        ],
+        "video_url": None,
+    },
+    "planning": {
+        "title": "📅 Planejamento - Organize Seu Futuro",
+        "description": "Planeje suas finanças com antecedência e alcance seus objetivos financeiros!",
+        "icon": "📅",
+        "image": "https://images.unsplash.com/photo-1454165804606-c3d57bc86b40?w=800",
+        "content": """
+# 📅 Planejamento - Organize Seu Futuro
+
+O planejamento financeiro é como um GPS para suas finanças! Ele te ajuda a saber exatamente quanto você pode gastar em cada área da vida, evitando surpresas desagradáveis no final do mês.
+
+## 🎯 Por que planejar?
+
+- 🎯 **Controle total**: Saiba exatamente quanto pode gastar em cada categoria
+- 💰 **Evite dívidas**: Não gaste mais do que planejou
+- 📊 **Acompanhe progresso**: Veja se está seguindo o planejado
+- 🚀 **Alcance objetivos**: Planeje para alcançar suas metas financeiras
+
+## ➕ Como criar um planejamento?
+
+### Passo 1: Acesse Planejamento
+Clique em **"Planejamento"** no menu lateral.
+
+### Passo 2: Crie um novo planejamento
+Clique em **"Novo Planejamento"** e preencha:
+
+**📅 Período**
+- Escolha o período do planejamento
+- **Mensal**: Para planejamento mensal (mais comum)
+- **Semanal**: Para controle semanal
+- **Anual**: Para visão anual
+
+**📁 Categoria**
+- Escolha a categoria que deseja planejar
+- Exemplos: Alimentação, Transporte, Lazer, etc.
+- Você pode criar planejamentos para múltiplas categorias
+
+**💰 Valor Planejado**
+- Defina quanto você quer gastar nesta categoria
+- Seja realista! Baseie-se nos seus gastos anteriores
+- Use os insights para ter uma ideia melhor
+
+**📅 Data**
+- Selecione o período específico
+- Para planejamento mensal, escolha o mês
+
+### Passo 3: Salvar
+Clique em **"Salvar"** e seu planejamento estará ativo! 🎉
+
+## 📊 Acompanhando seu planejamento
+
+Na página de Planejamento você verá:
+
+- **📈 Gráfico de Comparação**: Veja quanto planejou vs quanto gastou
+- **🎯 Progresso**: Percentual do planejamento já utilizado
+- **⚠️ Alertas**: Avisos quando estiver próximo do limite
+- **📋 Detalhes**: Veja todas as transações da categoria
+
+> 💡 **Dica**: Revise seu planejamento mensalmente e ajuste conforme necessário. A vida muda, e seu planejamento pode mudar também!
+
+## 💡 Dicas de Planejamento
+
+- ✅ **Seja realista**: Não planeje valores muito baixos que você não conseguirá cumprir
+- 📊 **Use dados históricos**: Veja quanto você gastou nos meses anteriores
+- 🎯 **Priorize**: Dê mais espaço para categorias essenciais
+- 🔄 **Ajuste quando necessário**: Planejamento não é prisão, é guia!
+
+## 🎯 Regra 50/30/20 (Opcional)
+
+Alguns usuários gostam de seguir a regra:
+- **50%** para necessidades (moradia, alimentação, transporte)
+- **30%** para desejos (lazer, entretenimento)
+- **20%** para economia e investimentos
+
+> 🎯 **Meta**: Tente seguir seu planejamento em pelo menos 80% das categorias. Isso já fará uma grande diferença!
+            """,
+        "tips": [
+            "Seja realista ao definir valores planejados",
+            "Use dados históricos para planejar melhor",
+            "Revise e ajuste seu planejamento mensalmente",
+            "Priorize categorias essenciais no planejamento"
+        ],
+        "video_url": None,
+    },
+    "goals": {
+        "title": "🎯 Metas - Transforme Sonhos em Realidade",
+        "description": "Defina metas financeiras claras e acompanhe seu progresso até alcançá-las!",
+        "icon": "🎯",
+        "image": "https://images.unsplash.com/photo-1521737604893-d14cc237f11d?w=800",
+        "content": """
+# 🎯 Metas - Transforme Sonhos em Realidade
+
+Metas são seus sonhos com prazo e valor! Elas transformam desejos vagos em objetivos concretos e alcançáveis. Com o FormuladoBolso, você pode definir, acompanhar e alcançar qualquer meta financeira.
+
+## 🌟 Por que ter metas?
+
+- 🎯 **Foco**: Você sabe exatamente para onde está indo
+- 💪 **Motivação**: Ver o progresso te motiva a continuar
+- 📊 **Planejamento**: Você sabe quanto precisa economizar
+- 🎉 **Realização**: A sensação de alcançar uma meta é incrível!
+
+## ➕ Como criar uma meta?
+
+### Passo 1: Acesse Metas
+Clique em **"Metas"** no menu lateral e depois em **"Nova Meta"**.
+
+### Passo 2: Defina sua meta
+
+**📝 Nome da Meta** (obrigatório)
+- Escolha um nome inspirador e claro
+- Exemplos: "Viagem para Europa", "Reserva de Emergência", "Entrada do Apartamento"
+
+**💰 Valor Objetivo** (obrigatório)
+- Quanto você precisa juntar?
+- Seja específico e realista
+- Exemplo: R$ 50.000 para entrada do apartamento
+
+**📅 Data Limite** (opcional, mas recomendado!)
+- Quando você quer alcançar esta meta?
+- Ter um prazo ajuda a manter o foco
+- O sistema calcula quanto você precisa economizar por mês
+
+**🎯 Tipo de Meta** (opcional)
+Escolha o tipo que melhor descreve sua meta:
+- **🏠 Casa**: Comprar casa, reforma, móveis
+- **🚗 Carro**: Compra de carro, manutenção
+- **✈️ Viagem**: Viagens, férias, passeios
+- **💍 Casamento**: Casamento, festa
+- **📚 Educação**: Cursos, faculdade, especialização
+- **🚨 Emergência**: Reserva de emergência
+- **👴 Aposentadoria**: Planejamento para aposentadoria
+- **🎯 Outros**: Outras metas
+
+**📄 Descrição** (opcional)
+- Adicione detalhes sobre sua meta
+- Por que ela é importante para você?
+- Isso ajuda a manter a motivação!
+
+**🎨 Personalize** (opcional)
+- Escolha uma cor e ícone para sua meta
+- Facilita identificar visualmente
+
+### Passo 3: Salvar
+Clique em **"Salvar"** e sua meta estará criada! 🎉
+
+## 💰 Como contribuir para sua meta?
+
+### Contribuição Manual
+1. Na página da meta, clique em **"Adicionar Contribuição"**
+2. Digite o valor que você está adicionando
+3. Escolha a conta de origem
+4. Clique em **"Adicionar"**
+
+### Contribuição Automática
+Você pode configurar contribuições automáticas:
+- **Porcentagem das receitas**: Ex: 10% de cada receita vai para a meta
+- **Valor fixo mensal**: Ex: R$ 500 todo mês
+- **Categoria de economia**: Vincula uma categoria específica
+
+> 💡 **Dica**: Contribuições automáticas são o segredo! Você nem percebe que está economizando.
+
+## 📊 Acompanhando seu progresso
+
+Na página de Metas você verá:
+
+- **📈 Barra de Progresso**: Visualize quanto já foi alcançado
+- **💰 Valor Restante**: Quanto ainda falta para alcançar
+- **⏰ Tempo Restante**: Quantos dias você tem
+- **📅 Data Estimada**: Quando você alcançará se mantiver o ritmo
+- **💡 Sugestões**: O sistema sugere quanto economizar por mês
+
+## 🎯 Dicas para alcançar suas metas
+
+- ✅ **Comece pequeno**: Metas muito grandes podem desmotivar
+- 💰 **Contribua regularmente**: Mesmo valores pequenos fazem diferença
+- 📊 **Acompanhe o progresso**: Visite suas metas regularmente
+- 🎉 **Celebre marcos**: Comemore quando alcançar 25%, 50%, 75%
+- 🔄 **Ajuste se necessário**: Se algo mudar, ajuste a meta
+
+## 💡 Tipos de Metas Comuns
+
+### 🚨 Reserva de Emergência
+- **Objetivo**: 6 meses de despesas
+- **Prazo**: 1-2 anos
+- **Prioridade**: Alta! Sempre tenha uma reserva
+
+### 🏠 Entrada de Imóvel
+- **Objetivo**: 20-30% do valor do imóvel
+- **Prazo**: 2-5 anos
+- **Dica**: Comece a economizar o quanto antes
+
+### ✈️ Viagem dos Sonhos
+- **Objetivo**: Valor total da viagem
+- **Prazo**: 6 meses - 2 anos
+- **Dica**: Planeje com antecedência para conseguir melhores preços
+
+### 🚗 Compra de Carro
+- **Objetivo**: Entrada ou valor total
+- **Prazo**: 1-3 anos
+- **Dica**: Considere também os custos de manutenção
+
+> 🎯 **Meta**: Defina pelo menos 3 metas: uma de curto prazo (6 meses), uma de médio prazo (1-2 anos) e uma de longo prazo (3+ anos)!
+            """,
+        "tips": [
+            "Defina metas realistas e alcançáveis",
+            "Configure contribuições automáticas quando possível",
+            "Acompanhe o progresso regularmente",
+            "Celebre cada marco alcançado para manter a motivação"
+        ],
+        "video_url": None,
+    },
+    "investments": {
+        "title": "📈 Investimentos - Faça Seu Dinheiro Trabalhar",
+        "description": "Gerencie todos os seus investimentos, acompanhe performance e planeje seu futuro financeiro!",
+        "icon": "📈",
+        "image": "https://images.unsplash.com/photo-1611974789855-9c2a0a7236a3?w=800",
+        "content": """
+# 📈 Investimentos - Faça Seu Dinheiro Trabalhar
+
+Investir é fazer seu dinheiro trabalhar para você! No FormuladoBolso, você pode gerenciar todos os seus investimentos em um só lugar, acompanhar performance e tomar decisões mais inteligentes.
+
+## 🎯 Por que usar o módulo de investimentos?
+
+- 📊 **Visão completa**: Veja todos os seus investimentos em um só lugar
+- 📈 **Acompanhe performance**: Saiba quanto seus investimentos renderam
+- 🎯 **Diversificação**: Veja se sua carteira está bem diversificada
+- 💰 **Cálculo de impostos**: Calcule IRPF automaticamente
+- 🚀 **Simulador**: Simule cenários antes de investir
+
+## ➕ Como começar?
+
+### Passo 1: Criar Conta de Investimento
+1. Vá em **"Investimentos"** > **"Contas"** > **"Nova Conta"**
+2. Preencha:
+   - **Nome**: Ex: "XP Investimentos", "Rico", "Nubank"
+   - **Tipo**: Corretora, Banco, Carteira Digital, etc.
+   - **Saldo inicial**: Quanto você já tem investido (opcional)
+
+### Passo 2: Registrar seus investimentos
+Agora você pode registrar todas as suas transações:
+
+**💵 Compras**
+- Quando você compra um ativo (ações, FIIs, etc.)
+- Registre o valor, quantidade e data
+
+**💰 Vendas**
+- Quando você vende um ativo
+- O sistema calcula automaticamente o lucro/prejuízo
+
+**📊 Dividendos e Juros**
+- Recebimento de dividendos
+- Juros de renda fixa
+- Rendimentos de fundos
+
+**🔄 Transferências**
+- Movimentações entre contas de investimento
+
+## 📊 Análises Disponíveis
+
+### 📈 Performance da Carteira
+- Veja o retorno total dos seus investimentos
+- Compare com benchmarks
+- Acompanhe evolução ao longo do tempo
+
+### 🎯 Diversificação
+- Veja a distribuição dos seus investimentos
+- Identifique se está muito concentrado em um ativo
+- Receba sugestões de diversificação
+
+### 🧮 Simulador de Investimentos
+- Simule quanto você terá no futuro
+- Teste diferentes cenários de aporte
+- Veja o poder dos juros compostos
+
+### 💰 Cálculo de IRPF
+- Calcule automaticamente o imposto devido
+- Organize por mês de apuração
+- Facilite a declaração de imposto de renda
+
+## 💡 Dicas de Investimento
+
+- ✅ **Diversifique**: Não coloque todos os ovos na mesma cesta
+- 📊 **Acompanhe regularmente**: Mas não fique obcecado com variações diárias
+- 🎯 **Invista regularmente**: Aporte mensal é melhor que aporte único grande
+- 📚 **Eduque-se**: Use o Centro de Educação para aprender mais
+- 💰 **Tenha reserva de emergência**: Antes de investir, tenha uma reserva
+
+## 🎯 Tipos de Investimentos Suportados
+
+- **📈 Ações**: Ações brasileiras e internacionais
+- **🏢 FIIs**: Fundos Imobiliários
+- **💰 Renda Fixa**: CDB, LCI, LCA, Tesouro Direto
+- **🌍 ETFs**: Exchange Traded Funds
+- **💎 Criptomoedas**: Bitcoin, Ethereum, etc.
+- **🏦 Fundos**: Fundos de investimento
+- **💼 Previdência**: Previdência privada
+
+> 🎯 **Meta**: Comece investindo pelo menos 10% da sua renda. Com o tempo, aumente esse percentual!
+            """,
+        "tips": [
+            "Diversifique seus investimentos para reduzir riscos",
+            "Acompanhe performance regularmente, mas não fique obcecado",
+            "Use o simulador antes de fazer grandes investimentos",
+            "Mantenha uma reserva de emergência antes de investir"
+        ],
+        "video_url": None,
+    },
+    "reports": {
+        "title": "📊 Relatórios - Entenda Suas Finanças",
+        "description": "Gere relatórios detalhados e profissionais para analisar suas finanças de forma completa!",
+        "icon": "📊",
+        "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
+        "content": """
+# 📊 Relatórios - Entenda Suas Finanças
+
+Relatórios são como exames de saúde para suas finanças! Eles mostram exatamente o que está acontecendo com seu dinheiro, onde você está indo bem e onde pode melhorar.
+
+## 🎯 Por que usar relatórios?
+
+- 📊 **Visão clara**: Entenda sua situação financeira de forma visual
+- 🎯 **Identifique problemas**: Veja onde você está gastando demais
+- 📈 **Acompanhe evolução**: Compare períodos diferentes
+- 💡 **Tome decisões**: Use dados reais para decidir melhor
+- 📄 **Compartilhe**: Exporte para PDF ou Excel
+
+## 📋 Tipos de Relatórios Disponíveis
+
+### 📊 Relatório Executivo
+- **O que é**: Visão geral completa das suas finanças
+- **Quando usar**: Para ter uma visão geral rápida
+- **Mostra**: Receitas, despesas, saldo, principais categorias
+
+### 💰 Relatório de Receitas
+- **O que é**: Análise detalhada de todas as suas receitas
+- **Quando usar**: Para entender de onde vem seu dinheiro
+- **Mostra**: Receitas por categoria, por mês, tendências
+
+### 💸 Relatório de Despesas
+- **O que é**: Análise detalhada de todos os seus gastos
+- **Quando usar**: Para identificar onde você mais gasta
+- **Mostra**: Despesas por categoria, maiores gastos, tendências
+
+### 📁 Relatório por Categorias
+- **O que é**: Distribuição de gastos por categoria
+- **Quando usar**: Para ver onde seu dinheiro está indo
+- **Mostra**: Gráficos de pizza, barras, comparações
+
+### 📈 Relatório de Tendências
+- **O que é**: Evolução das suas finanças ao longo do tempo
+- **Quando usar**: Para ver se está melhorando ou piorando
+- **Mostra**: Gráficos de linha, comparações mensais/anuais
+
+### 🎯 Relatório de Metas
+- **O que é**: Progresso de todas as suas metas
+- **Quando usar**: Para acompanhar se está no caminho certo
+- **Mostra**: Progresso, tempo restante, sugestões
+
+### 📅 Relatório Temporal
+- **O que é**: Análise por períodos específicos
+- **Quando usar**: Para comparar meses, trimestres ou anos
+- **Mostra**: Comparações lado a lado, evolução
+
+### 🏦 Relatório de Contas
+- **O que é**: Análise por conta bancária
+- **Quando usar**: Para ver movimentações por conta
+- **Mostra**: Saldos, movimentações, gráficos por conta
+
+## 📤 Como exportar relatórios?
+
+### Exportar em PDF
+1. Gere o relatório desejado
+2. Clique em **"Exportar PDF"**
+3. O arquivo será baixado automaticamente
+4. Perfeito para compartilhar ou arquivar
+
+### Exportar em Excel
+1. Gere o relatório desejado
+2. Clique em **"Exportar Excel"**
+3. O arquivo será baixado com todos os dados
+4. Perfeito para análises mais detalhadas
+
+## 💡 Dicas para usar relatórios
+
+- ✅ **Gere regularmente**: Faça relatórios mensais para acompanhar
+- 📊 **Compare períodos**: Compare mês a mês para ver evolução
+- 🎯 **Use filtros**: Filtre por período, categoria ou conta
+- 📄 **Exporte e arquive**: Guarde relatórios importantes
+- 💡 **Aja com base nos dados**: Use os relatórios para tomar decisões
+
+## 🎯 Como interpretar relatórios?
+
+### Se suas despesas estão aumentando:
+- ✅ **Bom**: Se suas receitas também aumentaram proporcionalmente
+- ⚠️ **Atenção**: Se suas receitas não aumentaram, você precisa cortar gastos
+
+### Se uma categoria está muito alta:
+- 📊 **Analise**: Veja se é necessário ou pode ser reduzido
+- 🎯 **Planeje**: Crie um planejamento para essa categoria
+
+### Se suas metas estão atrasadas:
+- 💰 **Aumente aportes**: Considere aumentar as contribuições
+- 📅 **Ajuste prazos**: Se necessário, ajuste a data limite
+
+> 🎯 **Meta**: Gere pelo menos um relatório mensal para manter o controle das suas finanças!
+            """,
+        "tips": [
+            "Gere relatórios mensais para acompanhar sua evolução",
+            "Compare períodos diferentes para identificar tendências",
+            "Use os filtros para análises mais específicas",
+            "Exporte relatórios importantes para arquivar"
+        ],
+        "video_url": None,
+    },
+    "workspaces": {
+        "title": "👥 Workspaces - Organize por Contexto",
+        "description": "Organize suas finanças em diferentes contextos: pessoal, familiar ou compartilhado!",
+        "icon": "👥",
+        "image": "https://images.unsplash.com/photo-1522071820081-009f0129c71c?w=800",
+        "content": """
+# 👥 Workspaces - Organize por Contexto
+
+Workspaces são como "pastas" para suas finanças! Eles permitem que você separe suas finanças pessoais das familiares, ou crie espaços compartilhados para projetos em comum.
+
+## 🎯 Por que usar workspaces?
+
+- 🎯 **Organização**: Separe finanças pessoais, familiares e de negócios
+- 👥 **Colaboração**: Compartilhe com familiares ou parceiros
+- 📊 **Visão isolada**: Veja relatórios específicos de cada contexto
+- 🔒 **Privacidade**: Mantenha suas finanças pessoais privadas
+
+## ➕ Como criar um workspace?
+
+### Passo 1: Acesse Workspaces
+Clique em **"Workspaces"** no menu lateral e depois em **"Novo Workspace"**.
+
+### Passo 2: Configure seu workspace
+
+**📝 Nome** (obrigatório)
+- Escolha um nome claro e descritivo
+- Exemplos: "Finanças Pessoais", "Casa da Família", "Projeto Viagem"
+
+**🎯 Tipo** (obrigatório)
+Escolha o tipo que melhor descreve seu workspace:
+
+- **👤 Pessoal**: Apenas para você
+  - Use para: Suas finanças pessoais
+  - Privacidade: Totalmente privado
+
+- **👨‍👩‍👧‍👦 Familiar**: Para sua família
+  - Use para: Finanças da casa, contas compartilhadas
+  - Privacidade: Compartilhado com membros da família
+
+- **🤝 Compartilhado**: Para projetos ou grupos
+  - Use para: Viagens em grupo, eventos, projetos
+  - Privacidade: Compartilhado com pessoas específicas
+
+**📄 Descrição** (opcional)
+- Adicione detalhes sobre o propósito do workspace
+- Exemplo: "Finanças da casa - contas e despesas compartilhadas"
+
+### Passo 3: Salvar
+Clique em **"Salvar"** e seu workspace estará criado! 🎉
+
+## 👥 Compartilhando Workspaces
+
+### Como compartilhar?
+1. Vá para o workspace desejado
+2. Clique em **"Compartilhar"** ou **"Membros"**
+3. Digite o email da pessoa
+4. Escolha o nível de permissão:
+   - **👀 Visualizador**: Pode apenas ver
+   - **✏️ Editor**: Pode editar transações e dados
+   - **👑 Administrador**: Controle total
+
+### Tipos de compartilhamento
+
+**👨‍👩‍👧‍👦 Familiar**
+- Ideal para: Família que divide despesas
+- Exemplo: Contas da casa, mercado, etc.
+- Membros: Cônjuge, filhos maiores de idade
+
+**🤝 Compartilhado**
+- Ideal para: Projetos em comum
+- Exemplo: Viagem em grupo, evento, negócio
+- Membros: Amigos, parceiros, colegas
+
+## 📊 Usando Workspaces
+
+### Alternando entre workspaces
+- Use o seletor no topo da página ou no menu lateral
+- Cada workspace tem seus próprios:
+  - Contas
+  - Transações
+  - Categorias
+  - Metas
+  - Relatórios
+
+### Dados isolados
+- Cada workspace é completamente independente
+- Transações de um workspace não aparecem em outro
+- Relatórios são gerados por workspace
+
+## 💡 Dicas de uso
+
+- ✅ **Crie workspaces específicos**: Separe bem cada contexto
+- 👥 **Compartilhe com cuidado**: Só compartilhe com pessoas de confiança
+- 📊 **Use para projetos**: Crie workspaces temporários para projetos específicos
+- 🔄 **Organize regularmente**: Revise e organize seus workspaces periodicamente
+
+## 🎯 Casos de uso comuns
+
+### 👤 Workspace Pessoal
+- Suas finanças pessoais
+- Contas e investimentos pessoais
+- Metas pessoais
+- **Privacidade**: Totalmente privado
+
+### 👨‍👩‍👧‍👦 Workspace Familiar
+- Contas da casa
+- Despesas compartilhadas
+- Planejamento familiar
+- **Membros**: Cônjuge, filhos
+
+### 🤝 Workspace de Viagem
+- Orçamento da viagem
+- Despesas compartilhadas
+- Planejamento conjunto
+- **Membros**: Grupo de viagem
+
+> 🎯 **Meta**: Organize suas finanças em pelo menos 2 workspaces: um pessoal e um compartilhado (familiar ou projeto)!
+            """,
+        "tips": [
+            "Separe bem suas finanças pessoais das compartilhadas",
+            "Compartilhe workspaces apenas com pessoas de confiança",
+            "Use workspaces temporários para projetos específicos",
+            "Revise e organize seus workspaces periodicamente"
+        ],
+        "video_url": None,
+    },
+    "insights": {
+        "title": "💡 Insights - Análises Inteligentes",
+        "description": "Receba análises automáticas e inteligentes das suas finanças para tomar melhores decisões!",
+        "icon": "💡",
+        "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800",
+        "content": """
+# 💡 Insights - Análises Inteligentes
+
+Insights são como um consultor financeiro pessoal que analisa seus dados 24/7! Eles identificam padrões, tendências e oportunidades que você pode não ter notado.
+
+## 🎯 Por que usar insights?
+
+- 🔍 **Descubra padrões**: Veja padrões que você não percebeu
+- 📊 **Entenda tendências**: Saiba se está melhorando ou piorando
+- 💡 **Receba recomendações**: Sugestões personalizadas baseadas nos seus dados
+- ⚠️ **Identifique problemas**: Alertas sobre gastos incomuns
+- 🚀 **Tome decisões melhores**: Use dados reais para decidir
+
+## 📊 Tipos de Insights Disponíveis
+
+### 🔄 Mudanças nos Gastos
+- **O que é**: Compara seus gastos atuais com períodos anteriores
+- **Quando aparece**: Quando há mudanças significativas
+- **Exemplo**: "Seus gastos com alimentação aumentaram 30% este mês"
+
+### 📈 Padrões de Consumo
+- **O que é**: Identifica padrões recorrentes nos seus gastos
+- **Quando aparece**: Quando detecta padrões claros
+- **Exemplo**: "Você sempre gasta mais aos finais de semana"
+
+### 💰 Recomendações Personalizadas
+- **O que é**: Sugestões específicas para você
+- **Quando aparece**: Baseado na sua situação financeira
+- **Exemplo**: "Considere aumentar sua reserva de emergência"
+
+### 📁 Análise de Categorias
+- **O que é**: Análise detalhada de cada categoria
+- **Quando aparece**: Mensalmente ou quando solicitado
+- **Exemplo**: "Você gasta 40% da sua renda com moradia"
+
+### 📊 Tendências
+- **O que é**: Evolução dos seus gastos ao longo do tempo
+- **Quando aparece**: Continuamente atualizado
+- **Exemplo**: "Suas economias estão aumentando consistentemente"
+
+## 🎯 Como usar insights?
+
+### Visualizar Insights
+1. Vá em **"Insights"** no menu lateral
+2. Veja os insights automáticos na aba **"Visão Geral"**
+3. Explore diferentes tipos de análise nas abas
+
+### Tipos de Análise
+
+**📈 Tendências de Gastos**
+- Veja como seus gastos evoluem
+- Compare períodos diferentes
+- Identifique sazonalidades
+
+**📁 Análise por Categoria**
+- Veja quais categorias mais consomem seu orçamento
+- Compare com médias
+- Receba alertas sobre categorias acima do normal
+
+**🔄 Padrões de Consumo**
+- Identifique quando você mais gasta
+- Veja padrões semanais, mensais ou anuais
+- Use para planejar melhor
+
+**💡 Recomendações**
+- Receba sugestões personalizadas
+- Baseadas na sua situação real
+- Ações práticas que você pode tomar
+
+## 💡 Dicas para aproveitar insights
+
+- ✅ **Revise regularmente**: Veja os insights pelo menos semanalmente
+- 📊 **Compare períodos**: Use para ver sua evolução
+- 🎯 **Aja nas recomendações**: Implemente as sugestões quando fizer sentido
+- 🔄 **Acompanhe tendências**: Use para planejar o futuro
+- ⚠️ **Preste atenção em alertas**: Alertas podem indicar problemas
+
+## 🎯 Interpretando Insights
+
+### Se seus gastos aumentaram:
+- ✅ **Bom**: Se suas receitas também aumentaram
+- ⚠️ **Atenção**: Se suas receitas não aumentaram, você precisa ajustar
+
+### Se uma categoria está alta:
+- 📊 **Analise**: Veja se é necessário ou pode ser reduzido
+- 🎯 **Planeje**: Crie um planejamento para essa categoria
+
+### Se receber uma recomendação:
+- 💡 **Considere**: Avalie se faz sentido para você
+- 🚀 **Implemente**: Se fizer sentido, coloque em prática
+- 📊 **Acompanhe**: Veja os resultados depois
+
+> 🎯 **Meta**: Revise seus insights pelo menos uma vez por semana para manter o controle e tomar decisões melhores!
+            """,
+        "tips": [
+            "Revise insights regularmente para identificar padrões",
+            "Use recomendações para melhorar suas finanças",
+            "Compare tendências para ver sua evolução",
+            "Preste atenção em alertas sobre gastos incomuns"
+        ],
+        "video_url": None,
+    },
+}
@@ -1,8 +1,9 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import List, Optional
 from src.shared.config import settings
+from src.application.notifications.smtp_pool import get_smtp_pool
 
 
 class EmailService:
@@ -20,6 +21,48 @@ class EmailService:
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password
 
+    def _has_placeholder_credentials(self) -> bool:
+        """Credenciais preenchidas com os valores de exemplo do env.example"""
+        if not (self.smtp_user and self.smtp_password):
+            return False
+        placeholder_users = ["seu-email@gmail.com", "seu-email@example.com", None]
+        placeholder_passwords = ["sua-senha-app", "sua-senha", "your-password", None]
+        return self.smtp_user in placeholder_users or self.smtp_password in placeholder_passwords
+
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> MIMEMultipart:
+        """Monta a mensagem MIME (texto opcional + HTML)"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.smtp_user
+        msg["To"] = to_email
+
+        # Adicionar conteúdo texto
+        if text_content:
+            text_part = MIMEText(text_content, "plain")
+            msg.attach(text_part)
+
+        # Adicionar conteúdo HTML
+        html_part = MIMEText(html_content, "html")
+        msg.attach(html_part)
+        return msg
+
+    async def send_now(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> None:
+        """Envia imediatamente pelo pool SMTP (levanta exceção em caso de falha)"""
+        pool = get_smtp_pool(self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_password)
+        await pool.send(self.build_message(to_email, subject, html_content, text_content))
+
     async def send_email(
         self,
         to_email: str,
@@ -27,58 +70,31 @@ class EmailService:
         html_content: str,
         text_content: Optional[str] = None,
     ) -> bool:
-        """Envia um email"""
-        try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.smtp_user
-            msg["To"] = to_email
-
-            # Adicionar conteúdo texto
-            if text_content:
-                text_part = MIMEText(text_content, "plain")
-                msg.attach(text_part)
+        """
+        Envia um email
 
-            # Adicionar conteúdo HTML
-            html_part = MIMEText(html_content, "html")
-            msg.attach(html_part)
+        Com EMAIL_OUTBOX_ENABLED a mensagem é gravada na fila de saída
+        (notification_outbox) e enviada pelo worker em background; o retorno
+        indica que foi enfileirada. Sem a fila, envia direto pelo pool SMTP.
+        """
+        if self._has_placeholder_credentials():
+            print(f"⚠️  AVISO: Credenciais SMTP não configuradas corretamente")
+            print(f"   SMTP_USER: {self.smtp_user}")
+            print(f"   Configure SMTP_USER e SMTP_PASSWORD no arquivo .env")
+            return False
 
-            # Enviar email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                if self.smtp_user and self.smtp_password:
-                    # Verificar se as credenciais não são placeholders
-                    placeholder_users = ["seu-email@gmail.com", "seu-email@example.com", None]
-                    placeholder_passwords = ["sua-senha-app", "sua-senha", "your-password", None]
-                    
-                    is_placeholder = (
-                        self.smtp_user in placeholder_users or 
-                        self.smtp_password in placeholder_passwords
-                    )
-                    
-                    if is_placeholder:
-                        print(f"⚠️  AVISO: Credenciais SMTP não configuradas corretamente")
-                        print(f"   SMTP_USER: {self.smtp_user}")
-                        print(f"   Configure SMTP_USER e SMTP_PASSWORD no arquivo .env")
-                        return False
-                    
-                    try:
-                        print(f"📧 Tentando enviar email via SMTP...")
-                        print(f"   Host: {self.smtp_host}:{self.smtp_port}")
-                        print(f"   User: {self.smtp_user}")
-                        server.login(self.smtp_user, self.smtp_password)
-                        print(f"✅ Autenticação SMTP bem-sucedida")
-                    except smtplib.SMTPAuthenticationError as auth_error:
-                        print(f"❌ Erro de autenticação SMTP: {auth_error}")
-                        print(f"   Verifique se:")
-                        print(f"   1. SMTP_USER está correto: {self.smtp_user}")
-                        print(f"   2. SMTP_PASSWORD é uma 'Senha de App' do Gmail (não a senha normal)")
-                        print(f"   3. A verificação em duas etapas está ativada na conta Google")
-                        print(f"   4. Gere uma nova senha de app em: https://myaccount.google.com/apppasswords")
-                        raise
-                server.send_message(msg)
-                print(f"✅ Email enviado com sucesso para {to_email}")
+        if settings.EMAIL_OUTBOX_ENABLED:
+            from src.application.tasks.notification_outbox_worker import notification_outbox_worker
+            try:
+                await notification_outbox_worker.enqueue_email(to_email, subject, html_content, text_content)
+                return True
+            except Exception as e:
+                print(f"❌ Erro ao enfileirar email: {e}")
+                return False
 
+        try:
+            await self.send_now(to_email, subject, html_content, text_content)
+            print(f"✅ Email enviado com sucesso para {to_email}")
             return True
         except smtplib.SMTPAuthenticationError as e:
             print(f"❌ Erro de autenticação SMTP: {e}")
@@ -90,8 +106,6 @@ class EmailService:
             return False
         except Exception as e:
             print(f"❌ Erro ao enviar email: {e}")
-            import traceback
-            traceback.print_exc()
             return False
 
     async def send_planning_alert(
@@ -272,6 +286,83 @@ class EmailService:
         </html>
         """
 
+    async def send_planning_digest(
+        self,
+        to_email: str,
+        user_name: str,
+        alerts: List[dict],
+    ) -> bool:
+        """
+        Envia um resumo com vários alertas de planejamento
+
+        Args:
+            alerts: dicts com planning_name, target_amount, actual_amount,
+                percentage e is_over_budget
+        """
+        over_budget = sum(1 for alert in alerts if alert["is_over_budget"])
+        if over_budget:
+            subject = f"⚠️ Resumo: {over_budget} de {len(alerts)} planejamentos fora do previsto"
+        else:
+            subject = f"🎉 Resumo: {len(alerts)} planejamentos no caminho certo"
+        return await self.send_email(to_email, subject, self._get_planning_digest_template(user_name, alerts))
+
+    def _get_planning_digest_template(self, user_name: str, alerts: List[dict]) -> str:
+        """Template HTML do resumo de alertas de planejamento"""
+        rows = "".join(
+            f"""
+                        <tr>
+                            <td>{alert["planning_name"]}</td>
+                            <td>R$ {alert["target_amount"]:,.2f}</td>
+                            <td>R$ {alert["actual_amount"]:,.2f}</td>
+                            <td style="color: {'#dc3545' if alert["is_over_budget"] else '#28a745'}; font-weight: bold;">{alert["percentage"]:.1f}%</td>
+                        </tr>"""
+            for alert in alerts
+        )
+        return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background-color: #6366f1; color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }}
+                .content {{ background-color: #f8f9fa; padding: 20px; border-radius: 0 0 5px 5px; }}
+                table {{ width: 100%; border-collapse: collapse; background-color: white; }}
+                th, td {{ padding: 10px; border-bottom: 1px solid #dee2e6; text-align: left; }}
+                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>📊 Resumo dos Seus Planejamentos</h1>
+                </div>
+                <div class="content">
+                    <p>Olá, <strong>{user_name}</strong>!</p>
+
+                    <p>Veja como estão seus planejamentos:</p>
+
+                    <table>
+                        <tr>
+                            <th>Planejamento</th>
+                            <th>Meta</th>
+                            <th>Gasto Real</th>
+                            <th>Utilizado</th>
+                        </tr>{rows}
+                    </table>
+
+                    <p>Acesse o FormuladoBolso para mais detalhes.</p>
+                </div>
+                <div class="footer">
+                    <p>FormuladoBolso - Seu gerenciador financeiro pessoal</p>
+                    <p>Este é um email automático, por favor não responda.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
     async def send_password_reset_email(
         self,
         to_email: str,
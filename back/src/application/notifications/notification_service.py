@@ -1,9 +1,13 @@
-from typing import Optional
+import asyncio
+from typing import List, Optional
 from decimal import Decimal
 from src.application.notifications.email_service import EmailService
 from src.application.notifications.whatsapp_service import WhatsAppService
 from src.shared.config import settings
 
+# Mensagens listadas no resumo do chat familiar
+CHAT_DIGEST_MAX_MESSAGES = 10
+
 
 class NotificationService:
     """Serviço orquestrador de notificações"""
@@ -31,6 +35,7 @@ class NotificationService:
         actual_amount: Decimal,
         percentage: float,
         threshold: float = 10.0,  # 10% de tolerância
+        immediate: bool = False,
     ) -> dict:
         """
         Envia notificações de planejamento
@@ -44,9 +49,10 @@ class NotificationService:
             actual_amount: Valor atual
             percentage: Porcentagem utilizada
             threshold: Limite de tolerância em porcentagem (padrão 10%)
+            immediate: Enviar agora, sem passar pelo despachante (agrupamento)
         
         Returns:
-            dict com status dos envios
+            dict com status dos envios ("queued" quando foi para o despachante)
         """
         is_over_budget = percentage > (100 + threshold)
         is_on_track = percentage <= 100
@@ -59,38 +65,76 @@ class NotificationService:
         }
 
         # Converter para float para os templates
-        target_float = float(target_amount)
-        actual_float = float(actual_amount)
+        alert = {
+            "planning_name": planning_name,
+            "target_amount": float(target_amount),
+            "actual_amount": float(actual_amount),
+            "percentage": percentage,
+            "is_over_budget": is_over_budget,
+        }
 
-        # Enviar email
-        try:
-            results["email_sent"] = await self.email_service.send_planning_alert(
-                to_email=user_email,
-                user_name=user_name,
-                planning_name=planning_name,
-                target_amount=target_float,
-                actual_amount=actual_float,
-                percentage=percentage,
-                is_over_budget=is_over_budget,
+        if settings.NOTIFICATION_DISPATCHER_ENABLED and not immediate:
+            # Alertas do mesmo usuário dentro da janela viram um único resumo
+            from src.application.tasks.notification_dispatcher import notification_dispatcher
+            notification_dispatcher.submit(
+                "planning",
+                user_email,
+                {"user_email": user_email, "user_name": user_name, "phone_number": phone_number},
+                alert,
             )
-        except Exception as e:
-            print(f"Erro ao enviar email: {e}")
-
-        # Enviar WhatsApp se número fornecido
-        if phone_number:
-            try:
-                results["whatsapp_sent"] = await self.whatsapp_service.send_planning_alert(
-                    phone_number=phone_number,
-                    user_name=user_name,
-                    planning_name=planning_name,
-                    target_amount=target_float,
-                    actual_amount=actual_float,
-                    percentage=percentage,
-                    is_over_budget=is_over_budget,
-                )
-            except Exception as e:
-                print(f"Erro ao enviar WhatsApp: {e}")
+            results["queued"] = True
+            return results
+
+        results.update(await self.deliver_planning_alerts(user_email, user_name, phone_number, [alert]))
+        return results
+
+    async def deliver_planning_alerts(
+        self,
+        user_email: str,
+        user_name: str,
+        phone_number: Optional[str],
+        alerts: List[dict],
+    ) -> dict:
+        """
+        Envia alertas de planejamento por email e WhatsApp em paralelo
 
+        Um alerta usa os templates individuais; vários viram um resumo, com
+        apenas o alerta mais recente de cada planejamento.
+        """
+        latest = {}
+        for alert in alerts:
+            latest[alert["planning_name"]] = alert
+        alerts = list(latest.values())
+
+        if len(alerts) == 1:
+            email = self.email_service.send_planning_alert(to_email=user_email, user_name=user_name, **alerts[0])
+            whatsapp = (
+                self.whatsapp_service.send_planning_alert(phone_number=phone_number, user_name=user_name, **alerts[0])
+                if phone_number
+                else None
+            )
+        else:
+            email = self.email_service.send_planning_digest(user_email, user_name, alerts)
+            whatsapp = (
+                self.whatsapp_service.send_planning_digest(phone_number, user_name, alerts)
+                if phone_number
+                else None
+            )
+        return await self._fan_out(email, whatsapp)
+
+    async def _fan_out(self, email, whatsapp) -> dict:
+        """Executa os envios de email e WhatsApp ao mesmo tempo"""
+        channels = {"email_sent": email}
+        if whatsapp is not None:
+            channels["whatsapp_sent"] = whatsapp
+        outcomes = await asyncio.gather(*channels.values(), return_exceptions=True)
+
+        results = {"email_sent": False, "whatsapp_sent": False}
+        for name, outcome in zip(channels, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Erro ao enviar {'email' if name == 'email_sent' else 'WhatsApp'}: {outcome}")
+            else:
+                results[name] = outcome
         return results
 
     def should_send_notification(
@@ -328,12 +372,33 @@ Equipe FormuladoBolso
         message: str,
     ) -> dict:
         """Envia notificação de nova mensagem no chat familiar"""
-        email_sent = False
-        whatsapp_sent = False
+        if settings.NOTIFICATION_DISPATCHER_ENABLED:
+            # Mensagens seguidas no mesmo grupo viram uma única notificação
+            from src.application.tasks.notification_dispatcher import notification_dispatcher
+            notification_dispatcher.submit(
+                "family_chat",
+                f"{user_email}:{family_name}",
+                {"user_email": user_email, "user_phone": user_phone, "family_name": family_name},
+                {"sender_name": sender_name, "message": message},
+            )
+            return {"email_sent": False, "whatsapp_sent": False, "queued": True}
 
-        # Email
-        subject = f"Nova mensagem no grupo {family_name}"
-        body = f"""
+        return await self.deliver_family_chat(
+            user_email, user_phone, family_name, [{"sender_name": sender_name, "message": message}]
+        )
+
+    async def deliver_family_chat(
+        self,
+        user_email: str,
+        user_phone: Optional[str],
+        family_name: str,
+        messages: List[dict],
+    ) -> dict:
+        """Envia a notificação de uma ou mais mensagens do chat familiar"""
+        if len(messages) == 1:
+            sender_name, message = messages[0]["sender_name"], messages[0]["message"]
+            subject = f"Nova mensagem no grupo {family_name}"
+            body = f"""
         Olá!
 
         {sender_name} enviou uma nova mensagem no grupo "{family_name}":
@@ -345,18 +410,27 @@ Equipe FormuladoBolso
         Atenciosamente,
         Equipe FormuladoBolso
         """
-        try:
-            email_sent = await self.email_service.send_email(user_email, subject, body)
-        except Exception as e:
-            print(f"Erro ao enviar email: {e}")
-
-        # WhatsApp
-        if user_phone:
             whatsapp_message = f"💬 Nova mensagem no grupo {family_name}\n\n{sender_name}: {message}\n\nAcesse o app para responder!"
-            try:
-                whatsapp_sent = await self.whatsapp_service.send_message(user_phone, whatsapp_message)
-            except Exception as e:
-                print(f"Erro ao enviar WhatsApp: {e}")
+        else:
+            # Resumo: as últimas mensagens do período
+            recent = messages[-CHAT_DIGEST_MAX_MESSAGES:]
+            lines = "\n".join(f'{m["sender_name"]}: {m["message"]}' for m in recent)
+            subject = f"{len(messages)} novas mensagens no grupo {family_name}"
+            body = f"""
+        Olá!
+
+        Há {len(messages)} novas mensagens no grupo "{family_name}":
+
+{lines}
+
+        Acesse o sistema para ver todas as mensagens e responder!
 
-        return {"email_sent": email_sent, "whatsapp_sent": whatsapp_sent}
+        Atenciosamente,
+        Equipe FormuladoBolso
+        """
+            whatsapp_message = f"💬 {len(messages)} novas mensagens no grupo {family_name}\n\n{lines}\n\nAcesse o app para responder!"
 
+        return await self._fan_out(
+            self.email_service.send_email(user_email, subject, body),
+            self.whatsapp_service.send_message(user_phone, whatsapp_message) if user_phone else None,
+        )
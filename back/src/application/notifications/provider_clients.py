@@ -0,0 +1,139 @@
+"""
+Clientes HTTP compartilhados por provedor de notificação, com limites de
+concorrência e de taxa
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+import httpx
+from src.shared.config import settings
+
+
+class RateLimiter:
+    """Token bucket assíncrono: até `rate` operações por segundo, com rajadas de `burst`.
+
+    `rate` <= 0 desativa o limite.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = max(1, burst or int(rate) or 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    async def acquire(self) -> None:
+        """Espera até haver uma ficha disponível"""
+        if self.rate <= 0:
+            return
+        # O lock mantém a ordem de chegada: quem espera não é ultrapassado
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+
+class ProviderClient:
+    """Um `httpx.AsyncClient` por provedor, reaproveitado entre envios.
+
+    As conexões ficam abertas (keep-alive) em vez de um novo TCP+TLS por
+    mensagem. No máximo `max_concurrency` requisições simultâneas e
+    `rate_limit` por segundo, para não estourar os limites do provedor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        rate_limit: float,
+        max_connections: int = settings.NOTIFICATION_HTTP_MAX_CONNECTIONS,
+        timeout: int = settings.NOTIFICATION_HTTP_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_connections, self.max_concurrency),
+        )
+        self._timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+        return self._client
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """POST respeitando os limites do provedor"""
+        await self.rate_limiter.acquire()
+        async with self._semaphore:
+            self.in_flight += 1
+            started = time.monotonic()
+            try:
+                response = await self.client.post(url, **kwargs)
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self.requests += 1
+                self.total_latency += time.monotonic() - started
+            if response.status_code >= 400:
+                self.errors += 1
+            return response
+
+    def stats(self) -> Dict[str, float]:
+        """Métricas do provedor"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+            "rate_limited_seconds": round(self.rate_limiter.waited_seconds, 3),
+        }
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_clients: Dict[str, ProviderClient] = {}
+
+
+def get_provider_client(name: str) -> ProviderClient:
+    """Cliente compartilhado do provedor (limites em settings.<NOME>_MAX_CONCURRENCY/_RATE_LIMIT_PER_SECOND)"""
+    if name not in _clients:
+        prefix = name.upper()
+        _clients[name] = ProviderClient(
+            name,
+            max_concurrency=getattr(settings, f"{prefix}_MAX_CONCURRENCY", 5),
+            rate_limit=getattr(settings, f"{prefix}_RATE_LIMIT_PER_SECOND", 0),
+        )
+    return _clients[name]
+
+
+def provider_stats() -> Dict[str, Dict[str, float]]:
+    """Métricas de todos os provedores já usados"""
+    return {name: client.stats() for name, client in _clients.items()}
+
+
+async def close_provider_clients() -> None:
+    """Fecha os clientes HTTP (desligamento da aplicação)"""
+    for client in list(_clients.values()):
+        await client.close()
@@ -0,0 +1,116 @@
+"""
+Pool de conexões SMTP persistentes
+"""
+import asyncio
+import smtplib
+from email.message import Message
+from typing import Dict, List, Optional, Tuple
+from src.shared.config import settings
+from src.application.notifications.provider_clients import RateLimiter
+
+
+class SMTPConnectionPool:
+    """Conexões SMTP reaproveitadas entre envios.
+
+    O smtplib é síncrono: conexão, STARTTLS, login e envio rodam em threads
+    (asyncio.to_thread), então o event loop nunca espera pelo servidor. As
+    conexões ficam abertas entre mensagens (sem novo TCP+STARTTLS+login a cada
+    envio) e são recriadas quando o servidor as encerra. No máximo `size`
+    envios simultâneos e, se configurado, `rate_limit` por segundo.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = settings.SMTP_POOL_SIZE,
+        starttls: bool = settings.SMTP_STARTTLS,
+        timeout: int = settings.SMTP_TIMEOUT_SECONDS,
+        rate_limit: float = settings.SMTP_RATE_LIMIT_PER_SECOND,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, size))
+        self._idle: List[smtplib.SMTP] = []
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            server.starttls()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        self.connections_opened += 1
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    async def send(self, message: Message) -> None:
+        """Envia a mensagem por uma conexão do pool (levanta exceção em caso de falha)"""
+        await self.rate_limiter.acquire()
+        async with self._semaphore:
+            server = self._idle.pop() if self._idle else None
+            try:
+                if server is None:
+                    server = await asyncio.to_thread(self._connect)
+                try:
+                    await asyncio.to_thread(server.send_message, message)
+                except smtplib.SMTPServerDisconnected:
+                    # Conexão ociosa encerrada pelo servidor: reconectar uma vez
+                    server = await asyncio.to_thread(self._connect)
+                    await asyncio.to_thread(server.send_message, message)
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # O servidor recusou a mensagem, mas a conexão continua válida
+                if server is None:
+                    raise
+                try:
+                    await asyncio.to_thread(server.rset)
+                    self._idle.append(server)
+                except Exception:
+                    await asyncio.to_thread(self._close, server)
+                raise
+            except Exception:
+                if server is not None:
+                    await asyncio.to_thread(self._close, server)
+                raise
+            self._idle.append(server)
+
+    async def close(self) -> None:
+        """Encerra as conexões ociosas"""
+        idle, self._idle = self._idle, []
+        for server in idle:
+            await asyncio.to_thread(self._close, server)
+
+
+_pools: Dict[Tuple[str, int, Optional[str]], SMTPConnectionPool] = {}
+
+
+def get_smtp_pool(
+    host: str,
+    port: int,
+    user: Optional[str] = None,
+    password: Optional[str] = None,
+) -> SMTPConnectionPool:
+    """Pool compartilhado por servidor/usuário"""
+    key = (host, port, user)
+    if key not in _pools:
+        _pools[key] = SMTPConnectionPool(host, port, user, password)
+    return _pools[key]
+
+
+async def close_smtp_pools() -> None:
+    """Encerra as conexões de todos os pools (desligamento da aplicação)"""
+    for pool in list(_pools.values()):
+        await pool.close()
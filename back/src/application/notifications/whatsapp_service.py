@@ -1,6 +1,6 @@
-from typing import Optional
-import httpx
+from typing import List, Optional
 from src.shared.config import settings
+from src.application.notifications.provider_clients import get_provider_client
 
 
 class WhatsAppService:
@@ -26,6 +26,8 @@ class WhatsAppService:
         self.phone_number_id = phone_number_id or getattr(
             settings, "WHATSAPP_PHONE_NUMBER_ID", None
         )
+        # Cliente HTTP compartilhado (keep-alive, concorrência e taxa limitadas)
+        self.client = get_provider_client("whatsapp")
 
     async def send_message(
         self, phone_number: str, message: str, template: Optional[str] = None
@@ -75,9 +77,8 @@ class WhatsAppService:
             "text": {"body": message},
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload)
-            return response.status_code == 200
+        response = await self.client.post(url, headers=headers, json=payload)
+        return response.status_code == 200
 
     async def _send_via_evolution_api(self, phone_number: str, message: str) -> bool:
         """Envia via Evolution API"""
@@ -91,9 +92,8 @@ class WhatsAppService:
             "text": message,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload)
-            return response.status_code == 200
+        response = await self.client.post(url, headers=headers, json=payload)
+        return response.status_code == 200
 
     async def _send_via_twilio(self, phone_number: str, message: str) -> bool:
         """Envia via Twilio"""
@@ -105,9 +105,8 @@ class WhatsAppService:
             "Body": message,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, auth=auth, data=data)
-            return response.status_code == 201
+        response = await self.client.post(url, auth=auth, data=data)
+        return response.status_code == 201
 
     def _format_phone_number(self, phone_number: str) -> str:
         """Formata número de telefone"""
@@ -140,6 +139,28 @@ class WhatsAppService:
 
         return await self.send_message(phone_number, message)
 
+    async def send_planning_digest(
+        self,
+        phone_number: str,
+        user_name: str,
+        alerts: List[dict],
+    ) -> bool:
+        """Envia um resumo com vários alertas de planejamento via WhatsApp"""
+        lines = []
+        for alert in alerts:
+            icon = "⚠️" if alert["is_over_budget"] else "✅"
+            lines.append(
+                f"{icon} *{alert['planning_name']}*: R$ {alert['actual_amount']:,.2f} "
+                f"de R$ {alert['target_amount']:,.2f} ({alert['percentage']:.1f}%)"
+            )
+        message = (
+            f"📊 *Resumo dos Seus Planejamentos*\n\nOlá, {user_name}!\n\n"
+            + "\n".join(lines)
+            + "\n\nAcesse o FormuladoBolso para mais detalhes.\n\n"
+            "_FormuladoBolso - Seu gerenciador financeiro pessoal_"
+        )
+        return await self.send_message(phone_number, message)
+
     def _get_over_budget_message(
         self,
         user_name: str,
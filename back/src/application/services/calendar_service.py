@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.account_repository import AccountRepository
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
 
 
 class CalendarService:
@@ -13,9 +14,11 @@ class CalendarService:
         self,
         transaction_repository: TransactionRepository,
         account_repository: AccountRepository,
+        transaction_rollup_repository: Optional[TransactionRollupRepository] = None,
     ):
         self.transaction_repository = transaction_repository
         self.account_repository = account_repository
+        self.transaction_rollup_repository = transaction_rollup_repository
 
     async def get_daily_expenses(
         self, user_id: UUID, date: datetime, workspace_id: Optional[UUID] = None
@@ -105,6 +108,9 @@ class CalendarService:
         self, user_id: UUID, year: int, workspace_id: Optional[UUID] = None
     ) -> Dict:
         """Obtém despesas de um ano"""
+        if self.transaction_rollup_repository:
+            return await self._get_yearly_expenses_from_rollups(user_id, year, workspace_id)
+
         start_date = datetime(year, 1, 1, 0, 0, 0)
         end_date = datetime(year, 12, 31, 23, 59, 59)
 
@@ -141,6 +147,39 @@ class CalendarService:
             "average_monthly": total / 12,
         }
 
+    async def _get_yearly_expenses_from_rollups(
+        self, user_id: UUID, year: int, workspace_id: Optional[UUID] = None
+    ) -> Dict:
+        """Obtém despesas de um ano a partir dos totais diários (12 linhas no máximo)"""
+        rows = await self.transaction_rollup_repository.get_totals(
+            user_id,
+            datetime(year, 1, 1).date(),
+            datetime(year, 12, 31).date(),
+            group_by=("month",),
+            transaction_type="expense",
+            status="completed",
+            workspace_id=workspace_id,
+        )
+
+        monthly_expenses = [
+            {
+                "month": row["month"].month,
+                "total": float(row["total"]),
+                "count": row["count"],
+                "transactions": [],
+            }
+            for row in rows
+        ]
+        total = sum(item["total"] for item in monthly_expenses)
+
+        return {
+            "year": year,
+            "total_expenses": total,
+            "transaction_count": sum(item["count"] for item in monthly_expenses),
+            "monthly_expenses": monthly_expenses,
+            "average_monthly": total / 12,
+        }
+
     async def get_calendar_view(
         self, user_id: UUID, year: int, month: int, workspace_id: Optional[UUID] = None
     ) -> Dict:
@@ -0,0 +1,48 @@
+"""
+Sincronização em lote dos eventos financeiros (transações, contas e metas) no calendário
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+from uuid import UUID
+import pytz
+from src.shared.config import settings
+from src.domain.repositories.calendar_repository import CalendarEventRepository
+
+
+class CalendarSyncService:
+    """Cria os eventos financeiros que faltam no calendário do usuário.
+
+    A primeira execução (ou `full=True`) percorre todas as transações
+    concluídas, contas pendentes e metas ativas do usuário. As seguintes leem
+    só as linhas alteradas desde a marca d'água (início da última execução,
+    menos `overlap_seconds` para cobrir escritas concorrentes); a releitura é
+    inofensiva porque o que já tem evento é descartado pelo anti-join.
+    """
+
+    def __init__(self, overlap_seconds: int = settings.CALENDAR_SYNC_OVERLAP_SECONDS):
+        self.overlap = timedelta(seconds=overlap_seconds)
+
+    async def sync_user(
+        self, repository: CalendarEventRepository, user_id: UUID, full: bool = False
+    ) -> Dict:
+        """Sincroniza e avança a marca d'água (um único commit)"""
+        started = time.perf_counter()
+        started_at = datetime.now(pytz.UTC)
+
+        watermark = None if full else await repository.get_sync_watermark(user_id)
+        since = watermark - self.overlap if watermark else None
+
+        created = await repository.insert_missing_financial_events(user_id, since)
+        await repository.save_sync_watermark(user_id, started_at)
+
+        return {
+            **created,
+            "created": sum(created.values()),
+            "incremental": since is not None,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+
+# Instância global
+calendar_sync_service = CalendarSyncService()
@@ -21,6 +21,17 @@ from src.infrastructure.database.models.gamification import (
     BadgeType,
 )
 from src.shared.exceptions import NotFoundException
+from src.application.services.leaderboard_service import leaderboard_service
+
+# Badges por contadores: (contador, mínimo, nome do badge)
+ACHIEVEMENT_RULES = (
+    ("transactions", 1, "Primeiro Passo"),
+    ("transactions", 10, "Organizado"),
+    ("transactions", 100, "Mestre das Transações"),
+    ("goals", 1, "Sonhador"),
+    ("completed_goals", 1, "Realizador"),
+)
+STREAK_MILESTONES = (7, 30, 100)
 
 
 class GamificationService:
@@ -59,12 +70,9 @@ class GamificationService:
         )
         return await self.user_level_repository.create(user_level)
 
-    async def add_points(self, user_id: UUID, points: int, reason: str = "") -> UserLevel:
-        """Adiciona pontos ao usuário"""
-        user_level = await self.user_level_repository.get_by_user_id(user_id)
-        if not user_level:
-            user_level = await self.initialize_user_level(user_id)
-
+    @staticmethod
+    def _apply_points(user_level: UserLevel, points: int):
+        """Soma os pontos e recalcula o nível (sem gravar)"""
         user_level.total_points += points
         user_level.experience_points += points
 
@@ -81,7 +89,17 @@ class GamificationService:
         if new_level > user_level.level:
             user_level.level = new_level
 
-        return await self.user_level_repository.update(user_level)
+    async def add_points(self, user_id: UUID, points: int, reason: str = "") -> UserLevel:
+        """Adiciona pontos ao usuário"""
+        user_level = await self.user_level_repository.get_by_user_id(user_id)
+        if not user_level:
+            user_level = await self.initialize_user_level(user_id)
+
+        self._apply_points(user_level, points)
+
+        user_level = await self.user_level_repository.update(user_level)
+        await leaderboard_service.record_points(self.user_level_repository, user_id, user_level.total_points)
+        return user_level
 
     async def award_badge(self, user_id: UUID, badge_id: UUID, progress: int = 100) -> UserBadge:
         """Concede um badge ao usuário"""
@@ -112,12 +130,9 @@ class GamificationService:
                 await self.add_points(user_id, badge.points, f"Badge: {badge.name}")
             return await self.user_badge_repository.create(user_badge)
 
-    async def update_streak(self, user_id: UUID) -> UserLevel:
-        """Atualiza streak de dias consecutivos"""
-        user_level = await self.user_level_repository.get_by_user_id(user_id)
-        if not user_level:
-            user_level = await self.initialize_user_level(user_id)
-
+    @staticmethod
+    def _advance_streak(user_level: UserLevel) -> Optional[int]:
+        """Atualiza a sequência de dias (sem gravar); retorna o marco atingido (7, 30, 100)"""
         now = datetime.now(pytz.UTC).date()
         last_activity = user_level.last_activity_date.date() if user_level.last_activity_date else None
 
@@ -129,20 +144,27 @@ class GamificationService:
             elif days_diff > 1:
                 # Quebrou a sequência
                 user_level.streak_days = 1
-            # Se days_diff == 0, já atualizou hoje
+            else:
+                # Já atualizou hoje
+                user_level.last_activity_date = datetime.now(pytz.UTC)
+                return None
         else:
             # Primeira vez
             user_level.streak_days = 1
 
         user_level.last_activity_date = datetime.now(pytz.UTC)
+        return user_level.streak_days if user_level.streak_days in STREAK_MILESTONES else None
+
+    async def update_streak(self, user_id: UUID) -> UserLevel:
+        """Atualiza streak de dias consecutivos"""
+        user_level = await self.user_level_repository.get_by_user_id(user_id)
+        if not user_level:
+            user_level = await self.initialize_user_level(user_id)
 
         # Badge por streak
-        if user_level.streak_days == 7:
-            await self._check_and_award_streak_badge(user_id, 7)
-        elif user_level.streak_days == 30:
-            await self._check_and_award_streak_badge(user_id, 30)
-        elif user_level.streak_days == 100:
-            await self._check_and_award_streak_badge(user_id, 100)
+        milestone = self._advance_streak(user_level)
+        if milestone:
+            await self._check_and_award_streak_badge(user_id, milestone)
 
         return await self.user_level_repository.update(user_level)
 
@@ -198,6 +220,77 @@ class GamificationService:
 
         return awarded
 
+    async def apply_events(
+        self, user_id: UUID, points: int, activity: bool = False, check_achievements: bool = False
+    ) -> UserLevel:
+        """
+        Aplica um lote de eventos do usuário com um único commit
+
+        Args:
+            user_id: Usuário
+            points: Soma dos pontos dos eventos
+            activity: Houve atividade (atualiza a sequência de dias)
+            check_achievements: Avaliar os badges por contadores (transações e metas)
+
+        Returns:
+            Nível atualizado
+        """
+        user_level = await self.user_level_repository.get_by_user_id(user_id)
+        if not user_level:
+            user_level = await self.initialize_user_level(user_id)
+
+        user_badges = {ub.badge_id: ub for ub in await self.user_badge_repository.get_by_user_id(user_id)}
+        earned = {badge_id for badge_id, ub in user_badges.items() if ub.progress >= 100}
+        all_badges: Optional[List[Badge]] = None
+        to_award: List[Badge] = []
+
+        if check_achievements:
+            all_badges = await self.badge_repository.get_all()
+            # Só as regras de badges ainda não conquistados consultam os contadores
+            pending = []
+            for counter, minimum, name in ACHIEVEMENT_RULES:
+                badge = self._match_badge(all_badges, name)
+                if badge and badge.id not in earned:
+                    pending.append((counter, minimum, badge))
+            if pending:
+                counters = await self.user_level_repository.get_achievement_counters(user_id)
+                to_award += [badge for counter, minimum, badge in pending if counters[counter] >= minimum]
+
+        if activity:
+            milestone = self._advance_streak(user_level)
+            if milestone:
+                if all_badges is None:
+                    all_badges = await self.badge_repository.get_all()
+                to_award += [
+                    badge for badge in all_badges
+                    if badge.badge_type == BadgeType.ACHIEVEMENT and badge.id not in earned
+                    and (f"{milestone}" in badge.name.lower() or "streak" in badge.name.lower())
+                ]
+
+        now = datetime.now(pytz.UTC)
+        for badge in {badge.id: badge for badge in to_award}.values():
+            existing = user_badges.get(badge.id)
+            if existing:
+                existing.progress = 100
+                existing.earned_at = now
+            else:
+                await self.user_badge_repository.add(
+                    UserBadge(user_id=user_id, badge_id=badge.id, progress=100, earned_at=now)
+                )
+            points += badge.points
+
+        self._apply_points(user_level, points)
+        user_level = await self.user_level_repository.update(user_level)
+        await leaderboard_service.record_points(self.user_level_repository, user_id, user_level.total_points)
+        return user_level
+
+    @staticmethod
+    def _match_badge(badges: List[Badge], name: str) -> Optional[Badge]:
+        for badge in badges:
+            if name.lower() in badge.name.lower():
+                return badge
+        return None
+
     async def _find_badge_by_name(self, name: str) -> Optional[Badge]:
         """Encontra badge por nome"""
         badges = await self.badge_repository.get_all()
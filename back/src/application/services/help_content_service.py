@@ -0,0 +1,77 @@
+"""
+Índice imutável do conteúdo de ajuda, compilado uma vez por processo
+"""
+import hashlib
+import json
+import os
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional
+from src.shared.config import settings
+
+# Chave da resposta sem tópico ({"topics": [...], "content": {...}})
+ALL_TOPICS = ""
+
+
+class CompiledHelp(NamedTuple):
+    """Corpo JSON pronto para enviar e o ETag forte (sha256 do corpo)"""
+    body: bytes
+    etag: str
+
+
+def _dump(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compile_help_content(content: Dict[str, Dict]) -> Dict[str, bytes]:
+    """Serializa cada tópico e a listagem completa (corpos JSON em bytes)"""
+    compiled = {topic: _dump(data) for topic, data in content.items()}
+    compiled[ALL_TOPICS] = _dump({"topics": list(content.keys()), "content": content})
+    return compiled
+
+
+class HelpContentIndex:
+    """Conteúdo de ajuda serializado e com ETag calculado uma única vez.
+
+    Por padrão compila o módulo application/content/help_content.py no
+    primeiro uso (ou no startup). Com HELP_CONTENT_PACK_PATH apontando para
+    um arquivo gerado por `scripts/build_help_content.py`, carrega os corpos
+    prontos dele, sem importar o módulo de conteúdo.
+    """
+
+    def __init__(self, pack_path: Optional[str] = settings.HELP_CONTENT_PACK_PATH):
+        self.pack_path = pack_path
+        self._entries: Optional[Mapping[str, CompiledHelp]] = None
+        self.source: Optional[str] = None
+
+    def load(self) -> Mapping[str, CompiledHelp]:
+        """Compila (ou lê do pacote) o índice, se ainda não carregado"""
+        if self._entries is None:
+            if self.pack_path and os.path.exists(self.pack_path):
+                with open(self.pack_path, "r", encoding="utf-8") as pack:
+                    bodies = {topic: body.encode("utf-8") for topic, body in json.load(pack).items()}
+                self.source = self.pack_path
+            else:
+                from src.application.content.help_content import HELP_CONTENT
+                bodies = compile_help_content(HELP_CONTENT)
+                self.source = "module"
+            self._entries = MappingProxyType({
+                topic: CompiledHelp(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+                for topic, body in bodies.items()
+            })
+        return self._entries
+
+    def get(self, topic: Optional[str] = None) -> Optional[CompiledHelp]:
+        """Tópico compilado (ou a listagem completa, sem tópico); None se não existe"""
+        return self.load().get(topic or ALL_TOPICS)
+
+    def stats(self) -> Dict:
+        entries = self._entries or {}
+        return {
+            "source": self.source,
+            "topics": max(len(entries) - 1, 0),
+            "bytes": sum(len(entry.body) for entry in entries.values()),
+        }
+
+
+# Instância global
+help_content_index = HelpContentIndex()
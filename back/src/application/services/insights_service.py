@@ -6,6 +6,7 @@ from collections import defaultdict
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.category_repository import CategoryRepository
+from src.infrastructure.cache.cache_service import cached
 
 
 class InsightsService:
@@ -21,6 +22,7 @@ class InsightsService:
         self.account_repository = account_repository
         self.category_repository = category_repository
 
+    @cached("insights", ("transactions", "accounts"))
     async def generate_insights(self, user_id: UUID, days: int = 30) -> List[Dict]:
         """Gera insights automáticos baseados em padrões"""
         insights = []
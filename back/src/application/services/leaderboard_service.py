@@ -0,0 +1,254 @@
+"""
+Ranking de gamificação em sorted sets do Redis (global, por família e por workspace)
+"""
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+from src.shared.config import settings
+from src.shared.exceptions import ForbiddenException, NotFoundException
+from src.domain.repositories.gamification_repository import UserLevelRepository
+from src.infrastructure.cache.redis_client import redis_client
+
+RECONCILE_CHUNK_SIZE = 1000
+
+# Membro-marcador gravado junto de cada ranking montado por completo. Fica na
+# própria chave: se o Redis a remover (eviction, FLUSHDB), o marcador some junto,
+# e um ranking recriado aos poucos por record_points não é servido como completo.
+BOARD_COMPLETE_MARKER = "__complete__"
+BOARD_REBUILD_LOCK_SECONDS = 30
+
+
+class LeaderboardService:
+    """Rankings por escopo, com score = total_points do usuário.
+
+    Cada escopo é um sorted set (`leaderboard:global`,
+    `leaderboard:family:{id}`, `leaderboard:workspace:{id}`). O
+    GamificationService grava o total absoluto do usuário em todos os seus
+    escopos a cada pontuação, então a escrita é idempotente; posição e
+    janela em volta do usuário são O(log n). A reconciliação reconstrói os
+    rankings a partir de `user_levels` e corrige vínculos novos ou removidos.
+    Um ranking só é lido do Redis se tiver o marcador de completo; sem ele
+    (chave removida, escopo criado depois da reconciliação) só aquele ranking
+    é reconstruído antes da leitura. Sem Redis, o ranking vem do banco.
+    """
+
+    def __init__(self, scopes_ttl: int = settings.LEADERBOARD_SCOPES_TTL_SECONDS):
+        self.scopes_ttl = scopes_ttl
+
+    @staticmethod
+    def board_key(scope: str, scope_id: Optional[UUID] = None) -> str:
+        if scope == "global":
+            return "leaderboard:global"
+        return f"leaderboard:{scope}:{scope_id}"
+
+    async def user_boards(self, repository: UserLevelRepository, user_id: UUID) -> List[str]:
+        """Chaves dos rankings de que o usuário participa (vínculos em cache)"""
+        cache_key = f"leaderboard:scopes:{user_id}"
+        try:
+            boards = await redis_client.get_json(cache_key)
+        except Exception:
+            boards = None
+        if boards is None:
+            scopes = await repository.get_leaderboard_scopes(user_id)
+            boards = [self.board_key("global")]
+            boards += [self.board_key("family", family_id) for family_id in scopes["family"]]
+            boards += [self.board_key("workspace", workspace_id) for workspace_id in scopes["workspace"]]
+            try:
+                await redis_client.set_json(cache_key, boards, expire=self.scopes_ttl)
+            except Exception as e:
+                print(f"[DEBUG] Erro ao gravar escopos do ranking: {e}")
+        return boards
+
+    async def record_points(self, repository: UserLevelRepository, user_id: UUID, total_points: int):
+        """Atualiza o score do usuário em todos os seus rankings"""
+        try:
+            for key in await self.user_boards(repository, user_id):
+                await redis_client.zadd(key, {str(user_id): total_points})
+        except Exception as e:
+            # O ranking se corrige na próxima reconciliação
+            print(f"[DEBUG] Erro ao atualizar ranking de {user_id}: {e}")
+
+    async def _resolve_board(
+        self, repository: UserLevelRepository, user_id: UUID, scope: str, scope_id: Optional[UUID]
+    ) -> str:
+        """Chave do ranking pedido; sem scope_id usa a primeira família/workspace do usuário"""
+        if scope == "global":
+            return self.board_key("global")
+        boards = await self.user_boards(repository, user_id)
+        if scope_id is None:
+            prefix = self.board_key(scope, "")
+            for key in boards:
+                if key.startswith(prefix):
+                    return key
+            raise NotFoundException("Família" if scope == "family" else "Workspace")
+        key = self.board_key(scope, scope_id)
+        if key not in boards:
+            raise ForbiddenException("Você não participa deste ranking")
+        return key
+
+    def _scope_filters(self, key: str) -> Dict[str, Optional[UUID]]:
+        """family_id/workspace_id correspondentes à chave do ranking"""
+        scope_id = UUID(key.rsplit(":", 1)[1]) if key != self.board_key("global") else None
+        return {
+            "family_id": scope_id if key.startswith("leaderboard:family:") else None,
+            "workspace_id": scope_id if key.startswith("leaderboard:workspace:") else None,
+        }
+
+    @staticmethod
+    async def _replace_board(key: str, members: Dict[str, int]):
+        """Monta o ranking (com o marcador de completo) em uma chave temporária e troca com RENAME"""
+        tmp_key = f"{key}:rebuild:{uuid4().hex}"
+        items = list(members.items())
+        await redis_client.zadd(tmp_key, {BOARD_COMPLETE_MARKER: float("-inf")})
+        for index in range(0, len(items), RECONCILE_CHUNK_SIZE):
+            await redis_client.zadd(tmp_key, dict(items[index:index + RECONCILE_CHUNK_SIZE]))
+        await redis_client.rename(tmp_key, key)
+
+    async def _ensure_board(self, repository: UserLevelRepository, key: str) -> bool:
+        """True se o ranking no Redis está completo (reconstruindo só ele se preciso)
+
+        False se o Redis estiver indisponível ou outra requisição já estiver
+        reconstruindo o ranking; nesses casos a leitura vai para o banco.
+        """
+        try:
+            if await redis_client.zscore(key, BOARD_COMPLETE_MARKER) is not None:
+                return True
+            lock_key = f"{key}:rebuild-lock"
+            if not await redis_client.acquire_lock(lock_key, expire=BOARD_REBUILD_LOCK_SECONDS):
+                return False
+            try:
+                scores = await repository.get_leaderboard_scores(**self._scope_filters(key))
+                await self._replace_board(key, {str(user_id): points or 0 for user_id, points in scores})
+                # Registrar o ranking para que a reconciliação o remova se o escopo deixar de existir
+                boards = await redis_client.get_json("leaderboard:boards") or []
+                if key not in boards:
+                    await redis_client.set_json("leaderboard:boards", sorted([*boards, key]))
+            finally:
+                await redis_client.delete(lock_key)
+            return True
+        except Exception as e:
+            print(f"[DEBUG] Ranking indisponível no Redis: {e}")
+            return False
+
+    async def _entries(self, repository: UserLevelRepository, rows, first_rank: int) -> List[Dict]:
+        profiles = await repository.get_leaderboard_profiles([UUID(member) for member, _ in rows])
+        entries = []
+        for offset, (member, score) in enumerate(rows):
+            username, level = profiles.get(UUID(member), (None, None))
+            entries.append({
+                "user_id": member,
+                "username": username or "Usuário",
+                "level": level or 1,
+                "total_points": int(score),
+                "rank": first_rank + offset,
+            })
+        return entries
+
+    async def _top_from_database(
+        self, repository: UserLevelRepository, key: str, limit: int
+    ) -> List[Dict]:
+        rows = await repository.get_leaderboard_top(limit, **self._scope_filters(key))
+        return [
+            {
+                "user_id": user_id,
+                "username": username or "Usuário",
+                "level": level or 1,
+                "total_points": total_points or 0,
+                "rank": rank,
+            }
+            for rank, (user_id, username, level, total_points) in enumerate(rows, 1)
+        ]
+
+    async def get_top(
+        self,
+        repository: UserLevelRepository,
+        user_id: UUID,
+        scope: str = "global",
+        scope_id: Optional[UUID] = None,
+        limit: int = 10,
+    ) -> List[Dict]:
+        """Primeiros colocados do ranking"""
+        key = await self._resolve_board(repository, user_id, scope, scope_id)
+        if not await self._ensure_board(repository, key):
+            return await self._top_from_database(repository, key, limit)
+        try:
+            rows = await redis_client.zrevrange(key, 0, limit - 1)
+        except Exception as e:
+            print(f"[DEBUG] Ranking indisponível no Redis: {e}")
+            return await self._top_from_database(repository, key, limit)
+        rows = [(member, score) for member, score in rows if member != BOARD_COMPLETE_MARKER]
+        return await self._entries(repository, rows, 1)
+
+    async def get_position(
+        self,
+        repository: UserLevelRepository,
+        user_id: UUID,
+        scope: str = "global",
+        scope_id: Optional[UUID] = None,
+        window: int = 5,
+    ) -> Dict:
+        """Posição do usuário e os `window` colocados acima e abaixo dele"""
+        key = await self._resolve_board(repository, user_id, scope, scope_id)
+        if not await self._ensure_board(repository, key):
+            return {"rank": None, "total_points": 0, "total_users": 0, "around": []}
+        try:
+            rank = await redis_client.zrevrank(key, str(user_id))
+            if rank is None:
+                # Usuário pontuou depois da montagem do ranking e a escrita se perdeu
+                user_level = await repository.get_by_user_id(user_id)
+                if user_level:
+                    await self.record_points(repository, user_id, user_level.total_points)
+                    rank = await redis_client.zrevrank(key, str(user_id))
+            # O marcador de completo não conta como usuário
+            total_users = await redis_client.zcard(key) - 1
+            if rank is None:
+                return {"rank": None, "total_points": 0, "total_users": total_users, "around": []}
+
+            start = max(0, rank - window)
+            rows = await redis_client.zrevrange(key, start, rank + window)
+            rows = [(member, score) for member, score in rows if member != BOARD_COMPLETE_MARKER]
+        except Exception as e:
+            print(f"[DEBUG] Ranking indisponível no Redis: {e}")
+            return {"rank": None, "total_points": 0, "total_users": 0, "around": []}
+
+        around = await self._entries(repository, rows, start + 1)
+        return {
+            "rank": rank + 1,
+            "total_points": around[rank - start]["total_points"],
+            "total_users": total_users,
+            "around": around,
+        }
+
+    async def reconcile(self, repository: UserLevelRepository) -> Dict:
+        """Reconstrói todos os rankings a partir de user_levels e dos vínculos atuais"""
+        started = time.perf_counter()
+        points, memberships = await repository.get_leaderboard_snapshot()
+        scores = {str(user_id): total_points for user_id, total_points in points}
+
+        boards: Dict[str, Dict[str, int]] = defaultdict(dict)
+        if scores:
+            boards[self.board_key("global")] = scores
+        for scope, scope_id, user_id in memberships:
+            if str(user_id) in scores:
+                boards[self.board_key(scope, scope_id)][str(user_id)] = scores[str(user_id)]
+
+        # Cada ranking é montado em uma chave temporária e trocado com RENAME
+        for key, members in boards.items():
+            await self._replace_board(key, members)
+
+        # Rankings que deixaram de existir (família/workspace removido)
+        previous = await redis_client.get_json("leaderboard:boards") or []
+        for key in set(previous) - set(boards):
+            await redis_client.delete(key)
+        await redis_client.set_json("leaderboard:boards", sorted(boards))
+
+        return {
+            "boards": len(boards),
+            "users": len(scores),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+
+# Instância global
+leaderboard_service = LeaderboardService()
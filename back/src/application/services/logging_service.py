@@ -14,8 +14,8 @@ class LoggingService:
     def __init__(self, log_repository: LogRepository):
         self.log_repository = log_repository
 
-    async def log(
-        self,
+    @staticmethod
+    def build_log(
         level: LogLevel,
         category: LogCategory,
         message: str,
@@ -30,7 +30,7 @@ class LoggingService:
         execution_time_ms: Optional[float] = None,
         exception: Optional[Exception] = None,
     ) -> SystemLog:
-        """Cria um log genérico"""
+        """Monta um log sem persistir (usado também pelo sink em lote)"""
         log = SystemLog(
             level=level,
             category=category,
@@ -44,6 +44,7 @@ class LoggingService:
             method=method,
             status_code=str(status_code) if status_code else None,
             execution_time_ms=str(execution_time_ms) if execution_time_ms else None,
+            created_at=datetime.now(pytz.UTC),
         )
 
         # Adicionar informações de erro se houver exceção
@@ -56,6 +57,74 @@ class LoggingService:
                 "exception_args": str(exception.args) if exception.args else None,
             }
 
+        return log
+
+    @classmethod
+    def build_api_request_log(
+        cls,
+        method: str,
+        endpoint: str,
+        user_id: Optional[UUID] = None,
+        status_code: int = 200,
+        execution_time_ms: Optional[float] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        request_id: Optional[str] = None,
+        error: Optional[Exception] = None,
+    ) -> SystemLog:
+        """Monta o log de uma requisição API sem persistir"""
+        if error:
+            level = LogLevel.ERROR
+        else:
+            level = LogLevel.ERROR if status_code >= 500 else (LogLevel.WARNING if status_code >= 400 else LogLevel.INFO)
+        
+        return cls.build_log(
+            level,
+            LogCategory.API,
+            f"{method} {endpoint} - {status_code}",
+            user_id=user_id,
+            endpoint=endpoint,
+            method=method,
+            status_code=status_code,
+            execution_time_ms=execution_time_ms,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            request_id=request_id,
+            exception=error,
+        )
+
+    async def log(
+        self,
+        level: LogLevel,
+        category: LogCategory,
+        message: str,
+        user_id: Optional[UUID] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        request_id: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        method: Optional[str] = None,
+        status_code: Optional[int] = None,
+        execution_time_ms: Optional[float] = None,
+        exception: Optional[Exception] = None,
+    ) -> SystemLog:
+        """Cria um log genérico"""
+        log = self.build_log(
+            level,
+            category,
+            message,
+            user_id=user_id,
+            details=details,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            request_id=request_id,
+            endpoint=endpoint,
+            method=method,
+            status_code=status_code,
+            execution_time_ms=execution_time_ms,
+            exception=exception,
+        )
         return await self.log_repository.create(log)
 
     async def log_info(
@@ -118,37 +187,18 @@ class LoggingService:
         error: Optional[Exception] = None,
     ) -> SystemLog:
         """Log específico para requisições API"""
-        level = LogLevel.ERROR if status_code >= 500 else (LogLevel.WARNING if status_code >= 400 else LogLevel.INFO)
-        message = f"{method} {endpoint} - {status_code}"
-        
-        if error:
-            return await self.log_error(
-                LogCategory.API,
-                message,
-                exception=error,
-                user_id=user_id,
-                endpoint=endpoint,
-                method=method,
-                status_code=status_code,
-                execution_time_ms=execution_time_ms,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_id=request_id,
-            )
-        
-        return await self.log(
-            level,
-            LogCategory.API,
-            message,
-            user_id=user_id,
-            endpoint=endpoint,
+        log = self.build_api_request_log(
             method=method,
+            endpoint=endpoint,
+            user_id=user_id,
             status_code=status_code,
             execution_time_ms=execution_time_ms,
             ip_address=ip_address,
             user_agent=user_agent,
             request_id=request_id,
+            error=error,
         )
+        return await self.log_repository.create(log)
 
     async def log_transaction(
         self,
@@ -0,0 +1,137 @@
+"""
+Renderização de relatórios em PDF (ReportLab)
+
+Roda em processos separados (ProcessPoolExecutor): recebe apenas dados simples
+(dict/list/str/float) e não importa configurações, banco ou cache.
+"""
+from io import BytesIO
+from typing import Dict, List
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.enums import TA_CENTER
+
+SUMMARY_TABLE_STYLE = [
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#3498db")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 12),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+]
+
+TRANSACTIONS_TABLE_STYLE = [
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#34495e")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("ALIGN", (3, 0), (3, -1), "RIGHT"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 10),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+    ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+]
+
+
+def _month_story(month: Dict, styles) -> List:
+    """Resumo financeiro e transações de um mês"""
+    story = []
+    story.append(Paragraph("Resumo Financeiro", styles["Heading2"]))
+    story.append(Spacer(1, 0.1 * inch))
+
+    balance = month["income"] - month["expense"]
+    summary_data = [
+        ["Receitas", f"R$ {month['income']:,.2f}"],
+        ["Despesas", f"R$ {month['expense']:,.2f}"],
+        ["Saldo", f"R$ {balance:,.2f}"],
+    ]
+    summary_table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
+    summary_table.setStyle(TableStyle(SUMMARY_TABLE_STYLE))
+    story.append(summary_table)
+    story.append(Spacer(1, 0.3 * inch))
+
+    story.append(Paragraph("Transações", styles["Heading2"]))
+    story.append(Spacer(1, 0.1 * inch))
+
+    if month["transactions"]:
+        trans_data = [["Data", "Descrição", "Tipo", "Valor", "Categoria"]] + month["transactions"]
+        trans_table = Table(trans_data, colWidths=[1 * inch, 2.5 * inch, 1 * inch, 1 * inch, 1.5 * inch])
+        trans_table.setStyle(TableStyle(TRANSACTIONS_TABLE_STYLE))
+        story.append(trans_table)
+    else:
+        story.append(Paragraph("Nenhuma transação neste período.", styles["Normal"]))
+    return story
+
+
+def render_report_pdf(payload: Dict) -> bytes:
+    """
+    Gera o PDF de um relatório
+
+    Args:
+        payload: {"title", "generated_at", "months": [{"label", "income",
+            "expense", "transactions": [[data, descrição, tipo, valor, categoria]]}]}
+
+    Returns:
+        Conteúdo do PDF
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    styles = getSampleStyleSheet()
+
+    # Título
+    title_style = ParagraphStyle(
+        "CustomTitle",
+        parent=styles["Heading1"],
+        fontSize=24,
+        textColor=colors.HexColor("#2c3e50"),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+    )
+    story.append(Paragraph(payload["title"], title_style))
+    story.append(Spacer(1, 0.2 * inch))
+
+    months = payload["months"]
+    if len(months) == 1:
+        story.extend(_month_story(months[0], styles))
+    else:
+        # Vários meses: resumo do período e depois uma página por mês
+        story.append(Paragraph("Resumo do Período", styles["Heading2"]))
+        story.append(Spacer(1, 0.1 * inch))
+        period_data = [["Mês", "Receitas", "Despesas", "Saldo"]]
+        for month in months:
+            period_data.append([
+                month["label"],
+                f"R$ {month['income']:,.2f}",
+                f"R$ {month['expense']:,.2f}",
+                f"R$ {month['income'] - month['expense']:,.2f}",
+            ])
+        total_income = sum(month["income"] for month in months)
+        total_expense = sum(month["expense"] for month in months)
+        period_data.append([
+            "Total",
+            f"R$ {total_income:,.2f}",
+            f"R$ {total_expense:,.2f}",
+            f"R$ {total_income - total_expense:,.2f}",
+        ])
+        period_table = Table(period_data, colWidths=[1.5 * inch, 1.75 * inch, 1.75 * inch, 1.75 * inch], repeatRows=1)
+        period_table.setStyle(TableStyle(SUMMARY_TABLE_STYLE + [("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold")]))
+        story.append(period_table)
+
+        for month in months:
+            story.append(PageBreak())
+            story.append(Paragraph(month["label"], styles["Heading1"]))
+            story.extend(_month_story(month, styles))
+
+    # Rodapé
+    story.append(Spacer(1, 0.3 * inch))
+    story.append(Paragraph(f"Gerado em {payload['generated_at']} - FormuladoBolso", styles["Normal"]))
+
+    doc.build(story)
+    return buffer.getvalue()
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, Any
 import re
 import json
+import time
 
 try:
     from PIL import Image
@@ -17,6 +18,15 @@ except ImportError:
 
 from src.infrastructure.database.models.receipt import Receipt
 
+# Largura ideal para o Tesseract: ~300 DPI em uma bobina de 80 mm
+OCR_TARGET_WIDTH = 1000
+# Lado da miniatura usada para localizar a nota na foto
+OCR_THUMBNAIL_SIZE = 512
+# Ruído estimado (desvio padrão) a partir do qual aplicar o denoise
+OCR_NOISE_THRESHOLD = 2.5
+# Variação da iluminação do fundo a partir da qual usar threshold adaptativo
+OCR_LIGHTING_THRESHOLD = 10.0
+
 
 class ReceiptOCRService:
     """Serviço avançado de OCR para notas fiscais"""
@@ -24,8 +34,19 @@ class ReceiptOCRService:
     def __init__(self):
         pass
 
-    async def process_image(self, image_path: str) -> Dict[str, Any]:
-        """Processa imagem da nota fiscal e extrai dados"""
+    async def process_image(self, image_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Processa imagem da nota fiscal e extrai dados
+
+        O OCR roda no pool de processos da fila de OCR (fora do event loop);
+        com `content_hash` (sha256 do arquivo) o resultado de uma imagem já
+        processada vem do cache.
+        """
+        from src.application.tasks.receipt_ocr_queue import receipt_ocr_queue
+        return await receipt_ocr_queue.run(image_path, content_hash)
+
+    def extract_from_file(self, image_path: str) -> Dict[str, Any]:
+        """Carrega a imagem, aplica o pré-processamento e o OCR (CPU, síncrono)"""
         if not OCR_AVAILABLE:
             return {"error": "OCR não disponível. Instale: pip install pytesseract opencv-python"}
         
@@ -48,20 +69,138 @@ class ReceiptOCRService:
         except Exception as e:
             return {"error": f"Erro no processamento: {str(e)}"}
 
-    def _preprocess_image(self, image):
-        """Pré-processa imagem para melhorar OCR"""
+    def _preprocess_image(self, image, timings: Optional[Dict[str, float]] = None):
+        """
+        Pré-processa imagem para melhorar OCR
+
+        1. Recorta a nota (detectada em miniatura) e redimensiona para ~300 DPI
+        2. Recorta a área com texto (descarta margens e fundo)
+        3. Mede ruído e iluminação (barato) e só aplica o denoise e o
+           threshold adaptativo quando necessários
+
+        Args:
+            timings: se informado, recebe os milissegundos de cada etapa
+        """
         if not OCR_AVAILABLE:
             return image
+        stages = timings if timings is not None else {}
+        started = time.perf_counter()
+
+        def mark(stage: str):
+            nonlocal started
+            now = time.perf_counter()
+            stages[stage] = round((now - started) * 1000, 2)
+            started = now
+
         # Converter para escala de cinza
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Aplicar threshold
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Reduzir ruído
-        denoised = cv2.fastNlMeansDenoising(thresh, None, 10, 7, 21)
-        
-        return denoised
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        mark("grayscale")
+
+        gray = self._crop_receipt(gray)
+        mark("receipt_roi")
+
+        gray = self._resize_for_ocr(gray)
+        mark("resize")
+
+        gray = self._crop_text_blocks(gray)
+        mark("text_roi")
+
+        noise, lighting = self._quality_score(gray)
+        stages["noise_sigma"] = round(noise, 2)
+        stages["lighting_std"] = round(lighting, 2)
+        mark("quality")
+
+        # Reduzir ruído (a etapa mais cara): só em imagens ruidosas
+        if noise > OCR_NOISE_THRESHOLD:
+            gray = cv2.fastNlMeansDenoising(gray, None, max(7.0, noise), 7, 21)
+        mark("denoise")
+
+        # Aplicar threshold (adaptativo com iluminação irregular, ex.: sombra)
+        if lighting > OCR_LIGHTING_THRESHOLD:
+            binary = cv2.adaptiveThreshold(
+                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15
+            )
+        else:
+            _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        mark("threshold")
+
+        return binary
+
+    @staticmethod
+    def _crop_receipt(gray):
+        """Recorta o papel da nota (maior região clara), detectado em uma miniatura"""
+        height, width = gray.shape
+        scale = OCR_THUMBNAIL_SIZE / max(height, width)
+        if scale >= 1:
+            return gray
+        thumb = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        thumb = cv2.GaussianBlur(thumb, (5, 5), 0)
+        _, mask = cv2.threshold(thumb, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((9, 9), np.uint8))
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return gray
+
+        x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+        area_ratio = (w * h) / (thumb.shape[0] * thumb.shape[1])
+        # Região pequena demais (não é a nota) ou a foto inteira (já recortada)
+        if area_ratio < 0.15 or area_ratio > 0.95:
+            return gray
+        x0, y0 = int(x / scale), int(y / scale)
+        x1, y1 = int((x + w) / scale), int((y + h) / scale)
+        return gray[y0:y1, x0:x1]
+
+    @staticmethod
+    def _resize_for_ocr(gray):
+        """Reduz (ou amplia imagens muito pequenas) para a largura ideal do OCR"""
+        width = gray.shape[1]
+        if width > OCR_TARGET_WIDTH * 1.2:
+            scale = OCR_TARGET_WIDTH / width
+            return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        if width < OCR_TARGET_WIDTH * 0.6:
+            scale = OCR_TARGET_WIDTH / width
+            return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        return gray
+
+    @staticmethod
+    def _crop_text_blocks(gray):
+        """Recorta o retângulo que contém os blocos de texto"""
+        gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+        _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        # Unir as letras de cada linha em blocos
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (25, 5)))
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        boxes = [cv2.boundingRect(c) for c in contours]
+        # Blocos com cara de linha de texto (ignora pontos de ruído e bordas)
+        boxes = [(x, y, w, h) for x, y, w, h in boxes if w >= 20 and 8 <= h <= gray.shape[0] * 0.5]
+        if not boxes:
+            return gray
+
+        height, width = gray.shape
+        margin = 10
+        x0 = max(0, min(x for x, _, _, _ in boxes) - margin)
+        y0 = max(0, min(y for _, y, _, _ in boxes) - margin)
+        x1 = min(width, max(x + w for x, _, w, _ in boxes) + margin)
+        y1 = min(height, max(y + h for _, y, _, h in boxes) + margin)
+        return gray[y0:y1, x0:x1]
+
+    @staticmethod
+    def _quality_score(gray) -> tuple:
+        """
+        Estimativas baratas de qualidade: (desvio padrão do ruído, variação da iluminação)
+
+        O ruído vem da mediana da resposta a um filtro laplaciano (as bordas do
+        texto são minoria e não afetam a mediana); a iluminação, do desvio
+        padrão do fundo em uma miniatura sem o texto.
+        """
+        kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], np.float32)
+        response = np.abs(cv2.filter2D(gray.astype(np.float32), -1, kernel))
+        noise = float(np.median(response)) / 0.6745 / 6
+
+        thumb = cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA)
+        background = cv2.morphologyEx(thumb, cv2.MORPH_CLOSE, np.ones((7, 7), np.uint8))
+        lighting = float(np.std(background))
+        return noise, lighting
 
     def _extract_data_from_text(self, text: str) -> Dict[str, Any]:
         """Extrai dados estruturados do texto OCR"""
@@ -161,3 +300,8 @@ class ReceiptOCRService:
 
         return data
 
+
+
+def extract_receipt_data(image_path: str) -> Dict[str, Any]:
+    """Ponto de entrada dos processos de OCR (função de módulo, serializável)"""
+    return ReceiptOCRService().extract_from_file(image_path)
@@ -0,0 +1,115 @@
+"""
+Renderização de PDFs em um pool de processos e jobs assíncronos de relatório
+"""
+import base64
+import logging
+import time
+from typing import Dict, Optional
+from uuid import UUID
+from src.shared.config import settings
+from src.infrastructure.cache.redis_client import redis_client
+from src.application.services.pdf_renderer import render_report_pdf
+from src.application.tasks.process_jobs import JobStore, ProcessPool
+
+
+class ReportRenderService:
+    """Gera PDFs fora do event loop.
+
+    O layout do ReportLab é CPU puro: roda em um ProcessPoolExecutor (processos
+    `spawn`, sem herdar o loop nem conexões), recebendo só o payload com os
+    dados já consultados. Relatórios longos (vários meses/anos) viram jobs:
+    o estado e o PDF ficam no Redis por `job_ttl` segundos, então qualquer
+    réplica responde a consulta e o download.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.REPORT_RENDER_WORKERS,
+        job_ttl: int = settings.REPORT_JOB_TTL_SECONDS,
+    ):
+        self.job_ttl = job_ttl
+        self.pool = ProcessPool(workers)
+        self.jobs = JobStore("report", job_ttl)
+        self.renders = 0
+        self.render_seconds = 0.0
+        self.jobs_submitted = 0
+        self.jobs_failed = 0
+
+    async def render(self, payload: Dict) -> bytes:
+        """Renderiza o PDF em um processo do pool"""
+        started = time.monotonic()
+        pdf = await self.pool.run(render_report_pdf, payload)
+        self.renders += 1
+        self.render_seconds += time.monotonic() - started
+        return pdf
+
+    async def submit_job(
+        self, user_id: UUID, start_year: int, start_month: int, end_year: int, end_month: int
+    ) -> Dict:
+        """Agenda a geração de um relatório de período; retorna o estado do job"""
+        job = await self.jobs.create(
+            user_id, period=f"{start_month:02d}/{start_year} - {end_month:02d}/{end_year}"
+        )
+        self.jobs_submitted += 1
+        self.jobs.start(self._run_job(job, user_id, start_year, start_month, end_year, end_month))
+        return job
+
+    async def get_job(self, job_id: str, user_id: UUID) -> Optional[Dict]:
+        """Estado do job (None se não existe, expirou ou é de outro usuário)"""
+        return await self.jobs.get(job_id, user_id)
+
+    async def get_job_pdf(self, job_id: str) -> Optional[bytes]:
+        """PDF de um job concluído"""
+        content = await redis_client.get(f"{self.jobs.key(job_id)}:pdf")
+        return base64.b64decode(content) if content else None
+
+    async def _run_job(
+        self, job: Dict, user_id: UUID, start_year: int, start_month: int, end_year: int, end_month: int
+    ):
+        from src.infrastructure.database.base import AsyncSessionLocal
+        from src.application.services.report_service import ReportService
+        from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+        from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
+        from src.infrastructure.repositories.goal_repository import SQLAlchemyGoalRepository
+        from src.infrastructure.repositories.planning_repository import SQLAlchemyPlanningRepository
+
+        key = self.jobs.key(job["job_id"])
+        try:
+            await self.jobs.mark_running(job)
+            async with AsyncSessionLocal() as session:
+                report_service = ReportService(
+                    SQLAlchemyTransactionRepository(session),
+                    SQLAlchemyAccountRepository(session),
+                    SQLAlchemyGoalRepository(session),
+                    SQLAlchemyPlanningRepository(session),
+                )
+                payload = await report_service.build_report_payload(
+                    user_id, start_year, start_month, end_year, end_month
+                )
+            pdf = await self.render(payload)
+            await redis_client.set(f"{key}:pdf", base64.b64encode(pdf).decode(), expire=self.job_ttl)
+            job = {**job, "status": "done", "size": len(pdf)}
+        except Exception as e:
+            self.jobs_failed += 1
+            logging.error(f"Erro ao gerar relatório {job['job_id']}: {e}")
+            job = {**job, "status": "failed", "error": str(e)}
+        await self.jobs.finish(job)
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de renderização e jobs"""
+        return {
+            "renders": self.renders,
+            "avg_render_ms": round(self.render_seconds / self.renders * 1000, 1) if self.renders else 0.0,
+            "jobs_running": self.jobs.running,
+            "jobs_submitted": self.jobs_submitted,
+            "jobs_failed": self.jobs_failed,
+        }
+
+    async def shutdown(self):
+        """Cancela jobs em andamento e encerra os processos do pool"""
+        await self.jobs.shutdown()
+        self.pool.shutdown()
+
+
+# Instância global
+report_render_service = ReportRenderService()
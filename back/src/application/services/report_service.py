@@ -1,23 +1,27 @@
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 from decimal import Decimal
+import asyncio
+import csv
+import io
+import os
+import tempfile
 from io import BytesIO
-import pandas as pd
+from openpyxl import Workbook
 import pytz
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.goal_repository import GoalRepository
 from src.domain.repositories.planning_repository import PlanningRepository
 from src.domain.repositories.bill_repository import BillRepository
+from src.infrastructure.cache.cache_service import cached, cache_service
+from src.shared.config import settings
 from collections import defaultdict
 
+EXPORT_COLUMNS = ["Data", "Descrição", "Tipo", "Valor", "Status", "Categoria", "Conta"]
+EXPORT_FILE_BLOCK_SIZE = 64 * 1024
+
 
 class ReportService:
     """Serviço para geração de relatórios"""
@@ -39,153 +43,160 @@ class ReportService:
     async def generate_monthly_report_pdf(
         self, user_id: UUID, year: int, month: int
     ) -> BytesIO:
-        """Gera relatório mensal em PDF"""
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        story = []
-        styles = getSampleStyleSheet()
+        """
+        Gera relatório mensal em PDF
 
-        # Título
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            textColor=colors.HexColor("#2c3e50"),
-            spaceAfter=30,
-            alignment=TA_CENTER,
+        A renderização roda no pool de processos; o PDF fica em cache até a
+        próxima alteração nas transações do usuário.
+        """
+        pdf = await cache_service.get_or_set_bytes(
+            "report:monthly_pdf",
+            user_id,
+            ("transactions",),
+            {"year": year, "month": month},
+            lambda: self._render_report_pdf(user_id, year, month, year, month),
+            ttl=settings.REPORT_PDF_CACHE_TTL_SECONDS,
         )
-        story.append(Paragraph(f"Relatório Mensal - {month:02d}/{year}", title_style))
-        story.append(Spacer(1, 0.2 * inch))
-
-        # Período
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(seconds=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(seconds=1)
+        return BytesIO(pdf)
 
-        # Obter dados
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
-        accounts = await self.account_repository.get_by_user_id(user_id)
+    async def _render_report_pdf(
+        self, user_id: UUID, start_year: int, start_month: int, end_year: int, end_month: int
+    ) -> bytes:
+        from src.application.services.report_render_service import report_render_service
 
-        # Resumo Financeiro
-        story.append(Paragraph("Resumo Financeiro", styles["Heading2"]))
-        story.append(Spacer(1, 0.1 * inch))
+        payload = await self.build_report_payload(user_id, start_year, start_month, end_year, end_month)
+        return await report_render_service.render(payload)
 
-        total_income = sum(
-            float(t.amount) for t in transactions if t.transaction_type.value == "income"
-        )
-        total_expense = sum(
-            float(t.amount) for t in transactions if t.transaction_type.value == "expense"
-        )
-        balance = total_income - total_expense
+    async def build_report_payload(
+        self, user_id: UUID, start_year: int, start_month: int, end_year: int, end_month: int
+    ) -> Dict:
+        """
+        Dados do relatório em PDF (apenas tipos simples, para o processo de renderização)
 
-        summary_data = [
-            ["Receitas", f"R$ {total_income:,.2f}"],
-            ["Despesas", f"R$ {total_expense:,.2f}"],
-            ["Saldo", f"R$ {balance:,.2f}"],
-        ]
+        Um mês gera o relatório mensal; um período gera o resumo por mês e
+        uma seção para cada mês.
+        """
+        months = []
+        for year, month in self._iter_months(datetime(start_year, start_month, 1), datetime(end_year, end_month, 1)):
+            # Período
+            start_date = datetime(year, month, 1)
+            if month == 12:
+                end_date = datetime(year + 1, 1, 1) - timedelta(seconds=1)
+            else:
+                end_date = datetime(year, month + 1, 1) - timedelta(seconds=1)
 
-        summary_table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
-        summary_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#3498db")),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
+            # Obter dados
+            transactions = await self.transaction_repository.get_by_user_id(
+                user_id, start_date, end_date
+            )
+            months.append(
+                {
+                    "label": f"{month:02d}/{year}",
+                    "income": sum(
+                        float(t.amount) for t in transactions if t.transaction_type.value == "income"
+                    ),
+                    "expense": sum(
+                        float(t.amount) for t in transactions if t.transaction_type.value == "expense"
+                    ),
+                    # Limitar a 50 para não ficar muito longo
+                    "transactions": [
+                        [
+                            t.transaction_date.strftime("%d/%m/%Y"),
+                            t.description[:30],
+                            t.transaction_type.value,
+                            f"R$ {float(t.amount):,.2f}",
+                            t.category.name if t.category else "-",
+                        ]
+                        for t in transactions[:50]
+                    ],
+                }
             )
-        )
-        story.append(summary_table)
-        story.append(Spacer(1, 0.3 * inch))
 
-        # Transações
-        story.append(Paragraph("Transações", styles["Heading2"]))
-        story.append(Spacer(1, 0.1 * inch))
+        if len(months) == 1:
+            title = f"Relatório Mensal - {start_month:02d}/{start_year}"
+        else:
+            title = f"Relatório do Período - {start_month:02d}/{start_year} a {end_month:02d}/{end_year}"
+        return {
+            "title": title,
+            "generated_at": datetime.now().strftime("%d/%m/%Y %H:%M"),
+            "months": months,
+        }
 
-        if transactions:
-            trans_data = [["Data", "Descrição", "Tipo", "Valor", "Categoria"]]
-            for t in transactions[:50]:  # Limitar a 50 para não ficar muito longo
-                trans_data.append(
-                    [
-                        t.transaction_date.strftime("%d/%m/%Y"),
-                        t.description[:30],
-                        t.transaction_type.value,
-                        f"R$ {float(t.amount):,.2f}",
-                        t.category.name if t.category else "-",
-                    ]
-                )
+    @staticmethod
+    def _export_row(row: tuple) -> list:
+        """Linha da exportação: Data, Descrição, Tipo, Valor, Status, Categoria, Conta"""
+        transaction_date, description, transaction_type, amount, status, category_name, account_name = row
+        return [
+            transaction_date.strftime("%d/%m/%Y %H:%M"),
+            description,
+            transaction_type.value,
+            float(amount),
+            status.value,
+            category_name or "",
+            account_name or "",
+        ]
 
-            trans_table = Table(trans_data, colWidths=[1 * inch, 2.5 * inch, 1 * inch, 1 * inch, 1.5 * inch])
-            trans_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#34495e")),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("ALIGN", (3, 0), (3, -1), "RIGHT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 10),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
-                        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                    ]
-                )
-            )
-            story.append(trans_table)
-        else:
-            story.append(Paragraph("Nenhuma transação neste período.", styles["Normal"]))
+    async def stream_transactions_excel(
+        self, user_id: UUID, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Gera relatório de transações em Excel, em partes
 
-        # Rodapé
-        story.append(Spacer(1, 0.3 * inch))
-        story.append(
-            Paragraph(
-                f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')} - FormuladoBolso",
-                styles["Normal"],
-            )
-        )
+        As linhas vêm do banco em lotes e vão para uma planilha write-only do
+        openpyxl (que mantém as linhas em arquivo temporário, não em memória).
+        O .xlsx é um zip, então só pode ser enviado depois de fechado: ele é
+        salvo em disco e transmitido em blocos.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Transações")
+        sheet.append(EXPORT_COLUMNS)
+
+        def append_rows(rows):
+            for row in rows:
+                sheet.append(self._export_row(row))
 
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
+        output = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+        output.close()
+        try:
+            async for rows in self.transaction_repository.stream_export_rows(
+                user_id, start_date, end_date, chunk_size=settings.EXPORT_CHUNK_SIZE
+            ):
+                # Serialização (CPU) fora do event loop
+                await asyncio.to_thread(append_rows, rows)
+            await asyncio.to_thread(workbook.save, output.name)
 
-    async def generate_transactions_excel(
+            with open(output.name, "rb") as file:
+                while True:
+                    chunk = await asyncio.to_thread(file.read, EXPORT_FILE_BLOCK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.unlink(output.name)
+
+    async def stream_transactions_csv(
         self, user_id: UUID, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
-    ) -> BytesIO:
-        """Gera relatório de transações em Excel"""
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
+    ) -> AsyncIterator[bytes]:
+        """
+        Gera relatório de transações em CSV, enviado à medida que as linhas chegam do banco
 
-        data = []
-        for t in transactions:
-            data.append(
-                {
-                    "Data": t.transaction_date.strftime("%d/%m/%Y %H:%M"),
-                    "Descrição": t.description,
-                    "Tipo": t.transaction_type.value,
-                    "Valor": float(t.amount),
-                    "Status": t.status.value,
-                    "Categoria": t.category.name if t.category else "",
-                    "Conta": t.account.name if t.account else "",
-                }
-            )
+        Separador ";" e vírgula decimal (padrão do Excel em português), com BOM UTF-8.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";")
+        writer.writerow(EXPORT_COLUMNS)
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
 
-        df = pd.DataFrame(data)
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Transações")
-        buffer.seek(0)
-        return buffer
+        async for rows in self.transaction_repository.stream_export_rows(
+            user_id, start_date, end_date, chunk_size=settings.EXPORT_CHUNK_SIZE
+        ):
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                values = self._export_row(row)
+                values[3] = f"{values[3]:.2f}".replace(".", ",")
+                writer.writerow(values)
+            yield buffer.getvalue().encode("utf-8")
 
     async def generate_summary_data_for_family(
         self, family_id: UUID, start_date: datetime, end_date: datetime, db_session=None
@@ -404,34 +415,185 @@ class ReportService:
             "recent_transactions": recent_transactions_data,
         }
 
+    async def generate_summary_data_for_user_families(
+        self, user_id: UUID, start_date: datetime, end_date: datetime, db_session
+    ) -> List[Dict]:
+        """
+        Gera os resumos de todas as famílias em que o usuário pode ver o dashboard.
+
+        Membros, permissões e agregados são resolvidos em duas queries (totais por
+        família e transações recentes por família), independente do número de famílias.
+        Cada item tem o mesmo formato de generate_summary_data_for_family.
+        """
+        from sqlalchemy import select, func, and_, union
+        from src.infrastructure.database.models.user import FamilyMember
+        from src.infrastructure.database.models.account import Account
+        from src.infrastructure.database.models.category import Category
+        from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
+        from src.infrastructure.database.models.family_permission import FamilyMemberPermission, ModulePermission
+
+        # Famílias do usuário com permissão de visualizar o dashboard
+        visible_families = (
+            select(FamilyMember.family_id)
+            .join(
+                FamilyMemberPermission,
+                and_(
+                    FamilyMemberPermission.family_member_id == FamilyMember.id,
+                    FamilyMemberPermission.module == ModulePermission.DASHBOARD,
+                    FamilyMemberPermission.can_view == True,
+                ),
+            )
+            .where(FamilyMember.user_id == user_id)
+            .distinct()
+            .cte("visible_families")
+        )
+        visible_family_ids = select(visible_families.c.family_id)
+
+        # Contas de cada família: contas com family_id + contas ativas de todos os membros
+        family_accounts = union(
+            select(
+                Account.family_id.label("family_id"),
+                Account.id.label("account_id"),
+                Account.balance.label("balance"),
+            ).where(
+                Account.family_id.in_(visible_family_ids),
+                Account.is_active == True,
+            ),
+            select(
+                FamilyMember.family_id.label("family_id"),
+                Account.id.label("account_id"),
+                Account.balance.label("balance"),
+            )
+            .join(Account, and_(Account.owner_id == FamilyMember.user_id, Account.is_active == True))
+            .where(FamilyMember.family_id.in_(visible_family_ids)),
+        ).cte("family_accounts")
+
+        balances = (
+            select(
+                family_accounts.c.family_id,
+                func.sum(family_accounts.c.balance).label("total_balance"),
+            )
+            .group_by(family_accounts.c.family_id)
+            .subquery("balances")
+        )
+
+        is_completed = Transaction.status == TransactionStatus.COMPLETED
+        flows = (
+            select(
+                family_accounts.c.family_id,
+                func.sum(Transaction.amount)
+                .filter(and_(is_completed, Transaction.transaction_type == TransactionType.INCOME))
+                .label("income"),
+                func.sum(Transaction.amount)
+                .filter(and_(is_completed, Transaction.transaction_type == TransactionType.EXPENSE))
+                .label("expenses"),
+            )
+            .select_from(family_accounts)
+            .join(Transaction, Transaction.account_id == family_accounts.c.account_id)
+            .where(
+                Transaction.transaction_date >= start_date,
+                Transaction.transaction_date <= end_date,
+            )
+            .group_by(family_accounts.c.family_id)
+            .subquery("flows")
+        )
+
+        totals_result = await db_session.execute(
+            select(
+                visible_families.c.family_id,
+                func.coalesce(balances.c.total_balance, 0),
+                func.coalesce(flows.c.income, 0),
+                func.coalesce(flows.c.expenses, 0),
+            )
+            .outerjoin(balances, balances.c.family_id == visible_families.c.family_id)
+            .outerjoin(flows, flows.c.family_id == visible_families.c.family_id)
+            .order_by(visible_families.c.family_id)
+        )
+
+        summaries = {}
+        for family_id, total_balance, income, expenses in totals_result.all():
+            summaries[family_id] = {
+                "family_id": str(family_id),
+                "total_balance": float(total_balance),
+                "monthly_income": float(income),
+                "monthly_expenses": float(expenses),
+                "monthly_savings": float(income) - float(expenses),
+                "recent_transactions": [],
+            }
+
+        if not summaries:
+            return []
+
+        # Transações recentes (últimas 10 concluídas dos últimos 90 dias) por família
+        recent_start_date = end_date - timedelta(days=90)
+        ranked = (
+            select(
+                family_accounts.c.family_id,
+                Transaction.id,
+                Transaction.description,
+                Transaction.amount,
+                Transaction.transaction_type,
+                Transaction.transaction_date,
+                Account.name.label("account_name"),
+                Category.name.label("category_name"),
+                func.row_number()
+                .over(
+                    partition_by=family_accounts.c.family_id,
+                    order_by=Transaction.transaction_date.desc(),
+                )
+                .label("position"),
+            )
+            .select_from(family_accounts)
+            .join(Transaction, Transaction.account_id == family_accounts.c.account_id)
+            .join(Account, Account.id == Transaction.account_id)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(
+                is_completed,
+                Transaction.transaction_date >= recent_start_date,
+                Transaction.transaction_date <= end_date,
+            )
+            .subquery("ranked")
+        )
+        recent_result = await db_session.execute(
+            select(ranked)
+            .where(ranked.c.position <= 10)
+            .order_by(ranked.c.family_id, ranked.c.position)
+        )
+
+        for row in recent_result.all():
+            trans_type = row.transaction_type
+            summaries[row.family_id]["recent_transactions"].append({
+                "id": str(row.id),
+                "description": row.description,
+                "amount": float(row.amount),
+                "transaction_type": str(trans_type.value) if hasattr(trans_type, 'value') else str(trans_type),
+                "transaction_date": row.transaction_date.isoformat(),
+                "account_name": row.account_name,
+                "category_name": row.category_name,
+            })
+
+        return list(summaries.values())
+
+    @cached("report:summary", ("transactions", "accounts", "bills", "goals"))
     async def generate_summary_data(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Gera dados resumidos para dashboard"""
-        # Buscar transações do período
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
+        # Totais do período agregados no banco (por tipo e status)
+        type_status_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("type", "status"), status=None
         )
+        transactions_count = sum(row["count"] for row in type_status_rows)
         
         # Buscar todas as contas
         accounts = await self.account_repository.get_by_user_id(user_id)
         
-        # Calcular totais do mês (acessar enums de forma segura)
-        monthly_income = 0.0
-        monthly_expenses = 0.0
-        for t in transactions:
-            try:
-                trans_type = str(t.transaction_type.value) if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                trans_status = str(t.status.value) if hasattr(t.status, 'value') else str(t.status)
-                if trans_status == "completed":
-                    amount = float(t.amount)
-                    if trans_type == "income":
-                        monthly_income += amount
-                    elif trans_type == "expense":
-                        monthly_expenses += amount
-            except Exception as e:
-                print(f"Erro ao processar transação {t.id}: {e}")
-                continue
+        # Calcular totais do mês (apenas transações concluídas)
+        income, expenses = self._type_totals(
+            [row for row in type_status_rows if row["status"] == "completed"]
+        )
+        monthly_income = float(income)
+        monthly_expenses = float(expenses)
         monthly_savings = monthly_income - monthly_expenses
         
         # Saldo total de todas as contas
@@ -573,37 +735,127 @@ class ReportService:
             "monthly_expenses": monthly_expenses,
             "monthly_savings": monthly_savings,
             "accounts_count": len([a for a in accounts if a.is_active]),
-            "transactions_count": len(transactions),
+            "transactions_count": transactions_count,
             "recent_transactions": recent_transactions_data,
             "upcoming_bills": upcoming_bills_data,
             "goals_progress": goals_progress_data,
         }
 
+    # ========== AGREGAÇÕES ==========
+
+    @staticmethod
+    def _month_start(value: datetime) -> datetime:
+        """Primeiro instante (UTC) do mês de uma data"""
+        return datetime(value.year, value.month, 1, tzinfo=pytz.UTC)
+
+    @staticmethod
+    def _month_end(value: datetime) -> datetime:
+        """Último instante (UTC) do mês de uma data"""
+        if value.month == 12:
+            return datetime(value.year + 1, 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
+        return datetime(value.year, value.month + 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
+
+    @staticmethod
+    def _iter_months(start_date: datetime, end_date: datetime):
+        """Itera (ano, mês) do mês de start_date até o mês de end_date"""
+        year, month = start_date.year, start_date.month
+        while (year, month) <= (end_date.year, end_date.month):
+            yield year, month
+            if month == 12:
+                year, month = year + 1, 1
+            else:
+                month += 1
+
+    @staticmethod
+    def _type_totals(rows: List[Dict]) -> tuple:
+        """Soma receitas e despesas de linhas agregadas por tipo"""
+        income = Decimal("0")
+        expense = Decimal("0")
+        for row in rows:
+            if row["type"] == "income":
+                income += row["total"]
+            elif row["type"] == "expense":
+                expense += row["total"]
+        return income, expense
+
+    async def _monthly_totals(
+        self, user_id: UUID, start_date: datetime, end_date: datetime
+    ) -> Dict[tuple, Dict]:
+        """Receitas, despesas e contagem de transações concluídas por (ano, mês)"""
+        rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("month", "type")
+        )
+        monthly = defaultdict(lambda: {"income": Decimal("0"), "expense": Decimal("0"), "count": 0})
+        for row in rows:
+            key = (row["month"].year, row["month"].month)
+            if row["type"] in ("income", "expense"):
+                monthly[key][row["type"]] += row["total"]
+            monthly[key]["count"] += row["count"]
+        return monthly
+
+    async def _type_breakdown(
+        self, user_id: UUID, start_date: datetime, end_date: datetime, transaction_type: str
+    ) -> Dict:
+        """Total, contagem, distribuição por categoria/conta e evolução mensal de um tipo"""
+        by_category_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("category",), transaction_type=transaction_type
+        )
+        by_account_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("account",), transaction_type=transaction_type
+        )
+        monthly_rows = await self.transaction_repository.aggregate(
+            user_id, self._month_start(start_date), end_date,
+            group_by=("month",), transaction_type=transaction_type,
+        )
+
+        by_category = defaultdict(Decimal)
+        for row in by_category_rows:
+            category_name = row["category_name"] or 'Sem categoria'
+            if category_name != 'Sem categoria':
+                by_category[category_name] += row["total"]
+
+        by_account = defaultdict(Decimal)
+        for row in by_account_rows:
+            account_name = row["account_name"] or 'Sem conta'
+            if account_name != 'Sem conta':
+                by_account[account_name] += row["total"]
+
+        monthly_totals = {(row["month"].year, row["month"].month): row["total"] for row in monthly_rows}
+        monthly_evolution = [
+            {
+                "month": f"{month:02d}/{year}",
+                "amount": float(monthly_totals.get((year, month), Decimal("0"))),
+            }
+            for year, month in self._iter_months(start_date, end_date)
+        ]
+
+        return {
+            "total": sum((row["total"] for row in by_category_rows), Decimal("0")),
+            "count": sum(row["count"] for row in by_category_rows),
+            "by_category": by_category,
+            "by_account": by_account,
+            "monthly_evolution": monthly_evolution,
+        }
+
     # ========== FASE 1 - MVP ==========
 
+    @cached("report:executive", ("transactions", "accounts"))
     async def get_executive_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório Executivo - Dashboard com KPIs"""
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
+        type_status_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("type", "status"), status=None
         )
         accounts = await self.account_repository.get_by_user_id(user_id)
         
-        # Calcular totais
-        total_income = Decimal("0")
-        total_expense = Decimal("0")
+        # Calcular totais (apenas transações concluídas)
+        completed_rows = [row for row in type_status_rows if row["status"] == "completed"]
+        total_income, total_expense = self._type_totals(completed_rows)
         transactions_by_type = defaultdict(int)
-        
-        for t in transactions:
-            if hasattr(t.status, 'value') and t.status.value == "completed":
-                amount = Decimal(str(t.amount))
-                trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                if trans_type == "income":
-                    total_income += amount
-                elif trans_type == "expense":
-                    total_expense += amount
-                transactions_by_type[trans_type] += 1
+        for row in completed_rows:
+            transactions_by_type[row["type"]] += row["count"]
+        transactions_count = sum(row["count"] for row in type_status_rows)
         
         balance = total_income - total_expense
         savings_rate = (balance / total_income * 100) if total_income > 0 else Decimal("0")
@@ -611,34 +863,19 @@ class ReportService:
         # Saldo total
         total_balance = sum(Decimal(str(a.balance)) for a in accounts if a.is_active)
         
-        # Evolução de saldo (últimos 6 meses)
+        # Evolução de saldo (últimos 6 meses) em uma única agregação mensal
+        evolution_dates = [end_date - timedelta(days=30 * (5 - i)) for i in range(6)]
+        monthly_totals = await self._monthly_totals(
+            user_id, self._month_start(evolution_dates[0]), self._month_end(evolution_dates[-1])
+        )
         balance_evolution = []
-        for i in range(6):
-            month_date = end_date - timedelta(days=30 * (5 - i))
-            month_start = datetime(month_date.year, month_date.month, 1, tzinfo=pytz.UTC)
-            if month_date.month == 12:
-                month_end = datetime(month_date.year + 1, 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            else:
-                month_end = datetime(month_date.year, month_date.month + 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            
-            month_transactions = await self.transaction_repository.get_by_user_id(
-                user_id, month_start, month_end
-            )
-            month_income = sum(
-                Decimal(str(t.amount)) for t in month_transactions
-                if hasattr(t.status, 'value') and t.status.value == "completed"
-                and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "income"
-            )
-            month_expense = sum(
-                Decimal(str(t.amount)) for t in month_transactions
-                if hasattr(t.status, 'value') and t.status.value == "completed"
-                and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "expense"
-            )
+        for month_date in evolution_dates:
+            totals = monthly_totals[(month_date.year, month_date.month)]
             balance_evolution.append({
                 "month": f"{month_date.month:02d}/{month_date.year}",
-                "income": float(month_income),
-                "expense": float(month_expense),
-                "balance": float(month_income - month_expense),
+                "income": float(totals["income"]),
+                "expense": float(totals["expense"]),
+                "balance": float(totals["income"] - totals["expense"]),
             })
         
         return {
@@ -652,155 +889,45 @@ class ReportService:
                 "balance": float(balance),
                 "savings_rate": float(savings_rate),
                 "total_balance": float(total_balance),
-                "transactions_count": len(transactions),
+                "transactions_count": transactions_count,
                 "accounts_count": len([a for a in accounts if a.is_active]),
             },
             "balance_evolution": balance_evolution,
             "transactions_by_type": dict(transactions_by_type),
         }
 
+    @cached("report:income", ("transactions",))
     async def get_income_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Receitas"""
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
-        
-        # Filtrar apenas receitas completas
-        income_transactions = [
-            t for t in transactions
-            if hasattr(t.status, 'value') and t.status.value == "completed"
-            and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "income"
-        ]
-        
-        # Por categoria
-        income_by_category = defaultdict(Decimal)
-        income_by_account = defaultdict(Decimal)
-        
-        for t in income_transactions:
-            amount = Decimal(str(t.amount))
-            # Acessar categoria (já está eager-loaded)
-            if hasattr(t, 'category') and t.category is not None:
-                category_name = getattr(t.category, 'name', None) or 'Sem categoria'
-                if category_name and category_name != 'Sem categoria':
-                    income_by_category[category_name] += amount
-            
-            # Acessar conta (já está eager-loaded)
-            if hasattr(t, 'account') and t.account is not None:
-                account_name = getattr(t.account, 'name', None) or 'Sem conta'
-                if account_name and account_name != 'Sem conta':
-                    income_by_account[account_name] += amount
-        
-        total_income = sum(Decimal(str(t.amount)) for t in income_transactions)
-        
-        # Evolução mensal
-        monthly_income = []
-        current = start_date
-        while current <= end_date:
-            month_start = datetime(current.year, current.month, 1, tzinfo=pytz.UTC)
-            if current.month == 12:
-                month_end = datetime(current.year + 1, 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            else:
-                month_end = datetime(current.year, current.month + 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            
-            month_transactions = await self.transaction_repository.get_by_user_id(
-                user_id, month_start, min(month_end, end_date)
-            )
-            month_total = sum(
-                Decimal(str(t.amount)) for t in month_transactions
-                if hasattr(t.status, 'value') and t.status.value == "completed"
-                and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "income"
-            )
-            monthly_income.append({
-                "month": f"{current.month:02d}/{current.year}",
-                "amount": float(month_total),
-            })
-            
-            if current.month == 12:
-                current = datetime(current.year + 1, 1, 1, tzinfo=pytz.UTC)
-            else:
-                current = datetime(current.year, current.month + 1, 1, tzinfo=pytz.UTC)
+        breakdown = await self._type_breakdown(user_id, start_date, end_date, "income")
+        total_income = breakdown["total"]
         
         return {
             "total_income": float(total_income),
-            "transactions_count": len(income_transactions),
+            "transactions_count": breakdown["count"],
             "by_category": [
                 {"category": k, "amount": float(v), "percentage": float(v / total_income * 100) if total_income > 0 else 0}
-                for k, v in sorted(income_by_category.items(), key=lambda x: x[1], reverse=True)
+                for k, v in sorted(breakdown["by_category"].items(), key=lambda x: x[1], reverse=True)
             ],
             "by_account": [
                 {"account": k, "amount": float(v), "percentage": float(v / total_income * 100) if total_income > 0 else 0}
-                for k, v in sorted(income_by_account.items(), key=lambda x: x[1], reverse=True)
+                for k, v in sorted(breakdown["by_account"].items(), key=lambda x: x[1], reverse=True)
             ],
-            "monthly_evolution": monthly_income,
+            "monthly_evolution": breakdown["monthly_evolution"],
         }
 
+    @cached("report:expense", ("transactions",))
     async def get_expense_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Despesas"""
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
-        
-        # Filtrar apenas despesas completas
-        expense_transactions = [
-            t for t in transactions
-            if hasattr(t.status, 'value') and t.status.value == "completed"
-            and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "expense"
-        ]
-        
-        # Por categoria (Top 10)
-        expense_by_category = defaultdict(Decimal)
-        expense_by_account = defaultdict(Decimal)
-        
-        for t in expense_transactions:
-            amount = Decimal(str(t.amount))
-            # Acessar categoria (já está eager-loaded)
-            if hasattr(t, 'category') and t.category is not None:
-                category_name = getattr(t.category, 'name', None) or 'Sem categoria'
-                if category_name and category_name != 'Sem categoria':
-                    expense_by_category[category_name] += amount
-            
-            # Acessar conta (já está eager-loaded)
-            if hasattr(t, 'account') and t.account is not None:
-                account_name = getattr(t.account, 'name', None) or 'Sem conta'
-                if account_name and account_name != 'Sem conta':
-                    expense_by_account[account_name] += amount
-        
-        total_expense = sum(Decimal(str(t.amount)) for t in expense_transactions)
+        breakdown = await self._type_breakdown(user_id, start_date, end_date, "expense")
+        total_expense = breakdown["total"]
         
         # Top 10 categorias
-        top_categories = sorted(expense_by_category.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        # Evolução mensal
-        monthly_expense = []
-        current = start_date
-        while current <= end_date:
-            month_start = datetime(current.year, current.month, 1, tzinfo=pytz.UTC)
-            if current.month == 12:
-                month_end = datetime(current.year + 1, 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            else:
-                month_end = datetime(current.year, current.month + 1, 1, tzinfo=pytz.UTC) - timedelta(seconds=1)
-            
-            month_transactions = await self.transaction_repository.get_by_user_id(
-                user_id, month_start, min(month_end, end_date)
-            )
-            month_total = sum(
-                Decimal(str(t.amount)) for t in month_transactions
-                if hasattr(t.status, 'value') and t.status.value == "completed"
-                and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "expense"
-            )
-            monthly_expense.append({
-                "month": f"{current.month:02d}/{current.year}",
-                "amount": float(month_total),
-            })
-            
-            if current.month == 12:
-                current = datetime(current.year + 1, 1, 1, tzinfo=pytz.UTC)
-            else:
-                current = datetime(current.year, current.month + 1, 1, tzinfo=pytz.UTC)
+        top_categories = sorted(breakdown["by_category"].items(), key=lambda x: x[1], reverse=True)[:10]
         
         # Insights básicos
         insights = []
@@ -813,51 +940,36 @@ class ReportService:
         
         return {
             "total_expense": float(total_expense),
-            "transactions_count": len(expense_transactions),
+            "transactions_count": breakdown["count"],
             "top_categories": [
                 {"category": k, "amount": float(v), "percentage": float(v / total_expense * 100) if total_expense > 0 else 0}
                 for k, v in top_categories
             ],
             "by_account": [
                 {"account": k, "amount": float(v), "percentage": float(v / total_expense * 100) if total_expense > 0 else 0}
-                for k, v in sorted(expense_by_account.items(), key=lambda x: x[1], reverse=True)
+                for k, v in sorted(breakdown["by_account"].items(), key=lambda x: x[1], reverse=True)
             ],
-            "monthly_evolution": monthly_expense,
+            "monthly_evolution": breakdown["monthly_evolution"],
             "insights": insights,
         }
 
+    @cached("report:categories", ("transactions",))
     async def get_categories_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Categorias"""
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
+        rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("category", "type")
         )
         
-        # Filtrar apenas transações completas
-        completed_transactions = [
-            t for t in transactions
-            if hasattr(t.status, 'value') and t.status.value == "completed"
-        ]
-        
-        # Por categoria
+        # Por categoria (agrupado pelo nome, como exibido)
         category_stats = defaultdict(lambda: {"income": Decimal("0"), "expense": Decimal("0"), "count": 0})
         
-        for t in completed_transactions:
-            # Acessar categoria (já está eager-loaded)
-            if not hasattr(t, 'category') or t.category is None:
-                category_name = 'Sem categoria'
-            else:
-                category_name = getattr(t.category, 'name', None) or 'Sem categoria'
-            
-            amount = Decimal(str(t.amount))
-            trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-            
-            if trans_type == "income":
-                category_stats[category_name]["income"] += amount
-            elif trans_type == "expense":
-                category_stats[category_name]["expense"] += amount
-            category_stats[category_name]["count"] += 1
+        for row in rows:
+            category_name = row["category_name"] or 'Sem categoria'
+            if row["type"] in ("income", "expense"):
+                category_stats[category_name][row["type"]] += row["total"]
+            category_stats[category_name]["count"] += row["count"]
         
         # Calcular totais
         total_income = sum(s["income"] for s in category_stats.values())
@@ -889,31 +1001,16 @@ class ReportService:
 
     # ========== FASE 2 - AVANÇADO ==========
 
+    @cached("report:planning_vs_real", ("transactions",))
     async def get_planning_vs_real_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Planejamento vs Real"""
-        # Buscar planejamento mensal
-        from src.infrastructure.database.models.planning import PlanningType
-        from src.infrastructure.database.models.planning import MonthlyPlanning
-        
-        # Buscar transações
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
-        
         # Calcular valores reais
-        real_income = Decimal("0")
-        real_expense = Decimal("0")
-        
-        for t in transactions:
-            if hasattr(t.status, 'value') and t.status.value == "completed":
-                amount = Decimal(str(t.amount))
-                trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                if trans_type == "income":
-                    real_income += amount
-                elif trans_type == "expense":
-                    real_expense += amount
+        type_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("type",)
+        )
+        real_income, real_expense = self._type_totals(type_rows)
         
         # Buscar planejamento (simplificado - buscar do monthly_budget se disponível)
         # Por enquanto, retornar estrutura básica
@@ -936,47 +1033,25 @@ class ReportService:
             },
         }
 
+    @cached("report:comparative", ("transactions",))
     async def get_comparative_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime, compare_period: str = "previous"
     ) -> Dict:
         """Relatório Comparativo"""
-        # Período atual
-        current_transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
-        
         # Calcular período anterior
         period_days = (end_date - start_date).days
         previous_start = start_date - timedelta(days=period_days + 1)
         previous_end = start_date - timedelta(seconds=1)
         
-        previous_transactions = await self.transaction_repository.get_by_user_id(
-            user_id, previous_start, previous_end
+        # Totais dos dois períodos
+        current_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("type",)
         )
-        
-        # Calcular totais período atual
-        current_income = Decimal("0")
-        current_expense = Decimal("0")
-        for t in current_transactions:
-            if hasattr(t.status, 'value') and t.status.value == "completed":
-                amount = Decimal(str(t.amount))
-                trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                if trans_type == "income":
-                    current_income += amount
-                elif trans_type == "expense":
-                    current_expense += amount
-        
-        # Calcular totais período anterior
-        previous_income = Decimal("0")
-        previous_expense = Decimal("0")
-        for t in previous_transactions:
-            if hasattr(t.status, 'value') and t.status.value == "completed":
-                amount = Decimal(str(t.amount))
-                trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                if trans_type == "income":
-                    previous_income += amount
-                elif trans_type == "expense":
-                    previous_expense += amount
+        previous_rows = await self.transaction_repository.aggregate(
+            user_id, previous_start, previous_end, group_by=("type",)
+        )
+        current_income, current_expense = self._type_totals(current_rows)
+        previous_income, previous_expense = self._type_totals(previous_rows)
         
         # Calcular variações
         income_variance = float(current_income - previous_income)
@@ -1008,35 +1083,20 @@ class ReportService:
             },
         }
 
+    @cached("report:trends", ("transactions",))
     async def get_trends_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Tendências"""
-        # Buscar transações do período
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
-        )
-        
-        # Agrupar por mês
-        monthly_data = defaultdict(lambda: {"income": Decimal("0"), "expense": Decimal("0"), "count": 0})
-        
-        for t in transactions:
-            if hasattr(t.status, 'value') and t.status.value == "completed":
-                month_key = f"{t.transaction_date.year}-{t.transaction_date.month:02d}"
-                amount = Decimal(str(t.amount))
-                trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                if trans_type == "income":
-                    monthly_data[month_key]["income"] += amount
-                elif trans_type == "expense":
-                    monthly_data[month_key]["expense"] += amount
-                monthly_data[month_key]["count"] += 1
+        # Agrupar por mês no banco
+        monthly_totals = await self._monthly_totals(user_id, start_date, end_date)
         
         # Preparar dados ordenados
         trends_data = []
-        for month_key in sorted(monthly_data.keys()):
-            data = monthly_data[month_key]
+        for year, month in sorted(monthly_totals.keys()):
+            data = monthly_totals[(year, month)]
             trends_data.append({
-                "month": month_key,
+                "month": f"{year}-{month:02d}",
                 "income": float(data["income"]),
                 "expense": float(data["expense"]),
                 "balance": float(data["income"] - data["expense"]),
@@ -1066,6 +1126,7 @@ class ReportService:
             },
         }
 
+    @cached("report:goals", ("goals",))
     async def get_goals_report(
         self, user_id: UUID
     ) -> Dict:
@@ -1115,21 +1176,16 @@ class ReportService:
 
     # ========== FASE 3 - PREMIUM ==========
 
+    @cached("report:temporal", ("transactions",))
     async def get_temporal_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Análise Temporal"""
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
+        # Despesas concluídas por dia (dia da semana e do mês derivados dos buckets)
+        daily_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("day",), transaction_type="expense"
         )
         
-        # Filtrar apenas despesas completas
-        expense_transactions = [
-            t for t in transactions
-            if hasattr(t.status, 'value') and t.status.value == "completed"
-            and (t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)) == "expense"
-        ]
-        
         # Por dia da semana
         by_weekday = defaultdict(Decimal)
         weekday_names = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
@@ -1137,13 +1193,10 @@ class ReportService:
         # Por dia do mês
         by_day = defaultdict(Decimal)
         
-        for t in expense_transactions:
-            amount = Decimal(str(t.amount))
-            weekday = t.transaction_date.weekday()  # 0 = segunda, 6 = domingo
-            day = t.transaction_date.day
-            
-            by_weekday[weekday] += amount
-            by_day[day] += amount
+        for row in daily_rows:
+            weekday = row["day"].weekday()  # 0 = segunda, 6 = domingo
+            by_weekday[weekday] += row["total"]
+            by_day[row["day"].day] += row["total"]
         
         # Preparar dados
         weekday_data = [
@@ -1165,46 +1218,38 @@ class ReportService:
             },
         }
 
+    @cached("report:accounts", ("transactions", "accounts"))
     async def get_accounts_report(
         self, user_id: UUID, start_date: datetime, end_date: datetime
     ) -> Dict:
         """Relatório de Contas"""
         accounts = await self.account_repository.get_by_user_id(user_id)
-        transactions = await self.transaction_repository.get_by_user_id(
-            user_id, start_date, end_date
+        account_rows = await self.transaction_repository.aggregate(
+            user_id, start_date, end_date, group_by=("account", "type")
         )
         
+        # Movimentação por conta
+        account_stats = defaultdict(lambda: {"income": Decimal("0"), "expense": Decimal("0"), "count": 0})
+        for row in account_rows:
+            if row["type"] in ("income", "expense"):
+                account_stats[row["account_id"]][row["type"]] += row["total"]
+            account_stats[row["account_id"]]["count"] += row["count"]
+        
         accounts_data = []
         
         for account in accounts:
             if not account.is_active:
                 continue
             
-            # Calcular movimentação
-            account_income = Decimal("0")
-            account_expense = Decimal("0")
-            account_transactions = [
-                t for t in transactions
-                if t.account_id == account.id
-                and hasattr(t.status, 'value') and t.status.value == "completed"
-            ]
-            
-            for t in account_transactions:
-                amount = Decimal(str(t.amount))
-                trans_type = t.transaction_type.value if hasattr(t.transaction_type, 'value') else str(t.transaction_type)
-                if trans_type == "income":
-                    account_income += amount
-                elif trans_type == "expense":
-                    account_expense += amount
-            
+            stats = account_stats[account.id]
             accounts_data.append({
                 "id": str(account.id),
                 "name": account.name,
                 "type": account.account_type.value if hasattr(account.account_type, 'value') else str(account.account_type),
                 "balance": float(Decimal(str(account.balance))),
-                "income": float(account_income),
-                "expense": float(account_expense),
-                "transactions_count": len(account_transactions),
+                "income": float(stats["income"]),
+                "expense": float(stats["expense"]),
+                "transactions_count": stats["count"],
             })
         
         return {
@@ -1212,4 +1257,3 @@ class ReportService:
             "total_accounts": len(accounts_data),
             "total_balance": sum(a["balance"] for a in accounts_data),
         }
-
@@ -0,0 +1,82 @@
+"""Serviço para manter os totais diários de transações sincronizados"""
+from typing import Dict, List, Tuple
+from datetime import datetime
+from decimal import Decimal
+import pytz
+
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
+from src.infrastructure.database.models.transaction import Transaction
+
+
+class TransactionRollupService:
+    """Aplica deltas incrementais na tabela de totais diários a cada escrita de transação"""
+
+    def __init__(self, transaction_rollup_repository: TransactionRollupRepository):
+        self.transaction_rollup_repository = transaction_rollup_repository
+
+    @staticmethod
+    def snapshot(transaction: Transaction) -> Dict:
+        """Captura a chave e o valor da transação (usar antes de alterá-la)"""
+        transaction_date: datetime = transaction.transaction_date
+        if transaction_date.tzinfo is None:
+            transaction_date = pytz.UTC.localize(transaction_date)
+        
+        return {
+            "user_id": transaction.user_id,
+            "workspace_id": transaction.workspace_id,
+            "category_id": transaction.category_id,
+            "transaction_type": getattr(transaction.transaction_type, "value", transaction.transaction_type),
+            "status": getattr(transaction.status, "value", transaction.status),
+            "day": transaction_date.astimezone(pytz.UTC).date(),
+            "amount": Decimal(str(transaction.amount)),
+        }
+
+    @staticmethod
+    def _deltas(signed_snapshots: List[Tuple[Dict, int]]) -> List[Dict]:
+        """Agrupa (snapshot, sinal) em um delta por chave do agregado"""
+        grouped: Dict[tuple, Dict] = {}
+        for snapshot, sign in signed_snapshots:
+            key = tuple(value for name, value in snapshot.items() if name != "amount")
+            if key in grouped:
+                grouped[key]["amount"] += snapshot["amount"] * sign
+                grouped[key]["count"] += sign
+            else:
+                grouped[key] = {**snapshot, "amount": snapshot["amount"] * sign, "count": sign}
+        return [delta for delta in grouped.values() if delta["count"] or delta["amount"]]
+
+    async def _apply(self, signed_snapshots: List[Tuple[Dict, int]], operation: str, strict: bool = False) -> None:
+        """Aplica os deltas em um único upsert atômico; uma falha é desfeita (SAVEPOINT) e só registrada
+
+        Com strict, a falha é repassada para que o chamador desfaça a própria transação junto.
+        """
+        try:
+            await self.transaction_rollup_repository.apply_deltas(self._deltas(signed_snapshots))
+        except Exception as e:
+            if strict:
+                raise
+            print(f"[DEBUG] Erro ao atualizar totais diários ({operation}): {e}")
+
+    async def record_created(self, transaction: Transaction) -> None:
+        """Soma a transação criada aos totais"""
+        await self._apply([(self.snapshot(transaction), 1)], "criação")
+
+    async def record_created_many(self, transactions: List[Transaction], strict: bool = False) -> None:
+        """Soma várias transações criadas em um único upsert (um delta por chave do agregado)"""
+        await self._apply(
+            [(self.snapshot(transaction), 1) for transaction in transactions], "criação em lote", strict
+        )
+
+    async def record_deleted(self, snapshot: Dict) -> None:
+        """Subtrai dos totais a transação removida (snapshot capturado antes da remoção)"""
+        await self.record_deleted_many([snapshot])
+
+    async def record_deleted_many(self, snapshots: List[Dict]) -> None:
+        """Subtrai dos totais várias transações removidas em um único upsert"""
+        await self._apply([(snapshot, -1) for snapshot in snapshots], "remoção")
+
+    async def record_updated(self, old_snapshot: Dict, transaction: Transaction) -> None:
+        """Move a transação da chave antiga para a nova (as duas no mesmo upsert)"""
+        new_snapshot = self.snapshot(transaction)
+        if new_snapshot == old_snapshot:
+            return
+        await self._apply([(old_snapshot, -1), (new_snapshot, 1)], "atualização")
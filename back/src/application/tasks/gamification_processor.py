@@ -0,0 +1,234 @@
+"""
+Processamento da gamificação em background: eventos agrupados por usuário e
+aplicados em lote, fora do caminho de escrita das transações
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from uuid import UUID
+from src.shared.config import settings
+
+
+class GamificationEvent:
+    """Pontos (e efeitos) de uma ação do usuário"""
+
+    __slots__ = ("user_id", "points", "reason", "activity", "check_achievements", "created_at", "attempts")
+
+    def __init__(self, user_id: UUID, points: int, reason: str, activity: bool, check_achievements: bool):
+        self.user_id = user_id
+        self.points = points
+        self.reason = reason
+        self.activity = activity
+        self.check_achievements = check_achievements
+        self.created_at = time.monotonic()
+        self.attempts = 0
+
+
+class GamificationProcessor:
+    """Fila em memória de eventos de gamificação por usuário.
+
+    Os eventos de um usuário esperam `batch_seconds` para juntar os que
+    chegam em seguida (ex.: importação de várias transações) e são aplicados
+    por GamificationService.apply_events em uma sessão própria, com um único
+    commit: soma dos pontos, sequência de dias e badges avaliados pelos
+    contadores. Cada usuário tem no máximo um lote em processamento, e no
+    máximo `concurrency` lotes rodam ao mesmo tempo.
+
+    Um lote que falha volta para a fila do usuário (junto com os eventos que
+    chegaram nesse meio tempo) e é tentado de novo após `batch_seconds`,
+    dobrando a cada tentativa; após `max_attempts` os eventos são descartados
+    com log e contados em `dropped_events`.
+
+    O estado é por processo; no desligamento o pendente é aplicado antes de
+    parar.
+    """
+
+    def __init__(
+        self,
+        batch_seconds: float = settings.GAMIFICATION_BATCH_SECONDS,
+        concurrency: int = settings.GAMIFICATION_CONCURRENCY,
+        max_attempts: int = settings.GAMIFICATION_MAX_ATTEMPTS,
+    ):
+        self.batch_seconds = batch_seconds
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.task: Optional[asyncio.Task] = None
+        self.is_running = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[UUID, List[GamificationEvent]] = {}
+        self._processing: Dict[UUID, asyncio.Task] = {}
+        self._retry_at: Dict[UUID, float] = {}
+        self._latencies = deque(maxlen=1000)
+        self.submitted = 0
+        self.batches = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped_events = 0
+
+    def start(self):
+        """Inicia o processador (precisa de um event loop rodando)"""
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.task = asyncio.create_task(self._run())
+        self.is_running = True
+        print("Processador de gamificação iniciado")
+
+    async def stop(self):
+        """Para o processador aplicando na hora tudo o que está pendente"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._wakeup.set()
+        await self.task
+        self.task = None
+        print(f"Processador de gamificação parado ({self.stats()})")
+
+    def submit(
+        self,
+        user_id: UUID,
+        points: int,
+        reason: str = "",
+        activity: bool = False,
+        check_achievements: bool = False,
+    ):
+        """
+        Enfileira um evento sem bloquear
+
+        Args:
+            user_id: Usuário que pontuou
+            points: Pontos da ação
+            reason: Descrição (ex.: "Registrar transação")
+            activity: Conta como atividade do dia (sequência de dias)
+            check_achievements: Reavaliar os badges por contadores
+        """
+        if not self.is_running:
+            self.start()
+        self._pending.setdefault(user_id, []).append(
+            GamificationEvent(user_id, points, reason, activity, check_achievements)
+        )
+        self.submitted += 1
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, object]:
+        """Profundidade da fila, contadores e latência (do primeiro evento até o commit)"""
+        latencies = sorted(self._latencies)
+        return {
+            "pending_events": sum(len(events) for events in self._pending.values()),
+            "pending_users": len(self._pending),
+            "in_flight": len(self._processing),
+            "submitted": self.submitted,
+            "batches": self.batches,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped_events": self.dropped_events,
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1) if latencies else 0.0,
+            },
+        }
+
+    async def _apply(self, user_id: UUID, events: List[GamificationEvent]):
+        from src.infrastructure.database.base import AsyncSessionLocal
+        from src.infrastructure.repositories.gamification_repository import (
+            SQLAlchemyBadgeRepository,
+            SQLAlchemyUserBadgeRepository,
+            SQLAlchemyUserLevelRepository,
+            SQLAlchemyChallengeRepository,
+            SQLAlchemyUserChallengeRepository,
+        )
+        from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+        from src.infrastructure.repositories.goal_repository import SQLAlchemyGoalRepository
+        from src.application.services.gamification_service import GamificationService
+
+        async with self._semaphore:
+            try:
+                async with AsyncSessionLocal() as session:
+                    service = GamificationService(
+                        SQLAlchemyBadgeRepository(session),
+                        SQLAlchemyUserBadgeRepository(session),
+                        SQLAlchemyUserLevelRepository(session),
+                        SQLAlchemyChallengeRepository(session),
+                        SQLAlchemyUserChallengeRepository(session),
+                        SQLAlchemyTransactionRepository(session),
+                        SQLAlchemyGoalRepository(session),
+                    )
+                    await service.apply_events(
+                        user_id,
+                        points=sum(event.points for event in events),
+                        activity=any(event.activity for event in events),
+                        check_achievements=any(event.check_achievements for event in events),
+                    )
+                self.batches += 1
+                self._latencies.append(time.monotonic() - events[0].created_at)
+            except Exception as e:
+                self.failed += 1
+                self._retry_or_drop(user_id, events, e)
+
+    def _retry_or_drop(self, user_id: UUID, events: List[GamificationEvent], error: Exception):
+        """Devolve o lote à fila do usuário ou, esgotadas as tentativas, descarta com log"""
+        reasons = ", ".join(sorted({event.reason for event in events if event.reason}))
+        attempts = max(event.attempts for event in events) + 1
+        if attempts >= self.max_attempts:
+            self.dropped_events += len(events)
+            logging.error(
+                f"Gamificação de {user_id} descartada após {attempts} tentativas "
+                f"({len(events)} eventos, {sum(event.points for event in events)} pontos; {reasons}): {error}"
+            )
+            return
+
+        for event in events:
+            event.attempts = attempts
+        # Na frente dos eventos que chegaram durante o lote (mantém o mais antigo primeiro)
+        self._pending[user_id] = events + self._pending.get(user_id, [])
+        self._retry_at[user_id] = time.monotonic() + self.batch_seconds * (2 ** (attempts - 1))
+        self.retried += 1
+        logging.warning(f"Erro ao processar gamificação de {user_id} ({reasons}), tentativa {attempts}: {error}")
+
+    def _dispatch(self, user_id: UUID):
+        events = self._pending.pop(user_id)
+        self._retry_at.pop(user_id, None)
+        task = asyncio.create_task(self._apply(user_id, events))
+        self._processing[user_id] = task
+        task.add_done_callback(lambda _: self._finished(user_id))
+
+    def _finished(self, user_id: UUID):
+        self._processing.pop(user_id, None)
+        if self._wakeup is not None:
+            # Eventos que chegaram durante o lote podem sair agora
+            self._wakeup.set()
+
+    async def _run(self):
+        while self.is_running:
+            self._wakeup.clear()
+            now = time.monotonic()
+            next_flush = None
+            for user_id, events in list(self._pending.items()):
+                if user_id in self._processing:
+                    continue
+                flush_at = max(events[0].created_at + self.batch_seconds, self._retry_at.get(user_id, 0.0))
+                if flush_at <= now:
+                    self._dispatch(user_id)
+                elif next_flush is None or flush_at < next_flush:
+                    next_flush = flush_at
+
+            timeout = 60.0 if next_flush is None else min(60.0, next_flush - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        # Desligamento: aplicar o que está pendente sem esperar o agrupamento
+        while self._pending or self._processing:
+            for user_id in [u for u in self._pending if u not in self._processing]:
+                self._dispatch(user_id)
+            if self._processing:
+                await asyncio.gather(*self._processing.values(), return_exceptions=True)
+
+
+# Instância global
+gamification_processor = GamificationProcessor()
@@ -0,0 +1,75 @@
+"""
+Tarefa agendada para reconstruir os rankings de gamificação a partir do banco
+"""
+from datetime import datetime
+from typing import Optional
+import pytz
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from src.shared.config import settings
+from src.infrastructure.cache.redis_client import redis_client
+from src.infrastructure.database.base import AsyncSessionLocal
+from src.infrastructure.repositories.gamification_repository import SQLAlchemyUserLevelRepository
+from src.application.services.leaderboard_service import leaderboard_service
+
+
+class LeaderboardReconcilerTask:
+    """Reconstrói periodicamente os sorted sets do ranking
+
+    Roda também na inicialização, para preencher o Redis vazio. Com várias
+    réplicas, só a que obtém o lock da execução reconstrói.
+    """
+
+    def __init__(self, interval_minutes: int = settings.LEADERBOARD_RECONCILE_INTERVAL_MINUTES):
+        self.scheduler = AsyncIOScheduler()
+        self.is_running = False
+        self.interval_minutes = interval_minutes
+        self.last_run: Optional[dict] = None
+
+    async def reconcile(self) -> Optional[dict]:
+        """Reconstrói todos os rankings"""
+        started_at = datetime.now(pytz.UTC)
+        try:
+            lock_ttl = max(60, self.interval_minutes * 60 - 60)
+            if not await redis_client.acquire_lock("lock:leaderboard_reconciler", lock_ttl):
+                return None
+            async with AsyncSessionLocal() as session:
+                totals = await leaderboard_service.reconcile(SQLAlchemyUserLevelRepository(session))
+        except Exception as e:
+            print(f"Erro na reconciliação do ranking: {e}")
+            return None
+
+        self.last_run = {"started_at": started_at.isoformat(), **totals}
+        print(f"[{datetime.now()}] Ranking reconstruído: {totals['users']} usuários, {totals['boards']} rankings")
+        return self.last_run
+
+    def start(self):
+        """Inicia o agendador"""
+        if self.is_running:
+            return
+
+        self.scheduler.add_job(
+            self.reconcile,
+            trigger=IntervalTrigger(minutes=self.interval_minutes),
+            next_run_time=datetime.now(pytz.UTC),
+            id="reconcile_leaderboard",
+            name="Reconstruir ranking de gamificação",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
+
+        self.scheduler.start()
+        self.is_running = True
+        print("Tarefa de reconciliação do ranking iniciada")
+
+    def stop(self):
+        """Para o agendador"""
+        if self.is_running:
+            self.scheduler.shutdown()
+            self.is_running = False
+            print("Tarefa de reconciliação do ranking parada")
+
+
+# Instância global
+leaderboard_reconciler = LeaderboardReconcilerTask()
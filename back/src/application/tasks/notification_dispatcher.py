@@ -0,0 +1,201 @@
+"""
+Despachante de notificações: agrupa eventos por usuário e janela e envia por
+email e WhatsApp em background
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from src.shared.config import settings
+
+
+class NotificationEvent:
+    """Um evento de notificação aguardando envio"""
+
+    __slots__ = ("kind", "key", "recipient", "payload", "created_at")
+
+    def __init__(self, kind: str, key: str, recipient: dict, payload: dict):
+        self.kind = kind
+        self.key = key
+        self.recipient = recipient
+        self.payload = payload
+        self.created_at = time.monotonic()
+
+
+class NotificationDispatcher:
+    """Fila em memória de eventos agrupados por (tipo, chave do destinatário).
+
+    O primeiro evento de uma chave espera `gather_seconds` para juntar os
+    demais que chegam em seguida (ex.: vários planejamentos do mesmo usuário
+    na mesma verificação). Depois de um envio, a chave só volta a ser enviada
+    após a janela do tipo (`windows`); tudo o que chegar nesse intervalo vira
+    um único resumo. Os envios rodam com no máximo `concurrency` destinatários
+    simultâneos, e cada provedor aplica seus próprios limites
+    (provider_clients, pool SMTP).
+
+    O estado é por processo: com várias réplicas o agrupamento vale para os
+    eventos gerados na mesma réplica.
+    """
+
+    def __init__(
+        self,
+        gather_seconds: int = settings.NOTIFICATION_GATHER_SECONDS,
+        windows: Optional[Dict[str, int]] = None,
+        concurrency: int = settings.NOTIFICATION_DISPATCH_CONCURRENCY,
+    ):
+        self.gather_seconds = gather_seconds
+        self.windows = windows or {
+            "planning": settings.NOTIFICATION_PLANNING_WINDOW_SECONDS,
+            "family_chat": settings.NOTIFICATION_CHAT_WINDOW_SECONDS,
+        }
+        self.concurrency = max(1, concurrency)
+        self.task: Optional[asyncio.Task] = None
+        self.is_running = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[Tuple[str, str], List[NotificationEvent]] = {}
+        self._last_sent: Dict[Tuple[str, str], float] = {}
+        self._deliveries: set = set()
+        self._latencies = deque(maxlen=1000)
+        self.submitted = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def start(self):
+        """Inicia o despachante (precisa de um event loop rodando)"""
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.task = asyncio.create_task(self._run())
+        self.is_running = True
+        print("Despachante de notificações iniciado")
+
+    async def stop(self):
+        """Para o despachante enviando na hora tudo o que está pendente"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._wakeup.set()
+        await self.task
+        self.task = None
+
+        from src.application.notifications.provider_clients import close_provider_clients
+        await close_provider_clients()
+        print(f"Despachante de notificações parado ({self.stats()})")
+
+    def submit(self, kind: str, key: str, recipient: dict, payload: dict) -> int:
+        """
+        Enfileira um evento sem bloquear
+
+        Args:
+            kind: Tipo do evento ("planning", "family_chat")
+            key: Chave de agrupamento (ex.: email do destinatário)
+            recipient: Dados do destinatário (email, nome, telefone)
+            payload: Dados do evento
+
+        Returns:
+            Eventos pendentes para a chave (1 = ainda não agrupou nenhum)
+        """
+        if not self.is_running:
+            self.start()
+        events = self._pending.setdefault((kind, key), [])
+        events.append(NotificationEvent(kind, key, recipient, payload))
+        self.submitted += 1
+        self._wakeup.set()
+        return len(events)
+
+    def _flush_at(self, key: Tuple[str, str], events: List[NotificationEvent]) -> float:
+        window = self.windows.get(key[0], 0)
+        last_sent = self._last_sent.get(key)
+        flush_at = events[0].created_at + self.gather_seconds
+        if last_sent is not None:
+            flush_at = max(flush_at, last_sent + window)
+        return flush_at
+
+    def stats(self) -> Dict[str, object]:
+        """Profundidade da fila, contadores e latência (do primeiro evento até o envio)"""
+        from src.application.notifications.provider_clients import provider_stats
+
+        latencies = sorted(self._latencies)
+        return {
+            "pending_events": sum(len(events) for events in self._pending.values()),
+            "pending_recipients": len(self._pending),
+            "in_flight": len(self._deliveries),
+            "submitted": self.submitted,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1) if latencies else 0.0,
+                "max": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+            },
+            "providers": provider_stats(),
+        }
+
+    async def _deliver(self, kind: str, events: List[NotificationEvent]):
+        from src.application.notifications.notification_service import NotificationService
+
+        async with self._semaphore:
+            recipient = events[-1].recipient
+            payloads = [event.payload for event in events]
+            try:
+                service = NotificationService()
+                if kind == "planning":
+                    await service.deliver_planning_alerts(**recipient, alerts=payloads)
+                elif kind == "family_chat":
+                    await service.deliver_family_chat(**recipient, messages=payloads)
+                else:
+                    raise ValueError(f"Tipo de notificação desconhecido: {kind}")
+                self.delivered += 1
+                self.coalesced += len(events) - 1
+            except Exception as e:
+                self.failed += 1
+                logging.error(f"Erro ao enviar notificação {kind}: {e}")
+            self._latencies.append(time.monotonic() - events[0].created_at)
+
+    def _dispatch(self, key: Tuple[str, str], now: float):
+        events = self._pending.pop(key)
+        self._last_sent[key] = now
+        task = asyncio.create_task(self._deliver(key[0], events))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    def _prune(self, now: float):
+        # Chaves sem envio recente não precisam mais lembrar o último envio
+        longest = max(self.windows.values(), default=0)
+        for key in [k for k, sent in self._last_sent.items() if now - sent > longest and k not in self._pending]:
+            del self._last_sent[key]
+
+    async def _run(self):
+        while self.is_running:
+            self._wakeup.clear()
+            now = time.monotonic()
+            next_flush = None
+            for key, events in list(self._pending.items()):
+                flush_at = self._flush_at(key, events)
+                if flush_at <= now:
+                    self._dispatch(key, now)
+                elif next_flush is None or flush_at < next_flush:
+                    next_flush = flush_at
+            self._prune(now)
+
+            timeout = 60.0 if next_flush is None else min(60.0, next_flush - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        # Desligamento: enviar o que está pendente sem esperar as janelas
+        now = time.monotonic()
+        for key in list(self._pending):
+            self._dispatch(key, now)
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+
+# Instância global
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,178 @@
+"""
+Worker em background que drena a fila de saída de notificações (notification_outbox)
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import pytz
+from src.shared.config import settings
+from src.infrastructure.database.base import AsyncSessionLocal
+from src.infrastructure.database.models.notification_outbox import NotificationOutbox
+from src.infrastructure.repositories.notification_outbox_repository import SQLAlchemyNotificationOutboxRepository
+
+
+class NotificationOutboxWorker:
+    """Envia as mensagens da fila de saída em lotes, com novas tentativas.
+
+    As mensagens são gravadas no banco (sobrevivem a reinícios) e reservadas
+    com SKIP LOCKED, então várias réplicas podem drenar a fila ao mesmo tempo.
+    Falhas são reagendadas com backoff exponencial até `max_attempts`.
+    Um enqueue no mesmo processo acorda o worker na hora; mensagens de outras
+    réplicas são vistas a cada `poll_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: int = settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds: int = settings.OUTBOX_RETRY_BASE_SECONDS,
+        lease_seconds: int = settings.OUTBOX_LEASE_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+        self.task: Optional[asyncio.Task] = None
+        self.is_running = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self.enqueued = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self):
+        """Inicia o worker (precisa de um event loop rodando)"""
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+        self.is_running = True
+        print("Worker da fila de notificações iniciado")
+
+    async def stop(self):
+        """Para o worker após o lote em andamento"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._wakeup.set()
+        await self.task
+        self.task = None
+
+        from src.application.notifications.smtp_pool import close_smtp_pools
+        await close_smtp_pools()
+        print(f"Worker da fila de notificações parado ({self.stats()})")
+
+    def wake(self):
+        """Acorda o worker para drenar a fila imediatamente"""
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def enqueue_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> NotificationOutbox:
+        """Grava um email na fila de saída"""
+        async with AsyncSessionLocal() as session:
+            message = await SQLAlchemyNotificationOutboxRepository(session).enqueue(
+                NotificationOutbox(
+                    channel="email",
+                    recipient=to_email,
+                    subject=subject,
+                    html_content=html_content,
+                    text_content=text_content,
+                )
+            )
+        self.enqueued += 1
+        self.wake()
+        return message
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores do worker"""
+        return {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        # Backoff exponencial com jitter, limitado a 1 hora
+        delay = min(self.retry_base_seconds * (2 ** (attempts - 1)), 3600)
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    async def _deliver(self, message: NotificationOutbox, email_service) -> Optional[str]:
+        """Envia uma mensagem; retorna a mensagem de erro em caso de falha"""
+        try:
+            if message.channel != "email":
+                raise ValueError(f"Canal não suportado: {message.channel}")
+            await email_service.send_now(
+                message.recipient, message.subject, message.html_content or "", message.text_content
+            )
+            return None
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    async def drain_once(self) -> int:
+        """Processa um lote; retorna o número de mensagens reservadas"""
+        from src.application.notifications.email_service import EmailService
+
+        email_service = EmailService(
+            smtp_host=getattr(settings, "SMTP_HOST", "smtp.gmail.com"),
+            smtp_port=getattr(settings, "SMTP_PORT", 587),
+            smtp_user=getattr(settings, "SMTP_USER", None),
+            smtp_password=getattr(settings, "SMTP_PASSWORD", None),
+        )
+
+        async with AsyncSessionLocal() as session:
+            repository = SQLAlchemyNotificationOutboxRepository(session)
+            batch = await repository.claim_batch(self.batch_size, self.lease_seconds)
+            if not batch:
+                return 0
+
+            # O pool SMTP limita quantos envios rodam de fato em paralelo
+            errors = await asyncio.gather(*(self._deliver(message, email_service) for message in batch))
+
+            await repository.mark_sent([m.id for m, error in zip(batch, errors) if error is None])
+            self.sent += sum(1 for error in errors if error is None)
+
+            now = datetime.now(pytz.UTC)
+            for message, error in zip(batch, errors):
+                if error is None:
+                    continue
+                give_up = message.attempts >= self.max_attempts
+                await repository.mark_failed(message.id, error, now + self._retry_delay(message.attempts), give_up)
+                if give_up:
+                    self.failed += 1
+                    logging.error(f"Notificação {message.id} descartada após {message.attempts} tentativas: {error}")
+                else:
+                    self.retried += 1
+            return len(batch)
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                claimed = await self.drain_once()
+            except Exception as e:
+                # Banco indisponível etc.: tentar de novo no próximo ciclo
+                logging.error(f"Erro ao drenar fila de notificações: {e}")
+                claimed = 0
+
+            # Lote cheio: provavelmente há mais mensagens, seguir sem esperar
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+# Instância global
+notification_outbox_worker = NotificationOutboxWorker()
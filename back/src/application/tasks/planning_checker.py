@@ -1,16 +1,16 @@
 """
 Tarefa agendada para verificar planejamentos e enviar notificações
 """
-import asyncio
+import random
+import time
 from datetime import datetime
+from typing import Optional
+import pytz
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from src.shared.config import settings
 from src.infrastructure.database.base import AsyncSessionLocal
-from src.domain.repositories.planning_repository import PlanningRepository
-from src.domain.repositories.transaction_repository import TransactionRepository
-from src.domain.repositories.user_repository import UserRepository
+from src.infrastructure.cache.redis_client import redis_client
 from src.infrastructure.repositories.planning_repository import (
     SQLAlchemyPlanningRepository,
     SQLAlchemyMonthlyPlanningRepository,
@@ -24,28 +24,55 @@ from src.infrastructure.repositories.user_repository import SQLAlchemyUserReposi
 from src.application.notifications.notification_service import NotificationService
 from src.application.use_cases.planning_use_cases import PlanningUseCases
 from src.application.use_cases.notification_use_cases import NotificationUseCases
-from src.infrastructure.database.models.planning import Planning
 
 
 class PlanningCheckerTask:
-    """Tarefa para verificar planejamentos periodicamente"""
-
-    def __init__(self):
+    """Tarefa para verificar planejamentos periodicamente
+
+    Os planejamentos são divididos em `PLANNING_CHECKER_SHARDS` shards por hash
+    do user_id. A cada execução, cada réplica da API tenta obter no Redis o lock
+    de cada shard para aquela hora (SET NX) e verifica apenas os shards que
+    obteve; assim nenhum shard é verificado duas vezes na mesma hora.
+    """
+
+    def __init__(
+        self,
+        shard_count: int = settings.PLANNING_CHECKER_SHARDS,
+        concurrency: int = settings.PLANNING_CHECKER_CONCURRENCY,
+        lock_ttl: int = settings.PLANNING_CHECKER_LOCK_TTL_SECONDS,
+        threshold: float = 10.0,  # 10% de tolerância
+    ):
         self.scheduler = AsyncIOScheduler()
         self.is_running = False
-
-    async def check_plannings(self):
-        """Verifica todos os planejamentos ativos"""
+        self.shard_count = max(1, shard_count)
+        self.concurrency = concurrency
+        self.lock_ttl = lock_ttl
+        self.threshold = threshold
+        self.last_run: Optional[dict] = None
+
+    async def _acquire_shard(self, run_key: str, shard_index: int) -> bool:
+        """Obtém o lock do shard para a execução; sem Redis, verifica localmente"""
+        try:
+            return await redis_client.acquire_lock(
+                f"lock:planning_checker:{run_key}:{shard_index}", self.lock_ttl
+            )
+        except Exception as e:
+            print(f"[DEBUG] Lock de planejamentos indisponível (shard {shard_index}): {e}")
+            return True
+
+    async def check_shard(self, shard_index: int) -> dict:
+        """Verifica os planejamentos ativos de um shard"""
         async with AsyncSessionLocal() as session:
-            try:
-                # Inicializar repositórios
-                planning_repo = SQLAlchemyPlanningRepository(session)
-                transaction_repo = SQLAlchemyTransactionRepository(session)
-                user_repo = SQLAlchemyUserRepository(session)
-
-                # Inicializar serviços
-                notification_service = NotificationService()
-                planning_use_cases = PlanningUseCases(
+            # Inicializar repositórios
+            planning_repo = SQLAlchemyPlanningRepository(session)
+            transaction_repo = SQLAlchemyTransactionRepository(session)
+
+            notification_use_cases = NotificationUseCases(
+                planning_repository=planning_repo,
+                transaction_repository=transaction_repo,
+                user_repository=SQLAlchemyUserRepository(session),
+                notification_service=NotificationService(),
+                planning_use_cases=PlanningUseCases(
                     planning_repository=planning_repo,
                     monthly_repository=SQLAlchemyMonthlyPlanningRepository(session),
                     weekly_repository=SQLAlchemyWeeklyPlanningRepository(session),
@@ -53,49 +80,81 @@ class PlanningCheckerTask:
                     annual_repository=SQLAlchemyAnnualPlanningRepository(session),
                     quarterly_repository=SQLAlchemyQuarterlyGoalRepository(session),
                     transaction_repository=transaction_repo,
+                ),
+            )
+
+            results = await notification_use_cases.check_all_active_plannings(
+                threshold=self.threshold,
+                shard_count=self.shard_count,
+                shard_index=shard_index,
+                concurrency=self.concurrency,
+            )
+
+        for result in results:
+            if result.get("notified"):
+                print(
+                    f"[{datetime.now()}] Notificação enviada para planejamento {result['planning_id']} "
+                    f"(Porcentagem: {result.get('percentage'):.2f}%)"
                 )
-                notification_use_cases = NotificationUseCases(
-                    planning_repository=planning_repo,
-                    transaction_repository=transaction_repo,
-                    user_repository=user_repo,
-                    notification_service=notification_service,
-                    planning_use_cases=planning_use_cases,
-                )
-
-                # Buscar todos os planejamentos ativos
-                result = await session.execute(
-                    select(Planning).where(
-                        Planning.is_active == True
-                    )
-                )
-                plannings = result.scalars().all()
-
-                print(f"[{datetime.now()}] Verificando {len(plannings)} planejamentos...")
-
-                for planning in plannings:
-                    try:
-                        result = await notification_use_cases.check_and_notify_planning(
-                            planning_id=planning.id,
-                            threshold=10.0,  # 10% de tolerância
-                        )
-
-                        if result.get("notified"):
-                            print(
-                                f"[{datetime.now()}] Notificação enviada para planejamento {planning.id} "
-                                f"(Porcentagem: {result.get('percentage'):.2f}%)"
-                            )
-                    except Exception as e:
-                        print(f"Erro ao verificar planejamento {planning.id}: {e}")
+        return {
+            "plannings": len(results),
+            "notified": sum(1 for r in results if r.get("notified")),
+            "errors": sum(1 for r in results if r.get("error")),
+        }
 
+    async def check_plannings(self):
+        """Verifica os planejamentos ativos dos shards obtidos por esta réplica"""
+        started_at = datetime.now(pytz.UTC)
+        run_key = started_at.strftime("%Y%m%d%H")
+        start = time.perf_counter()
+        metrics = {
+            "started_at": started_at.isoformat(),
+            "shards": [],
+            "shards_skipped": 0,
+            "plannings": 0,
+            "notified": 0,
+            "errors": 0,
+        }
+
+        # Começar por um shard aleatório para espalhar os shards entre as réplicas
+        offset = random.randrange(self.shard_count)
+        for i in range(self.shard_count):
+            shard_index = (offset + i) % self.shard_count
+            if not await self._acquire_shard(run_key, shard_index):
+                metrics["shards_skipped"] += 1
+                continue
+
+            shard_start = time.perf_counter()
+            try:
+                shard_metrics = await self.check_shard(shard_index)
             except Exception as e:
-                print(f"Erro na verificação de planejamentos: {e}")
+                print(f"Erro na verificação de planejamentos (shard {shard_index}): {e}")
+                metrics["errors"] += 1
+                continue
+
+            for key in ("plannings", "notified", "errors"):
+                metrics[key] += shard_metrics[key]
+            metrics["shards"].append({
+                "shard": shard_index,
+                "duration_ms": round((time.perf_counter() - shard_start) * 1000, 2),
+                **shard_metrics,
+            })
+
+        metrics["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self.last_run = metrics
+        print(
+            f"[{datetime.now()}] Planejamentos verificados: {metrics['plannings']} em "
+            f"{len(metrics['shards'])}/{self.shard_count} shards, {metrics['notified']} notificações, "
+            f"{metrics['errors']} erros, {metrics['duration_ms']:.0f} ms"
+        )
+        return metrics
 
     def start(self):
         """Inicia o agendador"""
         if self.is_running:
             return
 
-        # Verificar a cada hora
+        # Verificar a cada hora (inclui 8h e 20h; o lock por hora evita execuções duplicadas)
         self.scheduler.add_job(
             self.check_plannings,
             trigger=CronTrigger(minute=0),  # Todo minuto 0 de cada hora
@@ -104,15 +163,6 @@ class PlanningCheckerTask:
             replace_existing=True,
         )
 
-        # Também verificar diariamente às 8h e 20h
-        self.scheduler.add_job(
-            self.check_plannings,
-            trigger=CronTrigger(hour="8,20", minute=0),
-            id="check_plannings_daily",
-            name="Verificação diária de planejamentos",
-            replace_existing=True,
-        )
-
         self.scheduler.start()
         self.is_running = True
         print("Tarefa de verificação de planejamentos iniciada")
@@ -127,4 +177,3 @@ class PlanningCheckerTask:
 
 # Instância global
 planning_checker = PlanningCheckerTask()
-
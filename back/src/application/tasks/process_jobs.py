@@ -0,0 +1,108 @@
+"""
+Pool de processos e jobs assíncronos com estado no Redis, usados pela
+renderização de relatórios em PDF e pela fila de OCR de notas fiscais
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, Optional
+from uuid import UUID, uuid4
+import pytz
+from src.infrastructure.cache.redis_client import redis_client
+
+
+class ProcessPool:
+    """ProcessPoolExecutor criado sob demanda, com processos `spawn` (sem
+    herdar o event loop nem conexões)"""
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Executa `func(*args)` em um processo do pool"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: falta de memória): recriar o pool e tentar uma vez
+            self._executor = None
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class JobStore:
+    """Jobs de um usuário com o estado no Redis por `ttl` segundos (qualquer
+    réplica responde a consulta) e as tasks em andamento neste processo"""
+
+    def __init__(self, prefix: str, ttl: int):
+        self.prefix = prefix
+        self.ttl = ttl
+        self._tasks: set = set()
+
+    def key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    async def create(self, user_id: UUID, **fields) -> Dict:
+        """Grava o estado inicial (pending) do job"""
+        job = {
+            "job_id": str(uuid4()),
+            "user_id": str(user_id),
+            "status": "pending",
+            "created_at": datetime.now(pytz.UTC).isoformat(),
+            "finished_at": None,
+            "error": None,
+            **fields,
+        }
+        await redis_client.set_json(self.key(job["job_id"]), job, expire=self.ttl)
+        return job
+
+    def start(self, coroutine: Coroutine):
+        """Roda o job em background (cancelado em `shutdown`)"""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get(self, job_id: str, user_id: UUID) -> Optional[Dict]:
+        """Estado do job (None se não existe, expirou ou é de outro usuário)"""
+        job = await redis_client.get_json(self.key(job_id))
+        if not job or job["user_id"] != str(user_id):
+            return None
+        return job
+
+    async def mark_running(self, job: Dict):
+        await redis_client.set_json(self.key(job["job_id"]), {**job, "status": "running"}, expire=self.ttl)
+
+    async def finish(self, job: Dict) -> Dict:
+        """Grava o estado final (done/failed) com o horário de término"""
+        job = {**job, "finished_at": datetime.now(pytz.UTC).isoformat()}
+        try:
+            await redis_client.set_json(self.key(job["job_id"]), job, expire=self.ttl)
+        except Exception as e:
+            logging.error(f"Erro ao gravar estado do job {self.key(job['job_id'])}: {e}")
+        return job
+
+    async def shutdown(self):
+        """Cancela os jobs em andamento"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,154 @@
+"""
+Fila de OCR de notas fiscais: pool de processos, jobs assíncronos e cache por
+conteúdo da imagem
+"""
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+from src.shared.config import settings
+from src.shared.exceptions import BaseAppException
+from src.infrastructure.cache.redis_client import redis_client
+from src.application.services.receipt_ocr_service import extract_receipt_data
+from src.application.tasks.process_jobs import JobStore, ProcessPool
+
+
+class ReceiptOCRQueue:
+    """OCR fora do event loop, com no máximo `max_pending` imagens na fila.
+
+    O pré-processamento (OpenCV) e o Tesseract rodam em `workers` processos
+    (`spawn`). O resultado de cada imagem fica em cache pelo sha256 do
+    arquivo, então reenviar a mesma foto não refaz o OCR. Jobs (envio e
+    consulta) guardam o estado no Redis, como os relatórios em PDF.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.OCR_WORKERS,
+        max_pending: int = settings.OCR_MAX_PENDING,
+        cache_ttl: int = settings.OCR_RESULT_CACHE_TTL_SECONDS,
+        job_ttl: int = settings.OCR_JOB_TTL_SECONDS,
+    ):
+        self.max_pending = max_pending
+        self.cache_ttl = cache_ttl
+        self.pool = ProcessPool(workers)
+        self.jobs = JobStore("ocr", job_ttl)
+        self.pending = 0
+        self.processed = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.errors = 0
+        self.ocr_seconds = 0.0
+
+    @staticmethod
+    def _cache_key(content_hash: str) -> str:
+        return f"ocr:result:{content_hash}"
+
+    async def _cached(self, content_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not content_hash:
+            return None
+        try:
+            return await redis_client.get_json(self._cache_key(content_hash))
+        except Exception as e:
+            print(f"[DEBUG] Cache de OCR indisponível: {e}")
+            return None
+
+    async def run(self, image_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Extrai os dados da imagem (do cache ou pelo pool de processos)"""
+        cached = await self._cached(content_hash)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise BaseAppException("Muitas imagens em processamento. Tente novamente em instantes.", status_code=503)
+
+        self.pending += 1
+        started = time.monotonic()
+        try:
+            data = await self.pool.run(extract_receipt_data, image_path)
+        finally:
+            self.pending -= 1
+        self.processed += 1
+        self.ocr_seconds += time.monotonic() - started
+
+        if data.get("error"):
+            self.errors += 1
+        elif content_hash:
+            try:
+                await redis_client.set_json(self._cache_key(content_hash), data, expire=self.cache_ttl)
+            except Exception as e:
+                print(f"[DEBUG] Erro ao gravar cache de OCR: {e}")
+        return data
+
+    async def submit_job(self, user_id: UUID, image_path: str, content_hash: Optional[str] = None) -> Dict:
+        """
+        Agenda o OCR de uma imagem e a criação da nota fiscal
+
+        O arquivo em `image_path` passa a pertencer ao job (é removido ao final).
+        """
+        if self.pending + self.jobs.running >= self.max_pending:
+            self.rejected += 1
+            os.unlink(image_path)
+            raise BaseAppException("Muitas imagens em processamento. Tente novamente em instantes.", status_code=503)
+
+        try:
+            job = await self.jobs.create(user_id, receipt_id=None, data=None)
+        except Exception:
+            # Sem o job o arquivo não tem mais dono
+            os.unlink(image_path)
+            raise
+
+        self.jobs.start(self._run_job(job, user_id, image_path, content_hash))
+        return job
+
+    async def get_job(self, job_id: str, user_id: UUID) -> Optional[Dict]:
+        """Estado do job (None se não existe, expirou ou é de outro usuário)"""
+        return await self.jobs.get(job_id, user_id)
+
+    async def _run_job(self, job: Dict, user_id: UUID, image_path: str, content_hash: Optional[str]):
+        from src.infrastructure.database.base import AsyncSessionLocal
+        from src.infrastructure.repositories.receipt_repository import SQLAlchemyReceiptRepository
+        from src.application.use_cases.receipt_use_cases import ReceiptUseCases
+
+        try:
+            await self.jobs.mark_running(job)
+            data = await self.run(image_path, content_hash)
+            if data.get("error"):
+                job = {**job, "status": "failed", "error": data["error"]}
+            else:
+                async with AsyncSessionLocal() as session:
+                    receipt = await ReceiptUseCases(SQLAlchemyReceiptRepository(session)).create_from_ocr(data, user_id)
+                job = {**job, "status": "done", "receipt_id": str(receipt.id), "data": data}
+        except BaseAppException as e:
+            job = {**job, "status": "failed", "error": e.message}
+        except Exception as e:
+            logging.error(f"Erro no OCR {job['job_id']}: {e}")
+            job = {**job, "status": "failed", "error": str(e)}
+        finally:
+            if os.path.exists(image_path):
+                os.unlink(image_path)
+        await self.jobs.finish(job)
+
+    def stats(self) -> Dict[str, float]:
+        """Profundidade da fila e contadores"""
+        return {
+            "pending": self.pending,
+            "jobs_running": self.jobs.running,
+            "processed": self.processed,
+            "cache_hits": self.cache_hits,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "avg_ocr_ms": round(self.ocr_seconds / self.processed * 1000, 1) if self.processed else 0.0,
+        }
+
+    async def shutdown(self):
+        """Cancela jobs em andamento e encerra os processos do pool"""
+        await self.jobs.shutdown()
+        self.pool.shutdown()
+
+
+# Instância global
+receipt_ocr_queue = ReceiptOCRQueue()
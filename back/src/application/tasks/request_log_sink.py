@@ -0,0 +1,118 @@
+"""
+Sink assíncrono para logs de requisições, gravados em lote no banco
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from src.shared.config import settings
+from src.infrastructure.database.base import AsyncSessionLocal
+from src.infrastructure.database.models.system_log import SystemLog
+from src.infrastructure.repositories.log_repository import SQLAlchemyLogRepository
+
+
+class RequestLogSink:
+    """Fila limitada em memória com um flusher em background.
+
+    A requisição apenas enfileira o log (sem I/O). O flusher grava a cada
+    `batch_size` registros ou `flush_interval_ms` milissegundos, o que vier
+    primeiro. Com a fila cheia o log é descartado e contado em `dropped`.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = settings.LOG_SINK_MAX_QUEUE_SIZE,
+        batch_size: int = settings.LOG_SINK_BATCH_SIZE,
+        flush_interval_ms: int = settings.LOG_SINK_FLUSH_INTERVAL_MS,
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.is_running = False
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self):
+        """Inicia o flusher (precisa de um event loop rodando)"""
+        if self.is_running:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._batch_ready = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+        self.is_running = True
+        print("Sink de logs de requisições iniciado")
+
+    async def stop(self):
+        """Para o flusher gravando tudo o que ainda está na fila"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._batch_ready.set()
+        await self.task
+        self.task = None
+        print(f"Sink de logs de requisições parado ({self.stats()})")
+
+    def enqueue(self, log: SystemLog) -> bool:
+        """Enfileira um log sem bloquear; retorna False se foi descartado"""
+        if not self.is_running:
+            self.start()
+        try:
+            self.queue.put_nowait(log)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        # Acordar o flusher antes do intervalo quando já há um lote completo
+        if self.queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores do sink"""
+        return {
+            "queued": self.queue.qsize() if self.queue else 0,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _take_batch(self) -> List[SystemLog]:
+        batch = []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: List[SystemLog]):
+        try:
+            async with AsyncSessionLocal() as session:
+                self.written += await SQLAlchemyLogRepository(session).create_many(batch)
+        except Exception as e:
+            # Não derrubar o flusher; o lote é perdido e contado
+            self.failed += len(batch)
+            logging.error(f"Erro ao gravar lote de logs: {e}")
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+
+            while self.queue.qsize() >= self.batch_size:
+                await self._write(self._take_batch())
+            batch = self._take_batch()
+            if batch:
+                await self._write(batch)
+
+        # Drenar a fila no desligamento
+        while not self.queue.empty():
+            await self._write(self._take_batch())
+
+
+# Instância global
+request_log_sink = RequestLogSink()
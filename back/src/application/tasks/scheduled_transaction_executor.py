@@ -0,0 +1,99 @@
+"""
+Tarefa agendada para executar transações agendadas automáticas
+"""
+import time
+from datetime import datetime
+from typing import Optional
+import pytz
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from src.shared.config import settings
+from src.infrastructure.database.base import AsyncSessionLocal
+from src.infrastructure.database.unit_of_work import UnitOfWork
+from src.infrastructure.repositories.scheduled_transaction_repository import SQLAlchemyScheduledTransactionRepository
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+from src.application.use_cases.scheduled_transaction_use_cases import ScheduledTransactionUseCases
+
+
+class ScheduledTransactionExecutorTask:
+    """Executa periodicamente as transações agendadas com auto_execute
+
+    Roda também na inicialização, para recuperar as ocorrências perdidas
+    enquanto a API estava fora do ar. Várias réplicas podem rodar ao mesmo
+    tempo: os lotes são reservados com SELECT ... FOR UPDATE SKIP LOCKED.
+    Cada lote é confirmado em um único commit (UnitOfWork), totais diários incluídos.
+    """
+
+    def __init__(
+        self,
+        interval_minutes: int = settings.SCHEDULED_EXECUTOR_INTERVAL_MINUTES,
+        batch_size: int = settings.SCHEDULED_EXECUTOR_BATCH_SIZE,
+    ):
+        self.scheduler = AsyncIOScheduler()
+        self.is_running = False
+        self.interval_minutes = interval_minutes
+        self.batch_size = batch_size
+        self.last_run: Optional[dict] = None
+
+    async def execute_due(self) -> Optional[dict]:
+        """Executa os agendamentos vencidos"""
+        started_at = datetime.now(pytz.UTC)
+        start = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as session:
+                use_cases = ScheduledTransactionUseCases(
+                    scheduled_repository=SQLAlchemyScheduledTransactionRepository(session),
+                    transaction_repository=SQLAlchemyTransactionRepository(session),
+                    account_repository=SQLAlchemyAccountRepository(session),
+                    transaction_rollup_repository=SQLAlchemyTransactionRollupRepository(session),
+                    unit_of_work=UnitOfWork(session),
+                )
+                totals = await use_cases.execute_due(now=started_at, batch_size=self.batch_size)
+        except Exception as e:
+            print(f"Erro na execução de transações agendadas: {e}")
+            return None
+
+        self.last_run = {
+            "started_at": started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            **totals,
+        }
+        if totals["transactions"]:
+            print(
+                f"[{datetime.now()}] Transações agendadas executadas: {totals['transactions']} "
+                f"({totals['scheduled']} agendamentos, {totals['batches']} lotes)"
+            )
+        return self.last_run
+
+    def start(self):
+        """Inicia o agendador"""
+        if self.is_running:
+            return
+
+        self.scheduler.add_job(
+            self.execute_due,
+            trigger=IntervalTrigger(minutes=self.interval_minutes),
+            next_run_time=datetime.now(pytz.UTC),  # Recuperar atrasos já na inicialização
+            id="execute_scheduled_transactions",
+            name="Executar transações agendadas",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
+
+        self.scheduler.start()
+        self.is_running = True
+        print("Tarefa de execução de transações agendadas iniciada")
+
+    def stop(self):
+        """Para o agendador"""
+        if self.is_running:
+            self.scheduler.shutdown()
+            self.is_running = False
+            print("Tarefa de execução de transações agendadas parada")
+
+
+# Instância global
+scheduled_transaction_executor = ScheduledTransactionExecutorTask()
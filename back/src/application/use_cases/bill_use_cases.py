@@ -7,7 +7,9 @@ from src.domain.repositories.bill_repository import BillRepository
 from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.calendar_repository import CalendarEventRepository
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
 from src.application.services.calendar_event_service import CalendarEventService
+from src.application.services.transaction_rollup_service import TransactionRollupService
 from src.infrastructure.database.models.bill import Bill, BillType, BillStatus, RecurrenceType
 from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
 from src.shared.exceptions import NotFoundException, ValidationException
@@ -22,6 +24,7 @@ class BillUseCases:
         account_repository: AccountRepository,
         transaction_repository: TransactionRepository,
         calendar_event_repository: Optional[CalendarEventRepository] = None,
+        transaction_rollup_repository: Optional[TransactionRollupRepository] = None,
     ):
         self.bill_repository = bill_repository
         self.account_repository = account_repository
@@ -29,6 +32,9 @@ class BillUseCases:
         self.calendar_event_service = (
             CalendarEventService(calendar_event_repository) if calendar_event_repository else None
         )
+        self.rollup_service = (
+            TransactionRollupService(transaction_rollup_repository) if transaction_rollup_repository else None
+        )
 
     async def create_bill(
         self,
@@ -165,6 +171,8 @@ class BillUseCases:
 
                 transaction = await self.transaction_repository.create(transaction)
                 bill.transaction_id = transaction.id
+                if self.rollup_service:
+                    await self.rollup_service.record_created(transaction)
 
                 # Atualizar saldo da conta
                 if bill.bill_type == BillType.EXPENSE:
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -104,6 +104,21 @@ class CalendarUseCases:
         """Obtém eventos acessíveis pelo usuário"""
         return await self.event_repository.get_accessible_by_user(user_id, start_date, end_date)
 
+    async def get_user_event_views(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """Eventos acessíveis prontos para resposta (uma consulta, independente da quantidade)"""
+        return await self.event_repository.get_accessible_views(user_id, start_date, end_date)
+
+    async def get_event_view(self, event_id: UUID, user_id: UUID) -> Dict:
+        """Evento pronto para resposta, após verificar o acesso"""
+        await self.get_event(event_id, user_id)
+        views = await self.event_repository.get_views([event_id], user_id)
+        return views[0]
+
     async def update_event(
         self,
         event_id: UUID,
@@ -1,12 +1,16 @@
+import asyncio
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.domain.repositories.planning_repository import PlanningRepository
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.user_repository import UserRepository
 from src.application.notifications.notification_service import NotificationService
 from src.application.use_cases.planning_use_cases import PlanningUseCases
+from src.infrastructure.database.models.planning import Planning
+from src.infrastructure.database.models.user import User
 from src.shared.exceptions import NotFoundException
 
 
@@ -57,6 +61,33 @@ class NotificationUseCases:
         # Calcular progresso
         progress = await self.planning_use_cases.calculate_planning_progress(planning_id)
 
+        return await self.notify_planning(
+            planning, user, progress["actual_amount"], threshold, force_notification
+        )
+
+    async def notify_planning(
+        self,
+        planning: Planning,
+        user: User,
+        actual_amount: Decimal,
+        threshold: float = 10.0,
+        force_notification: bool = False,
+    ) -> dict:
+        """
+        Envia notificações de um planejamento com o valor realizado já calculado
+        
+        Args:
+            planning: Planejamento
+            user: Dono do planejamento
+            actual_amount: Valor realizado no período
+            threshold: Limite de tolerância em porcentagem
+            force_notification: Forçar envio mesmo se não atender critérios
+        
+        Returns:
+            dict com resultado da verificação e notificações
+        """
+        progress = self.planning_use_cases.build_progress(planning, actual_amount)
+
         percentage = progress["percentage"]
         target_amount = progress["target_amount"]
         actual_amount = progress["actual_amount"]
@@ -88,6 +119,7 @@ class NotificationUseCases:
             actual_amount=actual_amount,
             percentage=percentage,
             threshold=threshold,
+            immediate=force_notification,
         )
 
         return {
@@ -99,25 +131,48 @@ class NotificationUseCases:
         }
 
     async def check_all_active_plannings(
-        self, threshold: float = 10.0
+        self,
+        threshold: float = 10.0,
+        shard_count: int = 1,
+        shard_index: int = 0,
+        concurrency: int = 10,
     ) -> List[dict]:
         """
         Verifica todos os planejamentos ativos e envia notificações
         
+        O valor realizado de todos os planejamentos é calculado em uma única query
+        agrupada; os envios são feitos por `concurrency` workers em paralelo.
+        
         Args:
             threshold: Limite de tolerância em porcentagem
+            shard_count: Número de shards (por hash do user_id)
+            shard_index: Shard a verificar
+            concurrency: Número máximo de envios simultâneos
         
         Returns:
             Lista com resultados de cada verificação
         """
-        # Obter todos os planejamentos ativos
-        # TODO: Implementar método get_all_active no repositório
-        # Por enquanto, vamos buscar por usuários conhecidos
-        results = []
+        plannings = await self.planning_repository.get_active_with_spend(shard_count, shard_index)
 
-        # Esta é uma implementação simplificada
-        # Em produção, você deve ter um método para buscar todos os planejamentos ativos
-        # ou iterar por usuários e seus planejamentos
+        # Persistir apenas os valores que mudaram
+        await self.planning_repository.update_actual_amounts({
+            planning.id: actual_amount
+            for planning, actual_amount in plannings
+            if planning.actual_amount != actual_amount
+        })
 
+        results = []
+        pending = iter(plannings)
+
+        async def worker():
+            for planning, actual_amount in pending:
+                try:
+                    result = await self.notify_planning(planning, planning.user, actual_amount, threshold)
+                except Exception as e:
+                    print(f"Erro ao verificar planejamento {planning.id}: {e}")
+                    result = {"notified": False, "error": str(e)}
+                result["planning_id"] = planning.id
+                results.append(result)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
         return results
-
@@ -98,19 +98,24 @@ class PlanningUseCases:
         planning.actual_amount = Decimal(str(actual_amount))
         await self.planning_repository.update(planning)
 
+        return self.build_progress(planning, planning.actual_amount)
+
+    @staticmethod
+    def build_progress(planning: Planning, actual_amount: Decimal) -> dict:
+        """Monta o progresso de um planejamento a partir do valor realizado"""
         target = planning.target_amount or Decimal("0")
         percentage = (
-            float((planning.actual_amount / target) * 100) if target > 0 else 0.0
+            float((actual_amount / target) * 100) if target > 0 else 0.0
         )
-        remaining = target - planning.actual_amount
+        remaining = target - actual_amount
 
         return {
-            "planning_id": planning_id,
+            "planning_id": planning.id,
             "target_amount": target,
-            "actual_amount": planning.actual_amount,
+            "actual_amount": actual_amount,
             "percentage": round(percentage, 2),
             "remaining_amount": remaining,
-            "is_on_track": planning.actual_amount <= target,
+            "is_on_track": actual_amount <= target,
         }
 
     async def create_monthly_planning(
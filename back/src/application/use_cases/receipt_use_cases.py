@@ -34,6 +34,25 @@ class ReceiptUseCases:
 
         return await self.receipt_repository.create(receipt)
 
+    async def create_from_ocr(self, ocr_data: Dict[str, Any], user_id: UUID) -> Receipt:
+        """Cria a nota fiscal a partir dos dados extraídos da imagem por OCR"""
+        receipt = await self.process_qr_code(
+            qr_code_data=ocr_data.get("access_key") or "",
+            user_id=user_id,
+        )
+
+        # Atualizar com dados do OCR
+        if ocr_data.get("access_key"):
+            receipt = await self.update_receipt_data(
+                receipt_id=receipt.id,
+                number=ocr_data.get("number"),
+                series=ocr_data.get("series"),
+                issuer_cnpj=ocr_data.get("issuer_cnpj"),
+                total_amount=ocr_data.get("total_amount"),
+                issue_date=ocr_data.get("issue_date"),
+            )
+        return receipt
+
     def _extract_access_key(self, qr_code_data: str) -> Optional[str]:
         """Extrai chave de acesso do QR Code"""
         # QR Code de NFe geralmente contém a chave de acesso (44 caracteres)
@@ -1,10 +1,16 @@
-from typing import List, Optional
+import calendar
+import uuid
+from contextlib import nullcontext
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 from decimal import Decimal
+import pytz
 from src.domain.repositories.scheduled_transaction_repository import ScheduledTransactionRepository
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.account_repository import AccountRepository
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
+from src.application.services.transaction_rollup_service import TransactionRollupService
 from src.infrastructure.database.models.scheduled_transaction import (
     ScheduledTransaction,
     ScheduledTransactionStatus,
@@ -12,6 +18,7 @@ from src.infrastructure.database.models.scheduled_transaction import (
     TransactionExecution,
 )
 from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
+from src.infrastructure.database.unit_of_work import UnitOfWork
 from src.shared.exceptions import NotFoundException, ValidationException
 
 
@@ -23,10 +30,17 @@ class ScheduledTransactionUseCases:
         scheduled_repository: ScheduledTransactionRepository,
         transaction_repository: TransactionRepository,
         account_repository: AccountRepository,
+        transaction_rollup_repository: Optional[TransactionRollupRepository] = None,
+        unit_of_work: Optional[UnitOfWork] = None,
     ):
         self.scheduled_repository = scheduled_repository
         self.transaction_repository = transaction_repository
         self.account_repository = account_repository
+        self.rollup_service = (
+            TransactionRollupService(transaction_rollup_repository) if transaction_rollup_repository else None
+        )
+        # Com unidade de trabalho, cada lote de execute_due (execuções, saldos e totais) faz um único commit
+        self.unit_of_work = unit_of_work
 
     async def create_scheduled_transaction(
         self,
@@ -100,7 +114,120 @@ class ScheduledTransactionUseCases:
             raise ValidationException("Transação agendada não está ativa")
 
         # Criar transação
-        transaction = Transaction(
+        transaction = await self.transaction_repository.create(self._build_transaction(scheduled))
+        if self.rollup_service:
+            await self.rollup_service.record_created(transaction)
+
+        # Atualizar saldo da conta
+        account = await self.account_repository.get_by_id(scheduled.account_id)
+        account.balance += self._balance_delta(scheduled)
+        await self.account_repository.update(account)
+
+        # Registrar execução
+        execution = TransactionExecution(
+            scheduled_transaction_id=scheduled.id,
+            transaction_id=transaction.id,
+            execution_date=scheduled.next_execution_date,
+            status="success",
+        )
+        # TODO: Adicionar ao repositório de execuções
+
+        self._advance(scheduled)
+        await self.scheduled_repository.update(scheduled)
+
+        return transaction
+
+    async def execute_due(
+        self,
+        now: Optional[datetime] = None,
+        batch_size: int = 100,
+        max_occurrences: int = 1000,
+    ) -> dict:
+        """
+        Executa as transações agendadas automáticas vencidas, em lotes.
+
+        Cada lote é reservado com SKIP LOCKED (seguro com várias réplicas) e todas
+        as ocorrências perdidas até `now` são criadas (recuperação após período
+        fora do ar), com INSERTs em lote e um UPDATE de saldo por conta.
+        `max_occurrences` limita as ocorrências por agendamento em cada lote; o
+        restante é processado no lote seguinte, na mesma execução.
+        """
+        now = now or datetime.now(pytz.UTC)
+        max_occurrences = max(1, max_occurrences)
+        totals = {"batches": 0, "scheduled": 0, "transactions": 0}
+
+        while True:
+            claimed_count, transaction_count, behind = await self._execute_due_batch(
+                now, batch_size, max_occurrences
+            )
+            if not claimed_count:
+                break
+
+            totals["batches"] += 1
+            totals["scheduled"] += claimed_count
+            totals["transactions"] += transaction_count
+            # Lote incompleto: não há mais vencidos, a não ser os que pararam em max_occurrences
+            if claimed_count < batch_size and not behind:
+                break
+
+        return totals
+
+    async def _execute_due_batch(self, now: datetime, batch_size: int, max_occurrences: int) -> tuple:
+        """Reserva e executa um lote
+
+        Retorna (agendamentos reservados, transações criadas, algum agendamento
+        ainda com ocorrências vencidas por causa de `max_occurrences`).
+
+        Dentro da unidade de trabalho, transações, execuções, saldos e totais diários
+        são confirmados juntos (e os bloqueios liberados) em um único commit; uma
+        falha em qualquer etapa desfaz o lote inteiro.
+        """
+        async with self.unit_of_work or nullcontext():
+            claimed = await self.scheduled_repository.claim_due(now, batch_size)
+            if not claimed:
+                return 0, 0, False
+
+            transactions: List[Transaction] = []
+            executions: List[TransactionExecution] = []
+            balance_deltas: Dict[UUID, Decimal] = {}
+            for scheduled in claimed:
+                occurrences = 0
+                while (
+                    scheduled.status == ScheduledTransactionStatus.ACTIVE
+                    and scheduled.next_execution_date <= now
+                    and occurrences < max_occurrences
+                ):
+                    transaction = self._build_transaction(scheduled)
+                    transaction.id = uuid.uuid4()
+                    transactions.append(transaction)
+                    executions.append(
+                        TransactionExecution(
+                            scheduled_transaction_id=scheduled.id,
+                            transaction_id=transaction.id,
+                            execution_date=scheduled.next_execution_date,
+                            status="success",
+                        )
+                    )
+                    balance_deltas[scheduled.account_id] = (
+                        balance_deltas.get(scheduled.account_id, Decimal("0")) + self._balance_delta(scheduled)
+                    )
+                    self._advance(scheduled)
+                    occurrences += 1
+
+            await self.scheduled_repository.save_executions(transactions, executions, balance_deltas)
+            if self.rollup_service:
+                await self.rollup_service.record_created_many(transactions, strict=self.unit_of_work is not None)
+
+            behind = any(
+                scheduled.status == ScheduledTransactionStatus.ACTIVE and scheduled.next_execution_date <= now
+                for scheduled in claimed
+            )
+            return len(claimed), len(transactions), behind
+
+    @staticmethod
+    def _build_transaction(scheduled: ScheduledTransaction) -> Transaction:
+        """Transação correspondente à próxima ocorrência do agendamento"""
+        return Transaction(
             description=scheduled.description,
             amount=scheduled.amount,
             transaction_type=TransactionType(scheduled.transaction_type),
@@ -112,26 +239,18 @@ class ScheduledTransactionUseCases:
             workspace_id=scheduled.workspace_id,
             notes=scheduled.notes,
         )
-        transaction = await self.transaction_repository.create(transaction)
 
-        # Atualizar saldo da conta
-        account = await self.account_repository.get_by_id(scheduled.account_id)
+    @staticmethod
+    def _balance_delta(scheduled: ScheduledTransaction) -> Decimal:
+        """Efeito de uma ocorrência no saldo da conta"""
         if scheduled.transaction_type == "income":
-            account.balance += scheduled.amount
+            return scheduled.amount
         elif scheduled.transaction_type == "expense":
-            account.balance -= scheduled.amount
-        await self.account_repository.update(account)
+            return -scheduled.amount
+        return Decimal("0")
 
-        # Registrar execução
-        execution = TransactionExecution(
-            scheduled_transaction_id=scheduled.id,
-            transaction_id=transaction.id,
-            execution_date=scheduled.next_execution_date,
-            status="success",
-        )
-        # TODO: Adicionar ao repositório de execuções
-
-        # Atualizar próxima execução
+    def _advance(self, scheduled: ScheduledTransaction) -> None:
+        """Registra uma execução e calcula a próxima (ou conclui o agendamento)"""
         scheduled.execution_count += 1
         scheduled.last_execution_date = scheduled.next_execution_date
 
@@ -148,10 +267,6 @@ class ScheduledTransactionUseCases:
         if scheduled.end_date and scheduled.next_execution_date > scheduled.end_date:
             scheduled.status = ScheduledTransactionStatus.COMPLETED
 
-        await self.scheduled_repository.update(scheduled)
-
-        return transaction
-
     def _calculate_next_execution(self, scheduled: ScheduledTransaction) -> datetime:
         """Calcula próxima data de execução"""
         current = scheduled.next_execution_date
@@ -161,13 +276,16 @@ class ScheduledTransactionUseCases:
         elif scheduled.recurrence_type == RecurrenceType.WEEKLY:
             return current + timedelta(weeks=1)
         elif scheduled.recurrence_type == RecurrenceType.MONTHLY:
-            # Próximo mês, mesmo dia
-            if current.month == 12:
-                return current.replace(year=current.year + 1, month=1)
-            else:
-                return current.replace(month=current.month + 1)
+            # Próximo mês, mesmo dia (limitado ao último dia do mês). O dia vem do
+            # agendamento, não da última data, para não "grudar" no 28/29 depois de fevereiro
+            year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+            anchor_day = scheduled.recurrence_day or scheduled.start_date.day
+            day = min(anchor_day, calendar.monthrange(year, month)[1])
+            return current.replace(year=year, month=month, day=day)
         elif scheduled.recurrence_type == RecurrenceType.YEARLY:
-            return current.replace(year=current.year + 1)
+            # 29/02 vira 28/02 nos anos não bissextos e volta a 29/02 nos bissextos
+            day = min(scheduled.start_date.day, calendar.monthrange(current.year + 1, current.month)[1])
+            return current.replace(year=current.year + 1, day=day)
 
         return current
 
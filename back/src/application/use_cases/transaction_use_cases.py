@@ -1,4 +1,5 @@
-from typing import List, Optional
+from contextlib import nullcontext
+from typing import Any, Awaitable, List, Optional
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -7,14 +8,17 @@ from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.bill_repository import BillRepository
 from src.domain.repositories.goal_repository import GoalRepository, GoalContributionRepository
 from src.domain.repositories.calendar_repository import CalendarEventRepository
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
 from src.application.services.calendar_event_service import CalendarEventService
-from src.application.services.gamification_service import GamificationService
+from src.application.services.transaction_rollup_service import TransactionRollupService
+from src.application.tasks.gamification_processor import GamificationProcessor
 from src.infrastructure.database.models.transaction import (
     Transaction,
     TransactionType,
     TransactionStatus,
 )
 from src.infrastructure.database.models.bill import Bill, BillType, BillStatus, RecurrenceType
+from src.infrastructure.database.unit_of_work import UnitOfWork
 from src.shared.exceptions import NotFoundException, ValidationException
 
 
@@ -29,7 +33,9 @@ class TransactionUseCases:
         goal_repository: Optional[GoalRepository] = None,
         goal_contribution_repository: Optional[GoalContributionRepository] = None,
         calendar_event_repository: Optional[CalendarEventRepository] = None,
-        gamification_service: Optional[GamificationService] = None,
+        gamification_processor: Optional[GamificationProcessor] = None,
+        transaction_rollup_repository: Optional[TransactionRollupRepository] = None,
+        unit_of_work: Optional[UnitOfWork] = None,
     ):
         self.transaction_repository = transaction_repository
         self.account_repository = account_repository
@@ -39,7 +45,18 @@ class TransactionUseCases:
         self.calendar_event_service = (
             CalendarEventService(calendar_event_repository) if calendar_event_repository else None
         )
-        self.gamification_service = gamification_service
+        self.gamification_processor = gamification_processor
+        self.rollup_service = (
+            TransactionRollupService(transaction_rollup_repository) if transaction_rollup_repository else None
+        )
+        # Com unidade de trabalho, criação/edição/remoção fazem um único commit
+        self.unit_of_work = unit_of_work
+
+    async def _optional(self, step: Awaitable[Any], description: str) -> Any:
+        """Passo não essencial (totais, calendário, bill): isolado em SAVEPOINT dentro da unidade de trabalho"""
+        if self.unit_of_work:
+            return await self.unit_of_work.optional(step, description)
+        return await step
 
     async def create_transaction(
         self,
@@ -88,80 +105,77 @@ class TransactionUseCases:
             workspace_id=workspace_id,
         )
 
-        transaction = await self.transaction_repository.create(transaction)
+        async with self.unit_of_work or nullcontext():
+            transaction = await self.transaction_repository.create(transaction)
 
-        # Criar evento do calendário para transações concluídas
-        if transaction.status == TransactionStatus.COMPLETED and self.calendar_event_service:
-            try:
-                await self.calendar_event_service.create_transaction_event(
-                    transaction_id=transaction.id,
-                    title=description,
-                    transaction_date=transaction_date,
-                    user_id=user_id,
-                    workspace_id=workspace_id,
-                    amount=amount,
-                    transaction_type=transaction_type,
-                )
-            except Exception as e:
-                print(f"[DEBUG] Erro ao criar evento de calendário para transação: {e}")
-
-        # Se for uma transação de poupança (income ou expense na categoria de poupança), distribuir para metas
-        # TODO: Implementar distribuição automática para metas quando necessário
-        # if category_id and transaction.status == TransactionStatus.COMPLETED:
-        #     await self._distribute_to_goals(transaction, category_id, user_id)
-
-        # Se for uma despesa pendente, criar automaticamente uma bill (conta a pagar)
-        if (transaction.transaction_type == TransactionType.EXPENSE and 
-            transaction.status == TransactionStatus.PENDING and 
-            self.bill_repository):
-            try:
-                bill = Bill(
-                    name=description,
-                    description=notes,
-                    bill_type=BillType.EXPENSE,
-                    amount=amount,
-                    due_date=transaction_date,
-                    status=BillStatus.PENDING,
-                    is_recurring=False,
-                    recurrence_type=RecurrenceType.NONE,
-                    user_id=user_id,
-                    account_id=account_id,
-                    category_id=category_id,
-                    transaction_id=transaction.id,  # Associar à transação
-                )
-                await self.bill_repository.create(bill)
-                print(f"[DEBUG] Bill criada automaticamente para transação pendente: {transaction.id}")
-            except Exception as e:
-                print(f"[ERROR] Erro ao criar bill automaticamente: {e}")
-                import traceback
-                traceback.print_exc()
-                # Não falhar a criação da transação se a bill falhar
-
-        # Atualizar saldo da conta se a transação estiver completa
-        if transaction.status == TransactionStatus.COMPLETED:
-            if transaction.transaction_type == TransactionType.INCOME:
-                account.balance += amount
-            elif transaction.transaction_type == TransactionType.EXPENSE:
-                account.balance -= amount
-            # TRANSFER não altera saldo aqui (será tratado em outro lugar)
-            await self.account_repository.update(account)
+            # Atualizar totais diários
+            if self.rollup_service:
+                await self._optional(self.rollup_service.record_created(transaction), "Totais diários")
 
-        # Gamificação: Adicionar XP e verificar badges
-        if self.gamification_service:
-            try:
-                # Adicionar XP por criar transação
-                await self.gamification_service.add_points(user_id, 10, "Registrar transação")
-                
-                # Verificar e conceder badges automaticamente
-                await self.gamification_service.check_achievements(user_id)
-                
-                # Atualizar streak
-                await self.gamification_service.update_streak(user_id)
-            except Exception as e:
-                print(f"[DEBUG] Erro ao processar gamificação: {e}")
-                import traceback
-                traceback.print_exc()
-                # Não falhar a criação da transação se a gamificação falhar
+            # Criar evento do calendário para transações concluídas
+            if transaction.status == TransactionStatus.COMPLETED and self.calendar_event_service:
+                try:
+                    await self._optional(
+                        self.calendar_event_service.create_transaction_event(
+                            transaction_id=transaction.id,
+                            title=description,
+                            transaction_date=transaction_date,
+                            user_id=user_id,
+                            workspace_id=workspace_id,
+                            amount=amount,
+                            transaction_type=transaction_type,
+                        ),
+                        "Evento de calendário da transação",
+                    )
+                except Exception as e:
+                    print(f"[DEBUG] Erro ao criar evento de calendário para transação: {e}")
+
+            # Se for uma transação de poupança (income ou expense na categoria de poupança), distribuir para metas
+            # TODO: Implementar distribuição automática para metas quando necessário
+            # if category_id and transaction.status == TransactionStatus.COMPLETED:
+            #     await self._distribute_to_goals(transaction, category_id, user_id)
+
+            # Se for uma despesa pendente, criar automaticamente uma bill (conta a pagar)
+            if (transaction.transaction_type == TransactionType.EXPENSE and 
+                transaction.status == TransactionStatus.PENDING and 
+                self.bill_repository):
+                try:
+                    bill = Bill(
+                        name=description,
+                        description=notes,
+                        bill_type=BillType.EXPENSE,
+                        amount=amount,
+                        due_date=transaction_date,
+                        status=BillStatus.PENDING,
+                        is_recurring=False,
+                        recurrence_type=RecurrenceType.NONE,
+                        user_id=user_id,
+                        account_id=account_id,
+                        category_id=category_id,
+                        transaction_id=transaction.id,  # Associar à transação
+                    )
+                    if await self._optional(self.bill_repository.create(bill), "Bill automática"):
+                        print(f"[DEBUG] Bill criada automaticamente para transação pendente: {transaction.id}")
+                except Exception as e:
+                    print(f"[ERROR] Erro ao criar bill automaticamente: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    # Não falhar a criação da transação se a bill falhar
+
+            # Atualizar saldo da conta se a transação estiver completa
+            if transaction.status == TransactionStatus.COMPLETED:
+                if transaction.transaction_type == TransactionType.INCOME:
+                    account.balance += amount
+                elif transaction.transaction_type == TransactionType.EXPENSE:
+                    account.balance -= amount
+                # TRANSFER não altera saldo aqui (será tratado em outro lugar)
+                await self.account_repository.update(account)
+
+        # Gamificação: XP, badges e sequência de dias são aplicados em background
+        if self.gamification_processor:
+            self.gamification_processor.submit(
+                user_id, 10, "Registrar transação", activity=True, check_achievements=True
+            )
 
         return transaction
 
@@ -197,6 +211,7 @@ class TransactionUseCases:
         transaction = await self.get_transaction(transaction_id)
         old_amount = transaction.amount
         old_status = transaction.status
+        old_snapshot = TransactionRollupService.snapshot(transaction) if self.rollup_service else None
         account = await self.account_repository.get_by_id(transaction.account_id)
 
         if description:
@@ -215,116 +230,130 @@ class TransactionUseCases:
         if notes is not None:
             transaction.notes = notes
 
-        transaction = await self.transaction_repository.update(transaction)
+        async with self.unit_of_work or nullcontext():
+            transaction = await self.transaction_repository.update(transaction)
 
-        # Atualizar bill associada se for uma despesa
-        if (transaction.transaction_type == TransactionType.EXPENSE and 
-            self.bill_repository):
-            try:
-                # Buscar bill associada à transação
-                bill = await self.bill_repository.get_by_transaction_id(transaction.id)
+            # Atualizar totais diários
+            if self.rollup_service:
+                await self._optional(self.rollup_service.record_updated(old_snapshot, transaction), "Totais diários")
+
+            # Atualizar bill associada se for uma despesa
+            if (transaction.transaction_type == TransactionType.EXPENSE and 
+                self.bill_repository):
+                await self._optional(self._sync_bill(transaction), "Sincronização da bill")
+
+            # Atualizar saldo da conta se necessário
+            if old_status == TransactionStatus.COMPLETED:
+                if transaction.transaction_type == TransactionType.INCOME:
+                    account.balance -= old_amount
+                elif transaction.transaction_type == TransactionType.EXPENSE:
+                    account.balance += old_amount
+
+            if transaction.status == TransactionStatus.COMPLETED:
+                if transaction.transaction_type == TransactionType.INCOME:
+                    account.balance += transaction.amount
+                elif transaction.transaction_type == TransactionType.EXPENSE:
+                    account.balance -= transaction.amount
+
+            await self.account_repository.update(account)
+
+        return transaction
+
+    async def _sync_bill(self, transaction: Transaction) -> None:
+        """Mantém a bill da despesa em dia com o status e os campos da transação"""
+        try:
+            # Buscar bill associada à transação
+            bill = await self.bill_repository.get_by_transaction_id(transaction.id)
                 
-                # Verificar se houve mudanças relevantes
-                bill_needs_update = False
-                if bill:
-                    # Normalizar datas para comparação (remover timezone se necessário)
-                    bill_due_date = bill.due_date.replace(tzinfo=None) if bill.due_date and bill.due_date.tzinfo else bill.due_date
-                    trans_date = transaction.transaction_date.replace(tzinfo=None) if transaction.transaction_date and transaction.transaction_date.tzinfo else transaction.transaction_date
+            # Verificar se houve mudanças relevantes
+            bill_needs_update = False
+            if bill:
+                # Normalizar datas para comparação (remover timezone se necessário)
+                bill_due_date = bill.due_date.replace(tzinfo=None) if bill.due_date and bill.due_date.tzinfo else bill.due_date
+                trans_date = transaction.transaction_date.replace(tzinfo=None) if transaction.transaction_date and transaction.transaction_date.tzinfo else transaction.transaction_date
                     
-                    # Verificar se precisa atualizar campos da bill
-                    if (bill.name != transaction.description or
-                        (bill.description or '') != (transaction.notes or '') or
-                        bill.amount != transaction.amount or
-                        bill_due_date != trans_date or
-                        bill.category_id != transaction.category_id or
-                        bill.account_id != transaction.account_id):
-                        bill_needs_update = True
-                
-                # Atualizar ou criar bill baseado no status da transação
-                if transaction.status == TransactionStatus.COMPLETED:
-                    # Transação foi concluída -> marcar bill como paga
-                    if bill:
-                        bill.status = BillStatus.PAID
-                        bill.payment_date = transaction.transaction_date
-                        # Sincronizar todos os campos
-                        bill.name = transaction.description
-                        bill.description = transaction.notes
-                        bill.amount = transaction.amount
-                        bill.due_date = transaction.transaction_date
-                        bill.category_id = transaction.category_id
-                        bill.account_id = transaction.account_id
-                        await self.bill_repository.update(bill)
-                        print(f"[DEBUG] Bill {bill.id} atualizada para PAID e sincronizada com transação {transaction.id}")
-                    else:
-                        # Se não existe bill, criar uma (caso raro)
-                        bill = Bill(
-                            name=transaction.description,
-                            description=transaction.notes,
-                            bill_type=BillType.EXPENSE,
-                            amount=transaction.amount,
-                            due_date=transaction.transaction_date,
-                            status=BillStatus.PAID,
-                            payment_date=transaction.transaction_date,
-                            is_recurring=False,
-                            recurrence_type=RecurrenceType.NONE,
-                            user_id=transaction.user_id,
-                            account_id=transaction.account_id,
-                            category_id=transaction.category_id,
-                            transaction_id=transaction.id,
-                        )
-                        await self.bill_repository.create(bill)
-                        print(f"[DEBUG] Bill criada como paga para transação {transaction.id}")
+                # Verificar se precisa atualizar campos da bill
+                if (bill.name != transaction.description or
+                    (bill.description or '') != (transaction.notes or '') or
+                    bill.amount != transaction.amount or
+                    bill_due_date != trans_date or
+                    bill.category_id != transaction.category_id or
+                    bill.account_id != transaction.account_id):
+                    bill_needs_update = True
                 
-                elif transaction.status == TransactionStatus.PENDING:
-                    # Transação voltou para pendente -> marcar bill como pendente
-                    if bill:
-                        bill.status = BillStatus.PENDING
-                        bill.payment_date = None
-                        # Sincronizar todos os campos
-                        bill.name = transaction.description
-                        bill.description = transaction.notes
-                        bill.amount = transaction.amount
-                        bill.due_date = transaction.transaction_date
-                        bill.category_id = transaction.category_id
-                        bill.account_id = transaction.account_id
-                        await self.bill_repository.update(bill)
-                        print(f"[DEBUG] Bill {bill.id} atualizada para PENDING e sincronizada com transação {transaction.id}")
-                    else:
-                        # Se não existe bill, criar uma pendente
-                        bill = Bill(
-                            name=transaction.description,
-                            description=transaction.notes,
-                            bill_type=BillType.EXPENSE,
-                            amount=transaction.amount,
-                            due_date=transaction.transaction_date,
-                            status=BillStatus.PENDING,
-                            is_recurring=False,
-                            recurrence_type=RecurrenceType.NONE,
-                            user_id=transaction.user_id,
-                            account_id=transaction.account_id,
-                            category_id=transaction.category_id,
-                            transaction_id=transaction.id,
-                        )
-                        await self.bill_repository.create(bill)
-                        print(f"[DEBUG] Bill criada como pendente para transação {transaction.id}")
+            # Atualizar ou criar bill baseado no status da transação
+            if transaction.status == TransactionStatus.COMPLETED:
+                # Transação foi concluída -> marcar bill como paga
+                if bill:
+                    bill.status = BillStatus.PAID
+                    bill.payment_date = transaction.transaction_date
+                    # Sincronizar todos os campos
+                    bill.name = transaction.description
+                    bill.description = transaction.notes
+                    bill.amount = transaction.amount
+                    bill.due_date = transaction.transaction_date
+                    bill.category_id = transaction.category_id
+                    bill.account_id = transaction.account_id
+                    await self.bill_repository.update(bill)
+                    print(f"[DEBUG] Bill {bill.id} atualizada para PAID e sincronizada com transação {transaction.id}")
+                else:
+                    # Se não existe bill, criar uma (caso raro)
+                    bill = Bill(
+                        name=transaction.description,
+                        description=transaction.notes,
+                        bill_type=BillType.EXPENSE,
+                        amount=transaction.amount,
+                        due_date=transaction.transaction_date,
+                        status=BillStatus.PAID,
+                        payment_date=transaction.transaction_date,
+                        is_recurring=False,
+                        recurrence_type=RecurrenceType.NONE,
+                        user_id=transaction.user_id,
+                        account_id=transaction.account_id,
+                        category_id=transaction.category_id,
+                        transaction_id=transaction.id,
+                    )
+                    await self.bill_repository.create(bill)
+                    print(f"[DEBUG] Bill criada como paga para transação {transaction.id}")
                 
-                elif transaction.status == TransactionStatus.CANCELLED:
-                    # Transação foi cancelada -> cancelar bill
-                    if bill:
-                        bill.status = BillStatus.CANCELLED
-                        # Ainda sincronizar campos mesmo quando cancelada
-                        bill.name = transaction.description
-                        bill.description = transaction.notes
-                        bill.amount = transaction.amount
-                        bill.due_date = transaction.transaction_date
-                        bill.category_id = transaction.category_id
-                        bill.account_id = transaction.account_id
-                        await self.bill_repository.update(bill)
-                        print(f"[DEBUG] Bill {bill.id} cancelada e sincronizada com transação {transaction.id}")
+            elif transaction.status == TransactionStatus.PENDING:
+                # Transação voltou para pendente -> marcar bill como pendente
+                if bill:
+                    bill.status = BillStatus.PENDING
+                    bill.payment_date = None
+                    # Sincronizar todos os campos
+                    bill.name = transaction.description
+                    bill.description = transaction.notes
+                    bill.amount = transaction.amount
+                    bill.due_date = transaction.transaction_date
+                    bill.category_id = transaction.category_id
+                    bill.account_id = transaction.account_id
+                    await self.bill_repository.update(bill)
+                    print(f"[DEBUG] Bill {bill.id} atualizada para PENDING e sincronizada com transação {transaction.id}")
+                else:
+                    # Se não existe bill, criar uma pendente
+                    bill = Bill(
+                        name=transaction.description,
+                        description=transaction.notes,
+                        bill_type=BillType.EXPENSE,
+                        amount=transaction.amount,
+                        due_date=transaction.transaction_date,
+                        status=BillStatus.PENDING,
+                        is_recurring=False,
+                        recurrence_type=RecurrenceType.NONE,
+                        user_id=transaction.user_id,
+                        account_id=transaction.account_id,
+                        category_id=transaction.category_id,
+                        transaction_id=transaction.id,
+                    )
+                    await self.bill_repository.create(bill)
+                    print(f"[DEBUG] Bill criada como pendente para transação {transaction.id}")
                 
-                # Se a bill existe e houve mudanças em campos (mas status não mudou), sincronizar
-                elif bill and bill_needs_update:
-                    # Sincronizar todos os campos mantendo o status atual
+            elif transaction.status == TransactionStatus.CANCELLED:
+                # Transação foi cancelada -> cancelar bill
+                if bill:
+                    bill.status = BillStatus.CANCELLED
+                    # Ainda sincronizar campos mesmo quando cancelada
                     bill.name = transaction.description
                     bill.description = transaction.notes
                     bill.amount = transaction.amount
@@ -332,59 +361,66 @@ class TransactionUseCases:
                     bill.category_id = transaction.category_id
                     bill.account_id = transaction.account_id
                     await self.bill_repository.update(bill)
-                    print(f"[DEBUG] Bill {bill.id} sincronizada com transação {transaction.id} (campos atualizados, status mantido: {bill.status})")
+                    print(f"[DEBUG] Bill {bill.id} cancelada e sincronizada com transação {transaction.id}")
+                
+            # Se a bill existe e houve mudanças em campos (mas status não mudou), sincronizar
+            elif bill and bill_needs_update:
+                # Sincronizar todos os campos mantendo o status atual
+                bill.name = transaction.description
+                bill.description = transaction.notes
+                bill.amount = transaction.amount
+                bill.due_date = transaction.transaction_date
+                bill.category_id = transaction.category_id
+                bill.account_id = transaction.account_id
+                await self.bill_repository.update(bill)
+                print(f"[DEBUG] Bill {bill.id} sincronizada com transação {transaction.id} (campos atualizados, status mantido: {bill.status})")
                     
-            except Exception as e:
-                print(f"[ERROR] Erro ao atualizar bill associada: {e}")
-                import traceback
-                traceback.print_exc()
-                # Não falhar a atualização da transação se a bill falhar
-
-        # Atualizar saldo da conta se necessário
-        if old_status == TransactionStatus.COMPLETED:
-            if transaction.transaction_type == TransactionType.INCOME:
-                account.balance -= old_amount
-            elif transaction.transaction_type == TransactionType.EXPENSE:
-                account.balance += old_amount
-
-        if transaction.status == TransactionStatus.COMPLETED:
-            if transaction.transaction_type == TransactionType.INCOME:
-                account.balance += transaction.amount
-            elif transaction.transaction_type == TransactionType.EXPENSE:
-                account.balance -= transaction.amount
-
-        await self.account_repository.update(account)
-
-        return transaction
+        except Exception as e:
+            print(f"[ERROR] Erro ao atualizar bill associada: {e}")
+            import traceback
+            traceback.print_exc()
+            # Não falhar a atualização da transação se a bill falhar
 
     async def delete_transaction(self, transaction_id: UUID) -> bool:
         """Deleta uma transação"""
         transaction = await self.get_transaction(transaction_id)
         
-        # Cancelar bill associada se for uma despesa
-        if (transaction.transaction_type == TransactionType.EXPENSE and 
-            self.bill_repository):
-            try:
-                bill = await self.bill_repository.get_by_transaction_id(transaction_id)
-                if bill:
-                    bill.status = BillStatus.CANCELLED
-                    await self.bill_repository.update(bill)
-                    print(f"[DEBUG] Bill {bill.id} cancelada (transação {transaction_id} deletada)")
-            except Exception as e:
-                print(f"[ERROR] Erro ao cancelar bill associada: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        # Reverter saldo da conta se necessário
-        if transaction.status == TransactionStatus.COMPLETED:
-            account = await self.account_repository.get_by_id(transaction.account_id)
-            if transaction.transaction_type == TransactionType.INCOME:
-                account.balance -= transaction.amount
-            elif transaction.transaction_type == TransactionType.EXPENSE:
-                account.balance += transaction.amount
-            await self.account_repository.update(account)
+        async with self.unit_of_work or nullcontext():
+            # Cancelar bill associada se for uma despesa
+            if (transaction.transaction_type == TransactionType.EXPENSE and 
+                self.bill_repository):
+                await self._optional(self._cancel_bill(transaction_id), "Cancelamento da bill")
+            
+            # Reverter saldo da conta se necessário
+            if transaction.status == TransactionStatus.COMPLETED:
+                account = await self.account_repository.get_by_id(transaction.account_id)
+                if transaction.transaction_type == TransactionType.INCOME:
+                    account.balance -= transaction.amount
+                elif transaction.transaction_type == TransactionType.EXPENSE:
+                    account.balance += transaction.amount
+                await self.account_repository.update(account)
+
+            rollup_snapshot = TransactionRollupService.snapshot(transaction) if self.rollup_service else None
+            deleted = await self.transaction_repository.delete(transaction_id)
 
-        return await self.transaction_repository.delete(transaction_id)
+            # Atualizar totais diários
+            if deleted and self.rollup_service:
+                await self._optional(self.rollup_service.record_deleted(rollup_snapshot), "Totais diários")
+
+        return deleted
+
+    async def _cancel_bill(self, transaction_id: UUID) -> None:
+        """Cancela a bill da despesa removida"""
+        try:
+            bill = await self.bill_repository.get_by_transaction_id(transaction_id)
+            if bill:
+                bill.status = BillStatus.CANCELLED
+                await self.bill_repository.update(bill)
+                print(f"[DEBUG] Bill {bill.id} cancelada (transação {transaction_id} deletada)")
+        except Exception as e:
+            print(f"[ERROR] Erro ao cancelar bill associada: {e}")
+            import traceback
+            traceback.print_exc()
 
     async def search_transactions(
         self,
@@ -5,6 +5,8 @@ from decimal import Decimal
 from src.domain.repositories.transfer_repository import TransferRepository
 from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.transaction_repository import TransactionRepository
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
+from src.application.services.transaction_rollup_service import TransactionRollupService
 from src.infrastructure.database.models.transfer import Transfer, TransferStatus
 from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
 from src.shared.exceptions import NotFoundException, ValidationException
@@ -18,10 +20,14 @@ class TransferUseCases:
         transfer_repository: TransferRepository,
         account_repository: AccountRepository,
         transaction_repository: TransactionRepository,
+        transaction_rollup_repository: Optional[TransactionRollupRepository] = None,
     ):
         self.transfer_repository = transfer_repository
         self.account_repository = account_repository
         self.transaction_repository = transaction_repository
+        self.rollup_service = (
+            TransactionRollupService(transaction_rollup_repository) if transaction_rollup_repository else None
+        )
 
     async def create_transfer(
         self,
@@ -103,6 +109,8 @@ class TransferUseCases:
             notes=transfer.notes,
         )
         to_transaction = await self.transaction_repository.create(to_transaction)
+        if self.rollup_service:
+            await self.rollup_service.record_created_many([from_transaction, to_transaction])
         
         # Atualizar saldos
         from_account.balance -= transfer.amount
@@ -149,16 +157,29 @@ class TransferUseCases:
             await self.account_repository.update(from_account)
             await self.account_repository.update(to_account)
             
+            # Desvincular as transações da transferência antes de removê-las (chaves estrangeiras)
+            transaction_ids = [
+                transaction_id
+                for transaction_id in (transfer.from_transaction_id, transfer.to_transaction_id)
+                if transaction_id
+            ]
+            transfer.from_transaction_id = None
+            transfer.to_transaction_id = None
+            transfer.status = TransferStatus.CANCELLED
+            transfer = await self.transfer_repository.update(transfer)
+            
             # Cancelar transações
-            if transfer.from_transaction_id:
-                from_trans = await self.transaction_repository.get_by_id(transfer.from_transaction_id)
-                if from_trans:
-                    await self.transaction_repository.delete(from_trans.id)
+            deleted_snapshots = []
+            for transaction_id in transaction_ids:
+                transaction = await self.transaction_repository.get_by_id(transaction_id)
+                if transaction:
+                    snapshot = TransactionRollupService.snapshot(transaction)
+                    if await self.transaction_repository.delete(transaction.id):
+                        deleted_snapshots.append(snapshot)
             
-            if transfer.to_transaction_id:
-                to_trans = await self.transaction_repository.get_by_id(transfer.to_transaction_id)
-                if to_trans:
-                    await self.transaction_repository.delete(to_trans.id)
+            if self.rollup_service:
+                await self.rollup_service.record_deleted_many(deleted_snapshots)
+            return transfer
         
         transfer.status = TransferStatus.CANCELLED
         return await self.transfer_repository.update(transfer)
@@ -3,6 +3,7 @@ from uuid import UUID
 from src.domain.repositories.user_repository import UserRepository
 from src.infrastructure.database.models.user import User, UserRole
 from src.application.auth.jwt_service import JWTService
+from src.application.auth.password_hasher import password_hasher
 from src.shared.exceptions import ValidationException, ConflictException, NotFoundException
 
 
@@ -32,7 +33,7 @@ class UserUseCases:
             raise ConflictException("Username já está em uso")
 
         # Criar usuário
-        hashed_password = self.jwt_service.get_password_hash(password)
+        hashed_password = await password_hasher.hash(password)
         user = User(
             email=email,
             username=username,
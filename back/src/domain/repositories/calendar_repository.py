@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -63,6 +63,38 @@ class CalendarEventRepository(ABC):
         """Obtém todos os eventos acessíveis pelo usuário (próprios + compartilhados)"""
         pass
 
+    @abstractmethod
+    async def get_accessible_views(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """Eventos acessíveis já com nomes, contadores e participação do usuário (leitura do calendário)"""
+        pass
+
+    @abstractmethod
+    async def get_views(self, event_ids: List[UUID], viewer_id: UUID) -> List[Dict]:
+        """Mesma leitura de get_accessible_views para eventos específicos"""
+        pass
+
+    @abstractmethod
+    async def insert_missing_financial_events(
+        self, user_id: UUID, since: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Cria em lote os eventos de transações, contas e metas que ainda não têm evento"""
+        pass
+
+    @abstractmethod
+    async def get_sync_watermark(self, user_id: UUID) -> Optional[datetime]:
+        """Obtém a marca d'água da última sincronização do usuário"""
+        pass
+
+    @abstractmethod
+    async def save_sync_watermark(self, user_id: UUID, synced_until: datetime) -> None:
+        """Grava a marca d'água e confirma a sincronização"""
+        pass
+
     @abstractmethod
     async def update(self, event: CalendarEvent) -> CalendarEvent:
         """Atualiza um evento"""
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from src.infrastructure.database.models.gamification import (
     Badge,
@@ -49,6 +49,11 @@ class UserBadgeRepository(ABC):
     async def update(self, user_badge: UserBadge) -> UserBadge:
         pass
 
+    @abstractmethod
+    async def add(self, user_badge: UserBadge) -> None:
+        """Adiciona à sessão sem commit (gravado no próximo commit)"""
+        pass
+
 
 class UserLevelRepository(ABC):
     """Interface do repositório de níveis de usuários"""
@@ -65,6 +70,40 @@ class UserLevelRepository(ABC):
     async def update(self, user_level: UserLevel) -> UserLevel:
         pass
 
+    @abstractmethod
+    async def get_achievement_counters(self, user_id: UUID) -> Dict[str, int]:
+        """Contadores dos badges: transactions, goals, completed_goals"""
+        pass
+
+    @abstractmethod
+    async def get_leaderboard_scopes(self, user_id: UUID) -> Dict[str, List[UUID]]:
+        """Famílias e workspaces do usuário: {"family": [...], "workspace": [...]}"""
+        pass
+
+    @abstractmethod
+    async def get_leaderboard_profiles(self, user_ids: List[UUID]) -> Dict[UUID, Tuple[str, int]]:
+        """Nome e nível de cada usuário"""
+        pass
+
+    @abstractmethod
+    async def get_leaderboard_top(
+        self, limit: int, family_id: Optional[UUID] = None, workspace_id: Optional[UUID] = None
+    ) -> List[Tuple[UUID, str, int, int]]:
+        """Ranking direto do banco: (user_id, nome, nível, pontos)"""
+        pass
+
+    @abstractmethod
+    async def get_leaderboard_scores(
+        self, family_id: Optional[UUID] = None, workspace_id: Optional[UUID] = None
+    ) -> List[Tuple[UUID, int]]:
+        """Pontos de todos os usuários de um escopo (global, família ou workspace)"""
+        pass
+
+    @abstractmethod
+    async def get_leaderboard_snapshot(self) -> Tuple[List[Tuple[UUID, int]], List[Tuple[str, UUID, UUID]]]:
+        """Pontos de todos os usuários e vínculos (escopo, id do escopo, user_id)"""
+        pass
+
 
 class ChallengeRepository(ABC):
     """Interface do repositório de desafios"""
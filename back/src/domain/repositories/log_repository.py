@@ -13,6 +13,11 @@ class LogRepository(ABC):
         """Cria um novo log"""
         pass
 
+    @abstractmethod
+    async def create_many(self, logs: List[SystemLog]) -> int:
+        """Cria vários logs em um único INSERT multi-linha"""
+        pass
+
     @abstractmethod
     async def get_by_id(self, log_id: UUID) -> Optional[SystemLog]:
         """Obtém um log por ID"""
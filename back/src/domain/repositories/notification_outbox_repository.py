@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import List
+from uuid import UUID
+from datetime import datetime
+from src.infrastructure.database.models.notification_outbox import NotificationOutbox
+
+
+class NotificationOutboxRepository(ABC):
+    """Interface do repositório da fila de saída de notificações"""
+
+    @abstractmethod
+    async def enqueue(self, message: NotificationOutbox) -> NotificationOutbox:
+        """Grava uma mensagem pendente"""
+        pass
+
+    @abstractmethod
+    async def claim_batch(self, limit: int, lease_seconds: int) -> List[NotificationOutbox]:
+        """
+        Reserva até `limit` mensagens pendentes vencidas, adiando a próxima tentativa
+        por `lease_seconds` (se o worker cair, a mensagem volta a ficar disponível)
+        """
+        pass
+
+    @abstractmethod
+    async def mark_sent(self, message_ids: List[UUID]) -> None:
+        """Marca mensagens como enviadas"""
+        pass
+
+    @abstractmethod
+    async def mark_failed(self, message_id: UUID, error: str, next_attempt_at: datetime, give_up: bool) -> None:
+        """Registra uma falha de envio, reagendando ou desistindo da mensagem"""
+        pass
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from src.infrastructure.database.models.planning import (
     Planning,
     MonthlyPlanning,
@@ -40,6 +41,18 @@ class PlanningRepository(ABC):
         """Deleta um planejamento"""
         pass
 
+    @abstractmethod
+    async def get_active_with_spend(
+        self, shard_count: int = 1, shard_index: int = 0
+    ) -> List[Tuple[Planning, Decimal]]:
+        """Obtém planejamentos ativos (do shard) com o valor realizado no período de cada um"""
+        pass
+
+    @abstractmethod
+    async def update_actual_amounts(self, amounts: Dict[UUID, Decimal]) -> int:
+        """Atualiza o valor realizado de vários planejamentos"""
+        pass
+
 
 class MonthlyPlanningRepository(ABC):
     """Interface do repositório de planejamentos mensais"""
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
-from src.infrastructure.database.models.scheduled_transaction import ScheduledTransaction
+from decimal import Decimal
+from src.infrastructure.database.models.scheduled_transaction import ScheduledTransaction, TransactionExecution
+from src.infrastructure.database.models.transaction import Transaction
 
 
 class ScheduledTransactionRepository(ABC):
@@ -25,6 +27,21 @@ class ScheduledTransactionRepository(ABC):
         """Obtém transações agendadas que precisam ser executadas"""
         pass
 
+    @abstractmethod
+    async def claim_due(self, before_date: datetime, limit: int) -> List[ScheduledTransaction]:
+        """Reserva (bloqueia) um lote de agendamentos vencidos até o commit da transação"""
+        pass
+
+    @abstractmethod
+    async def save_executions(
+        self,
+        transactions: List[Transaction],
+        executions: List[TransactionExecution],
+        balance_deltas: Dict[UUID, Decimal],
+    ) -> None:
+        """Grava em lote as execuções do lote reservado e libera os bloqueios (no commit)"""
+        pass
+
     @abstractmethod
     async def update(self, scheduled: ScheduledTransaction) -> ScheduledTransaction:
         pass
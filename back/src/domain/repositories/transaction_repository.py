@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
 from src.infrastructure.database.models.transaction import Transaction
@@ -28,6 +28,45 @@ class TransactionRepository(ABC):
         """Obtém transações de um usuário"""
         pass
 
+    @abstractmethod
+    def stream_export_rows(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Linhas de exportação (data, descrição, tipo, valor, status, categoria, conta)
+        em lotes de `chunk_size`, lidas por cursor no servidor
+        """
+        pass
+
+    @abstractmethod
+    async def get_visible_page(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[Transaction]:
+        """Página (keyset) das transações do usuário e das famílias com permissão de visualização"""
+        pass
+
+    @abstractmethod
+    async def aggregate(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        group_by: Sequence[str] = (),
+        transaction_type: Optional[str] = None,
+        status: Optional[str] = "completed",
+    ) -> List[Dict]:
+        """Obtém soma e contagem de transações agrupadas por tipo, status, categoria, conta ou período"""
+        pass
+
     @abstractmethod
     async def get_by_account_id(
         self,
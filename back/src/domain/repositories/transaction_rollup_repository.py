@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+
+
+class TransactionRollupRepository(ABC):
+    """Interface do repositório de totais diários de transações"""
+
+    @abstractmethod
+    async def apply_delta(
+        self,
+        user_id: UUID,
+        transaction_type: str,
+        status: str,
+        day: date,
+        amount: Decimal,
+        count: int,
+        workspace_id: Optional[UUID] = None,
+        category_id: Optional[UUID] = None,
+    ) -> None:
+        """Soma (ou subtrai, com valores negativos) um delta ao total diário da chave"""
+        pass
+
+    @abstractmethod
+    async def apply_deltas(self, deltas: List[Dict]) -> None:
+        """Aplica vários deltas (chaves distintas, mesmos campos de apply_delta) em uma escrita: todos ou nenhum"""
+        pass
+
+    @abstractmethod
+    async def get_totals(
+        self,
+        user_id: UUID,
+        start_day: date,
+        end_day: date,
+        group_by: Sequence[str] = ("day",),
+        transaction_type: Optional[str] = None,
+        status: Optional[str] = None,
+        workspace_id: Optional[UUID] = None,
+    ) -> List[Dict]:
+        """Obtém totais do período (dias inclusivos) agrupados por day, month, category, type ou status"""
+        pass
+
+    @abstractmethod
+    async def rebuild(self, user_id: Optional[UUID] = None) -> int:
+        """Reconstrói os totais a partir da tabela de transações (de um usuário ou de todos)"""
+        pass
@@ -53,3 +53,8 @@ class UserRepository(ABC):
         """Atualiza senha do usuário"""
         pass
 
+    @abstractmethod
+    async def revoke_tokens(self, user_id: UUID) -> int:
+        """Revoga os tokens já emitidos do usuário; retorna a nova versão"""
+        pass
+
@@ -0,0 +1,148 @@
+"""Cache read-through por usuário com invalidação por namespaces versionados
+
+Cada usuário tem um contador de versão por namespace (transactions, accounts,
+bills, goals). A chave de um valor em cache inclui as versões dos namespaces
+de que ele depende; uma escrita só incrementa o contador e as entradas antigas
+deixam de ser lidas (expiram pelo TTL).
+"""
+import base64
+import functools
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Optional, Sequence
+from uuid import UUID
+from fastapi.encoders import jsonable_encoder
+from src.shared.config import settings
+from src.infrastructure.cache.redis_client import RedisClient, redis_client
+
+CACHE_NAMESPACES = ("transactions", "accounts", "bills", "goals")
+
+
+def _key_part(value: Any) -> Any:
+    """Normaliza parâmetros para a chave (datas com precisão de minuto)"""
+    if isinstance(value, datetime):
+        return value.replace(second=0, microsecond=0).isoformat()
+    if isinstance(value, (date, UUID)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_key_part(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _key_part(v) for k, v in sorted(value.items())}
+    return value
+
+
+class CacheService:
+    """Serviço de cache read-through sobre o RedisClient"""
+
+    def __init__(self, client: RedisClient = redis_client, ttl: int = settings.CACHE_TTL_SECONDS):
+        self.client = client
+        self.ttl = ttl
+
+    @staticmethod
+    def _version_key(user_id: UUID, namespace: str) -> str:
+        return f"cache:version:{namespace}:{user_id}"
+
+    async def build_key(self, name: str, user_id: UUID, namespaces: Sequence[str], params: Any = None) -> str:
+        """Monta a chave com as versões atuais dos namespaces"""
+        versions = await self.client.mget([self._version_key(user_id, ns) for ns in namespaces])
+        version_part = ".".join(v or "0" for v in versions)
+        params_hash = hashlib.sha1(
+            json.dumps(_key_part(params), sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return f"cache:{name}:{user_id}:{version_part}:{params_hash}"
+
+    async def get_or_set(
+        self,
+        name: str,
+        user_id: UUID,
+        namespaces: Sequence[str],
+        params: Any,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """Retorna o valor em cache ou calcula, grava e retorna (sempre em formato JSON)"""
+        if not settings.CACHE_ENABLED:
+            return jsonable_encoder(await factory())
+
+        key = None
+        try:
+            key = await self.build_key(name, user_id, namespaces, params)
+            cached = await self.client.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            # Cache indisponível: calcular normalmente
+            print(f"[DEBUG] Cache indisponível ({name}): {e}")
+            key = None
+
+        value = jsonable_encoder(await factory())
+
+        if key:
+            try:
+                await self.client.set(key, json.dumps(value), expire=ttl or self.ttl)
+            except Exception as e:
+                print(f"[DEBUG] Erro ao gravar cache ({name}): {e}")
+        return value
+
+    async def get_or_set_bytes(
+        self,
+        name: str,
+        user_id: UUID,
+        namespaces: Sequence[str],
+        params: Any,
+        factory: Callable[[], Awaitable[bytes]],
+        ttl: Optional[int] = None,
+    ) -> bytes:
+        """Como get_or_set, para conteúdo binário (ex.: PDFs), gravado em base64"""
+        if not settings.CACHE_ENABLED:
+            return await factory()
+
+        key = None
+        try:
+            key = await self.build_key(name, user_id, namespaces, params)
+            cached = await self.client.get(key)
+            if cached is not None:
+                return base64.b64decode(cached)
+        except Exception as e:
+            print(f"[DEBUG] Cache indisponível ({name}): {e}")
+            key = None
+
+        value = await factory()
+
+        if key:
+            try:
+                await self.client.set(key, base64.b64encode(value).decode(), expire=ttl or self.ttl)
+            except Exception as e:
+                print(f"[DEBUG] Erro ao gravar cache ({name}): {e}")
+        return value
+
+    async def invalidate(self, user_id: Optional[UUID], *namespaces: str):
+        """Invalida os valores do usuário que dependem dos namespaces"""
+        if not user_id or not settings.CACHE_ENABLED:
+            return
+        for namespace in namespaces:
+            try:
+                await self.client.incr(self._version_key(user_id, namespace))
+            except Exception as e:
+                print(f"[DEBUG] Erro ao invalidar cache ({namespace}): {e}")
+
+
+cache_service = CacheService()
+
+
+def cached(name: str, namespaces: Sequence[str] = CACHE_NAMESPACES, ttl: Optional[int] = None):
+    """Decorator para métodos de serviço no formato `metodo(self, user_id, ...)`"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, user_id: UUID, *args, **kwargs):
+            return await cache_service.get_or_set(
+                name,
+                user_id,
+                namespaces,
+                {"args": args, "kwargs": kwargs},
+                lambda: func(self, user_id, *args, **kwargs),
+                ttl,
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+"""Substituto em memória do cliente redis.asyncio (estilo fakeredis)
+
+Implementa apenas os comandos usados pela aplicação, com a mesma semântica de
+`decode_responses=True` (valores sempre str). Usado em testes e em ambientes
+sem Redis (CACHE_BACKEND=memory).
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class InMemoryRedis:
+    """Cliente Redis em memória com suporte a expiração"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._zsets: Dict[str, Dict[str, float]] = {}
+
+    def _alive(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._alive(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self._alive(key) for key in keys]
+
+    async def set(self, key: str, value, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._alive(key) is not None:
+            return None
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (str(value), expires_at)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._alive(key) is not None:
+                del self._data[key]
+                removed += 1
+            elif self._zsets.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    async def rename(self, key: str, new_key: str) -> bool:
+        if key in self._zsets:
+            self._zsets[new_key] = self._zsets.pop(key)
+            self._data.pop(new_key, None)
+        else:
+            self._data[new_key] = self._data.pop(key)
+            self._zsets.pop(new_key, None)
+        return True
+
+    def _ranked(self, key: str) -> List[Tuple[str, float]]:
+        # Mesma ordem do ZREVRANGE: score decrescente, empate por membro decrescente
+        return sorted(self._zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        zset = self._zsets.setdefault(key, {})
+        added = sum(1 for member in mapping if member not in zset)
+        zset.update({member: float(score) for member, score in mapping.items()})
+        return added
+
+    async def zrevrange(self, key: str, start: int, stop: int, withscores: bool = False) -> list:
+        ranked = self._ranked(key)
+        items = ranked[start:] if stop == -1 else ranked[start:stop + 1]
+        return items if withscores else [member for member, _ in items]
+
+    async def zrevrank(self, key: str, member: str) -> Optional[int]:
+        for index, (ranked_member, _) in enumerate(self._ranked(key)):
+            if ranked_member == member:
+                return index
+        return None
+
+    async def zscore(self, key: str, member: str) -> Optional[float]:
+        return self._zsets.get(key, {}).get(member)
+
+    async def zcard(self, key: str) -> int:
+        return len(self._zsets.get(key, {}))
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        current = self._alive(key)
+        expires_at = self._data[key][1] if current is not None else None
+        value = int(current or 0) + amount
+        self._data[key] = (str(value), expires_at)
+        return value
+
+    async def flushdb(self) -> bool:
+        self._data.clear()
+        self._zsets.clear()
+        return True
+
+    async def close(self):
+        pass
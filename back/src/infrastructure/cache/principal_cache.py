@@ -0,0 +1,152 @@
+"""Cache do usuário autenticado (principal) usado por get_current_user
+
+Dois níveis: um LRU em memória com TTL curto, chaveado por (user_id,
+token_version), e o Redis (`principal:{user_id}`, com a versão no valor). O
+hash da senha e o token de reset nunca entram no cache. As escritas do
+SQLAlchemyUserRepository invalidam os dois níveis do processo atual e o Redis;
+nos demais processos o LRU expira em PRINCIPAL_CACHE_LOCAL_TTL_SECONDS. Tokens
+revogados (token_version incrementado) nunca encontram entrada válida.
+"""
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import DateTime, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import make_transient_to_detached
+from src.shared.config import settings
+from src.infrastructure.cache.redis_client import RedisClient, redis_client
+from src.infrastructure.database.models.user import User
+
+# Colunas que não saem do banco
+PRIVATE_COLUMNS = {"hashed_password", "reset_token", "reset_token_expires"}
+
+
+def _to_payload(user: User) -> Dict:
+    payload = {}
+    for column in User.__table__.columns:
+        if column.key in PRIVATE_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        if isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif hasattr(value, "value"):
+            value = value.value
+        payload[column.key] = value
+    return payload
+
+
+def _from_payload(payload: Dict) -> User:
+    """Usuário desanexado (sem sessão) com as colunas do payload"""
+    values = {}
+    for column in User.__table__.columns:
+        if column.key not in payload:
+            continue
+        value = payload[column.key]
+        if value is not None:
+            if isinstance(column.type, PG_UUID):
+                value = UUID(value)
+            elif isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, SQLEnum):
+                value = column.type.enum_class(value)
+        values[column.key] = value
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+class PrincipalCache:
+    """Principal por (user_id, token_version) em memória e no Redis"""
+
+    def __init__(
+        self,
+        client: RedisClient = redis_client,
+        ttl: int = settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        local_ttl: float = settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+        max_entries: int = settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        self._local: "OrderedDict[Tuple[UUID, int], Tuple[float, Dict]]" = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"principal:{user_id}"
+
+    def _remember(self, user_id: UUID, version: int, payload: Dict):
+        self._local[(user_id, version)] = (time.monotonic() + self.local_ttl, payload)
+        self._local.move_to_end((user_id, version))
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, user_id: UUID, token_version: int) -> Optional[User]:
+        """Principal em cache para a versão do token, ou None (buscar no banco)"""
+        if not settings.CACHE_ENABLED:
+            return None
+
+        entry = self._local.get((user_id, token_version))
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end((user_id, token_version))
+                self.local_hits += 1
+                return _from_payload(payload)
+            del self._local[(user_id, token_version)]
+
+        try:
+            cached = await self.client.get(self._key(user_id))
+        except Exception as e:
+            print(f"[DEBUG] Cache de principal indisponível: {e}")
+            cached = None
+        if cached is not None:
+            payload = json.loads(cached)
+            if payload.get("token_version", 0) == token_version:
+                self.redis_hits += 1
+                self._remember(user_id, token_version, payload)
+                return _from_payload(payload)
+
+        self.misses += 1
+        return None
+
+    async def set(self, user: User):
+        """Grava o principal (apenas usuários ativos)"""
+        if not settings.CACHE_ENABLED or not user.is_active:
+            return
+        payload = _to_payload(user)
+        self._remember(user.id, user.token_version or 0, payload)
+        try:
+            await self.client.set(self._key(user.id), json.dumps(payload), expire=self.ttl)
+        except Exception as e:
+            print(f"[DEBUG] Erro ao gravar principal em cache: {e}")
+
+    async def invalidate(self, user_id: Optional[UUID]):
+        """Remove o principal do usuário (após atualização, desativação ou troca de senha)"""
+        if not user_id:
+            return
+        for key in [key for key in self._local if key[0] == user_id]:
+            del self._local[key]
+        try:
+            await self.client.delete(self._key(user_id))
+        except Exception as e:
+            print(f"[DEBUG] Erro ao invalidar principal: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "local_entries": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+principal_cache = PrincipalCache()
@@ -1,6 +1,6 @@
 import redis.asyncio as redis
 from src.shared.config import settings
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import json
 
 
@@ -15,6 +15,9 @@ class RedisClient:
 
     async def connect(self):
         """Conecta ao Redis"""
+        if self._client is None and settings.CACHE_BACKEND == "memory":
+            from src.infrastructure.cache.memory_redis import InMemoryRedis
+            self._client = InMemoryRedis()
         if self._client is None:
             self._client = await redis.from_url(
                 f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}",
@@ -47,6 +50,60 @@ class RedisClient:
             await self.connect()
         await self._client.delete(key)
 
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Obtém vários valores em uma única ida ao Redis"""
+        if not self._client:
+            await self.connect()
+        return await self._client.mget(keys)
+
+    async def incr(self, key: str) -> int:
+        """Incrementa um contador"""
+        if not self._client:
+            await self.connect()
+        return await self._client.incr(key)
+
+    async def acquire_lock(self, key: str, expire: int, value: str = "1") -> bool:
+        """Cria a chave somente se ela não existir (SET NX); True se o lock foi obtido"""
+        if not self._client:
+            await self.connect()
+        return bool(await self._client.set(key, value, ex=expire, nx=True))
+
+    async def rename(self, key: str, new_key: str):
+        """Renomeia uma chave (substitui `new_key` de forma atômica)"""
+        if not self._client:
+            await self.connect()
+        await self._client.rename(key, new_key)
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        """Define o score de membros de um sorted set"""
+        if not self._client:
+            await self.connect()
+        return await self._client.zadd(key, mapping)
+
+    async def zrevrange(self, key: str, start: int, stop: int) -> List[Tuple[str, float]]:
+        """Membros e scores do maior para o menor score, entre as posições start e stop"""
+        if not self._client:
+            await self.connect()
+        return await self._client.zrevrange(key, start, stop, withscores=True)
+
+    async def zrevrank(self, key: str, member: str) -> Optional[int]:
+        """Posição do membro (0 = maior score) ou None"""
+        if not self._client:
+            await self.connect()
+        return await self._client.zrevrank(key, member)
+
+    async def zscore(self, key: str, member: str) -> Optional[float]:
+        """Score do membro ou None"""
+        if not self._client:
+            await self.connect()
+        return await self._client.zscore(key, member)
+
+    async def zcard(self, key: str) -> int:
+        """Quantidade de membros do sorted set"""
+        if not self._client:
+            await self.connect()
+        return await self._client.zcard(key)
+
     async def get_json(self, key: str) -> Optional[dict]:
         """Obtém JSON do cache"""
         value = await self.get(key)
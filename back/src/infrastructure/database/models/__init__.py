@@ -25,6 +25,9 @@ from .workspace import Workspace, WorkspaceMember
 from .transfer import Transfer
 from .scheduled_transaction import ScheduledTransaction, TransactionExecution
 from .system_log import SystemLog
+from .transaction_rollup import DailyTransactionRollup
+from .notification_outbox import NotificationOutbox
+from .calendar_sync_state import CalendarSyncState
 
 __all__ = [
     "User",
@@ -70,5 +73,8 @@ __all__ = [
     "ScheduledTransaction",
     "TransactionExecution",
     "SystemLog",
+    "DailyTransactionRollup",
+    "NotificationOutbox",
+    "CalendarSyncState",
 ]
 
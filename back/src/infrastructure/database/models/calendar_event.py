@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -83,6 +83,28 @@ class CalendarEvent(Base):
     comments = relationship("CalendarEventComment", back_populates="event", cascade="all, delete-orphan")
     participants = relationship("CalendarEventParticipant", back_populates="event", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Um evento automático por transação/conta/meta (árbitros do ON CONFLICT da sincronização)
+        Index(
+            'uq_calendar_events_transaction',
+            'related_transaction_id',
+            unique=True,
+            postgresql_where=text("event_type = 'transaction'"),
+        ),
+        Index(
+            'uq_calendar_events_bill',
+            'related_bill_id',
+            unique=True,
+            postgresql_where=text("event_type = 'bill'"),
+        ),
+        Index(
+            'uq_calendar_events_goal',
+            'related_goal_id',
+            unique=True,
+            postgresql_where=text("event_type = 'goal'"),
+        ),
+    )
+
 
 class CalendarEventComment(Base):
     """Comentário em um evento do calendário"""
@@ -107,7 +129,7 @@ class CalendarEventParticipant(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = Column(UUID(as_uuid=True), ForeignKey("calendar_events.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    status = Column(SQLEnum(EventParticipationStatus), default=EventParticipationStatus.NOT_RESPONDED, nullable=False)
+    status = Column(SQLEnum(EventParticipationStatus, values_callable=lambda obj: [e.value for e in obj]), default=EventParticipationStatus.NOT_RESPONDED, nullable=False)
     responded_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC), nullable=False)
 
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import pytz
+
+from src.infrastructure.database.base import Base
+
+
+class CalendarSyncState(Base):
+    """Marca d'água da sincronização de eventos financeiros de cada usuário"""
+    __tablename__ = "calendar_sync_state"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    synced_until = Column(DateTime(timezone=True), nullable=False)  # Início da última sincronização concluída
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC), onupdate=lambda: datetime.now(pytz.UTC), nullable=False)
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+import pytz
+
+from src.infrastructure.database.base import Base
+
+
+class OutboxStatus:
+    """Status de uma mensagem na fila de saída (coluna VARCHAR)"""
+    PENDING = "pending"  # Aguardando envio (ou nova tentativa)
+    SENT = "sent"  # Enviada
+    FAILED = "failed"  # Tentativas esgotadas
+
+
+class NotificationOutbox(Base):
+    """Fila durável de notificações a enviar (drenada por um worker em background)"""
+    __tablename__ = "notification_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    channel = Column(String(20), default="email", nullable=False)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=True)
+    html_content = Column(Text, nullable=True)
+    text_content = Column(Text, nullable=True)
+
+    # Entrega
+    status = Column(String(20), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC), nullable=False)
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC), onupdate=lambda: datetime.now(pytz.UTC), nullable=False)
+
+    __table_args__ = (
+        # Apenas as pendentes, na ordem em que o worker as busca
+        Index(
+            'idx_notification_outbox_pending',
+            'next_attempt_at',
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
@@ -31,13 +31,14 @@ class ScheduledTransaction(Base):
     description = Column(String(500), nullable=False)
     amount = Column(Numeric(15, 2), nullable=False)
     transaction_type = Column(String(20), nullable=False)  # income, expense, transfer (usando string para evitar dependência circular)
-    status = Column(SQLEnum(ScheduledTransactionStatus), default=ScheduledTransactionStatus.ACTIVE, nullable=False)
+    # Colunas VARCHAR(20) na migração 003 (sem tipo ENUM no banco)
+    status = Column(SQLEnum(ScheduledTransactionStatus, native_enum=False, length=20), default=ScheduledTransactionStatus.ACTIVE, nullable=False)
     
     # Data e recorrência
     start_date = Column(DateTime(timezone=True), nullable=False)
     end_date = Column(DateTime(timezone=True), nullable=True)  # Data final (opcional)
     next_execution_date = Column(DateTime(timezone=True), nullable=False)
-    recurrence_type = Column(SQLEnum(RecurrenceType), default=RecurrenceType.NONE, nullable=False)
+    recurrence_type = Column(SQLEnum(RecurrenceType, native_enum=False, length=20), default=RecurrenceType.NONE, nullable=False)
     recurrence_day = Column(Integer, nullable=True)  # Dia do mês para mensal
     recurrence_weekday = Column(Integer, nullable=True)  # Dia da semana para semanal
     
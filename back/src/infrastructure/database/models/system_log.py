@@ -44,8 +44,9 @@ class SystemLog(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Informações básicas
-    level = Column(SQLEnum(LogLevel), nullable=False, index=True)
-    category = Column(SQLEnum(LogCategory), nullable=False, index=True)
+    # Os tipos no banco usam os valores em minúsculas (ver migração 004)
+    level = Column(SQLEnum(LogLevel, values_callable=lambda obj: [e.value for e in obj]), nullable=False, index=True)
+    category = Column(SQLEnum(LogCategory, values_callable=lambda obj: [e.value for e in obj]), nullable=False, index=True)
     message = Column(Text, nullable=False)
     details = Column(JSON, nullable=True)  # Detalhes adicionais em JSON
     
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Numeric, Integer, Date, DateTime, ForeignKey, Enum as SQLEnum, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+import pytz
+
+from src.infrastructure.database.base import Base
+from src.infrastructure.database.models.transaction import TransactionType, TransactionStatus
+
+
+class DailyTransactionRollup(Base):
+    """Totais diários de transações por usuário/workspace/categoria/tipo/status"""
+    __tablename__ = "daily_transaction_rollups"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # Chave do agregado
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    workspace_id = Column(UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=True)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="CASCADE"), nullable=True)
+    transaction_type = Column(SQLEnum(TransactionType), nullable=False)
+    status = Column(SQLEnum(TransactionStatus), nullable=False)
+    day = Column(Date, nullable=False)  # Dia da transação em UTC
+    
+    # Valores agregados
+    total_amount = Column(Numeric(15, 2), default=0, nullable=False)
+    transaction_count = Column(Integer, default=0, nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC), onupdate=lambda: datetime.now(pytz.UTC), nullable=False)
+
+    __table_args__ = (
+        # NULLS NOT DISTINCT: workspace/categoria nulos também formam uma única linha por chave
+        Index(
+            'uq_daily_transaction_rollups_key',
+            'user_id', 'workspace_id', 'category_id', 'transaction_type', 'status', 'day',
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index('idx_daily_rollups_user_day', 'user_id', 'day'),
+    )
@@ -0,0 +1,107 @@
+"""
+Unidade de trabalho: escritas de vários repositórios em uma única transação
+
+Dentro de `async with UnitOfWork(session)`, os repositórios que usam
+save_changes só fazem flush (sem commit nem refresh); o commit acontece uma
+vez, na saída do bloco, e qualquer exceção desfaz tudo. Invalidações de cache
+registradas com after_commit rodam só depois do commit. Fora de uma
+UnitOfWork os repositórios continuam confirmando cada escrita.
+"""
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+UNIT_OF_WORK_KEY = "unit_of_work"
+DB_ERRORS_KEY = "db_errors"
+
+
+@event.listens_for(Engine, "handle_error")
+def _count_db_errors(context) -> None:
+    """Conta erros por conexão, inclusive os que os serviços capturam e não repassam"""
+    if context.connection is not None:
+        context.connection.info[DB_ERRORS_KEY] = context.connection.info.get(DB_ERRORS_KEY, 0) + 1
+
+
+def current_unit_of_work(session: AsyncSession) -> Optional["UnitOfWork"]:
+    """UnitOfWork ativa na sessão, se houver"""
+    return session.info.get(UNIT_OF_WORK_KEY)
+
+
+async def save_changes(session: AsyncSession, *instances) -> None:
+    """Envia as alterações pendentes: flush dentro de uma UnitOfWork, commit + refresh fora dela"""
+    if current_unit_of_work(session) is not None:
+        # Defaults são calculados no Python, então o flush já preenche id/created_at/updated_at
+        await session.flush()
+        return
+    await session.commit()
+    for instance in instances:
+        await session.refresh(instance)
+
+
+async def after_commit(session: AsyncSession, func: Callable[..., Awaitable[Any]], *args) -> None:
+    """Executa func(*args) depois do commit da UnitOfWork (imediatamente, se não houver uma)"""
+    unit_of_work = current_unit_of_work(session)
+    if unit_of_work is not None:
+        unit_of_work._after_commit.append((func, args))
+        return
+    await func(*args)
+
+
+class UnitOfWork:
+    """Transação única para um caso de uso (um commit no fim, rollback em caso de erro)"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._after_commit: List[Tuple[Callable[..., Awaitable[Any]], tuple]] = []
+        self._outer: Optional["UnitOfWork"] = None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        # Blocos aninhados participam da transação mais externa
+        self._outer = current_unit_of_work(self.session)
+        if self._outer is None:
+            self.session.info[UNIT_OF_WORK_KEY] = self
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._outer is not None:
+            return
+        try:
+            if exc_type is not None:
+                await self.session.rollback()
+                return
+            try:
+                await self.session.commit()
+            except Exception:
+                await self.session.rollback()
+                raise
+        finally:
+            self.session.info.pop(UNIT_OF_WORK_KEY, None)
+            callbacks, self._after_commit = self._after_commit, []
+
+        for func, args in callbacks:
+            try:
+                await func(*args)
+            except Exception as e:
+                print(f"[DEBUG] Erro em ação pós-commit: {e}")
+
+    async def optional(self, step: Awaitable[Any], description: str) -> Any:
+        """Executa um passo não essencial em um SAVEPOINT: se falhar, só ele é desfeito
+
+        Os serviços chamados aqui costumam capturar os próprios erros; se o passo
+        gerou erro de banco (mesmo engolido), a transação estaria abortada, então
+        o savepoint é desfeito em vez de liberado.
+        """
+        connection = (await self.session.connection()).sync_connection
+        savepoint = await self.session.begin_nested()
+        errors_before = connection.info.get(DB_ERRORS_KEY, 0)
+        try:
+            result = await step
+            if savepoint.is_active and connection.info.get(DB_ERRORS_KEY, 0) == errors_before:
+                await savepoint.commit()
+                return result
+            print(f"[DEBUG] {description} desfeito após erro de banco")
+        except Exception as e:
+            print(f"[DEBUG] {description} desfeito: {e}")
+        await savepoint.rollback()
+        return None
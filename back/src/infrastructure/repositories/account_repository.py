@@ -4,6 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from src.domain.repositories.account_repository import AccountRepository
 from src.infrastructure.database.models.account import Account
+from src.infrastructure.cache.cache_service import cache_service
+from src.infrastructure.database.unit_of_work import save_changes, after_commit
 
 
 class SQLAlchemyAccountRepository(AccountRepository):
@@ -14,8 +16,8 @@ class SQLAlchemyAccountRepository(AccountRepository):
 
     async def create(self, account: Account) -> Account:
         self.session.add(account)
-        await self.session.commit()
-        await self.session.refresh(account)
+        await save_changes(self.session, account)
+        await after_commit(self.session, cache_service.invalidate, account.owner_id, "accounts")
         return account
 
     async def get_by_id(self, account_id: UUID) -> Optional[Account]:
@@ -35,15 +37,16 @@ class SQLAlchemyAccountRepository(AccountRepository):
         return list(result.scalars().all())
 
     async def update(self, account: Account) -> Account:
-        await self.session.commit()
-        await self.session.refresh(account)
+        await save_changes(self.session, account)
+        await after_commit(self.session, cache_service.invalidate, account.owner_id, "accounts")
         return account
 
     async def delete(self, account_id: UUID) -> bool:
         account = await self.get_by_id(account_id)
         if account:
             account.is_active = False
-            await self.session.commit()
+            await save_changes(self.session)
+            await after_commit(self.session, cache_service.invalidate, account.owner_id, "accounts")
             return True
         return False
 
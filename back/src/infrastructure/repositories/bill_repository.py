@@ -7,6 +7,8 @@ from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import joinedload
 from src.domain.repositories.bill_repository import BillRepository
 from src.infrastructure.database.models.bill import Bill, BillStatus
+from src.infrastructure.cache.cache_service import cache_service
+from src.infrastructure.database.unit_of_work import save_changes, after_commit
 
 
 class SQLAlchemyBillRepository(BillRepository):
@@ -17,8 +19,8 @@ class SQLAlchemyBillRepository(BillRepository):
 
     async def create(self, bill: Bill) -> Bill:
         self.session.add(bill)
-        await self.session.commit()
-        await self.session.refresh(bill)
+        await save_changes(self.session, bill)
+        await after_commit(self.session, cache_service.invalidate, bill.user_id, "bills", "transactions")
         return bill
 
     async def get_by_id(self, bill_id: UUID) -> Optional[Bill]:
@@ -86,15 +88,17 @@ class SQLAlchemyBillRepository(BillRepository):
         return list(result.scalars().all())
 
     async def update(self, bill: Bill) -> Bill:
-        await self.session.commit()
-        await self.session.refresh(bill)
+        await save_changes(self.session, bill)
+        # Bills canceladas saem das leituras de transações
+        await after_commit(self.session, cache_service.invalidate, bill.user_id, "bills", "transactions")
         return bill
 
     async def delete(self, bill_id: UUID) -> bool:
         bill = await self.get_by_id(bill_id)
         if bill:
             await self.session.delete(bill)
-            await self.session.commit()
+            await save_changes(self.session)
+            await after_commit(self.session, cache_service.invalidate, bill.user_id, "bills", "transactions")
             return True
         return False
 
@@ -1,9 +1,11 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, and_, or_
+from collections import Counter
+from sqlalchemy import select, and_, or_, func, case, cast, exists, literal, null, union_all, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload
 
 from src.domain.repositories.calendar_repository import (
     CalendarEventRepository,
@@ -17,7 +19,22 @@ from src.infrastructure.database.models.calendar_event import (
     CalendarEventType,
     EventParticipationStatus,
 )
-from src.infrastructure.database.models.workspace import WorkspaceMember
+from src.infrastructure.database.models.calendar_sync_state import CalendarSyncState
+from src.infrastructure.database.models.account import Account
+from src.infrastructure.database.models.bill import Bill, BillStatus, BillType
+from src.infrastructure.database.models.goal import Goal, GoalStatus
+from src.infrastructure.database.models.transaction import Transaction, TransactionStatus, TransactionType
+from src.infrastructure.database.models.user import User
+from src.infrastructure.database.models.workspace import Workspace, WorkspaceMember
+from src.infrastructure.database.unit_of_work import save_changes
+
+# Colunas preenchidas pela sincronização em lote, na ordem dos SELECTs
+FINANCIAL_EVENT_COLUMNS = [
+    "id", "event_type", "title", "description", "start_date", "all_day",
+    "user_id", "created_by", "workspace_id",
+    "related_transaction_id", "related_bill_id", "related_goal_id",
+    "color", "icon", "is_shared", "is_public", "created_at", "updated_at",
+]
 
 
 class SQLAlchemyCalendarEventRepository(CalendarEventRepository):
@@ -28,8 +45,7 @@ class SQLAlchemyCalendarEventRepository(CalendarEventRepository):
 
     async def create(self, event: CalendarEvent) -> CalendarEvent:
         self.session.add(event)
-        await self.session.commit()
-        await self.session.refresh(event)
+        await save_changes(self.session, event)
         return event
 
     async def get_by_id(self, event_id: UUID) -> Optional[CalendarEvent]:
@@ -99,6 +115,30 @@ class SQLAlchemyCalendarEventRepository(CalendarEventRepository):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    def _accessible_filter(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ):
+        """Eventos próprios + compartilhados nos workspaces do usuário + públicos"""
+        member_workspaces = select(WorkspaceMember.workspace_id).where(WorkspaceMember.user_id == user_id)
+        conditions = [
+            or_(
+                CalendarEvent.user_id == user_id,
+                and_(
+                    CalendarEvent.workspace_id.in_(member_workspaces),
+                    CalendarEvent.is_shared == True,
+                ),
+                CalendarEvent.is_public == True,
+            )
+        ]
+        if start_date:
+            conditions.append(CalendarEvent.start_date >= start_date)
+        if end_date:
+            conditions.append(CalendarEvent.start_date <= end_date)
+        return and_(*conditions)
+
     async def get_accessible_by_user(
         self,
         user_id: UUID,
@@ -106,58 +146,284 @@ class SQLAlchemyCalendarEventRepository(CalendarEventRepository):
         end_date: Optional[datetime] = None,
     ) -> List[CalendarEvent]:
         """Obtém todos os eventos acessíveis: próprios + compartilhados + públicos"""
-        # Buscar eventos próprios
-        own_events = await self.get_by_user_id(user_id, start_date, end_date)
+        result = await self.session.execute(
+            select(CalendarEvent)
+            .where(self._accessible_filter(user_id, start_date, end_date))
+            .order_by(CalendarEvent.start_date.asc())
+        )
+        return list(result.scalars().all())
 
-        # Buscar eventos compartilhados em workspaces
-        # Primeiro buscar workspaces do usuário
-        workspace_members_query = select(WorkspaceMember.workspace_id).where(
-            WorkspaceMember.user_id == user_id
+    async def _get_views(self, viewer_id: UUID, condition) -> List[Dict]:
+        """Eventos com nomes, contadores e participação do usuário em uma única consulta.
+
+        Comentários e participantes são contados por subconsultas agrupadas
+        restritas aos eventos selecionados, assim como a participação de
+        quem consulta.
+        """
+        owner = aliased(User)
+        creator = aliased(User)
+        event_ids = select(CalendarEvent.id).where(condition)
+
+        comments = (
+            select(CalendarEventComment.event_id, func.count().label("total"))
+            .where(CalendarEventComment.event_id.in_(event_ids))
+            .group_by(CalendarEventComment.event_id)
+            .subquery()
+        )
+        participants = (
+            select(CalendarEventParticipant.event_id, func.count().label("total"))
+            .where(CalendarEventParticipant.event_id.in_(event_ids))
+            .group_by(CalendarEventParticipant.event_id)
+            .subquery()
+        )
+        viewer_participation = (
+            select(
+                CalendarEventParticipant.event_id,
+                func.min(CalendarEventParticipant.status).label("status"),
+            )
+            .where(
+                CalendarEventParticipant.event_id.in_(event_ids),
+                CalendarEventParticipant.user_id == viewer_id,
+            )
+            .group_by(CalendarEventParticipant.event_id)
+            .subquery()
         )
-        workspace_members_result = await self.session.execute(workspace_members_query)
-        workspace_ids = [row[0] for row in workspace_members_result.all()]
 
-        # Buscar eventos desses workspaces
-        workspace_events = []
-        if workspace_ids:
-            workspace_query = select(CalendarEvent).where(
-                and_(
-                    CalendarEvent.workspace_id.in_(workspace_ids),
-                    CalendarEvent.is_shared == True,
-                )
+        query = (
+            select(
+                CalendarEvent,
+                owner.full_name,
+                creator.full_name,
+                Workspace.name,
+                func.coalesce(comments.c.total, 0),
+                func.coalesce(participants.c.total, 0),
+                viewer_participation.c.status,
             )
-            if start_date:
-                workspace_query = workspace_query.where(CalendarEvent.start_date >= start_date)
-            if end_date:
-                workspace_query = workspace_query.where(CalendarEvent.start_date <= end_date)
-            workspace_query = workspace_query.order_by(CalendarEvent.start_date.asc())
-            workspace_result = await self.session.execute(workspace_query)
-            workspace_events = list(workspace_result.scalars().all())
-
-        # Buscar eventos públicos
-        public_query = select(CalendarEvent).where(CalendarEvent.is_public == True)
-        if start_date:
-            public_query = public_query.where(CalendarEvent.start_date >= start_date)
-        if end_date:
-            public_query = public_query.where(CalendarEvent.start_date <= end_date)
-        public_query = public_query.order_by(CalendarEvent.start_date.asc())
-        public_result = await self.session.execute(public_query)
-        public_events = list(public_result.scalars().all())
+            .outerjoin(owner, owner.id == CalendarEvent.user_id)
+            .outerjoin(creator, creator.id == CalendarEvent.created_by)
+            .outerjoin(Workspace, Workspace.id == CalendarEvent.workspace_id)
+            .outerjoin(comments, comments.c.event_id == CalendarEvent.id)
+            .outerjoin(participants, participants.c.event_id == CalendarEvent.id)
+            .outerjoin(viewer_participation, viewer_participation.c.event_id == CalendarEvent.id)
+            .where(condition)
+            .order_by(CalendarEvent.start_date.asc())
+        )
+        result = await self.session.execute(query)
 
-        # Combinar e remover duplicatas
-        all_events = {e.id: e for e in own_events + workspace_events + public_events}
-        return list(all_events.values())
+        views = []
+        for event, user_name, created_by_name, workspace_name, comments_count, participants_count, status in result.all():
+            views.append({
+                "id": event.id,
+                "event_type": event.event_type if isinstance(event.event_type, str) else event.event_type.value,
+                "title": event.title,
+                "description": event.description,
+                "start_date": event.start_date,
+                "end_date": event.end_date,
+                "all_day": event.all_day,
+                "user_id": event.user_id,
+                "user_name": user_name,
+                "workspace_id": event.workspace_id,
+                "workspace_name": workspace_name,
+                "family_id": event.family_id,
+                "related_transaction_id": event.related_transaction_id,
+                "related_bill_id": event.related_bill_id,
+                "related_goal_id": event.related_goal_id,
+                "color": event.color,
+                "icon": event.icon,
+                "location": event.location,
+                "is_shared": event.is_shared,
+                "is_public": event.is_public,
+                "created_at": event.created_at,
+                "updated_at": event.updated_at,
+                "created_by": event.created_by,
+                "created_by_name": created_by_name,
+                "comments_count": comments_count,
+                "participants_count": participants_count,
+                "user_participation_status": status.value if hasattr(status, "value") else status,
+            })
+        return views
+
+    async def get_accessible_views(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Dict]:
+        return await self._get_views(user_id, self._accessible_filter(user_id, start_date, end_date))
+
+    async def get_views(self, event_ids: List[UUID], viewer_id: UUID) -> List[Dict]:
+        if not event_ids:
+            return []
+        return await self._get_views(viewer_id, CalendarEvent.id.in_(event_ids))
+
+    @staticmethod
+    def _without_event(event_type: CalendarEventType, related_column, source_id):
+        return ~exists().where(
+            related_column == source_id,
+            CalendarEvent.event_type == event_type.value,
+        )
 
-    async def update(self, event: CalendarEvent) -> CalendarEvent:
+    @staticmethod
+    def _amount_suffix(amount):
+        return case((amount != 0, literal(" - R$ ") + cast(amount, String)), else_=literal(""))
+
+    def _missing_transaction_events(self, user_id: UUID, since: Optional[datetime]):
+        is_income = Transaction.transaction_type == TransactionType.INCOME
+        query = (
+            select(
+                func.gen_random_uuid(),
+                literal(CalendarEventType.TRANSACTION.value),
+                Transaction.description,
+                literal("Transação: ") + Transaction.description + self._amount_suffix(Transaction.amount),
+                Transaction.transaction_date,
+                literal(True),
+                Transaction.user_id,
+                Transaction.user_id,
+                Account.workspace_id,
+                Transaction.id,
+                cast(null(), PG_UUID(as_uuid=True)),
+                cast(null(), PG_UUID(as_uuid=True)),
+                case((is_income, literal("#10b981")), else_=literal("#ef4444")),
+                case((is_income, literal("💰")), else_=literal("💸")),
+                Account.workspace_id.isnot(None),
+                literal(False),
+                func.now(),
+                func.now(),
+            )
+            .select_from(Transaction)
+            .outerjoin(Account, Account.id == Transaction.account_id)
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.status == TransactionStatus.COMPLETED,
+                self._without_event(CalendarEventType.TRANSACTION, CalendarEvent.related_transaction_id, Transaction.id),
+            )
+        )
+        if since:
+            query = query.where(Transaction.updated_at >= since)
+        return query
+
+    def _missing_bill_events(self, user_id: UUID, since: Optional[datetime]):
+        is_income = Bill.bill_type == BillType.INCOME
+        query = (
+            select(
+                func.gen_random_uuid(),
+                literal(CalendarEventType.BILL.value),
+                Bill.name,
+                case((is_income, literal("Conta a receber: ")), else_=literal("Conta a pagar: "))
+                + Bill.name + self._amount_suffix(Bill.amount),
+                Bill.due_date,
+                literal(True),
+                Bill.user_id,
+                Bill.user_id,
+                Account.workspace_id,
+                cast(null(), PG_UUID(as_uuid=True)),
+                Bill.id,
+                cast(null(), PG_UUID(as_uuid=True)),
+                case((is_income, literal("#10b981")), else_=literal("#f97316")),
+                case((is_income, literal("📥")), else_=literal("📋")),
+                Account.workspace_id.isnot(None),
+                literal(False),
+                func.now(),
+                func.now(),
+            )
+            .select_from(Bill)
+            .outerjoin(Account, Account.id == Bill.account_id)
+            .where(
+                Bill.user_id == user_id,
+                Bill.status == BillStatus.PENDING,
+                self._without_event(CalendarEventType.BILL, CalendarEvent.related_bill_id, Bill.id),
+            )
+        )
+        if since:
+            query = query.where(Bill.updated_at >= since)
+        return query
+
+    def _missing_goal_events(self, user_id: UUID, since: Optional[datetime]):
+        query = (
+            select(
+                func.gen_random_uuid(),
+                literal(CalendarEventType.GOAL.value),
+                literal("Meta: ") + Goal.name,
+                literal("Data objetivo da meta: ") + Goal.name,
+                Goal.target_date,
+                literal(True),
+                Goal.user_id,
+                Goal.user_id,
+                cast(null(), PG_UUID(as_uuid=True)),
+                cast(null(), PG_UUID(as_uuid=True)),
+                cast(null(), PG_UUID(as_uuid=True)),
+                Goal.id,
+                literal("#3b82f6"),
+                literal("🎯"),
+                literal(False),
+                literal(False),
+                func.now(),
+                func.now(),
+            )
+            .where(
+                Goal.user_id == user_id,
+                Goal.status == GoalStatus.ACTIVE,
+                Goal.target_date.isnot(None),
+                self._without_event(CalendarEventType.GOAL, CalendarEvent.related_goal_id, Goal.id),
+            )
+        )
+        if since:
+            query = query.where(Goal.updated_at >= since)
+        return query
+
+    async def insert_missing_financial_events(
+        self, user_id: UUID, since: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Cria os eventos que faltam para transações, contas e metas em um único INSERT ... SELECT.
+
+        Os anti-joins (NOT EXISTS) descartam o que já tem evento e o
+        ON CONFLICT DO NOTHING, apoiado nos índices únicos parciais, cobre
+        sincronizações concorrentes. Com `since`, só considera linhas
+        alteradas a partir dessa data. Não faz commit.
+        """
+        missing = union_all(
+            self._missing_transaction_events(user_id, since),
+            self._missing_bill_events(user_id, since),
+            self._missing_goal_events(user_id, since),
+        )
+        stmt = (
+            pg_insert(CalendarEvent.__table__)
+            .from_select(FINANCIAL_EVENT_COLUMNS, missing)
+            .on_conflict_do_nothing()
+            .returning(CalendarEvent.__table__.c.event_type)
+        )
+        result = await self.session.execute(stmt)
+        created = Counter(result.scalars().all())
+        return {
+            "transactions": created[CalendarEventType.TRANSACTION.value],
+            "bills": created[CalendarEventType.BILL.value],
+            "goals": created[CalendarEventType.GOAL.value],
+        }
+
+    async def get_sync_watermark(self, user_id: UUID) -> Optional[datetime]:
+        result = await self.session.execute(
+            select(CalendarSyncState.synced_until).where(CalendarSyncState.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def save_sync_watermark(self, user_id: UUID, synced_until: datetime) -> None:
+        stmt = pg_insert(CalendarSyncState).values(user_id=user_id, synced_until=synced_until, updated_at=func.now())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CalendarSyncState.user_id],
+            set_={"synced_until": stmt.excluded.synced_until, "updated_at": func.now()},
+        )
+        await self.session.execute(stmt)
         await self.session.commit()
-        await self.session.refresh(event)
+
+    async def update(self, event: CalendarEvent) -> CalendarEvent:
+        await save_changes(self.session, event)
         return event
 
     async def delete(self, event_id: UUID) -> bool:
         event = await self.get_by_id(event_id)
         if event:
             await self.session.delete(event)
-            await self.session.commit()
+            await save_changes(self.session)
             return True
         return False
 
@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, desc, func, union
 from src.domain.repositories.gamification_repository import (
     BadgeRepository,
     UserBadgeRepository,
@@ -70,6 +70,9 @@ class SQLAlchemyUserBadgeRepository(UserBadgeRepository):
         await self.session.refresh(user_badge)
         return user_badge
 
+    async def add(self, user_badge: UserBadge) -> None:
+        self.session.add(user_badge)
+
 
 class SQLAlchemyUserLevelRepository(UserLevelRepository):
     def __init__(self, session: AsyncSession):
@@ -90,6 +93,118 @@ class SQLAlchemyUserLevelRepository(UserLevelRepository):
         await self.session.refresh(user_level)
         return user_level
 
+    async def get_achievement_counters(self, user_id: UUID) -> Dict[str, int]:
+        from src.infrastructure.database.models.transaction import Transaction
+        from src.infrastructure.database.models.goal import Goal, GoalStatus
+
+        result = await self.session.execute(
+            select(
+                select(func.count(Transaction.id)).where(Transaction.user_id == user_id).scalar_subquery(),
+                select(func.count(Goal.id)).where(Goal.user_id == user_id).scalar_subquery(),
+                select(func.count(Goal.id))
+                .where(Goal.user_id == user_id, Goal.status == GoalStatus.COMPLETED)
+                .scalar_subquery(),
+            )
+        )
+        transactions, goals, completed_goals = result.one()
+        return {"transactions": transactions, "goals": goals, "completed_goals": completed_goals}
+
+    @staticmethod
+    def _workspace_members():
+        """(workspace_id, user_id) dos donos e membros de workspaces ativos"""
+        from src.infrastructure.database.models.workspace import Workspace, WorkspaceMember
+
+        owners = select(Workspace.id.label("workspace_id"), Workspace.owner_id.label("user_id")).where(
+            Workspace.is_active == True
+        )
+        members = (
+            select(WorkspaceMember.workspace_id, WorkspaceMember.user_id)
+            .join(Workspace, Workspace.id == WorkspaceMember.workspace_id)
+            .where(Workspace.is_active == True)
+        )
+        return union(owners, members).subquery()
+
+    async def get_leaderboard_scopes(self, user_id: UUID) -> Dict[str, List[UUID]]:
+        from src.infrastructure.database.models.user import FamilyMember
+
+        families = await self.session.execute(
+            select(FamilyMember.family_id).where(FamilyMember.user_id == user_id).order_by(FamilyMember.joined_at)
+        )
+        workspace_members = self._workspace_members()
+        workspaces = await self.session.execute(
+            select(workspace_members.c.workspace_id).where(workspace_members.c.user_id == user_id)
+        )
+        return {
+            "family": list(families.scalars().all()),
+            "workspace": list(workspaces.scalars().all()),
+        }
+
+    async def get_leaderboard_profiles(self, user_ids: List[UUID]) -> Dict[UUID, Tuple[str, int]]:
+        from src.infrastructure.database.models.user import User
+
+        if not user_ids:
+            return {}
+        result = await self.session.execute(
+            select(User.id, func.coalesce(User.full_name, User.username).label("name"), UserLevel.level)
+            .outerjoin(UserLevel, UserLevel.user_id == User.id)
+            .where(User.id.in_(user_ids))
+        )
+        return {row.id: (row.name, row.level) for row in result.all()}
+
+    async def get_leaderboard_top(
+        self, limit: int, family_id: Optional[UUID] = None, workspace_id: Optional[UUID] = None
+    ) -> List[Tuple[UUID, str, int, int]]:
+        from src.infrastructure.database.models.user import User, FamilyMember
+
+        query = select(
+            UserLevel.user_id,
+            func.coalesce(User.full_name, User.username),
+            UserLevel.level,
+            UserLevel.total_points,
+        ).join(User, UserLevel.user_id == User.id)
+        if family_id:
+            query = query.join(FamilyMember, FamilyMember.user_id == UserLevel.user_id).where(
+                FamilyMember.family_id == family_id
+            )
+        if workspace_id:
+            workspace_members = self._workspace_members()
+            query = query.join(workspace_members, workspace_members.c.user_id == UserLevel.user_id).where(
+                workspace_members.c.workspace_id == workspace_id
+            )
+        result = await self.session.execute(query.order_by(desc(UserLevel.total_points)).limit(limit))
+        return [tuple(row) for row in result.all()]
+
+    async def get_leaderboard_scores(
+        self, family_id: Optional[UUID] = None, workspace_id: Optional[UUID] = None
+    ) -> List[Tuple[UUID, int]]:
+        from src.infrastructure.database.models.user import FamilyMember
+
+        query = select(UserLevel.user_id, UserLevel.total_points)
+        if family_id:
+            query = query.join(FamilyMember, FamilyMember.user_id == UserLevel.user_id).where(
+                FamilyMember.family_id == family_id
+            )
+        if workspace_id:
+            workspace_members = self._workspace_members()
+            query = query.join(workspace_members, workspace_members.c.user_id == UserLevel.user_id).where(
+                workspace_members.c.workspace_id == workspace_id
+            )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_leaderboard_snapshot(self) -> Tuple[List[Tuple[UUID, int]], List[Tuple[str, UUID, UUID]]]:
+        from src.infrastructure.database.models.user import FamilyMember
+
+        points = await self.session.execute(select(UserLevel.user_id, UserLevel.total_points))
+        families = await self.session.execute(select(FamilyMember.family_id, FamilyMember.user_id))
+        workspace_members = self._workspace_members()
+        workspaces = await self.session.execute(
+            select(workspace_members.c.workspace_id, workspace_members.c.user_id)
+        )
+        memberships = [("family", family_id, user_id) for family_id, user_id in families.all()]
+        memberships += [("workspace", workspace_id, user_id) for workspace_id, user_id in workspaces.all()]
+        return [tuple(row) for row in points.all()], memberships
+
 
 class SQLAlchemyChallengeRepository(ChallengeRepository):
     def __init__(self, session: AsyncSession):
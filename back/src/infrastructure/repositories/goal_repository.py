@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from src.domain.repositories.goal_repository import GoalRepository, GoalContributionRepository
 from src.infrastructure.database.models.goal import Goal, GoalContribution
+from src.infrastructure.cache.cache_service import cache_service
 
 
 class SQLAlchemyGoalRepository(GoalRepository):
@@ -16,6 +17,7 @@ class SQLAlchemyGoalRepository(GoalRepository):
         self.session.add(goal)
         await self.session.commit()
         await self.session.refresh(goal)
+        await cache_service.invalidate(goal.user_id, "goals")
         return goal
 
     async def get_by_id(self, goal_id: UUID) -> Optional[Goal]:
@@ -31,6 +33,7 @@ class SQLAlchemyGoalRepository(GoalRepository):
     async def update(self, goal: Goal) -> Goal:
         await self.session.commit()
         await self.session.refresh(goal)
+        await cache_service.invalidate(goal.user_id, "goals")
         return goal
 
     async def delete(self, goal_id: UUID) -> bool:
@@ -38,6 +41,7 @@ class SQLAlchemyGoalRepository(GoalRepository):
         if goal:
             await self.session.delete(goal)
             await self.session.commit()
+            await cache_service.invalidate(goal.user_id, "goals")
             return True
         return False
 
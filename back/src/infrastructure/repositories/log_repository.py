@@ -1,8 +1,9 @@
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
+import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import select, insert, func, and_, or_, desc
 from src.domain.repositories.log_repository import LogRepository
 from src.infrastructure.database.models.system_log import SystemLog, LogLevel, LogCategory
 
@@ -19,6 +20,21 @@ class SQLAlchemyLogRepository(LogRepository):
         await self.session.refresh(log)
         return log
 
+    async def create_many(self, logs: List[SystemLog]) -> int:
+        if not logs:
+            return 0
+        
+        columns = [column.key for column in SystemLog.__table__.columns]
+        rows = []
+        for log in logs:
+            row = {key: getattr(log, key) for key in columns}
+            row["id"] = row["id"] or uuid.uuid4()
+            rows.append(row)
+        
+        await self.session.execute(insert(SystemLog).values(rows))
+        await self.session.commit()
+        return len(rows)
+
     async def get_by_id(self, log_id: UUID) -> Optional[SystemLog]:
         result = await self.session.execute(
             select(SystemLog).where(SystemLog.id == log_id)
@@ -0,0 +1,71 @@
+from typing import List
+from uuid import UUID
+from datetime import datetime, timedelta
+import pytz
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from src.domain.repositories.notification_outbox_repository import NotificationOutboxRepository
+from src.infrastructure.database.models.notification_outbox import NotificationOutbox, OutboxStatus
+
+
+class SQLAlchemyNotificationOutboxRepository(NotificationOutboxRepository):
+    """Implementação do repositório da fila de saída de notificações com SQLAlchemy"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, message: NotificationOutbox) -> NotificationOutbox:
+        self.session.add(message)
+        await self.session.commit()
+        return message
+
+    async def claim_batch(self, limit: int, lease_seconds: int) -> List[NotificationOutbox]:
+        now = datetime.now(pytz.UTC)
+        # SKIP LOCKED: vários workers (réplicas) drenam a fila sem pegar a mesma mensagem
+        due = (
+            select(NotificationOutbox.id)
+            .where(
+                NotificationOutbox.status == OutboxStatus.PENDING,
+                NotificationOutbox.next_attempt_at <= now,
+            )
+            .order_by(NotificationOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(due))
+            .values(
+                attempts=NotificationOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=lease_seconds),
+            )
+            .returning(NotificationOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        messages = list(result.scalars().all())
+        await self.session.commit()
+        return messages
+
+    async def mark_sent(self, message_ids: List[UUID]) -> None:
+        if not message_ids:
+            return
+        await self.session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(message_ids))
+            .values(status=OutboxStatus.SENT, sent_at=datetime.now(pytz.UTC), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def mark_failed(self, message_id: UUID, error: str, next_attempt_at: datetime, give_up: bool) -> None:
+        await self.session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id == message_id)
+            .values(
+                status=OutboxStatus.FAILED if give_up else OutboxStatus.PENDING,
+                next_attempt_at=next_attempt_at,
+                last_error=error[:2000],
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, and_, or_, cast, String
 from src.domain.repositories.planning_repository import (
     PlanningRepository,
     MonthlyPlanningRepository,
@@ -57,6 +58,62 @@ class SQLAlchemyPlanningRepository(PlanningRepository):
             return True
         return False
 
+    async def get_active_with_spend(
+        self, shard_count: int = 1, shard_index: int = 0
+    ) -> List[Tuple[Planning, Decimal]]:
+        """
+        Planejamentos ativos com o valor realizado, em uma única query agrupada.
+
+        Usa os mesmos critérios de TransactionRepository.get_sum_by_period
+        (transações concluídas no período; só despesas quando há valor alvo).
+        Com shard_count > 1, retorna apenas os usuários do shard (hash do user_id).
+        """
+        from sqlalchemy.orm import selectinload
+        from src.infrastructure.database.models.transaction import (
+            Transaction,
+            TransactionStatus,
+            TransactionType,
+        )
+
+        spent = func.coalesce(func.sum(Transaction.amount), 0)
+        query = (
+            select(Planning, spent)
+            .outerjoin(
+                Transaction,
+                and_(
+                    Transaction.user_id == Planning.user_id,
+                    Transaction.transaction_date >= Planning.start_date,
+                    Transaction.transaction_date <= Planning.end_date,
+                    Transaction.status == TransactionStatus.COMPLETED,
+                    or_(
+                        Planning.target_amount.is_(None),
+                        Planning.target_amount == 0,
+                        Transaction.transaction_type == TransactionType.EXPENSE,
+                    ),
+                ),
+            )
+            .options(selectinload(Planning.user))
+            .where(Planning.is_active == True)
+            .group_by(Planning.id)
+        )
+        if shard_count > 1:
+            shard = func.abs(func.mod(func.hashtext(cast(Planning.user_id, String)), shard_count))
+            query = query.where(shard == shard_index)
+
+        result = await self.session.execute(query)
+        return [(planning, Decimal(str(total))) for planning, total in result.all()]
+
+    async def update_actual_amounts(self, amounts: Dict[UUID, Decimal]) -> int:
+        if not amounts:
+            return 0
+        # UPDATE em lote por chave primária (executemany)
+        await self.session.execute(
+            update(Planning),
+            [{"id": planning_id, "actual_amount": amount} for planning_id, amount in amounts.items()],
+        )
+        await self.session.commit()
+        return len(amounts)
+
 
 class SQLAlchemyMonthlyPlanningRepository(MonthlyPlanningRepository):
     def __init__(self, session: AsyncSession):
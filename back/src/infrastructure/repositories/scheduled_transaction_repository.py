@@ -1,13 +1,29 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, update, and_
 from src.domain.repositories.scheduled_transaction_repository import ScheduledTransactionRepository
 from src.infrastructure.database.models.scheduled_transaction import (
     ScheduledTransaction,
     ScheduledTransactionStatus,
+    TransactionExecution,
 )
+from src.infrastructure.database.models.transaction import Transaction
+from src.infrastructure.database.models.account import Account
+from src.infrastructure.cache.cache_service import cache_service
+from src.infrastructure.database.unit_of_work import save_changes, after_commit
+
+
+def _row(instance) -> dict:
+    """Valores já definidos de uma instância ORM (defaults ficam a cargo do INSERT)"""
+    values = {}
+    for attr in instance.__mapper__.column_attrs:
+        value = getattr(instance, attr.key)
+        if value is not None:
+            values[attr.key] = value
+    return values
 
 
 class SQLAlchemyScheduledTransactionRepository(ScheduledTransactionRepository):
@@ -51,6 +67,59 @@ class SQLAlchemyScheduledTransactionRepository(ScheduledTransactionRepository):
         )
         return list(result.scalars().all())
 
+    async def claim_due(self, before_date: datetime, limit: int) -> List[ScheduledTransaction]:
+        """
+        Reserva um lote de agendamentos vencidos com SELECT ... FOR UPDATE SKIP LOCKED.
+
+        Linhas já reservadas por outra réplica são puladas; os bloqueios valem
+        até o commit da transação (em save_executions ou no fim da UnitOfWork).
+        """
+        result = await self.session.execute(
+            select(ScheduledTransaction)
+            .where(
+                and_(
+                    ScheduledTransaction.status == ScheduledTransactionStatus.ACTIVE,
+                    ScheduledTransaction.is_active == True,
+                    ScheduledTransaction.next_execution_date <= before_date,
+                    ScheduledTransaction.auto_execute == True,
+                )
+            )
+            .order_by(ScheduledTransaction.next_execution_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def save_executions(
+        self,
+        transactions: List[Transaction],
+        executions: List[TransactionExecution],
+        balance_deltas: Dict[UUID, Decimal],
+    ) -> None:
+        # Transações e histórico em INSERTs de várias linhas
+        if transactions:
+            await self.session.execute(
+                insert(Transaction),
+                [_row(transaction) for transaction in transactions],
+            )
+        if executions:
+            await self.session.execute(
+                insert(TransactionExecution),
+                [_row(execution) for execution in executions],
+            )
+        # Um UPDATE por conta, em ordem de id para evitar deadlock entre réplicas
+        for account_id in sorted(balance_deltas, key=str):
+            await self.session.execute(
+                update(Account)
+                .where(Account.id == account_id)
+                .values(balance=Account.balance + balance_deltas[account_id])
+            )
+        # Agendamentos alterados (próxima execução, contador, status) e liberação dos bloqueios
+        # (dentro de uma UnitOfWork, o commit e a liberação ficam para o fim do bloco)
+        await save_changes(self.session)
+        for user_id in {transaction.user_id for transaction in transactions}:
+            await after_commit(self.session, cache_service.invalidate, user_id, "transactions", "accounts")
+
     async def update(self, scheduled: ScheduledTransaction) -> ScheduledTransaction:
         await self.session.commit()
         await self.session.refresh(scheduled)
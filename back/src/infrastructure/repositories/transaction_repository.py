@@ -1,12 +1,17 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, exists
 from decimal import Decimal
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.infrastructure.database.models.transaction import Transaction, TransactionType
 from src.infrastructure.database.models.bill import Bill, BillStatus
+from src.infrastructure.cache.cache_service import cache_service
+from src.infrastructure.database.unit_of_work import save_changes, after_commit
+
+# Buckets de tempo aceitos por aggregate (unidades do date_trunc)
+TIME_BUCKETS = ("day", "week", "month")
 
 
 class SQLAlchemyTransactionRepository(TransactionRepository):
@@ -17,8 +22,8 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
 
     async def create(self, transaction: Transaction) -> Transaction:
         self.session.add(transaction)
-        await self.session.commit()
-        await self.session.refresh(transaction)
+        await save_changes(self.session, transaction)
+        await after_commit(self.session, cache_service.invalidate, transaction.user_id, "transactions")
         return transaction
 
     async def get_by_id(self, transaction_id: UUID) -> Optional[Transaction]:
@@ -27,56 +32,251 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
         )
         return result.scalar_one_or_none()
 
-    async def get_by_user_id(
-        self,
-        user_id: UUID,
+    @staticmethod
+    def _period_conditions(
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> List[Transaction]:
-        from sqlalchemy.orm import joinedload
-        
-        # Subquery para obter transaction_ids de bills canceladas
-        cancelled_bills_subquery = select(Bill.transaction_id).where(
-            and_(
-                Bill.status == BillStatus.CANCELLED,
-                Bill.transaction_id.isnot(None)
-            )
-        )
-        
-        query = select(Transaction).options(
-            joinedload(Transaction.category),
-            joinedload(Transaction.account)
-        ).where(
-            and_(
-                Transaction.user_id == user_id,
-                ~Transaction.id.in_(cancelled_bills_subquery)
-            )
-        )
+    ) -> list:
+        """Filtros de período (UTC; end_date inclui o dia inteiro)"""
+        import pytz
         
+        conditions = []
         if start_date:
             # Garantir que start_date seja timezone-aware
-            import pytz
             if start_date.tzinfo is None:
                 start_date = pytz.UTC.localize(start_date)
             else:
                 start_date = start_date.astimezone(pytz.UTC)
-            query = query.where(Transaction.transaction_date >= start_date)
+            conditions.append(Transaction.transaction_date >= start_date)
         if end_date:
             # Garantir que end_date seja timezone-aware e inclua o final do dia
-            import pytz
             if end_date.tzinfo is None:
                 end_date = pytz.UTC.localize(end_date)
             else:
                 end_date = end_date.astimezone(pytz.UTC)
             # Adicionar 23:59:59.999 para incluir todo o dia
-            from datetime import timedelta
             end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-            query = query.where(Transaction.transaction_date <= end_date)
+            conditions.append(Transaction.transaction_date <= end_date)
+        
+        return conditions
+
+    @staticmethod
+    def _not_from_cancelled_bill():
+        """
+        Exclui transações de bills canceladas.
+
+        NOT EXISTS correlacionado (anti-join): só as transações já filtradas são
+        verificadas, pelo índice parcial ix_bills_cancelled_transaction_id, em vez
+        de um NOT IN sobre as bills canceladas de todos os usuários.
+        """
+        return ~exists().where(
+            Bill.transaction_id == Transaction.id,
+            Bill.status == BillStatus.CANCELLED,
+        )
+
+    def _user_period_conditions(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> list:
+        """Filtros comuns de leitura por usuário/período (excluindo transações de bills canceladas)"""
+        return [
+            Transaction.user_id == user_id,
+            self._not_from_cancelled_bill(),
+            *self._period_conditions(start_date, end_date),
+        ]
+
+    async def get_by_user_id(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Transaction]:
+        from sqlalchemy.orm import joinedload
+        
+        query = select(Transaction).options(
+            joinedload(Transaction.category),
+            joinedload(Transaction.account)
+        ).where(
+            and_(*self._user_period_conditions(user_id, start_date, end_date))
+        )
         
         query = query.order_by(Transaction.transaction_date.desc())
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def stream_export_rows(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[List[Tuple]]:
+        from src.infrastructure.database.models.category import Category
+        from src.infrastructure.database.models.account import Account
+
+        # Só as colunas exportadas (sem montar entidades ORM) e por cursor no
+        # servidor: a memória fica limitada a um lote, qualquer que seja o histórico
+        query = (
+            select(
+                Transaction.transaction_date,
+                Transaction.description,
+                Transaction.transaction_type,
+                Transaction.amount,
+                Transaction.status,
+                Category.name,
+                Account.name,
+            )
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .outerjoin(Account, Account.id == Transaction.account_id)
+            .where(and_(*self._user_period_conditions(user_id, start_date, end_date)))
+            .order_by(Transaction.transaction_date.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    async def get_visible_page(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[Transaction]:
+        """
+        Página de transações visíveis ao usuário, ordenada por (transaction_date, id) desc.
+
+        Inclui as transações do usuário e as das contas das famílias em que ele tem
+        permissão de ver transações (contas da família + contas ativas dos membros),
+        em uma única query. `after` é a chave (transaction_date, id) do último item
+        da página anterior.
+        """
+        from sqlalchemy import union, tuple_
+        from src.infrastructure.database.models.account import Account
+        from src.infrastructure.database.models.user import FamilyMember
+        from src.infrastructure.database.models.family_permission import FamilyMemberPermission, ModulePermission
+        
+        # Famílias em que o usuário pode ver transações
+        visible_families = (
+            select(FamilyMember.family_id)
+            .join(
+                FamilyMemberPermission,
+                and_(
+                    FamilyMemberPermission.family_member_id == FamilyMember.id,
+                    FamilyMemberPermission.module == ModulePermission.TRANSACTIONS,
+                    FamilyMemberPermission.can_view == True,
+                ),
+            )
+            .where(FamilyMember.user_id == user_id)
+        )
+        family_account_ids = union(
+            select(Account.id).where(
+                Account.family_id.in_(visible_families),
+                Account.is_active == True,
+            ),
+            select(Account.id)
+            .join(FamilyMember, Account.owner_id == FamilyMember.user_id)
+            .where(
+                FamilyMember.family_id.in_(visible_families),
+                Account.is_active == True,
+            ),
+        )
+        
+        own_conditions = self._user_period_conditions(user_id)
+        query = select(Transaction).where(
+            and_(
+                *self._period_conditions(start_date, end_date),
+                or_(
+                    and_(*own_conditions),
+                    Transaction.account_id.in_(family_account_ids),
+                ),
+            )
+        )
+        if after:
+            query = query.where(tuple_(Transaction.transaction_date, Transaction.id) < tuple_(*after))
+        
+        query = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def aggregate(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        group_by: Sequence[str] = (),
+        transaction_type: Optional[str] = None,
+        status: Optional[str] = "completed",
+    ) -> List[Dict]:
+        """
+        Soma e contagem de transações agrupadas no banco.
+        
+        Usa os mesmos filtros de get_by_user_id. Dimensões aceitas em group_by:
+        type, status, category, account, day, week e month (buckets em UTC).
+        Cada linha traz as dimensões pedidas mais "total" (Decimal) e "count".
+        """
+        from src.infrastructure.database.models.transaction import TransactionStatus
+        from src.infrastructure.database.models.category import Category
+        from src.infrastructure.database.models.account import Account
+        
+        columns = []
+        needs_category = False
+        needs_account = False
+        for dimension in group_by:
+            if dimension == "type":
+                columns.append(Transaction.transaction_type.label("type"))
+            elif dimension == "status":
+                columns.append(Transaction.status.label("status"))
+            elif dimension == "category":
+                columns.append(Transaction.category_id.label("category_id"))
+                columns.append(Category.name.label("category_name"))
+                needs_category = True
+            elif dimension == "account":
+                columns.append(Transaction.account_id.label("account_id"))
+                columns.append(Account.name.label("account_name"))
+                needs_account = True
+            elif dimension in TIME_BUCKETS:
+                columns.append(
+                    func.date_trunc(
+                        dimension, func.timezone("UTC", Transaction.transaction_date)
+                    ).label(dimension)
+                )
+            else:
+                raise ValueError(f"Dimensão de agrupamento inválida: {dimension}")
+        
+        conditions = self._user_period_conditions(user_id, start_date, end_date)
+        if transaction_type:
+            conditions.append(Transaction.transaction_type == TransactionType(transaction_type))
+        if status:
+            conditions.append(Transaction.status == TransactionStatus(status))
+        
+        query = select(
+            *columns,
+            func.coalesce(func.sum(Transaction.amount), 0).label("total"),
+            func.count(Transaction.id).label("count"),
+        ).select_from(Transaction)
+        if needs_category:
+            query = query.outerjoin(Category, Category.id == Transaction.category_id)
+        if needs_account:
+            query = query.outerjoin(Account, Account.id == Transaction.account_id)
+        query = query.where(and_(*conditions))
+        if columns:
+            query = query.group_by(*columns).order_by(*columns)
+        
+        result = await self.session.execute(query)
+        rows = []
+        for row in result.mappings().all():
+            item = dict(row)
+            for key in ("type", "status"):
+                if key in item and hasattr(item[key], "value"):
+                    item[key] = item[key].value
+            item["total"] = Decimal(str(item["total"]))
+            rows.append(item)
+        return rows
+
     async def get_by_account_id(
         self,
         account_id: UUID,
@@ -95,15 +295,16 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
         return list(result.scalars().all())
 
     async def update(self, transaction: Transaction) -> Transaction:
-        await self.session.commit()
-        await self.session.refresh(transaction)
+        await save_changes(self.session, transaction)
+        await after_commit(self.session, cache_service.invalidate, transaction.user_id, "transactions")
         return transaction
 
     async def delete(self, transaction_id: UUID) -> bool:
         transaction = await self.get_by_id(transaction_id)
         if transaction:
             await self.session.delete(transaction)
-            await self.session.commit()
+            await save_changes(self.session)
+            await after_commit(self.session, cache_service.invalidate, transaction.user_id, "transactions")
             return True
         return False
 
@@ -153,25 +354,17 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
         """Busca avançada de transações com filtros múltiplos"""
         from sqlalchemy import or_, desc, asc
         
-        # Subquery para obter transaction_ids de bills canceladas
-        cancelled_bills_subquery = select(Bill.transaction_id).where(
-            and_(
-                Bill.status == BillStatus.CANCELLED,
-                Bill.transaction_id.isnot(None)
-            )
-        )
-        
         # Query base (excluindo transações de bills canceladas)
         query = select(Transaction).where(
             and_(
                 Transaction.user_id == user_id,
-                ~Transaction.id.in_(cancelled_bills_subquery)
+                self._not_from_cancelled_bill()
             )
         )
         count_query = select(func.count(Transaction.id)).where(
             and_(
                 Transaction.user_id == user_id,
-                ~Transaction.id.in_(cancelled_bills_subquery)
+                self._not_from_cancelled_bill()
             )
         )
         
@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func, and_, cast, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
+from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
+from src.infrastructure.database.models.transaction_rollup import DailyTransactionRollup
+from src.infrastructure.database.unit_of_work import save_changes
+
+# Colunas que formam a chave única do agregado
+ROLLUP_KEY = ("user_id", "workspace_id", "category_id", "transaction_type", "status", "day")
+
+# Linhas por INSERT no upsert em lote (limite de parâmetros do PostgreSQL)
+ROLLUP_UPSERT_CHUNK = 1000
+
+
+class SQLAlchemyTransactionRollupRepository(TransactionRollupRepository):
+    """Implementação do repositório de totais diários com SQLAlchemy"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_delta(
+        self,
+        user_id: UUID,
+        transaction_type: str,
+        status: str,
+        day: date,
+        amount: Decimal,
+        count: int,
+        workspace_id: Optional[UUID] = None,
+        category_id: Optional[UUID] = None,
+    ) -> None:
+        await self.apply_deltas([{
+            "user_id": user_id,
+            "workspace_id": workspace_id,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+            "status": status,
+            "day": day,
+            "amount": amount,
+            "count": count,
+        }])
+
+    async def apply_deltas(self, deltas: List[Dict]) -> None:
+        if not deltas:
+            return
+        # Upsert: cria a linha da chave ou acumula o delta na existente
+        # (ordenado pela chave para que escritas concorrentes travem na mesma ordem)
+        rows = sorted(
+            (
+                {
+                    "user_id": delta["user_id"],
+                    "workspace_id": delta.get("workspace_id"),
+                    "category_id": delta.get("category_id"),
+                    "transaction_type": TransactionType(delta["transaction_type"]),
+                    "status": TransactionStatus(delta["status"]),
+                    "day": delta["day"],
+                    "total_amount": delta["amount"],
+                    "transaction_count": delta["count"],
+                }
+                for delta in deltas
+            ),
+            key=lambda row: tuple(str(row[column]) for column in ROLLUP_KEY),
+        )
+        # SAVEPOINT: se o upsert falhar, só ele é desfeito e a sessão do chamador segue utilizável
+        async with self.session.begin_nested():
+            for start in range(0, len(rows), ROLLUP_UPSERT_CHUNK):
+                stmt = pg_insert(DailyTransactionRollup).values(rows[start:start + ROLLUP_UPSERT_CHUNK])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(ROLLUP_KEY),
+                    set_={
+                        "total_amount": DailyTransactionRollup.total_amount + stmt.excluded.total_amount,
+                        "transaction_count": DailyTransactionRollup.transaction_count + stmt.excluded.transaction_count,
+                        "updated_at": func.now(),
+                    },
+                )
+                await self.session.execute(stmt)
+        await save_changes(self.session)
+
+    async def get_totals(
+        self,
+        user_id: UUID,
+        start_day: date,
+        end_day: date,
+        group_by: Sequence[str] = ("day",),
+        transaction_type: Optional[str] = None,
+        status: Optional[str] = None,
+        workspace_id: Optional[UUID] = None,
+    ) -> List[Dict]:
+        columns = []
+        for dimension in group_by:
+            if dimension == "day":
+                columns.append(DailyTransactionRollup.day.label("day"))
+            elif dimension == "month":
+                columns.append(cast(func.date_trunc("month", DailyTransactionRollup.day), Date).label("month"))
+            elif dimension == "category":
+                columns.append(DailyTransactionRollup.category_id.label("category_id"))
+            elif dimension == "type":
+                columns.append(DailyTransactionRollup.transaction_type.label("type"))
+            elif dimension == "status":
+                columns.append(DailyTransactionRollup.status.label("status"))
+            else:
+                raise ValueError(f"Dimensão de agrupamento inválida: {dimension}")
+        
+        conditions = [
+            DailyTransactionRollup.user_id == user_id,
+            DailyTransactionRollup.day >= start_day,
+            DailyTransactionRollup.day <= end_day,
+        ]
+        if transaction_type:
+            conditions.append(DailyTransactionRollup.transaction_type == TransactionType(transaction_type))
+        if status:
+            conditions.append(DailyTransactionRollup.status == TransactionStatus(status))
+        if workspace_id:
+            conditions.append(DailyTransactionRollup.workspace_id == workspace_id)
+        
+        query = select(
+            *columns,
+            func.coalesce(func.sum(DailyTransactionRollup.total_amount), 0).label("total"),
+            func.coalesce(func.sum(DailyTransactionRollup.transaction_count), 0).label("count"),
+        ).where(and_(*conditions))
+        if columns:
+            query = query.group_by(*columns).order_by(*columns)
+        
+        result = await self.session.execute(query)
+        rows = []
+        for row in result.mappings().all():
+            item = dict(row)
+            for key in ("type", "status"):
+                if key in item and hasattr(item[key], "value"):
+                    item[key] = item[key].value
+            item["total"] = Decimal(str(item["total"]))
+            item["count"] = int(item["count"])
+            # Descartar chaves zeradas (ex.: transação criada e removida no mesmo dia)
+            if item["count"] == 0 and item["total"] == 0:
+                continue
+            rows.append(item)
+        return rows
+
+    async def rebuild(self, user_id: Optional[UUID] = None) -> int:
+        delete_stmt = delete(DailyTransactionRollup)
+        if user_id:
+            delete_stmt = delete_stmt.where(DailyTransactionRollup.user_id == user_id)
+        await self.session.execute(delete_stmt)
+        
+        day = cast(func.timezone("UTC", Transaction.transaction_date), Date)
+        source = select(
+            func.gen_random_uuid(),
+            Transaction.user_id,
+            Transaction.workspace_id,
+            Transaction.category_id,
+            Transaction.transaction_type,
+            Transaction.status,
+            day,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+            func.now(),
+        ).group_by(
+            Transaction.user_id,
+            Transaction.workspace_id,
+            Transaction.category_id,
+            Transaction.transaction_type,
+            Transaction.status,
+            day,
+        )
+        if user_id:
+            source = source.where(Transaction.user_id == user_id)
+        
+        result = await self.session.execute(
+            insert(DailyTransactionRollup).from_select(
+                ["id", *ROLLUP_KEY, "total_amount", "transaction_count", "updated_at"],
+                source,
+            )
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from src.domain.repositories.user_repository import UserRepository
 from src.infrastructure.database.models.user import User
+from src.infrastructure.cache.principal_cache import principal_cache
 
 
 class SQLAlchemyUserRepository(UserRepository):
@@ -33,6 +34,7 @@ class SQLAlchemyUserRepository(UserRepository):
 
     async def update(self, user: User) -> User:
         await self.session.commit()
+        await principal_cache.invalidate(user.id)
         await self.session.refresh(user)
         return user
 
@@ -41,6 +43,7 @@ class SQLAlchemyUserRepository(UserRepository):
         if user:
             await self.session.delete(user)
             await self.session.commit()
+            await principal_cache.invalidate(user_id)
             return True
         return False
 
@@ -68,8 +71,23 @@ class SQLAlchemyUserRepository(UserRepository):
         )
         await self.session.execute(stmt)
         await self.session.commit()
+        await principal_cache.invalidate(user_id)
         return True
 
+    async def revoke_tokens(self, user_id: UUID) -> int:
+        """Incrementa a versão dos tokens: os já emitidos deixam de valer"""
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.token_version)
+        )
+        result = await self.session.execute(stmt)
+        token_version = result.scalar_one()
+        await self.session.commit()
+        await principal_cache.invalidate(user_id)
+        return token_version
+
     async def update_user(self, user_id: UUID, **kwargs) -> User:
         """Atualiza campos de um usuário"""
         # Filtrar apenas campos válidos do modelo User
@@ -93,6 +111,7 @@ class SQLAlchemyUserRepository(UserRepository):
         )
         await self.session.execute(stmt)
         await self.session.commit()
+        await principal_cache.invalidate(user_id)
         
         # Retornar usuário atualizado
         user = await self.get_by_id(user_id)
@@ -1,5 +1,5 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.infrastructure.database.base import get_db
@@ -27,12 +27,16 @@ def get_auth_service(
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     auth_service: AuthService = Depends(get_auth_service),
 ) -> User:
     """Dependency para obter usuário atual autenticado"""
     try:
-        return await auth_service.get_current_user(token)
+        user = await auth_service.get_current_user(token)
+        # Disponibilizar para o LoggingMiddleware
+        request.state.user = user
+        return user
     except UnauthorizedException as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -7,6 +7,17 @@ from src.shared.config import settings
 from src.infrastructure.cache.redis_client import redis_client
 from src.presentation.api.v1.routes import api_router  # routes.py (arquivo, não diretório)
 from src.application.tasks.planning_checker import planning_checker
+from src.application.tasks.scheduled_transaction_executor import scheduled_transaction_executor
+from src.application.tasks.request_log_sink import request_log_sink
+from src.application.tasks.notification_outbox_worker import notification_outbox_worker
+from src.application.tasks.notification_dispatcher import notification_dispatcher
+from src.application.services.report_render_service import report_render_service
+from src.application.tasks.receipt_ocr_queue import receipt_ocr_queue
+from src.application.tasks.leaderboard_reconciler import leaderboard_reconciler
+from src.application.tasks.gamification_processor import gamification_processor
+from src.application.services.help_content_service import help_content_index
+from src.infrastructure.cache.principal_cache import principal_cache
+from src.application.auth.password_hasher import password_hasher
 from src.presentation.api.middleware.logging_middleware import LoggingMiddleware
 from src.shared.exceptions import (
     BaseAppException,
@@ -24,9 +35,33 @@ async def lifespan(app: FastAPI):
     await redis_client.connect()
     # Iniciar tarefa de verificação de planejamentos
     planning_checker.start()
+    # Iniciar execução automática de transações agendadas
+    scheduled_transaction_executor.start()
+    # Iniciar gravação em lote dos logs de requisições
+    request_log_sink.start()
+    # Iniciar envio em background da fila de notificações
+    notification_outbox_worker.start()
+    # Iniciar agrupamento e envio de notificações por email/WhatsApp
+    notification_dispatcher.start()
+    # Iniciar aplicação em lote dos pontos e badges de gamificação
+    gamification_processor.start()
+    # Iniciar reconstrução periódica do ranking de gamificação (Redis)
+    leaderboard_reconciler.start()
+    # Compilar o conteúdo de ajuda (corpos JSON e ETags) antes da primeira requisição
+    help_content_index.load()
     yield
     # Shutdown
     planning_checker.stop()
+    scheduled_transaction_executor.stop()
+    leaderboard_reconciler.stop()
+    await gamification_processor.stop()
+    await request_log_sink.stop()
+    # O despachante entrega o pendente na fila de saída antes de o worker parar
+    await notification_dispatcher.stop()
+    await notification_outbox_worker.stop()
+    await report_render_service.shutdown()
+    await receipt_ocr_queue.shutdown()
+    password_hasher.shutdown()
     await redis_client.disconnect()
 
 
@@ -84,6 +119,18 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected",
-        "cache": "connected"
+        "cache": "connected",
+        "request_log_sink": request_log_sink.stats(),
+        "planning_checker": planning_checker.last_run,
+        "scheduled_transaction_executor": scheduled_transaction_executor.last_run,
+        "leaderboard_reconciler": leaderboard_reconciler.last_run,
+        "gamification_processor": gamification_processor.stats(),
+        "notification_outbox": notification_outbox_worker.stats(),
+        "notification_dispatcher": notification_dispatcher.stats(),
+        "report_renderer": report_render_service.stats(),
+        "receipt_ocr": receipt_ocr_queue.stats(),
+        "help_content": help_content_index.stats(),
+        "principal_cache": principal_cache.stats(),
+        "password_hasher": password_hasher.stats(),
     }
 
@@ -1,74 +1,74 @@
 import time
 import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from src.application.services.logging_service import LoggingService
-from src.domain.repositories.log_repository import LogRepository
-from src.infrastructure.repositories.log_repository import SQLAlchemyLogRepository
-from src.infrastructure.database.base import AsyncSessionLocal
-from sqlalchemy.ext.asyncio import AsyncSession
+from src.application.tasks.request_log_sink import request_log_sink
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware para logging automático de requisições"""
+class LoggingMiddleware:
+    """Middleware ASGI para logging automático de requisições
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Gerar ID único para a requisição
+    Implementado direto sobre ASGI (sem BaseHTTPMiddleware) para não criar
+    tasks nem envolver o corpo da resposta; StreamingResponse passa intacta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Gerar ID único para a requisição (disponível em request.state.request_id)
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # Obter informações da requisição
-        start_time = time.time()
-        method = request.method
-        endpoint = str(request.url.path)
-        ip_address = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
-        
-        # Obter usuário se autenticado
-        user_id = None
-        if hasattr(request.state, "user") and request.state.user:
-            user_id = request.state.user.id
-        
-        # Executar requisição
-        response = None
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+
+        start_time = time.perf_counter()
+        status_code = 500
         error = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             error = e
             raise
         finally:
             # Calcular tempo de execução
-            execution_time = (time.time() - start_time) * 1000  # em milissegundos
-            
-            # Obter status code
-            status_code = response.status_code if response else 500
-            
-            # Criar log (assíncrono em background)
-            # Nota: Em produção, isso deveria ser feito em background task
-            # Por enquanto, vamos fazer de forma assíncrona mas sem bloquear a resposta
+            execution_time = (time.perf_counter() - start_time) * 1000  # em milissegundos
+
+            # Usuário autenticado (definido por get_current_user em request.state.user)
+            user = state.get("user")
+            client = scope.get("client")
+            user_agent = None
+            for name, value in scope.get("headers", []):
+                if name == b"user-agent":
+                    user_agent = value.decode("latin-1")
+                    break
+
+            # Enfileirar log; a gravação é feita em lote pelo request_log_sink
             try:
-                from src.infrastructure.database.base import AsyncSessionLocal
-                async with AsyncSessionLocal() as db:
-                    log_repo = SQLAlchemyLogRepository(db)
-                    logging_service = LoggingService(log_repo)
-                    
-                    await logging_service.log_api_request(
-                        method=method,
-                        endpoint=endpoint,
-                        user_id=user_id,
+                request_log_sink.enqueue(
+                    LoggingService.build_api_request_log(
+                        method=scope["method"],
+                        endpoint=scope["path"],
+                        user_id=user.id if user else None,
                         status_code=status_code,
                         execution_time_ms=execution_time,
-                        ip_address=ip_address,
+                        ip_address=client[0] if client else None,
                         user_agent=user_agent,
                         request_id=request_id,
                         error=error,
                     )
+                )
             except Exception as log_error:
                 # Não falhar a requisição se o log falhar
                 import logging
                 logging.error(f"Erro ao criar log: {log_error}")
-        
-        return response
-
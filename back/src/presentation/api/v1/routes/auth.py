@@ -17,7 +17,7 @@ from src.presentation.schemas.user import (
 )
 from src.presentation.api.dependencies import get_auth_service, get_user_repository
 from src.shared.config import settings
-from src.shared.exceptions import UnauthorizedException
+from src.shared.exceptions import UnauthorizedException, TooManyRequestsException
 
 router = APIRouter()
 
@@ -91,6 +91,8 @@ async def register(
         print(f"✅ Registro concluído. Retornando dados com 2FA: {bool(response_data.get('two_factor'))}")
         return response_data
         
+    except TooManyRequestsException:
+        raise
     except Exception as e:
         print(f"❌ Erro no registro: {str(e)}")
         import traceback
@@ -112,8 +114,8 @@ async def login(
         result = await auth_service.authenticate(credentials.email, credentials.password)
         print(f"✅ Login bem-sucedido para: {credentials.email}")
         return result
-    except UnauthorizedException:
-        # Deixa passar para o handler global tratar (retorna 401)
+    except (UnauthorizedException, TooManyRequestsException):
+        # Deixa passar para o handler global tratar (401 / 429)
         raise
     except Exception as e:
         # Log do erro interno mas retorna mensagem genérica
@@ -8,10 +8,12 @@ from src.domain.repositories.bill_repository import BillRepository
 from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.calendar_repository import CalendarEventRepository
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
 from src.infrastructure.repositories.bill_repository import SQLAlchemyBillRepository
 from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
 from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
 from src.infrastructure.repositories.calendar_repository import SQLAlchemyCalendarEventRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
 from src.application.use_cases.bill_use_cases import BillUseCases
 from src.infrastructure.database.base import get_db
 from src.infrastructure.database.models.user import User
@@ -40,13 +42,18 @@ def get_calendar_event_repository(
     return SQLAlchemyCalendarEventRepository(db)
 
 
+def get_transaction_rollup_repository(db: AsyncSession = Depends(get_db)) -> TransactionRollupRepository:
+    return SQLAlchemyTransactionRollupRepository(db)
+
+
 def get_bill_use_cases(
     bill_repo: BillRepository = Depends(get_bill_repository),
     account_repo: AccountRepository = Depends(get_account_repository),
     transaction_repo: TransactionRepository = Depends(get_transaction_repository),
     calendar_event_repo: "CalendarEventRepository" = Depends(get_calendar_event_repository),
+    transaction_rollup_repo: TransactionRollupRepository = Depends(get_transaction_rollup_repository),
 ) -> BillUseCases:
-    return BillUseCases(bill_repo, account_repo, transaction_repo, calendar_event_repo)
+    return BillUseCases(bill_repo, account_repo, transaction_repo, calendar_event_repo, transaction_rollup_repo)
 
 
 @router.post("/", response_model=BillResponse, status_code=status.HTTP_201_CREATED)
@@ -7,7 +7,7 @@ from src.presentation.api.dependencies import get_current_active_user
 from src.infrastructure.database.models.user import User, FamilyMemberRole
 from src.infrastructure.database.models.family_permission import FamilyMemberPermission, ModulePermission
 from src.domain.repositories.family_permission_repository import FamilyPermissionRepository
-from src.shared.exceptions import NotFoundException, UnauthorizedException
+from src.shared.exceptions import NotFoundException, UnauthorizedException, TooManyRequestsException
 from src.domain.repositories.family_repository import (
     FamilyRepository,
     FamilyMemberRepository,
@@ -26,6 +26,7 @@ from src.infrastructure.repositories.user_repository import SQLAlchemyUserReposi
 from src.shared.config import settings
 from src.application.use_cases.family_use_cases import FamilyUseCases
 from src.application.notifications.notification_service import NotificationService
+from src.application.tasks.gamification_processor import gamification_processor
 from src.infrastructure.database.base import get_db
 from src.presentation.schemas.family import (
     FamilyCreate,
@@ -111,57 +112,11 @@ def get_family_use_cases(db: AsyncSession = Depends(get_db)) -> FamilyUseCases:
     return FamilyUseCases(family_repo, member_repo, chat_repo, invite_repo, user_repo, notification_service)
 
 
-def get_gamification_service_helper(db: AsyncSession):
-    """Helper para criar GamificationService"""
-    try:
-        from src.domain.repositories.gamification_repository import (
-            BadgeRepository,
-            UserBadgeRepository,
-            UserLevelRepository,
-            ChallengeRepository,
-            UserChallengeRepository,
-        )
-        from src.domain.repositories.transaction_repository import TransactionRepository
-        from src.domain.repositories.goal_repository import GoalRepository
-        from src.infrastructure.repositories.gamification_repository import (
-            SQLAlchemyBadgeRepository,
-            SQLAlchemyUserBadgeRepository,
-            SQLAlchemyUserLevelRepository,
-            SQLAlchemyChallengeRepository,
-            SQLAlchemyUserChallengeRepository,
-        )
-        from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
-        from src.infrastructure.repositories.goal_repository import SQLAlchemyGoalRepository
-        from src.application.services.gamification_service import GamificationService
-        
-        badge_repo = SQLAlchemyBadgeRepository(db)
-        user_badge_repo = SQLAlchemyUserBadgeRepository(db)
-        user_level_repo = SQLAlchemyUserLevelRepository(db)
-        challenge_repo = SQLAlchemyChallengeRepository(db)
-        user_challenge_repo = SQLAlchemyUserChallengeRepository(db)
-        transaction_repo = SQLAlchemyTransactionRepository(db)
-        goal_repo = SQLAlchemyGoalRepository(db)
-        
-        return GamificationService(
-            badge_repo,
-            user_badge_repo,
-            user_level_repo,
-            challenge_repo,
-            user_challenge_repo,
-            transaction_repo,
-            goal_repo,
-        )
-    except Exception as e:
-        print(f"[WARNING] Erro ao criar GamificationService: {e}")
-        return None
-
-
 @router.post("", response_model=FamilyResponse, status_code=status.HTTP_201_CREATED)
 async def create_family(
     family_data: FamilyCreate,
     use_cases: FamilyUseCases = Depends(get_family_use_cases),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
 ):
     """Cria um novo grupo/família"""
     family = await use_cases.create_family(
@@ -170,13 +125,8 @@ async def create_family(
         owner_id=current_user.id,
     )
     
-    # Adicionar XP por criar família (gamificação)
-    gamification_service = get_gamification_service_helper(db)
-    if gamification_service:
-        try:
-            await gamification_service.add_points(current_user.id, 50, "Criar família")
-        except Exception as e:
-            print(f"[WARNING] Erro ao adicionar XP por criar família: {e}")
+    # Adicionar XP por criar família (gamificação, em background)
+    gamification_processor.submit(current_user.id, 50, "Criar família")
     
     return family
 
@@ -284,13 +234,8 @@ async def invite_member(
             frontend_url=frontend_url,
         )
         
-        # Adicionar XP por convidar membro (gamificação)
-        gamification_service = get_gamification_service_helper(db)
-        if gamification_service:
-            try:
-                await gamification_service.add_points(current_user.id, 25, "Convidar membro para família")
-            except Exception as e:
-                print(f"[WARNING] Erro ao adicionar XP por convidar membro: {e}")
+        # Adicionar XP por convidar membro (gamificação, em background)
+        gamification_processor.submit(current_user.id, 25, "Convidar membro para família")
         
         # Se membro foi criado diretamente (usuário já existia), criar permissões padrão
         if not result.get("invite_created") and result.get("member"):
@@ -731,14 +676,8 @@ async def register_via_invite(
         auth_service = get_auth_service(use_cases.user_repository)
         tokens = await auth_service.authenticate(invite.email, request.password)
         
-        # Inicializar nível de gamificação
-        gamification_service = get_gamification_service_helper(db)
-        if gamification_service:
-            try:
-                await gamification_service.initialize_user_level(user.id)
-                await gamification_service.add_points(user.id, 50, "Cadastro via convite familiar")
-            except Exception as e:
-                print(f"[WARNING] Erro ao inicializar gamificação: {e}")
+        # Inicializar nível de gamificação (em background)
+        gamification_processor.submit(user.id, 50, "Cadastro via convite familiar")
         
         # Converter QR code para base64 string
         import base64
@@ -773,7 +712,7 @@ async def register_via_invite(
             },
             "message": "Conta criada com sucesso! Configure seu autenticador 2FA."
         }
-    except HTTPException:
+    except (HTTPException, TooManyRequestsException):
         raise
     except Exception as e:
         import traceback
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from src.presentation.schemas.gamification import (
     BadgeResponse,
@@ -11,6 +11,7 @@ from src.presentation.schemas.gamification import (
     ChallengeResponse,
     UserChallengeResponse,
     LeaderboardEntry,
+    LeaderboardPosition,
 )
 from src.presentation.api.dependencies import get_current_active_user
 from src.infrastructure.database.models.user import User
@@ -34,6 +35,7 @@ from src.infrastructure.repositories.gamification_repository import (
 from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
 from src.infrastructure.repositories.goal_repository import SQLAlchemyGoalRepository
 from src.application.services.gamification_service import GamificationService
+from src.application.services.leaderboard_service import leaderboard_service
 from src.infrastructure.database.models.gamification import Badge, UserBadge, UserLevel, Challenge, UserChallenge, BadgeType
 
 router = APIRouter()
@@ -272,50 +274,24 @@ async def join_challenge(
 async def get_leaderboard(
     limit: int = Query(10, ge=1, le=100),
     scope: str = Query("global", regex="^(global|family|workspace)$"),
-    db: AsyncSession = Depends(get_db),
+    scope_id: Optional[UUID] = Query(None, description="Família ou workspace (padrão: o primeiro do usuário)"),
+    user_level_repo: UserLevelRepository = Depends(get_user_level_repository),
     current_user: User = Depends(get_current_active_user),
 ):
     """Obtém ranking de usuários"""
-    from src.infrastructure.database.models.user import User
-    from src.infrastructure.database.models.gamification import UserLevel
-    
-    try:
-        # Query começando de UserLevel e fazendo join com User
-        query = select(
-            UserLevel.user_id,
-            User.name.label("username"),
-            UserLevel.level,
-            UserLevel.total_points,
-        ).select_from(UserLevel).join(User, UserLevel.user_id == User.id)
-        
-        # Filtrar por escopo (futuro: family, workspace)
-        if scope == "global":
-            pass  # Todos os usuários
-        # TODO: Adicionar filtros para family e workspace
-        
-        # Ordenar por total_points e limitar
-        query = query.order_by(desc(UserLevel.total_points)).limit(limit)
-        
-        result = await db.execute(query)
-        rows = result.all()
-        
-        leaderboard = []
-        for idx, row in enumerate(rows, 1):
-            leaderboard.append({
-                "user_id": row.user_id,
-                "username": row.username or "Usuário",
-                "level": row.level or 1,
-                "total_points": row.total_points or 0,
-                "rank": idx,
-            })
-        
-        return leaderboard
-    except Exception as e:
-        # Se não houver UserLevels, retornar lista vazia
-        print(f"[DEBUG] Erro ao buscar leaderboard: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    return await leaderboard_service.get_top(user_level_repo, current_user.id, scope, scope_id, limit)
+
+
+@router.get("/leaderboard/me", response_model=LeaderboardPosition)
+async def get_my_leaderboard_position(
+    window: int = Query(5, ge=0, le=50),
+    scope: str = Query("global", regex="^(global|family|workspace)$"),
+    scope_id: Optional[UUID] = Query(None, description="Família ou workspace (padrão: o primeiro do usuário)"),
+    user_level_repo: UserLevelRepository = Depends(get_user_level_repository),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Posição do usuário no ranking e os vizinhos acima e abaixo"""
+    return await leaderboard_service.get_position(user_level_repo, current_user.id, scope, scope_id, window)
 
 
 @router.post("/update-streak")
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends, status, HTTPException, Query
 from typing import Optional, List
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 import pytz
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, and_, or_
 
 from src.presentation.schemas.monthly_budget import (
     MonthlyBudgetSummaryResponse,
@@ -19,7 +18,6 @@ from src.presentation.schemas.monthly_budget import (
 from src.presentation.api.dependencies import get_current_active_user
 from src.infrastructure.database.models.user import User
 from src.infrastructure.database.models.category import Category, CategoryType
-from src.infrastructure.database.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.infrastructure.database.base import get_db
 
 router = APIRouter()
@@ -97,41 +95,37 @@ async def get_monthly_budget_summary(
                     planning_map[str(planning.category_id)] = mp
                     break
     
-    # Buscar transações do período
-    transactions_query = select(Transaction).where(
-        and_(
-            Transaction.user_id == current_user.id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            Transaction.status == TransactionStatus.COMPLETED,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date < end_date
-        )
-    ).options(joinedload(Transaction.category))
-    
-    transactions_result = await db.execute(transactions_query)
-    transactions = list(transactions_result.scalars().all())
+    # Totais do período a partir dos agregados diários (sem varrer transações)
+    from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+    rollup_repo = SQLAlchemyTransactionRollupRepository(db)
+    first_day = start_date.date()
+    last_day = (end_date - timedelta(days=1)).date()
     
     # Calcular gastos por categoria
-    expenses_by_category = {}
-    for transaction in transactions:
-        if transaction.category_id:
-            cat_id = str(transaction.category_id)
-            if cat_id not in expenses_by_category:
-                expenses_by_category[cat_id] = Decimal("0")
-            expenses_by_category[cat_id] += transaction.amount
+    expense_rows = await rollup_repo.get_totals(
+        current_user.id,
+        first_day,
+        last_day,
+        group_by=("category",),
+        transaction_type="expense",
+        status="completed",
+    )
+    expenses_by_category = {
+        str(row["category_id"]): row["total"]
+        for row in expense_rows
+        if row["category_id"]
+    }
     
     # Calcular receitas do período (receita real)
-    income_query = select(func.sum(Transaction.amount)).where(
-        and_(
-            Transaction.user_id == current_user.id,
-            Transaction.transaction_type == TransactionType.INCOME,
-            Transaction.status == TransactionStatus.COMPLETED,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date < end_date
-        )
+    income_rows = await rollup_repo.get_totals(
+        current_user.id,
+        first_day,
+        last_day,
+        group_by=(),
+        transaction_type="income",
+        status="completed",
     )
-    total_income_result = await db.execute(income_query)
-    total_income = total_income_result.scalar() or Decimal("0")
+    total_income = income_rows[0]["total"] if income_rows else Decimal("0")
     
     # Buscar receita planejada (armazenada em um Planning mensal geral sem categoria)
     planned_income_query = select(Planning).where(
@@ -1,5 +1,8 @@
 from fastapi import APIRouter, Depends, UploadFile, File, status
-from typing import Optional, List
+import hashlib
+import os
+import tempfile
+from typing import Optional, List, Tuple
 from uuid import UUID
 from src.presentation.schemas.receipt import (
     ReceiptResponse,
@@ -11,12 +14,17 @@ from src.domain.repositories.receipt_repository import ReceiptRepository
 from src.infrastructure.repositories.receipt_repository import SQLAlchemyReceiptRepository
 from src.application.use_cases.receipt_use_cases import ReceiptUseCases
 from src.application.services.receipt_ocr_service import ReceiptOCRService
+from src.application.tasks.receipt_ocr_queue import receipt_ocr_queue
 from src.infrastructure.database.base import get_db
 from src.infrastructure.database.models.user import User
+from src.shared.config import settings
+from src.shared.exceptions import NotFoundException, ValidationException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 def get_receipt_repository(db: AsyncSession = Depends(get_db)) -> ReceiptRepository:
     return SQLAlchemyReceiptRepository(db)
@@ -39,6 +47,29 @@ async def scan_qr_code(
     return receipt
 
 
+async def _save_upload(file: UploadFile) -> Tuple[str, str]:
+    """Grava o upload em arquivo temporário em blocos; retorna (caminho, sha256)"""
+    max_bytes = settings.OCR_MAX_UPLOAD_MB * 1024 * 1024
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_file:
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValidationException(f"Imagem maior que {settings.OCR_MAX_UPLOAD_MB} MB")
+                digest.update(chunk)
+                tmp_file.write(chunk)
+        except Exception:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+    return tmp_file.name, digest.hexdigest()
+
+
 @router.post("/scan-qr-code-file", response_model=ReceiptResponse, status_code=status.HTTP_201_CREATED)
 async def scan_qr_code_file(
     file: UploadFile = File(...),
@@ -47,43 +78,44 @@ async def scan_qr_code_file(
     current_user: User = Depends(get_current_active_user),
 ):
     """Escaneia QR Code de uma imagem de nota fiscal"""
-    import tempfile
-    import os
-    
     # Salvar arquivo temporário
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    tmp_path, content_hash = await _save_upload(file)
     
     try:
         # Processar imagem
-        ocr_data = await ocr_service.process_image(tmp_path)
+        ocr_data = await ocr_service.process_image(tmp_path, content_hash)
         
         # Criar nota fiscal com dados extraídos
-        receipt = await use_cases.process_qr_code(
-            qr_code_data=ocr_data.get("access_key", ""),
-            user_id=current_user.id,
-        )
-        
-        # Atualizar com dados do OCR
-        if ocr_data.get("access_key"):
-            receipt = await use_cases.update_receipt_data(
-                receipt_id=receipt.id,
-                number=ocr_data.get("number"),
-                series=ocr_data.get("series"),
-                issuer_cnpj=ocr_data.get("issuer_cnpj"),
-                total_amount=ocr_data.get("total_amount"),
-                issue_date=ocr_data.get("issue_date"),
-            )
-        
-        return receipt
+        return await use_cases.create_from_ocr(ocr_data, current_user.id)
     finally:
         # Remover arquivo temporário
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
 
 
+@router.post("/ocr-jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_ocr_job(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Envia uma imagem de nota fiscal para OCR em background (consultar em /ocr-jobs/{job_id})"""
+    tmp_path, content_hash = await _save_upload(file)
+    job = await receipt_ocr_queue.submit_job(current_user.id, tmp_path, content_hash)
+    return {key: value for key, value in job.items() if key != "user_id"}
+
+
+@router.get("/ocr-jobs/{job_id}")
+async def get_ocr_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Estado de um OCR agendado (com o ID da nota fiscal criada, quando concluído)"""
+    job = await receipt_ocr_queue.get_job(job_id, current_user.id)
+    if not job:
+        raise NotFoundException("Processamento de OCR", job_id)
+    return {key: value for key, value in job.items() if key != "user_id"}
+
+
 @router.get("/", response_model=List[ReceiptResponse])
 async def list_receipts(
     use_cases: ReceiptUseCases = Depends(get_receipt_use_cases),
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import StreamingResponse
+from io import BytesIO
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -14,8 +15,11 @@ from src.infrastructure.repositories.goal_repository import SQLAlchemyGoalReposi
 from src.infrastructure.repositories.planning_repository import SQLAlchemyPlanningRepository
 from src.infrastructure.repositories.bill_repository import SQLAlchemyBillRepository
 from src.application.services.report_service import ReportService
+from src.application.services.report_render_service import report_render_service
 from src.infrastructure.database.base import get_db
 from src.infrastructure.database.models.user import User
+from src.shared.config import settings
+from src.shared.exceptions import ConflictException, NotFoundException, ValidationException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -53,6 +57,65 @@ async def get_monthly_report_pdf(
     )
 
 
+@router.post("/pdf/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_report_pdf_job(
+    start_year: int = Query(..., ge=2020, le=2100),
+    start_month: int = Query(..., ge=1, le=12),
+    end_year: int = Query(..., ge=2020, le=2100),
+    end_month: int = Query(..., ge=1, le=12),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Agenda um relatório em PDF de vários meses (consultar em /pdf/jobs/{job_id})"""
+    months = (end_year - start_year) * 12 + (end_month - start_month) + 1
+    if months < 1:
+        raise ValidationException("O mês final deve ser igual ou posterior ao mês inicial")
+    if months > settings.REPORT_JOB_MAX_MONTHS:
+        raise ValidationException(f"Período máximo de {settings.REPORT_JOB_MAX_MONTHS} meses")
+
+    job = await report_render_service.submit_job(
+        current_user.id, start_year, start_month, end_year, end_month
+    )
+    return {key: value for key, value in job.items() if key != "user_id"}
+
+
+@router.get("/pdf/jobs/{job_id}")
+async def get_report_pdf_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Estado de um relatório em PDF agendado"""
+    job = await report_render_service.get_job(job_id, current_user.id)
+    if not job:
+        raise NotFoundException("Relatório", job_id)
+    return {key: value for key, value in job.items() if key != "user_id"}
+
+
+@router.get("/pdf/jobs/{job_id}/download")
+async def download_report_pdf_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Baixa o PDF de um relatório agendado já concluído"""
+    job = await report_render_service.get_job(job_id, current_user.id)
+    if not job:
+        raise NotFoundException("Relatório", job_id)
+    if job["status"] != "done":
+        raise ConflictException(f"Relatório ainda não está pronto (status: {job['status']})")
+
+    pdf = await report_render_service.get_job_pdf(job_id)
+    if pdf is None:
+        raise NotFoundException("Relatório", job_id)
+
+    return StreamingResponse(
+        BytesIO(pdf),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=relatorio_{job['period'].replace('/', '_').replace(' ', '')}.pdf",
+            "Content-Length": str(len(pdf)),
+        },
+    )
+
+
 @router.get("/transactions/excel")
 async def get_transactions_excel(
     start_date: Optional[datetime] = Query(None),
@@ -61,12 +124,8 @@ async def get_transactions_excel(
     current_user: User = Depends(get_current_active_user),
 ):
     """Gera relatório de transações em Excel"""
-    excel_buffer = await report_service.generate_transactions_excel(
-        current_user.id, start_date, end_date
-    )
-    
     return StreamingResponse(
-        excel_buffer,
+        report_service.stream_transactions_excel(current_user.id, start_date, end_date),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={
             "Content-Disposition": "attachment; filename=transacoes.xlsx"
@@ -74,6 +133,23 @@ async def get_transactions_excel(
     )
 
 
+@router.get("/transactions/csv")
+async def get_transactions_csv(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    report_service: ReportService = Depends(get_report_service),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Gera relatório de transações em CSV (enviado à medida que é gerado)"""
+    return StreamingResponse(
+        report_service.stream_transactions_csv(current_user.id, start_date, end_date),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": "attachment; filename=transacoes.csv"
+        },
+    )
+
+
 # ========== FASE 1 - MVP ==========
 
 @router.get("/executive")
@@ -12,6 +12,7 @@ from src.domain.repositories.account_repository import AccountRepository
 from src.infrastructure.repositories.scheduled_transaction_repository import SQLAlchemyScheduledTransactionRepository
 from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
 from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
 from src.application.use_cases.scheduled_transaction_use_cases import ScheduledTransactionUseCases
 from src.infrastructure.database.base import get_db
 from src.infrastructure.database.models.user import User
@@ -24,7 +25,8 @@ def get_scheduled_use_cases(db: AsyncSession = Depends(get_db)) -> ScheduledTran
     scheduled_repo = SQLAlchemyScheduledTransactionRepository(db)
     transaction_repo = SQLAlchemyTransactionRepository(db)
     account_repo = SQLAlchemyAccountRepository(db)
-    return ScheduledTransactionUseCases(scheduled_repo, transaction_repo, account_repo)
+    rollup_repo = SQLAlchemyTransactionRollupRepository(db)
+    return ScheduledTransactionUseCases(scheduled_repo, transaction_repo, account_repo, rollup_repo)
 
 
 @router.post("", response_model=ScheduledTransactionResponse, status_code=status.HTTP_201_CREATED)
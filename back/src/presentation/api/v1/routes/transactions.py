@@ -16,30 +16,21 @@ from src.domain.repositories.account_repository import AccountRepository
 from src.domain.repositories.bill_repository import BillRepository
 from src.domain.repositories.goal_repository import GoalRepository, GoalContributionRepository
 from src.domain.repositories.calendar_repository import CalendarEventRepository
-from src.domain.repositories.gamification_repository import (
-    BadgeRepository,
-    UserBadgeRepository,
-    UserLevelRepository,
-    ChallengeRepository,
-    UserChallengeRepository,
-)
+from src.domain.repositories.transaction_rollup_repository import TransactionRollupRepository
 from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
 from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
 from src.infrastructure.repositories.bill_repository import SQLAlchemyBillRepository
 from src.infrastructure.repositories.goal_repository import SQLAlchemyGoalRepository, SQLAlchemyGoalContributionRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
 from src.infrastructure.repositories.calendar_repository import SQLAlchemyCalendarEventRepository
-from src.infrastructure.repositories.gamification_repository import (
-    SQLAlchemyBadgeRepository,
-    SQLAlchemyUserBadgeRepository,
-    SQLAlchemyUserLevelRepository,
-    SQLAlchemyChallengeRepository,
-    SQLAlchemyUserChallengeRepository,
-)
+from src.infrastructure.database.unit_of_work import UnitOfWork
 from src.application.use_cases.transaction_use_cases import TransactionUseCases
-from src.application.services.gamification_service import GamificationService
+from src.application.tasks.gamification_processor import gamification_processor
 from src.infrastructure.database.base import get_db
 from src.infrastructure.database.models.user import User
 from src.infrastructure.database.models.bill import BillStatus
+from src.shared.exceptions import ValidationException
+from src.shared.utils import encode_cursor, decode_cursor
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -69,44 +60,12 @@ def get_calendar_event_repository(db: AsyncSession = Depends(get_db)) -> Calenda
     return SQLAlchemyCalendarEventRepository(db)
 
 
-def get_badge_repository(db: AsyncSession = Depends(get_db)) -> BadgeRepository:
-    return SQLAlchemyBadgeRepository(db)
-
-
-def get_user_badge_repository(db: AsyncSession = Depends(get_db)) -> UserBadgeRepository:
-    return SQLAlchemyUserBadgeRepository(db)
-
+def get_transaction_rollup_repository(db: AsyncSession = Depends(get_db)) -> TransactionRollupRepository:
+    return SQLAlchemyTransactionRollupRepository(db)
 
-def get_user_level_repository(db: AsyncSession = Depends(get_db)) -> UserLevelRepository:
-    return SQLAlchemyUserLevelRepository(db)
 
-
-def get_challenge_repository(db: AsyncSession = Depends(get_db)) -> ChallengeRepository:
-    return SQLAlchemyChallengeRepository(db)
-
-
-def get_user_challenge_repository(db: AsyncSession = Depends(get_db)) -> UserChallengeRepository:
-    return SQLAlchemyUserChallengeRepository(db)
-
-
-def get_gamification_service(
-    badge_repo: BadgeRepository = Depends(get_badge_repository),
-    user_badge_repo: UserBadgeRepository = Depends(get_user_badge_repository),
-    user_level_repo: UserLevelRepository = Depends(get_user_level_repository),
-    challenge_repo: ChallengeRepository = Depends(get_challenge_repository),
-    user_challenge_repo: UserChallengeRepository = Depends(get_user_challenge_repository),
-    transaction_repo: TransactionRepository = Depends(get_transaction_repository),
-    goal_repo: GoalRepository = Depends(get_goal_repository),
-) -> GamificationService:
-    return GamificationService(
-        badge_repo,
-        user_badge_repo,
-        user_level_repo,
-        challenge_repo,
-        user_challenge_repo,
-        transaction_repo,
-        goal_repo,
-    )
+def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    return UnitOfWork(db)
 
 
 def get_transaction_use_cases(
@@ -116,7 +75,8 @@ def get_transaction_use_cases(
     goal_repository: GoalRepository = Depends(get_goal_repository),
     goal_contribution_repository: GoalContributionRepository = Depends(get_goal_contribution_repository),
     calendar_event_repository: CalendarEventRepository = Depends(get_calendar_event_repository),
-    gamification_service: GamificationService = Depends(get_gamification_service),
+    transaction_rollup_repository: TransactionRollupRepository = Depends(get_transaction_rollup_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
 ) -> TransactionUseCases:
     return TransactionUseCases(
         transaction_repository, 
@@ -125,7 +85,9 @@ def get_transaction_use_cases(
         goal_repository,
         goal_contribution_repository,
         calendar_event_repository,
-        gamification_service
+        gamification_processor,
+        transaction_rollup_repository,
+        unit_of_work,
     )
 
 
@@ -157,108 +119,29 @@ async def list_transactions(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     limit: int = Query(100, ge=1, le=500, description="Número máximo de transações a retornar"),
-    offset: int = Query(0, ge=0, description="Offset para paginação"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (next_cursor da resposta anterior)"),
     use_cases: TransactionUseCases = Depends(get_transaction_use_cases),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Lista transações do usuário e da família (se aplicável) com paginação"""
-    import pytz
-    from src.infrastructure.repositories.family_repository import SQLAlchemyFamilyRepository, SQLAlchemyFamilyMemberRepository
-    from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
-    from src.infrastructure.repositories.family_permission_repository import SQLAlchemyFamilyPermissionRepository
-    from src.infrastructure.database.models.family_permission import ModulePermission
-    
-    # Normalizar timezone das datas recebidas
-    if start_date:
-        if start_date.tzinfo is None:
-            start_date = pytz.UTC.localize(start_date)
-        else:
-            start_date = start_date.astimezone(pytz.UTC)
-    
-    if end_date:
-        if end_date.tzinfo is None:
-            end_date = pytz.UTC.localize(end_date)
-        else:
-            end_date = end_date.astimezone(pytz.UTC)
-        from datetime import timedelta
-        end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+    """Lista transações do usuário e da família (se aplicável) com paginação por cursor"""
+    after = None
+    if cursor:
+        after = decode_cursor(cursor)
+        if not after:
+            raise ValidationException("Cursor de paginação inválido")
     
-    # Buscar transações do usuário
-    user_transactions = await use_cases.get_user_transactions(
-        user_id=current_user.id,
+    # Transações do usuário + contas das famílias com permissão, já paginadas no banco
+    # (busca um item a mais para saber se há próxima página)
+    page = await use_cases.transaction_repository.get_visible_page(
+        current_user.id,
         start_date=start_date,
         end_date=end_date,
+        limit=limit + 1,
+        after=after,
     )
-    
-    # Verificar se usuário está em alguma família e tem permissão para ver transações
-    try:
-        from sqlalchemy import select, text
-        family_repo = SQLAlchemyFamilyRepository(db)
-        member_repo = SQLAlchemyFamilyMemberRepository(db)
-        account_repo = SQLAlchemyAccountRepository(db)
-        permission_repo = SQLAlchemyFamilyPermissionRepository(db)
-        
-        families = await family_repo.get_by_user_id(current_user.id)
-        all_transactions = list(user_transactions)  # Começar com transações do usuário
-        
-        # Para cada família, buscar transações se tiver permissão
-        for family in families:
-            try:
-                member = await member_repo.get_member_in_family(current_user.id, family.id)
-                if member:
-                    # Verificar permissão para ver transações
-                    permission = await permission_repo.get_by_family_member_and_module(
-                        member.id, ModulePermission.TRANSACTIONS
-                    )
-                    if permission and permission.can_view:
-                        # Buscar todas as contas da família (com family_id)
-                        family_accounts = await account_repo.get_by_family_id(family.id)
-                        family_account_ids = {acc.id for acc in family_accounts}
-                        
-                        # Buscar user_ids dos membros da família usando SQL direto (evita greenlet error)
-                        result = await db.execute(
-                            text("SELECT user_id FROM family_members WHERE family_id = :family_id"),
-                            {"family_id": str(family.id)}
-                        )
-                        member_user_ids = [row[0] for row in result.fetchall()]
-                        
-                        # Buscar contas de cada membro
-                        for member_user_id in member_user_ids:
-                            try:
-                                member_accounts = await account_repo.get_by_user_id(member_user_id)
-                                for acc in member_accounts:
-                                    family_account_ids.add(acc.id)
-                            except Exception as e:
-                                print(f"⚠️ Erro ao buscar contas do membro {member_user_id}: {e}")
-                                continue
-                        
-                        # Buscar transações dessas contas
-                        for account_id in family_account_ids:
-                            try:
-                                account_transactions = await use_cases.transaction_repository.get_by_account_id(
-                                    account_id, start_date, end_date
-                                )
-                                # Adicionar apenas transações que ainda não estão na lista
-                                existing_ids = {t.id for t in all_transactions}
-                                for trans in account_transactions:
-                                    if trans.id not in existing_ids:
-                                        all_transactions.append(trans)
-                                        existing_ids.add(trans.id)
-                            except Exception as e:
-                                print(f"⚠️ Erro ao buscar transações da conta {account_id}: {e}")
-                                continue
-            except Exception as e:
-                print(f"⚠️ Erro ao processar família {family.id}: {e}")
-                continue
-    except Exception as e:
-        print(f"⚠️ Erro ao buscar dados da família: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # Aplicar paginação antes de processar (otimização para grandes volumes)
-    total_count = len(all_transactions)
-    transactions = all_transactions[offset:offset + limit]
+    has_more = len(page) > limit
+    transactions = page[:limit]
     
     # Buscar categorias de todas as transações usando SQL direto (evita lazy loading)
     category_ids = {t.category_id for t in transactions if t.category_id}
@@ -305,12 +188,16 @@ async def list_transactions(
         result.append(transaction_dict)
     
     # Retornar com metadados de paginação
+    next_cursor = None
+    if has_more and transactions:
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.transaction_date, last.id)
+    
     return {
         "transactions": result,
-        "total": total_count,
         "limit": limit,
-        "offset": offset,
-        "has_more": (offset + limit) < total_count
+        "has_more": has_more,
+        "next_cursor": next_cursor,
     }
 
 
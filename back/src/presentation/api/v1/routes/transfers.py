@@ -10,6 +10,7 @@ from src.domain.repositories.transaction_repository import TransactionRepository
 from src.infrastructure.repositories.transfer_repository import SQLAlchemyTransferRepository
 from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
 from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
 from src.application.use_cases.transfer_use_cases import TransferUseCases
 from src.infrastructure.database.base import get_db
 from src.infrastructure.database.models.user import User
@@ -22,7 +23,8 @@ def get_transfer_use_cases(db: AsyncSession = Depends(get_db)) -> TransferUseCas
     transfer_repo = SQLAlchemyTransferRepository(db)
     account_repo = SQLAlchemyAccountRepository(db)
     transaction_repo = SQLAlchemyTransactionRepository(db)
-    return TransferUseCases(transfer_repo, account_repo, transaction_repo)
+    rollup_repo = SQLAlchemyTransactionRollupRepository(db)
+    return TransferUseCases(transfer_repo, account_repo, transaction_repo, rollup_repo)
 
 
 @router.post("", response_model=TransferResponse, status_code=status.HTTP_201_CREATED)
@@ -61,21 +61,20 @@ async def change_password(
     user_repository: UserRepository = Depends(get_user_repository),
 ):
     """Altera a senha do usuário atual"""
-    from src.application.auth.jwt_service import JWTService
+    from src.application.auth.password_hasher import password_hasher
     
-    jwt_service = JWTService()
-    
-    # Verificar senha atual
-    password_valid = jwt_service.verify_password(
+    # Verificar senha atual (o usuário autenticado vem do cache, sem o hash)
+    user = await user_repository.get_by_id(current_user.id)
+    password_valid = await password_hasher.verify(
         password_data.current_password,
-        current_user.hashed_password
+        user.hashed_password
     )
     
     if not password_valid:
         raise UnauthorizedException("Senha atual incorreta")
     
     # Atualizar senha
-    hashed_password = jwt_service.get_password_hash(password_data.new_password)
+    hashed_password = await password_hasher.hash(password_data.new_password)
     await user_repository.update_password(current_user.id, hashed_password)
     
     return {"message": "Senha alterada com sucesso"}
@@ -78,3 +78,10 @@ class LeaderboardEntry(BaseModel):
     total_points: int
     rank: int
 
+
+
+class LeaderboardPosition(BaseModel):
+    rank: Optional[int] = None
+    total_points: int
+    total_users: int
+    around: List[LeaderboardEntry]
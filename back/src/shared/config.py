@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -25,6 +25,20 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
+    
+    # Cache de leitura (relatórios/dashboard)
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "redis"  # "redis" ou "memory" (substituto em memória, para testes/dev)
+    CACHE_TTL_SECONDS: int = 300
+
+    # Cache do usuário autenticado (infrastructure/cache/principal_cache.py)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300  # Redis; invalidado nas escritas do usuário
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: float = 15  # LRU do processo (atraso máximo entre réplicas)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt fora do event loop (application/auth/password_hasher.py)
+    PASSWORD_HASH_WORKERS: int = 2  # Threads do pool (o bcrypt libera o GIL)
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Hashes/verificações na fila antes de recusar (429)
 
     # CORS - aceita string ou lista
     CORS_ORIGINS: str | List[str] = "http://localhost:3000,http://localhost:8000"
@@ -41,6 +55,81 @@ class Settings(BaseSettings):
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_SINK_MAX_QUEUE_SIZE: int = 10000  # Logs de requisição pendentes antes de descartar
+    LOG_SINK_BATCH_SIZE: int = 200  # Registros por INSERT
+    LOG_SINK_FLUSH_INTERVAL_MS: int = 500  # Intervalo máximo entre gravações
+
+    # Verificação de planejamentos (application/tasks/planning_checker.py)
+    PLANNING_CHECKER_SHARDS: int = 1  # Shards por hash do user_id, divididos entre as réplicas
+    PLANNING_CHECKER_CONCURRENCY: int = 10  # Envios de notificação simultâneos
+    PLANNING_CHECKER_LOCK_TTL_SECONDS: int = 3300  # Lock por shard e execução (Redis)
+
+    # Execução automática de transações agendadas (application/tasks/scheduled_transaction_executor.py)
+    SCHEDULED_EXECUTOR_INTERVAL_MINUTES: int = 5
+    SCHEDULED_EXECUTOR_BATCH_SIZE: int = 100  # Agendamentos reservados por lote
+
+    # Email: servidor SMTP, pool de conexões e fila de saída (notification_outbox)
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 587
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_POOL_SIZE: int = 2  # Conexões SMTP persistentes por servidor
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: int = 30
+    SMTP_RATE_LIMIT_PER_SECOND: float = 0  # Envios por segundo por servidor (0 = sem limite)
+    EMAIL_OUTBOX_ENABLED: bool = True  # False envia direto (sem fila)
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_INTERVAL_SECONDS: int = 5
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: int = 30  # Dobra a cada tentativa (máx. 1h)
+    OUTBOX_LEASE_SECONDS: int = 300  # Mensagem reservada volta à fila se o worker cair
+
+    # WhatsApp (Evolution API, Meta ou Twilio)
+    WHATSAPP_API_URL: Optional[str] = None
+    WHATSAPP_API_TOKEN: Optional[str] = None
+    WHATSAPP_PHONE_NUMBER_ID: Optional[str] = None
+    TWILIO_AUTH_TOKEN: Optional[str] = None
+    WHATSAPP_MAX_CONCURRENCY: int = 5  # Requisições simultâneas ao provedor
+    WHATSAPP_RATE_LIMIT_PER_SECOND: float = 10  # 0 = sem limite
+
+    # Relatórios em PDF (application/services/report_render_service.py)
+    REPORT_RENDER_WORKERS: int = 2  # Processos de renderização
+    REPORT_PDF_CACHE_TTL_SECONDS: int = 3600  # PDF mensal em cache (invalidado ao alterar transações)
+    REPORT_JOB_TTL_SECONDS: int = 3600  # Estado e PDF dos jobs de relatório de período
+    REPORT_JOB_MAX_MONTHS: int = 120
+    EXPORT_CHUNK_SIZE: int = 2000  # Linhas por lote na exportação de transações (Excel/CSV)
+
+    # OCR de notas fiscais (application/tasks/receipt_ocr_queue.py)
+    OCR_WORKERS: int = 2  # Processos de OCR
+    OCR_MAX_PENDING: int = 20  # Imagens na fila antes de recusar (503)
+    OCR_MAX_UPLOAD_MB: int = 10
+    OCR_RESULT_CACHE_TTL_SECONDS: int = 604800  # Resultado por sha256 da imagem (7 dias)
+    OCR_JOB_TTL_SECONDS: int = 3600
+
+    # Gamificação em background (application/tasks/gamification_processor.py)
+    GAMIFICATION_BATCH_SECONDS: float = 2  # Espera por outros eventos do mesmo usuário antes de aplicar
+    GAMIFICATION_CONCURRENCY: int = 5  # Lotes (sessões de banco) simultâneos
+    GAMIFICATION_MAX_ATTEMPTS: int = 3  # Tentativas de um lote (espera dobra a cada uma) antes de descartar
+
+    # Ranking de gamificação (application/services/leaderboard_service.py)
+    LEADERBOARD_SCOPES_TTL_SECONDS: int = 600  # Famílias/workspaces do usuário em cache
+    LEADERBOARD_RECONCILE_INTERVAL_MINUTES: int = 30  # Reconstrução dos rankings a partir de user_levels
+
+    # Conteúdo de ajuda (application/services/help_content_service.py)
+    HELP_CONTENT_PACK_PATH: Optional[str] = None  # Pacote gerado por scripts/build_help_content.py
+    HELP_CONTENT_MAX_AGE_SECONDS: int = 3600  # Cache-Control; depois o navegador revalida pelo ETag
+
+    # Sincronização de eventos financeiros do calendário (application/services/calendar_sync_service.py)
+    CALENDAR_SYNC_OVERLAP_SECONDS: int = 300  # Releitura antes da marca d'água (escritas concorrentes)
+
+    # Despachante de notificações (application/tasks/notification_dispatcher.py)
+    NOTIFICATION_DISPATCHER_ENABLED: bool = True  # False envia cada notificação na hora
+    NOTIFICATION_GATHER_SECONDS: int = 30  # Espera por outros eventos do mesmo usuário antes de enviar
+    NOTIFICATION_PLANNING_WINDOW_SECONDS: int = 3600  # No máximo um alerta/resumo de planejamento por usuário
+    NOTIFICATION_CHAT_WINDOW_SECONDS: int = 300  # No máximo uma notificação por grupo e destinatário
+    NOTIFICATION_DISPATCH_CONCURRENCY: int = 20  # Destinatários atendidos em paralelo
+    NOTIFICATION_HTTP_MAX_CONNECTIONS: int = 20  # Conexões HTTP por provedor
+    NOTIFICATION_HTTP_TIMEOUT_SECONDS: int = 10
 
     class Config:
         env_file = ".env"
@@ -41,3 +41,9 @@ class ConflictException(BaseAppException):
     def __init__(self, message: str):
         super().__init__(message, status_code=409)
 
+
+
+class TooManyRequestsException(BaseAppException):
+    """Sobrecarga momentânea (tente novamente)"""
+    def __init__(self, message: str = "Muitas requisições. Tente novamente em instantes."):
+        super().__init__(message, status_code=429)
@@ -1,5 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
+from uuid import UUID
+import base64
+import json
 import pytz
 
 
@@ -17,3 +20,21 @@ def parse_date(date_string: Optional[str]) -> Optional[datetime]:
     except (ValueError, AttributeError):
         return None
 
+
+
+def encode_cursor(sort_value: datetime, item_id: UUID) -> str:
+    """Gera um cursor opaco de paginação a partir da chave (data, id) do último item"""
+    payload = json.dumps([sort_value.isoformat(), str(item_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, UUID]]:
+    """Lê um cursor gerado por encode_cursor; retorna None se for inválido"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(sort_value, str) or not isinstance(item_id, str):
+            return None
+        return datetime.fromisoformat(sort_value), UUID(item_id)
+    except (ValueError, TypeError, AttributeError, json.JSONDecodeError):
+        return None
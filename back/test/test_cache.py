@@ -0,0 +1,80 @@
+"""
+Testes para o cache read-through com namespaces versionados
+"""
+import uuid
+import pytest
+
+from src.infrastructure.cache import cache_service as cache_module
+from src.infrastructure.cache.cache_service import CacheService, cached
+from src.infrastructure.cache.memory_redis import InMemoryRedis
+from src.infrastructure.cache.redis_client import RedisClient
+
+
+class FakeReportService:
+    """Serviço mínimo que conta quantas vezes o relatório foi calculado"""
+
+    def __init__(self):
+        self.calls = 0
+
+    @cached("report:test", ("transactions",))
+    async def get_report(self, user_id, days: int = 30):
+        self.calls += 1
+        return {"user_id": user_id, "days": days, "total": self.calls}
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Cache usando o substituto em memória do Redis"""
+    client = RedisClient()
+    monkeypatch.setattr(client, "_client", InMemoryRedis())
+    service = CacheService(client=client, ttl=60)
+    monkeypatch.setattr(cache_module, "cache_service", service)
+    return service
+
+
+class TestCachedDecorator:
+    async def test_repeat_call_is_served_from_cache(self, memory_cache):
+        service = FakeReportService()
+        user_id = uuid.uuid4()
+
+        first = await service.get_report(user_id, days=30)
+        second = await service.get_report(user_id, days=30)
+
+        assert service.calls == 1
+        assert first == second
+        assert first["user_id"] == str(user_id)
+
+    async def test_keys_are_per_user_and_per_params(self, memory_cache):
+        service = FakeReportService()
+        user_id = uuid.uuid4()
+
+        await service.get_report(user_id, days=30)
+        await service.get_report(user_id, days=7)
+        await service.get_report(uuid.uuid4(), days=30)
+
+        assert service.calls == 3
+
+    async def test_namespace_write_invalidates(self, memory_cache):
+        service = FakeReportService()
+        user_id = uuid.uuid4()
+
+        await service.get_report(user_id)
+        await memory_cache.invalidate(user_id, "goals")
+        await service.get_report(user_id)
+        assert service.calls == 1
+
+        await memory_cache.invalidate(user_id, "transactions")
+        result = await service.get_report(user_id)
+        assert service.calls == 2
+        assert result["total"] == 2
+
+    async def test_unavailable_cache_falls_back_to_compute(self, monkeypatch, memory_cache):
+        async def broken(*args, **kwargs):
+            raise ConnectionError("redis fora do ar")
+
+        monkeypatch.setattr(memory_cache.client, "mget", broken)
+        service = FakeReportService()
+
+        result = await service.get_report(uuid.uuid4())
+
+        assert result["total"] == 1
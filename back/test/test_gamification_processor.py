@@ -0,0 +1,189 @@
+"""
+Testes do processamento em lote da gamificação (GamificationProcessor + apply_events)
+
+Precisam de PostgreSQL (contadores de conquistas): defina TEST_POSTGRES_URL.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytz
+from sqlalchemy import select
+
+from src.application.services.gamification_service import GamificationService
+from src.application.tasks.gamification_processor import GamificationProcessor
+from src.infrastructure.database import base as database_base
+from src.infrastructure.database.models.gamification import Badge, BadgeType, UserBadge, UserLevel
+from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
+
+BADGES = (("Primeiro Passo", 10), ("Organizado", 25), ("Sonhador", 25))
+
+
+@pytest.fixture
+async def processor(pg_session_factory, memory_redis, monkeypatch):
+    """Processador com agrupamento curto, usando as sessões do banco de teste"""
+    monkeypatch.setattr(database_base, "AsyncSessionLocal", pg_session_factory)
+    processor = GamificationProcessor(batch_seconds=0.05, concurrency=2, max_attempts=3)
+    yield processor
+    await processor.stop()
+
+
+@pytest.fixture
+async def badges(pg_session):
+    for name, points in BADGES:
+        pg_session.add(Badge(name=name, badge_type=BadgeType.ACHIEVEMENT, points=points))
+    await pg_session.commit()
+
+
+async def add_transactions(session, user_id, account_id, count):
+    for index in range(count):
+        session.add(Transaction(
+            description=f"Transação {index + 1}",
+            amount=Decimal("10.00"),
+            transaction_type=TransactionType.EXPENSE,
+            status=TransactionStatus.COMPLETED,
+            transaction_date=datetime(2024, 1, 15, tzinfo=pytz.UTC),
+            user_id=user_id,
+            account_id=account_id,
+        ))
+    await session.commit()
+
+
+async def drain(processor, timeout=5.0):
+    """Espera a fila (inclusive as novas tentativas) esvaziar"""
+    async def idle():
+        while True:
+            stats = processor.stats()
+            if not stats["pending_events"] and not stats["in_flight"]:
+                return
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(idle(), timeout)
+
+
+async def user_level(session_factory, user_id):
+    async with session_factory() as session:
+        return await session.scalar(select(UserLevel).where(UserLevel.user_id == user_id))
+
+
+async def earned_badges(session_factory, user_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Badge.name).join(UserBadge, UserBadge.badge_id == Badge.id).where(UserBadge.user_id == user_id)
+        )
+        return sorted(result.scalars().all())
+
+
+def submit_many(processor, user_id, count, points=10):
+    for _ in range(count):
+        processor.submit(user_id, points, "Registrar transação", activity=True, check_achievements=True)
+
+
+class TestBatchedEvents:
+    """Vários eventos do mesmo usuário viram um único lote"""
+
+    async def test_points_level_streak_and_badges(
+        self, processor, badges, pg_session, pg_session_factory, pg_user, make_account
+    ):
+        account = await make_account()
+        user_id = pg_user.id
+        await add_transactions(pg_session, user_id, account.id, 20)
+
+        submit_many(processor, user_id, 20)
+        await drain(processor)
+
+        level = await user_level(pg_session_factory, user_id)
+        # 20 x 10 pontos + Primeiro Passo (10) + Organizado (25)
+        assert level.total_points == 235
+        assert level.experience_points == 235
+        assert level.level == 2
+        assert level.streak_days == 1
+        assert level.last_activity_date.date() == datetime.now(pytz.UTC).date()
+        assert await earned_badges(pg_session_factory, user_id) == ["Organizado", "Primeiro Passo"]
+        assert processor.stats()["batches"] == 1
+
+        # Próximo lote: só os pontos dos eventos, badges não são concedidos de novo
+        submit_many(processor, user_id, 5)
+        await drain(processor)
+
+        level = await user_level(pg_session_factory, user_id)
+        assert level.total_points == 285
+        assert level.level == 2
+        assert level.streak_days == 1
+        assert await earned_badges(pg_session_factory, user_id) == ["Organizado", "Primeiro Passo"]
+
+    async def test_streak_continues_from_yesterday_once_per_batch(
+        self, processor, pg_session, pg_session_factory, pg_user
+    ):
+        user_id = pg_user.id
+        pg_session.add(UserLevel(
+            user_id=user_id,
+            streak_days=3,
+            last_activity_date=datetime.now(pytz.UTC) - timedelta(days=1),
+        ))
+        await pg_session.commit()
+
+        submit_many(processor, user_id, 3)
+        await drain(processor)
+
+        level = await user_level(pg_session_factory, user_id)
+        assert level.streak_days == 4
+        assert level.total_points == 30
+
+    async def test_stop_applies_pending_events(self, pg_session_factory, pg_user, memory_redis, monkeypatch):
+        monkeypatch.setattr(database_base, "AsyncSessionLocal", pg_session_factory)
+        processor = GamificationProcessor(batch_seconds=60)
+
+        submit_many(processor, pg_user.id, 2, points=50)
+        await processor.stop()
+
+        assert (await user_level(pg_session_factory, pg_user.id)).total_points == 100
+
+
+class TestFailedBatches:
+    """Lote com erro é tentado de novo; só é descartado (com log) após max_attempts"""
+
+    async def test_failed_batch_is_retried_with_later_events(
+        self, processor, pg_session_factory, pg_user, monkeypatch
+    ):
+        original = GamificationService.apply_events
+        calls = []
+
+        async def flaky(self, user_id, points, **flags):
+            calls.append(points)
+            if len(calls) == 1:
+                # Eventos que chegam enquanto o lote falha entram na nova tentativa
+                submit_many(processor, user_id, 2)
+                raise RuntimeError("conexão perdida")
+            return await original(self, user_id, points, **flags)
+
+        monkeypatch.setattr(GamificationService, "apply_events", flaky)
+
+        submit_many(processor, pg_user.id, 3)
+        await drain(processor)
+
+        assert calls == [30, 50]
+        assert (await user_level(pg_session_factory, pg_user.id)).total_points == 50
+        stats = processor.stats()
+        assert (stats["failed"], stats["retried"], stats["dropped_events"], stats["batches"]) == (1, 1, 0, 1)
+
+    async def test_events_are_dropped_only_after_max_attempts(
+        self, processor, pg_session_factory, pg_user, monkeypatch, caplog
+    ):
+        async def broken(self, user_id, points, **flags):
+            raise RuntimeError("banco indisponível")
+
+        monkeypatch.setattr(GamificationService, "apply_events", broken)
+
+        with caplog.at_level(logging.WARNING):
+            submit_many(processor, pg_user.id, 2)
+            await drain(processor)
+
+        stats = processor.stats()
+        assert (stats["failed"], stats["retried"], stats["dropped_events"]) == (3, 2, 2)
+        errors = [record.getMessage() for record in caplog.records if record.levelno == logging.ERROR]
+        assert len(errors) == 1
+        assert "após 3 tentativas" in errors[0] and "2 eventos, 20 pontos" in errors[0]
+        assert await user_level(pg_session_factory, pg_user.id) is None
@@ -0,0 +1,136 @@
+"""
+Testes do ranking em sorted sets (LeaderboardService) com o substituto em memória do Redis
+"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from src.application.services import leaderboard_service as leaderboard_module
+from src.application.services.leaderboard_service import LeaderboardService
+
+
+class FakeUserLevelRepository:
+    """Pontos e vínculos em memória, com contadores de leituras do banco"""
+
+    def __init__(self):
+        self.points = {}
+        self.families = {}
+        self.top_calls = 0
+        self.scores_calls = 0
+
+    def add_user(self, points, family_id=None):
+        user_id = uuid.uuid4()
+        self.points[user_id] = points
+        if family_id:
+            self.families.setdefault(family_id, set()).add(user_id)
+        return user_id
+
+    def _members(self, family_id=None, workspace_id=None):
+        if family_id:
+            return {user_id: self.points[user_id] for user_id in self.families.get(family_id, ())}
+        return dict(self.points)
+
+    async def get_by_user_id(self, user_id):
+        if user_id in self.points:
+            return SimpleNamespace(total_points=self.points[user_id])
+        return None
+
+    async def get_leaderboard_scopes(self, user_id):
+        families = [family_id for family_id, members in self.families.items() if user_id in members]
+        return {"family": families, "workspace": []}
+
+    async def get_leaderboard_profiles(self, user_ids):
+        return {user_id: (f"user-{str(user_id)[:4]}", 1) for user_id in user_ids}
+
+    async def get_leaderboard_top(self, limit, family_id=None, workspace_id=None):
+        self.top_calls += 1
+        ranked = sorted(self._members(family_id).items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(user_id, "nome", 1, points) for user_id, points in ranked]
+
+    async def get_leaderboard_scores(self, family_id=None, workspace_id=None):
+        self.scores_calls += 1
+        return list(self._members(family_id).items())
+
+    async def get_leaderboard_snapshot(self):
+        memberships = [
+            ("family", family_id, user_id)
+            for family_id, members in self.families.items()
+            for user_id in members
+        ]
+        return list(self.points.items()), memberships
+
+
+@pytest.fixture
+def repository():
+    return FakeUserLevelRepository()
+
+
+def points_of(entries):
+    return [entry["total_points"] for entry in entries]
+
+
+class TestPartialBoards:
+    """Ranking incompleto no Redis não pode ser servido como completo"""
+
+    async def test_evicted_board_is_rebuilt_before_serving(self, memory_redis, repository):
+        service = LeaderboardService()
+        users = [repository.add_user(points) for points in (300, 200, 100)]
+        await service.reconcile(repository)
+
+        # Eviction/FLUSHDB seguido de uma única pontuação
+        await memory_redis.flushdb()
+        repository.points[users[2]] = 150
+        await service.record_points(repository, users[2], 150)
+
+        top = await service.get_top(repository, users[2])
+
+        assert points_of(top) == [300, 200, 150]
+        assert repository.scores_calls == 1
+
+        # Já completo: a leitura seguinte não volta ao banco
+        await service.get_top(repository, users[2])
+        assert repository.scores_calls == 1
+
+    async def test_family_created_after_reconcile_is_built_on_first_read(self, memory_redis, repository):
+        service = LeaderboardService()
+        repository.add_user(500)
+        await service.reconcile(repository)
+
+        family_id = uuid.uuid4()
+        first = repository.add_user(40, family_id)
+        second = repository.add_user(70, family_id)
+        await service.record_points(repository, first, 40)
+
+        top = await service.get_top(repository, first, scope="family")
+
+        assert points_of(top) == [70, 40]
+        assert f"leaderboard:family:{family_id}" in await leaderboard_module.redis_client.get_json(
+            "leaderboard:boards"
+        )
+        position = await service.get_position(repository, second, scope="family")
+        assert position["rank"] == 1
+        assert position["total_users"] == 2
+
+    async def test_position_ignores_completion_marker(self, memory_redis, repository):
+        service = LeaderboardService()
+        users = [repository.add_user(points) for points in (30, 20, 10)]
+        await service.reconcile(repository)
+
+        position = await service.get_position(repository, users[2], window=5)
+
+        assert position["rank"] == 3
+        assert position["total_users"] == 3
+        assert points_of(position["around"]) == [30, 20, 10]
+
+    async def test_rebuild_in_progress_falls_back_to_database(self, memory_redis, repository):
+        service = LeaderboardService()
+        user_id = repository.add_user(10)
+        repository.add_user(20)
+        await memory_redis.set("leaderboard:global:rebuild-lock", "1", ex=30)
+
+        top = await service.get_top(repository, user_id)
+
+        assert points_of(top) == [20, 10]
+        assert repository.top_calls == 1
+        assert repository.scores_calls == 0
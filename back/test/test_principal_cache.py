@@ -0,0 +1,163 @@
+"""
+Testes do cache do usuário autenticado (principal) usado por get_current_user
+"""
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+import pytz
+from sqlalchemy import inspect
+
+from src.application.auth.auth_service import AuthService
+from src.application.auth.jwt_service import JWTService
+from src.application.use_cases.user_use_cases import UserUseCases
+from src.infrastructure.cache.memory_redis import InMemoryRedis
+from src.infrastructure.cache.principal_cache import (
+    PRIVATE_COLUMNS,
+    PrincipalCache,
+    _from_payload,
+    _to_payload,
+    principal_cache,
+)
+from src.infrastructure.database.models.user import User, UserRole
+from src.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from src.shared.exceptions import UnauthorizedException
+
+
+@pytest.fixture
+def memory_principal_cache(monkeypatch):
+    """principal_cache global com Redis em memória e LRU vazio"""
+    backend = InMemoryRedis()
+    monkeypatch.setattr(principal_cache.client, "_client", backend)
+    monkeypatch.setattr(principal_cache, "_local", OrderedDict())
+    return principal_cache
+
+
+def access_token(user_id, token_version):
+    return JWTService.create_access_token({"sub": str(user_id), "ver": token_version})
+
+
+class TestPayload:
+    """Conversão do User para o valor em cache e de volta"""
+
+    def make_user(self):
+        return User(
+            id=uuid.uuid4(),
+            email="usuario@teste.com.br",
+            username="teste",
+            hashed_password="$2b$12$hash",
+            full_name="Usuário Teste",
+            is_active=True,
+            is_verified=False,
+            role=UserRole.ADMIN,
+            theme_preference="dark",
+            reset_token="token-de-reset",
+            reset_token_expires=datetime(2024, 1, 1, tzinfo=pytz.UTC),
+            token_version=3,
+            created_at=datetime(2023, 5, 1, 8, 30, tzinfo=pytz.UTC),
+            updated_at=datetime(2024, 2, 10, 17, 45, 12, 500, tzinfo=pytz.UTC),
+        )
+
+    def test_round_trip_restores_types(self):
+        user = self.make_user()
+
+        # O valor vai para o Redis como JSON
+        restored = _from_payload(json.loads(json.dumps(_to_payload(user))))
+
+        assert restored.id == user.id and isinstance(restored.id, uuid.UUID)
+        assert restored.role is UserRole.ADMIN
+        assert restored.created_at == user.created_at
+        assert restored.updated_at == user.updated_at and restored.updated_at.tzinfo is not None
+        for field in ("email", "username", "full_name", "is_active", "is_verified", "theme_preference", "token_version"):
+            assert getattr(restored, field) == getattr(user, field)
+
+    def test_private_columns_are_never_cached(self):
+        payload = _to_payload(self.make_user())
+
+        assert PRIVATE_COLUMNS.isdisjoint(payload)
+        # No usuário restaurado essas colunas nem são carregadas
+        restored = _from_payload(payload)
+        assert PRIVATE_COLUMNS <= inspect(restored).unloaded
+
+    def test_restored_user_is_detached(self):
+        restored = _from_payload(_to_payload(self.make_user()))
+
+        assert inspect(restored).detached
+
+
+class TestPrincipalCache:
+    """Entradas por (user_id, token_version)"""
+
+    async def test_other_token_version_misses(self, memory_principal_cache):
+        user = TestPayload().make_user()
+        await memory_principal_cache.set(user)
+
+        assert (await memory_principal_cache.get(user.id, 3)).id == user.id
+        assert await memory_principal_cache.get(user.id, 2) is None
+        # Nem pelo Redis (sem o LRU do processo)
+        assert await PrincipalCache(client=memory_principal_cache.client).get(user.id, 2) is None
+
+    async def test_inactive_user_is_not_cached(self, memory_principal_cache):
+        user = TestPayload().make_user()
+        user.is_active = False
+
+        await memory_principal_cache.set(user)
+
+        assert await memory_principal_cache.get(user.id, 3) is None
+
+
+class TestAuthenticationWithCache:
+    """get_current_user com principal em cache (PostgreSQL)"""
+
+    async def test_cached_principal_is_served_without_database(self, pg_session, pg_user, memory_principal_cache):
+        auth_service = AuthService(SQLAlchemyUserRepository(pg_session))
+        token = access_token(pg_user.id, 0)
+
+        await auth_service.get_current_user(token)
+        hits = memory_principal_cache.local_hits
+        user = await auth_service.get_current_user(token)
+
+        assert user.id == pg_user.id
+        assert memory_principal_cache.local_hits == hits + 1
+
+    async def test_revoked_token_version_is_rejected(self, pg_session, pg_user, memory_principal_cache):
+        repository = SQLAlchemyUserRepository(pg_session)
+        auth_service = AuthService(repository)
+        old_token = access_token(pg_user.id, 0)
+        await auth_service.get_current_user(old_token)
+
+        new_version = await repository.revoke_tokens(pg_user.id)
+
+        with pytest.raises(UnauthorizedException):
+            await auth_service.get_current_user(old_token)
+        # Outro processo (LRU vazio, mesmo Redis) também não aceita a versão antiga
+        other_process = PrincipalCache(client=memory_principal_cache.client)
+        assert await other_process.get(pg_user.id, 0) is None
+        # O token novo continua válido
+        user = await auth_service.get_current_user(access_token(pg_user.id, new_version))
+        assert user.token_version == new_version
+
+    async def test_deactivated_user_is_rejected_immediately(self, pg_session, pg_user, memory_principal_cache):
+        repository = SQLAlchemyUserRepository(pg_session)
+        auth_service = AuthService(repository)
+        token = access_token(pg_user.id, 0)
+        await auth_service.get_current_user(token)
+
+        await UserUseCases(repository).update_user(pg_user.id, is_active=False)
+
+        with pytest.raises(UnauthorizedException):
+            await auth_service.get_current_user(token)
+        assert await PrincipalCache(client=memory_principal_cache.client).get(pg_user.id, 0) is None
+
+    async def test_deactivation_through_repository_update_user(self, pg_session, pg_user, memory_principal_cache):
+        repository = SQLAlchemyUserRepository(pg_session)
+        auth_service = AuthService(repository)
+        token = access_token(pg_user.id, 0)
+        await auth_service.get_current_user(token)
+
+        await repository.update_user(pg_user.id, is_active=False)
+
+        with pytest.raises(UnauthorizedException):
+            await auth_service.get_current_user(token)
@@ -0,0 +1,213 @@
+"""
+Testes da execução em lote das transações agendadas automáticas (execute_due)
+
+Precisam de PostgreSQL (SKIP LOCKED, upsert dos totais): defina TEST_POSTGRES_URL.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+import pytz
+from sqlalchemy import select, func
+
+from src.application.use_cases.scheduled_transaction_use_cases import ScheduledTransactionUseCases
+from src.infrastructure.database.models.account import Account
+from src.infrastructure.database.models.scheduled_transaction import (
+    ScheduledTransaction,
+    ScheduledTransactionStatus,
+    RecurrenceType,
+)
+from src.infrastructure.database.models.transaction import Transaction
+from src.infrastructure.database.unit_of_work import UnitOfWork
+from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
+from src.infrastructure.repositories.scheduled_transaction_repository import SQLAlchemyScheduledTransactionRepository
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+
+
+def utc(year, month, day, hour=12):
+    return datetime(year, month, day, hour, tzinfo=pytz.UTC)
+
+
+@pytest.fixture
+def use_cases(pg_session):
+    return ScheduledTransactionUseCases(
+        scheduled_repository=SQLAlchemyScheduledTransactionRepository(pg_session),
+        transaction_repository=SQLAlchemyTransactionRepository(pg_session),
+        account_repository=SQLAlchemyAccountRepository(pg_session),
+        transaction_rollup_repository=SQLAlchemyTransactionRollupRepository(pg_session),
+        unit_of_work=UnitOfWork(pg_session),
+    )
+
+
+@pytest.fixture
+def make_scheduled(pg_session, pg_user, make_account):
+    """Cria um agendamento automático (expense de 100,00) em uma conta nova"""
+
+    async def _make_scheduled(start_date, recurrence_type="monthly", **fields) -> ScheduledTransaction:
+        account = await make_account()
+        scheduled = ScheduledTransaction(
+            description="Aluguel",
+            amount=Decimal("100.00"),
+            transaction_type="expense",
+            status=ScheduledTransactionStatus.ACTIVE,
+            start_date=start_date,
+            next_execution_date=start_date,
+            recurrence_type=RecurrenceType(recurrence_type),
+            auto_execute=True,
+            user_id=pg_user.id,
+            account_id=account.id,
+            **fields,
+        )
+        pg_session.add(scheduled)
+        await pg_session.commit()
+        return scheduled
+
+    return _make_scheduled
+
+
+async def execution_dates(session_factory, scheduled):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Transaction.transaction_date)
+            .where(Transaction.account_id == scheduled.account_id)
+            .order_by(Transaction.transaction_date)
+        )
+        return [value.astimezone(pytz.UTC).date() for value in result.scalars().all()]
+
+
+async def stored(session_factory, model, id_):
+    async with session_factory() as session:
+        return await session.get(model, id_)
+
+
+class TestExecuteDue:
+    """Recuperação de atrasos, recorrências e limites"""
+
+    async def test_catches_up_missed_occurrences(self, use_cases, make_scheduled, pg_session_factory):
+        scheduled = await make_scheduled(utc(2024, 1, 5), "weekly")
+
+        totals = await use_cases.execute_due(now=utc(2024, 1, 27))
+
+        assert totals == {"batches": 1, "scheduled": 1, "transactions": 4}
+        assert await execution_dates(pg_session_factory, scheduled) == [
+            date(2024, 1, 5), date(2024, 1, 12), date(2024, 1, 19), date(2024, 1, 26),
+        ]
+        saved = await stored(pg_session_factory, ScheduledTransaction, scheduled.id)
+        assert saved.execution_count == 4
+        assert saved.next_execution_date == utc(2024, 2, 2)
+        account = await stored(pg_session_factory, Account, scheduled.account_id)
+        assert account.balance == Decimal("600.00")
+
+        # Rodar de novo no mesmo instante não duplica nada
+        assert (await use_cases.execute_due(now=utc(2024, 1, 27)))["transactions"] == 0
+
+    async def test_monthly_clamps_to_last_day_and_keeps_anchor(
+        self, use_cases, make_scheduled, pg_session_factory
+    ):
+        scheduled = await make_scheduled(utc(2024, 1, 31), "monthly")
+
+        await use_cases.execute_due(now=utc(2024, 4, 30, 23))
+
+        assert await execution_dates(pg_session_factory, scheduled) == [
+            date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30),
+        ]
+
+    async def test_yearly_clamps_leap_day(self, use_cases, make_scheduled, pg_session_factory):
+        scheduled = await make_scheduled(utc(2023, 2, 28), "yearly")
+        leap = await make_scheduled(utc(2024, 2, 29), "yearly")
+
+        await use_cases.execute_due(now=utc(2028, 3, 1))
+
+        assert await execution_dates(pg_session_factory, scheduled) == [
+            date(2023, 2, 28), date(2024, 2, 28), date(2025, 2, 28),
+            date(2026, 2, 28), date(2027, 2, 28), date(2028, 2, 28),
+        ]
+        assert await execution_dates(pg_session_factory, leap) == [
+            date(2024, 2, 29), date(2025, 2, 28), date(2026, 2, 28), date(2027, 2, 28), date(2028, 2, 29),
+        ]
+
+    async def test_max_occurrences_defers_rest_to_next_batch(
+        self, use_cases, make_scheduled, pg_session_factory
+    ):
+        scheduled = await make_scheduled(utc(2024, 1, 1), "daily")
+
+        totals = await use_cases.execute_due(now=utc(2024, 1, 10), batch_size=1, max_occurrences=3)
+
+        # Cada lote cria no máximo 3 ocorrências; o agendamento é reservado de novo até zerar o atraso
+        assert totals == {"batches": 4, "scheduled": 4, "transactions": 10}
+        assert len(await execution_dates(pg_session_factory, scheduled)) == 10
+
+    async def test_max_occurrences_catches_up_with_default_batch_size(
+        self, use_cases, make_scheduled, pg_session_factory
+    ):
+        behind = await make_scheduled(utc(2024, 1, 1), "daily")
+        up_to_date = await make_scheduled(utc(2024, 1, 10), "monthly")
+
+        # Lote menor que batch_size: continua enquanto algum agendamento parou no limite
+        totals = await use_cases.execute_due(now=utc(2024, 1, 10), max_occurrences=3)
+
+        assert totals == {"batches": 4, "scheduled": 5, "transactions": 11}
+        assert len(await execution_dates(pg_session_factory, behind)) == 10
+        assert await execution_dates(pg_session_factory, up_to_date) == [date(2024, 1, 10)]
+        saved = await stored(pg_session_factory, ScheduledTransaction, behind.id)
+        assert saved.next_execution_date == utc(2024, 1, 11)
+
+    async def test_max_executions_completes_schedule(self, use_cases, make_scheduled, pg_session_factory):
+        scheduled = await make_scheduled(utc(2024, 1, 1), "daily", max_executions=2)
+
+        totals = await use_cases.execute_due(now=utc(2024, 1, 10))
+
+        assert totals["transactions"] == 2
+        saved = await stored(pg_session_factory, ScheduledTransaction, scheduled.id)
+        assert saved.status == ScheduledTransactionStatus.COMPLETED
+
+    async def test_one_off_schedule_becomes_completed(self, use_cases, make_scheduled, pg_session_factory):
+        scheduled = await make_scheduled(utc(2024, 1, 15), "none")
+
+        totals = await use_cases.execute_due(now=utc(2024, 3, 1))
+
+        assert totals["transactions"] == 1
+        saved = await stored(pg_session_factory, ScheduledTransaction, scheduled.id)
+        assert saved.status == ScheduledTransactionStatus.COMPLETED
+        assert saved.execution_count == 1
+        assert await use_cases.execute_due(now=utc(2024, 4, 1)) == {"batches": 0, "scheduled": 0, "transactions": 0}
+
+
+class TestExecuteDueRollups:
+    """Totais diários gravados no mesmo commit das execuções"""
+
+    async def test_rollups_match_created_transactions(self, use_cases, make_scheduled, pg_user, pg_session):
+        await make_scheduled(utc(2024, 1, 1), "daily")
+
+        await use_cases.execute_due(now=utc(2024, 1, 5))
+
+        rows = await SQLAlchemyTransactionRollupRepository(pg_session).get_totals(
+            pg_user.id, date(2024, 1, 1), date(2024, 1, 31), group_by=()
+        )
+        assert rows[0]["total"] == Decimal("500.00")
+        assert rows[0]["count"] == 5
+
+    async def test_rollup_failure_rolls_back_whole_batch(
+        self, use_cases, make_scheduled, pg_session_factory, monkeypatch
+    ):
+        scheduled = await make_scheduled(utc(2024, 1, 1), "daily")
+        scheduled_id, account_id = scheduled.id, scheduled.account_id
+
+        async def broken(deltas):
+            raise RuntimeError("upsert falhou")
+
+        monkeypatch.setattr(use_cases.rollup_service.transaction_rollup_repository, "apply_deltas", broken)
+
+        with pytest.raises(RuntimeError):
+            await use_cases.execute_due(now=utc(2024, 1, 5))
+
+        async with pg_session_factory() as session:
+            count = await session.scalar(
+                select(func.count(Transaction.id)).where(Transaction.account_id == account_id)
+            )
+            assert count == 0
+        saved = await stored(pg_session_factory, ScheduledTransaction, scheduled_id)
+        assert saved.execution_count == 0
+        account = await stored(pg_session_factory, Account, account_id)
+        assert account.balance == Decimal("1000.00")
@@ -0,0 +1,92 @@
+"""
+Testes da paginação por cursor (keyset) da listagem de transações
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytz
+
+from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.shared.utils import encode_cursor, decode_cursor
+
+
+def raw_cursor(payload) -> str:
+    """Cursor com conteúdo arbitrário (mesma codificação de encode_cursor)"""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+class TestCursorEncoding:
+    """encode_cursor/decode_cursor"""
+
+    def test_round_trip(self):
+        sort_value = datetime(2024, 1, 15, 10, 30, 0, 123456, tzinfo=pytz.UTC)
+        item_id = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(sort_value, item_id)) == (sort_value, item_id)
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(datetime(2024, 1, 15, tzinfo=pytz.UTC), uuid.uuid4())
+
+        assert "=" not in cursor
+        assert "+" not in cursor and "/" not in cursor
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "",
+            "não-é-base64!",
+            base64.urlsafe_b64encode(b"not json").decode(),
+            raw_cursor(["2024-01-01"]),
+            raw_cursor(["2024-01-01", str(uuid.uuid4()), "extra"]),
+            raw_cursor(["2024-01-01", 5]),
+            raw_cursor([20240101, str(uuid.uuid4())]),
+            raw_cursor(["ontem", str(uuid.uuid4())]),
+            raw_cursor(["2024-01-01", "não-é-uuid"]),
+            raw_cursor({"date": "2024-01-01", "id": str(uuid.uuid4())}),
+            raw_cursor(None),
+        ],
+    )
+    def test_malformed_cursor_returns_none(self, cursor):
+        assert decode_cursor(cursor) is None
+
+
+class TestVisiblePageKeyset:
+    """get_visible_page com várias transações na mesma data (desempate pelo id)"""
+
+    async def test_pages_split_equal_dates_without_gaps_or_duplicates(self, pg_session, pg_user, make_account):
+        account = await make_account()
+        same_date = datetime(2024, 3, 10, 12, 0, tzinfo=pytz.UTC)
+        dates = [same_date] * 3 + [datetime(2024, 3, 9, 12, 0, tzinfo=pytz.UTC)]
+        for index, transaction_date in enumerate(dates):
+            pg_session.add(Transaction(
+                description=f"Transação {index + 1}",
+                amount=Decimal("10.00"),
+                transaction_type=TransactionType.EXPENSE,
+                status=TransactionStatus.COMPLETED,
+                transaction_date=transaction_date,
+                user_id=pg_user.id,
+                account_id=account.id,
+            ))
+        await pg_session.commit()
+        repository = SQLAlchemyTransactionRepository(pg_session)
+
+        first_page = await repository.get_visible_page(pg_user.id, limit=2)
+        last = first_page[-1]
+        after = decode_cursor(encode_cursor(last.transaction_date, last.id))
+        second_page = await repository.get_visible_page(pg_user.id, limit=2, after=after)
+
+        keys = [(t.transaction_date, t.id) for t in first_page + second_page]
+        assert len(set(keys)) == 4
+        assert keys == sorted(keys, reverse=True)
+        # O corte caiu entre transações da mesma data
+        assert first_page[-1].transaction_date == second_page[0].transaction_date == same_date
+        assert second_page[-1].transaction_date < same_date
+
+        assert await repository.get_visible_page(
+            pg_user.id, limit=2, after=(second_page[-1].transaction_date, second_page[-1].id)
+        ) == []
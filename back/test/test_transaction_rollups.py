@@ -0,0 +1,141 @@
+"""
+Testes dos totais diários (daily_transaction_rollups) mantidos nas escritas de transações
+
+Precisam de PostgreSQL (upsert com ON CONFLICT): defina TEST_POSTGRES_URL.
+"""
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+import pytz
+from sqlalchemy import select, func
+
+from src.application.services.transaction_rollup_service import TransactionRollupService
+from src.application.use_cases.transfer_use_cases import TransferUseCases
+from src.infrastructure.database.models.account import Account
+from src.infrastructure.database.models.transaction import Transaction, TransactionType, TransactionStatus
+from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+from src.infrastructure.repositories.transfer_repository import SQLAlchemyTransferRepository
+
+
+async def totals_by_type(rollup_repo, user_id):
+    """Totais dos agregados por tipo"""
+    rows = await rollup_repo.get_totals(user_id, date(2000, 1, 1), date(2100, 1, 1), group_by=("type",))
+    return {row["type"]: (row["total"], row["count"]) for row in rows}
+
+
+async def transactions_by_type(session, user_id):
+    """Mesmos totais calculados direto na tabela de transações"""
+    result = await session.execute(
+        select(Transaction.transaction_type, func.sum(Transaction.amount), func.count(Transaction.id))
+        .where(Transaction.user_id == user_id)
+        .group_by(Transaction.transaction_type)
+    )
+    return {row[0].value: (Decimal(str(row[1])), row[2]) for row in result.all()}
+
+
+@pytest.fixture
+def transfer_use_cases(pg_session):
+    return TransferUseCases(
+        SQLAlchemyTransferRepository(pg_session),
+        SQLAlchemyAccountRepository(pg_session),
+        SQLAlchemyTransactionRepository(pg_session),
+        SQLAlchemyTransactionRollupRepository(pg_session),
+    )
+
+
+class TestTransferRollups:
+    """Transferências criam/removem transações e devem mover os totais junto"""
+
+    async def test_transfer_matches_transactions_sum(self, pg_session, pg_user, make_account, transfer_use_cases):
+        origin = await make_account("Origem", "1000.00")
+        destination = await make_account("Destino", "0.00")
+
+        await transfer_use_cases.create_transfer(
+            from_account_id=origin.id,
+            to_account_id=destination.id,
+            amount=Decimal("250.00"),
+            user_id=pg_user.id,
+            transfer_date=datetime(2024, 3, 10, 12, 0, tzinfo=pytz.UTC),
+        )
+
+        rollup_repo = SQLAlchemyTransactionRollupRepository(pg_session)
+        totals = await totals_by_type(rollup_repo, pg_user.id)
+        assert totals == await transactions_by_type(pg_session, pg_user.id)
+        assert totals == {
+            "expense": (Decimal("250.00"), 1),
+            "income": (Decimal("250.00"), 1),
+        }
+
+    async def test_cancelled_transfer_is_removed_from_totals(
+        self, pg_session, pg_user, make_account, transfer_use_cases
+    ):
+        origin = await make_account("Origem", "1000.00")
+        destination = await make_account("Destino", "0.00")
+        transfer = await transfer_use_cases.create_transfer(
+            from_account_id=origin.id,
+            to_account_id=destination.id,
+            amount=Decimal("100.00"),
+            user_id=pg_user.id,
+            transfer_date=datetime(2024, 3, 10, 12, 0, tzinfo=pytz.UTC),
+        )
+
+        await transfer_use_cases.cancel_transfer(transfer.id)
+
+        rollup_repo = SQLAlchemyTransactionRollupRepository(pg_session)
+        assert await totals_by_type(rollup_repo, pg_user.id) == {}
+        assert await transactions_by_type(pg_session, pg_user.id) == {}
+
+
+class TestRollupFailure:
+    """Falha no upsert dos totais não pode deixar a sessão do chamador abortada"""
+
+    async def test_failed_upsert_is_rolled_back_and_session_stays_usable(
+        self, pg_session, pg_session_factory, pg_user, make_account
+    ):
+        account = await make_account("Conta", "500.00")
+        service = TransactionRollupService(SQLAlchemyTransactionRollupRepository(pg_session))
+        # Usuário inexistente: o upsert viola a chave estrangeira
+        orphan = Transaction(
+            description="Órfã",
+            amount=Decimal("10.00"),
+            transaction_type=TransactionType.EXPENSE,
+            status=TransactionStatus.COMPLETED,
+            transaction_date=datetime(2024, 3, 10, tzinfo=pytz.UTC),
+            user_id=uuid.uuid4(),
+            account_id=account.id,
+        )
+
+        await service.record_created(orphan)
+
+        # A escrita seguinte do caso de uso continua funcionando
+        account.balance -= Decimal("10.00")
+        await SQLAlchemyAccountRepository(pg_session).update(account)
+
+        async with pg_session_factory() as session:
+            stored = await session.get(Account, account.id)
+            assert stored.balance == Decimal("490.00")
+
+    async def test_update_moves_amount_within_same_key(self, pg_session, pg_user, make_account):
+        account = await make_account()
+        rollup_repo = SQLAlchemyTransactionRollupRepository(pg_session)
+        service = TransactionRollupService(rollup_repo)
+        transaction = Transaction(
+            description="Mercado",
+            amount=Decimal("80.00"),
+            transaction_type=TransactionType.EXPENSE,
+            status=TransactionStatus.COMPLETED,
+            transaction_date=datetime(2024, 3, 10, tzinfo=pytz.UTC),
+            user_id=pg_user.id,
+            account_id=account.id,
+        )
+        await service.record_created(transaction)
+
+        old_snapshot = TransactionRollupService.snapshot(transaction)
+        transaction.amount = Decimal("95.50")
+        await service.record_updated(old_snapshot, transaction)
+
+        assert await totals_by_type(rollup_repo, pg_user.id) == {"expense": (Decimal("95.50"), 1)}
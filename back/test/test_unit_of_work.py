@@ -0,0 +1,170 @@
+"""
+Testes da unidade de trabalho (um commit por caso de uso) na criação de transações
+
+Precisam de PostgreSQL (SAVEPOINT, upsert dos totais): defina TEST_POSTGRES_URL.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytz
+from sqlalchemy import select, func, text
+
+from src.application.use_cases.transaction_use_cases import TransactionUseCases
+from src.infrastructure.cache import cache_service as cache_module
+from src.infrastructure.database.models.account import Account
+from src.infrastructure.database.models.calendar_event import CalendarEvent
+from src.infrastructure.database.models.transaction import Transaction
+from src.infrastructure.database.unit_of_work import UnitOfWork, after_commit
+from src.infrastructure.repositories.account_repository import SQLAlchemyAccountRepository
+from src.infrastructure.repositories.calendar_repository import SQLAlchemyCalendarEventRepository
+from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
+from src.infrastructure.repositories.transaction_rollup_repository import SQLAlchemyTransactionRollupRepository
+
+
+class BrokenCalendarEventRepository(SQLAlchemyCalendarEventRepository):
+    """Gera um erro de banco ao criar o evento (o serviço de calendário engole o erro)"""
+
+    async def create(self, event):
+        await self.session.execute(text("INSERT INTO tabela_inexistente VALUES (1)"))
+
+
+class BrokenAccountRepository(SQLAlchemyAccountRepository):
+    """Falha ao gravar o saldo, depois de a transação já ter sido enviada ao banco"""
+
+    async def update(self, account):
+        raise RuntimeError("falha ao atualizar saldo")
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    """Registra as invalidações de cache em vez de ir ao Redis"""
+    calls = []
+
+    async def record(user_id, *namespaces):
+        calls.append((user_id, namespaces))
+
+    monkeypatch.setattr(cache_module.cache_service, "invalidate", record)
+    return calls
+
+
+def build_use_cases(session, account_repository=None, calendar_event_repository=None):
+    return TransactionUseCases(
+        transaction_repository=SQLAlchemyTransactionRepository(session),
+        account_repository=account_repository or SQLAlchemyAccountRepository(session),
+        calendar_event_repository=calendar_event_repository or SQLAlchemyCalendarEventRepository(session),
+        transaction_rollup_repository=SQLAlchemyTransactionRollupRepository(session),
+        unit_of_work=UnitOfWork(session),
+    )
+
+
+async def create_expense(use_cases, user_id, account_id):
+    return await use_cases.create_transaction(
+        description="Mercado",
+        amount=Decimal("150.50"),
+        transaction_type="expense",
+        transaction_date=datetime(2024, 1, 15, 10, 0, tzinfo=pytz.UTC),
+        user_id=user_id,
+        account_id=account_id,
+    )
+
+
+async def count(session_factory, model):
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+async def balance(session_factory, account_id):
+    async with session_factory() as session:
+        return (await session.get(Account, account_id)).balance
+
+
+class TestUnitOfWorkCreateTransaction:
+    """create_transaction confirma tudo junto ou nada"""
+
+    async def test_commits_transaction_event_rollup_and_balance(
+        self, pg_session, pg_session_factory, pg_user, make_account, invalidations
+    ):
+        account = await make_account()
+
+        await create_expense(build_use_cases(pg_session), pg_user.id, account.id)
+
+        assert await count(pg_session_factory, Transaction) == 1
+        assert await count(pg_session_factory, CalendarEvent) == 1
+        assert await balance(pg_session_factory, account.id) == Decimal("849.50")
+        assert (pg_user.id, ("transactions",)) in invalidations
+
+    async def test_account_update_failure_rolls_back_everything(
+        self, pg_session, pg_session_factory, pg_user, make_account, invalidations
+    ):
+        account = await make_account()
+        user_id, account_id = pg_user.id, account.id
+        use_cases = build_use_cases(pg_session, account_repository=BrokenAccountRepository(pg_session))
+
+        with pytest.raises(RuntimeError):
+            await create_expense(use_cases, user_id, account_id)
+
+        assert await count(pg_session_factory, Transaction) == 0
+        assert await count(pg_session_factory, CalendarEvent) == 0
+        assert await balance(pg_session_factory, account_id) == Decimal("1000.00")
+        # Invalidações registradas com after_commit não rodam sem commit
+        assert invalidations == []
+
+    async def test_failing_optional_step_is_rolled_back_alone(
+        self, pg_session, pg_session_factory, pg_user, make_account, invalidations
+    ):
+        account = await make_account()
+        use_cases = build_use_cases(
+            pg_session, calendar_event_repository=BrokenCalendarEventRepository(pg_session)
+        )
+
+        transaction = await create_expense(use_cases, pg_user.id, account.id)
+
+        assert transaction.id is not None
+        assert await count(pg_session_factory, Transaction) == 1
+        assert await count(pg_session_factory, CalendarEvent) == 0
+        assert await balance(pg_session_factory, account.id) == Decimal("849.50")
+
+
+class TestAfterCommit:
+    """Ações pós-commit da UnitOfWork"""
+
+    async def test_callbacks_run_only_after_commit(self, pg_session):
+        calls = []
+
+        async def callback(value):
+            calls.append(value)
+
+        async with UnitOfWork(pg_session):
+            await after_commit(pg_session, callback, "ok")
+            assert calls == []
+
+        assert calls == ["ok"]
+
+    async def test_callbacks_are_dropped_on_rollback(self, pg_session):
+        calls = []
+
+        async def callback(value):
+            calls.append(value)
+
+        with pytest.raises(ValueError):
+            async with UnitOfWork(pg_session):
+                await after_commit(pg_session, callback, "não deveria rodar")
+                raise ValueError("erro no caso de uso")
+
+        assert calls == []
+
+        # A mesma sessão segue utilizável e a próxima unidade de trabalho começa limpa
+        async with UnitOfWork(pg_session):
+            await after_commit(pg_session, callback, "ok")
+        assert calls == ["ok"]
+
+    async def test_without_unit_of_work_callback_runs_immediately(self, pg_session):
+        calls = []
+
+        async def callback(value):
+            calls.append(value)
+
+        await after_commit(pg_session, callback, "agora")
+
+        assert calls == ["agora"]